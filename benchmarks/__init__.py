@@ -0,0 +1 @@
+"""Performance benchmarks for linmon (not part of the unit test suite)."""
@@ -0,0 +1,135 @@
+"""
+End-to-end run benchmark.
+
+Runs LinmonCore against fixture trees: a storage monitor over directories
+of a temporary filesystem and a cgroup monitor over a synthetic cgroup v2
+hierarchy, with history, journal and Prometheus output enabled. Monitors
+that sample the live system (cpu sleeps, iostuck reads the kernel log)
+are left out so runs are comparable between hosts.
+
+Usage:
+    python -m benchmarks.bench_core --mounts 100 --cgroups 1000
+"""
+
+import argparse
+import json
+import os
+import tempfile
+from typing import Dict, List
+
+from benchmarks.harness import Case, run_cases
+from linmon.core import LinmonCore
+
+DEFAULT_MOUNTS, DEFAULT_CGROUPS = 100, 1000
+FULL_MOUNTS, FULL_CGROUPS = 500, 5000
+
+CGROUPS_PER_SLICE = 100
+
+
+def build_cgroup_tree(root: str, count: int) -> None:
+    """Create ``count`` service cgroups with v2 stat files, in slices of 100."""
+    for i in range(count):
+        path = os.path.join(root, f"slice{i // CGROUPS_PER_SLICE}.slice", f"svc{i}.service")
+        os.makedirs(path)
+        files: Dict[str, str] = {
+            "cpu.stat": f"usage_usec {i * 1000}\nuser_usec {i * 800}\nsystem_usec {i * 200}\n"
+                        f"nr_periods 0\nnr_throttled 0\nthrottled_usec {i % 7}\n",
+            "memory.current": f"{(i + 1) * 4096}\n",
+            "memory.events": f"low 0\nhigh {i % 3}\nmax 0\noom 0\noom_kill 0\n",
+            "io.stat": f"8:0 rbytes={i * 512} wbytes={i * 256} rios=1 wios=1 dbytes=0 dios=0\n",
+            "io.pressure": f"some avg10=0.00 avg60=0.00 avg300=0.00 total={i * 10}\n"
+                           "full avg10=0.00 avg60=0.00 avg300=0.00 total=0\n",
+            "cgroup.procs": "",
+        }
+        for name, text in files.items():
+            with open(os.path.join(path, name), "w") as f:
+                f.write(text)
+
+
+def write_config(workdir: str, mounts: int, cgroups: int) -> str:
+    """
+    Write a config monitoring fixture trees below workdir.
+    
+    Returns:
+        Config file path
+    """
+    base = os.path.join(workdir, f"core-{mounts}-{cgroups}")
+    cgroup_root = os.path.join(base, "cgroup")
+    build_cgroup_tree(cgroup_root, cgroups)
+    
+    mountpoints = []
+    for i in range(mounts):
+        path = os.path.join(base, "mnt", f"vol{i}")
+        os.makedirs(path)
+        mountpoints.append({
+            "path": path,
+            "rules": [
+                # Always fires, so every run builds anomalies and diagnostics
+                {"name": f"vol{i}_used", "metric": "bytes_used_percent", "op": "gte", "value": 0, "consecutive": 1},
+                {"name": f"vol{i}_inodes", "metric": "inodes_used_percent", "op": "gt", "value": 95, "consecutive": 2},
+            ],
+        })
+    
+    config = {
+        "state_file": os.path.join(base, "state", "state.json"),
+        "report_dir": os.path.join(base, "reports"),
+        "reports": {"mode": "journal"},
+        "alerts": {"stdout": False, "file": os.path.join(base, "alerts.log")},
+        "history": {"enabled": True},
+        "prometheus": {"textfile": os.path.join(base, "linmon.prom")},
+        "monitors": {
+            "storage": {
+                "mountpoints": mountpoints,
+                "scan": {"enabled": False},
+                "deleted_files": {"enabled": False},
+            },
+            "cgroup": {
+                "root": cgroup_root,
+                "depth": 2,
+                "rules": [
+                    {"name": "cgroup_memory", "metric": "cgroup_memory_bytes", "op": "gt", "value": 1e12, "consecutive": 1},
+                ],
+            },
+        },
+    }
+    path = os.path.join(base, "config.yaml")
+    # JSON is valid YAML
+    with open(path, "w") as f:
+        json.dump(config, f, indent=2)
+    return path
+
+
+def cases(workdir: str, full: bool = False, mounts: int = 0, cgroups: int = 0) -> List[Case]:
+    """End-to-end cases."""
+    mounts = mounts or (FULL_MOUNTS if full else DEFAULT_MOUNTS)
+    cgroups = cgroups or (FULL_CGROUPS if full else DEFAULT_CGROUPS)
+    config_path = write_config(workdir, mounts, cgroups)
+    core = LinmonCore(config_path)
+    
+    def cold_run():
+        # Config load and monitor setup included, as for a cron run
+        fresh = LinmonCore(config_path)
+        try:
+            fresh.run()
+        finally:
+            fresh.close()
+    
+    suffix = f"{mounts}_mounts_{cgroups}_cgroups"
+    return [
+        Case(f"core.cold_run_{suffix}", cold_run, repeat=3),
+        Case(f"core.run_{suffix}", core.run),
+    ]
+
+
+def main():
+    """Benchmark entry point."""
+    parser = argparse.ArgumentParser(description="linmon end-to-end run benchmark")
+    parser.add_argument("--mounts", type=int, default=DEFAULT_MOUNTS, help="Storage mountpoints")
+    parser.add_argument("--cgroups", type=int, default=DEFAULT_CGROUPS, help="Synthetic cgroups")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory(prefix="linmon-bench-") as tmpdir:
+        run_cases(cases(tmpdir, mounts=args.mounts, cgroups=args.cgroups))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Kernel log scanning benchmark.
+
+Generates synthetic kernel logs and compares the legacy line-based path
+(readlines + per-line regex) with the bytes-level LogScanner.
+
+Usage:
+    python -m benchmarks.bench_logscan --sizes 10M,100M,1G
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from typing import Dict, List, Sequence
+
+from benchmarks.harness import Case
+from linmon.collectors.logs import LogCollector
+
+NORMAL_LINES = [
+    b"2026-01-05T10:00:00+0000 host kernel: EXT4-fs (sda1): mounted filesystem with ordered data mode\n",
+    b"2026-01-05T10:00:01+0000 host kernel: audit: type=1400 audit(1704448801.123:42): apparmor=\"ALLOWED\"\n",
+    b"2026-01-05T10:00:02+0000 host kernel: nfs: server storage01 not responding, still trying\n",
+    b"2026-01-05T10:00:03+0000 host kernel: e1000e: eth0 NIC Link is Up 1000 Mbps Full Duplex\n",
+]
+HUNG_LINE = b"2026-01-05T10:00:04+0000 host kernel: INFO: task kworker/u8:2:1234 blocked for more than 120 seconds.\n"
+HUNG_EVERY = 1000  # One hung-task line per this many lines
+
+DEFAULT_SIZES = ("10M",)
+FULL_SIZES = ("10M", "100M", "1G")
+
+
+def parse_size(s: str) -> int:
+    """Parse a size like 10M or 1G into bytes."""
+    s = s.strip().upper()
+    units = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+    if s and s[-1] in units:
+        return int(float(s[:-1]) * units[s[-1]])
+    return int(s)
+
+
+def generate_log(path: str, size: int) -> int:
+    """
+    Write a synthetic kernel log of roughly size bytes.
+    
+    Returns:
+        Number of hung-task lines written
+    """
+    block = []
+    for i in range(HUNG_EVERY):
+        block.append(HUNG_LINE if i == 0 else NORMAL_LINES[i % len(NORMAL_LINES)])
+    block_bytes = b"".join(block)
+    
+    written = 0
+    hung = 0
+    with open(path, "wb") as f:
+        while written < size:
+            f.write(block_bytes)
+            written += len(block_bytes)
+            hung += 1
+    return hung
+
+
+def measure(fn) -> Dict[str, float]:
+    """Run fn once, returning wall time and Python heap peak."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"count": count, "seconds": elapsed, "peak_bytes": peak}
+
+
+def run(sizes: List[int], legacy_limit: int) -> List[Dict]:
+    """Run the benchmark for each size and return result rows."""
+    collector = LogCollector()
+    rows = []
+    
+    with tempfile.TemporaryDirectory(prefix="linmon-bench-") as tmpdir:
+        for size in sizes:
+            path = os.path.join(tmpdir, f"kern-{size}.log")
+            expected = generate_log(path, size)
+            actual_size = os.path.getsize(path)
+            
+            def scan():
+                result, _ = collector.scanner.scan_file(path, 0)
+                return result.count
+            
+            row = {"size_bytes": actual_size, "expected": expected, "scanner": measure(scan)}
+            
+            if size <= legacy_limit:
+                def legacy():
+                    lines, _ = collector.collect_from_file(path, 0)
+                    return collector.find_hung_tasks(lines)
+                
+                row["legacy"] = measure(legacy)
+            
+            rows.append(row)
+            os.unlink(path)
+    
+    return rows
+
+
+def cases(workdir: str, full: bool = False, sizes: Sequence[str] = ()) -> List[Case]:
+    """Scanner cases (logs are written to workdir up front)."""
+    collector = LogCollector()
+    result = []
+    for label in sizes or (FULL_SIZES if full else DEFAULT_SIZES):
+        path = os.path.join(workdir, f"kern-{label}.log")
+        generate_log(path, parse_size(label))
+        
+        def scan(path=path):
+            return collector.scanner.scan_file(path, 0)
+        
+        # Large logs take seconds per scan: time them once
+        large = os.path.getsize(path) > 100 * 1024 ** 2
+        result.append(Case(f"logscan.scan_{label}", scan, repeat=1 if large else 3, warmup=0 if large else 1))
+    return result
+
+
+def main():
+    """Benchmark entry point."""
+    parser = argparse.ArgumentParser(description="linmon log scanning benchmark")
+    parser.add_argument("--sizes", default="10M,100M,1G", help="Comma-separated log sizes")
+    parser.add_argument(
+        "--legacy-limit",
+        default="100M",
+        help="Largest size to run the legacy readlines path on (it holds the whole log in memory)",
+    )
+    args = parser.parse_args()
+    
+    sizes = [parse_size(s) for s in args.sizes.split(",") if s.strip()]
+    rows = run(sizes, parse_size(args.legacy_limit))
+    
+    print(f"{'size':>10} {'impl':>8} {'count':>8} {'seconds':>9} {'MB/s':>9} {'heap peak':>12}")
+    for row in rows:
+        mb = row["size_bytes"] / (1024 ** 2)
+        for impl in ("scanner", "legacy"):
+            if impl not in row:
+                continue
+            m = row[impl]
+            rate = mb / m["seconds"] if m["seconds"] > 0 else float("inf")
+            ok = "" if m["count"] == row["expected"] else "  MISMATCH"
+            print(
+                f"{mb:>8.0f}MB {impl:>8} {m['count']:>8} {m['seconds']:>9.3f} "
+                f"{rate:>9.1f} {m['peak_bytes'] / 1024:>10.0f}KB{ok}"
+            )
+
+
+if __name__ == "__main__":
+    main()
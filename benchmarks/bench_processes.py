@@ -0,0 +1,107 @@
+"""
+Process scanning benchmark.
+
+Measures the D-state task scan over synthetic ``ps`` output and the
+deleted-open-file scan over a synthetic /proc tree, at 1k/10k/50k tasks.
+
+Usage:
+    python -m benchmarks.bench_processes --tasks 1000,10000,50000
+"""
+
+import argparse
+import os
+import stat
+import tempfile
+from typing import List, Sequence
+
+from benchmarks.harness import Case, run_cases
+from linmon.collectors.deleted import DELETED_SUFFIX, DeletedFileCollector
+from linmon.collectors.processes import ProcessCollector
+
+DEFAULT_TASKS = (1000, 10000)
+FULL_TASKS = (1000, 10000, 50000)
+
+FDS_PER_TASK = 4
+D_STATE_EVERY = 100  # One task in uninterruptible sleep per this many
+WCHANS = ["do_wait", "ep_poll", "futex_wait_queue", "hrtimer_nanosleep", "pipe_read"]
+
+
+def write_fake_ps(workdir: str, tasks: int) -> str:
+    """
+    Write an executable printing ``ps -eo pid,state,comm,wchan:32`` output.
+    
+    Returns:
+        Path of the script
+    """
+    output = os.path.join(workdir, f"ps-{tasks}.txt")
+    with open(output, "w") as f:
+        f.write("    PID S COMMAND         WCHAN\n")
+        for pid in range(1, tasks + 1):
+            if pid % D_STATE_EVERY == 0:
+                f.write(f"{pid:>7} D kworker/u8:{pid % 16}   io_schedule\n")
+            else:
+                f.write(f"{pid:>7} S worker{pid % 97:<9} {WCHANS[pid % len(WCHANS)]}\n")
+    
+    script = os.path.join(workdir, f"ps-{tasks}")
+    with open(script, "w") as f:
+        f.write(f"#!/bin/sh\nexec cat '{output}'\n")
+    os.chmod(script, os.stat(script).st_mode | stat.S_IXUSR)
+    return script
+
+
+def build_proc_tree(workdir: str, tasks: int) -> str:
+    """
+    Build a /proc-like tree of ``tasks`` processes with fd symlinks.
+    
+    Most fds point at pipes and sockets (skipped on the link target
+    alone); one per task points at a " (deleted)" path, which is stat()ed.
+    
+    Returns:
+        The tree's root, to use as proc_root
+    """
+    root = os.path.join(workdir, f"proc-{tasks}")
+    # A real file named like a deleted one: still linked, so it is stat()ed
+    # and then skipped, as a file replaced under an open fd would be
+    held = os.path.join(workdir, "held.log" + DELETED_SUFFIX)
+    with open(held, "w") as f:
+        f.write("x")
+    for pid in range(1, tasks + 1):
+        fd_dir = os.path.join(root, str(pid), "fd")
+        os.makedirs(fd_dir)
+        with open(os.path.join(root, str(pid), "comm"), "w") as f:
+            f.write(f"worker{pid % 97}\n")
+        os.symlink(held, os.path.join(fd_dir, "0"))
+        for fd in range(1, FDS_PER_TASK):
+            target = f"pipe:[{pid * 10 + fd}]" if fd % 2 else f"socket:[{pid * 10 + fd}]"
+            os.symlink(target, os.path.join(fd_dir, str(fd)))
+    return root
+
+
+def cases(workdir: str, full: bool = False, tasks: Sequence[int] = ()) -> List[Case]:
+    """Process scanning cases."""
+    result = []
+    for count in tasks or (FULL_TASKS if full else DEFAULT_TASKS):
+        repeat = 3 if count > 10000 else 5
+        
+        ps = ProcessCollector()
+        ps.ps_path = write_fake_ps(workdir, count)
+        result.append(Case(f"processes.d_state_{count}_tasks", ps.get_d_state_tasks, repeat))
+        
+        deleted = DeletedFileCollector(build_proc_tree(workdir, count))
+        result.append(Case(f"processes.deleted_open_{count}_tasks", deleted.scan, repeat))
+    return result
+
+
+def main():
+    """Benchmark entry point."""
+    parser = argparse.ArgumentParser(description="linmon process scanning benchmark")
+    parser.add_argument("--tasks", default="1000,10000,50000", help="Comma-separated task counts")
+    args = parser.parse_args()
+    
+    tasks = [int(t) for t in args.tasks.split(",") if t.strip()]
+    with tempfile.TemporaryDirectory(prefix="linmon-bench-") as tmpdir:
+        run_cases(cases(tmpdir, tasks=tasks))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+procfs, PSI, cgroup and mountstats parsing benchmark.
+
+/proc/stat, /proc/loadavg and PSI are read from the running kernel; the
+cgroup stat files and mountstats are synthetic, so hosts without cgroup v2
+or NFS mounts measure the same work.
+
+Usage:
+    python -m benchmarks.bench_procfs
+"""
+
+import argparse
+import io
+import tempfile
+from typing import List
+
+from benchmarks.harness import Case, run_cases
+from linmon.collectors.cgroups import parse_sample
+from linmon.collectors.nfs import parse_mountstats
+from linmon.collectors.procfs import ProcFSCollector
+from linmon.collectors.psi import PSICollector
+
+CALLS = 1000  # Parses per timed run of the small files
+
+CGROUP_FILES = {
+    "cpu.stat": (
+        "usage_usec 123456789\nuser_usec 100000000\nsystem_usec 23456789\n"
+        "nr_periods 5000\nnr_throttled 120\nthrottled_usec 9876543\n"
+    ),
+    "memory.current": "536870912\n",
+    "memory.events": "low 0\nhigh 12\nmax 3\noom 1\noom_kill 1\n",
+    "io.stat": "".join(
+        f"8:{16 * i} rbytes=123456789 wbytes=98765432 rios=1234 wios=5678 dbytes=0 dios=0\n" for i in range(4)
+    ),
+    "cpu.pressure": "some avg10=1.00 avg60=0.50 avg300=0.10 total=123456\nfull avg10=0 avg60=0 avg300=0 total=0\n",
+    "memory.pressure": "some avg10=0.00 avg60=0.00 avg300=0.00 total=0\nfull avg10=0 avg60=0 avg300=0 total=0\n",
+    "io.pressure": "some avg10=5.00 avg60=2.00 avg300=1.00 total=9999999\nfull avg10=1 avg60=1 avg300=0 total=99\n",
+}
+
+NFS_OPS = [
+    "NULL", "READ", "WRITE", "COMMIT", "OPEN", "OPEN_CONFIRM", "OPEN_NOATTR", "OPEN_DOWNGRADE", "CLOSE",
+    "SETATTR", "FSINFO", "RENEW", "SETCLIENTID", "LOCK", "LOCKT", "LOCKU", "ACCESS", "GETATTR", "LOOKUP",
+    "LOOKUP_ROOT", "REMOVE", "RENAME", "LINK", "SYMLINK", "CREATE", "PATHCONF", "STATFS", "READLINK",
+    "READDIR", "SERVER_CAPS", "DELEGRETURN", "GETACL", "SETACL", "FS_LOCATIONS", "SECINFO", "EXCHANGE_ID",
+]
+
+
+def build_mountstats(nfs_mounts: int, other_mounts: int) -> str:
+    """Build a mountstats file with many NFSv4 and local mounts."""
+    parts: List[str] = []
+    for i in range(other_mounts):
+        parts.append(f"device /dev/loop{i} mounted on /snap/pkg{i} with fstype squashfs\n")
+    for i in range(nfs_mounts):
+        parts.append(f"device nas{i % 4}:/export/{i} mounted on /mnt/nfs{i} with fstype nfs4 statvers=1.1\n")
+        parts.append("\topts:\trw,vers=4.2,rsize=1048576,wsize=1048576,hard,proto=tcp,timeo=600\n")
+        parts.append("\tage:\t123456\n\tcaps:\tcaps=0xffff,wtmult=512,dtsize=32768,bsize=0,namlen=255\n")
+        parts.append("\tevents:\t" + " ".join(str(n) for n in range(27)) + "\n")
+        parts.append("\tbytes:\t1 2 3 4 5 6 7 8\n\tRPC iostats version: 1.1  p/v: 100003/4 (nfs)\n")
+        parts.append("\txprt:\ttcp 833 1 1 0 0 123456 123456 0 123456 789 64 0 0\n\tper-op statistics\n")
+        for op in NFS_OPS:
+            parts.append(f"\t{op:>12}: 1234 1236 0 123456 654321 12 3456 3789 0\n")
+        parts.append("\n")
+    return "".join(parts)
+
+
+def cases(workdir: str, full: bool = False) -> List[Case]:
+    """Parsing cases."""
+    procfs = ProcFSCollector()
+    psi = PSICollector()
+    mountstats = build_mountstats(200 if full else 50, 200)
+    ops = ["READ", "WRITE", "GETATTR", "LOOKUP", "ACCESS", "COMMIT"]
+    
+    def read_stat():
+        for _ in range(CALLS):
+            procfs.read_stat()
+            procfs.read_loadavg()
+    
+    def read_psi():
+        for _ in range(CALLS):
+            psi.read_io_pressure()
+    
+    def cgroup_parse():
+        for _ in range(CALLS):
+            parse_sample(CGROUP_FILES)
+    
+    def mountstats_parse():
+        parse_mountstats(io.StringIO(mountstats), ops)
+    
+    return [
+        Case(f"procfs.stat_loadavg_x{CALLS}", read_stat),
+        Case(f"procfs.psi_io_x{CALLS}", read_psi),
+        Case(f"procfs.cgroup_sample_x{CALLS}", cgroup_parse),
+        Case(f"procfs.mountstats_{200 if full else 50}_nfs_mounts", mountstats_parse),
+    ]
+
+
+def main():
+    """Benchmark entry point."""
+    parser = argparse.ArgumentParser(description="linmon procfs parsing benchmark")
+    parser.add_argument("--full", action="store_true", help="Use the larger workloads")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory(prefix="linmon-bench-") as tmpdir:
+        run_cases(cases(tmpdir, args.full))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Report building and serialization benchmark.
+
+Evaluates a synthetic monitor with many labelled rules (half of them
+anomalous), then measures ReportBuilder.build() and the JSON, text and
+Prometheus reporters on the result.
+
+Usage:
+    python -m benchmarks.bench_report --rules 2000
+"""
+
+import argparse
+import os
+import tempfile
+from typing import List
+
+from benchmarks.bench_rules import build_workload
+from benchmarks.harness import Case, run_cases
+from linmon.config.schema import MonitorConfig
+from linmon.metrics.model import MetricSet
+from linmon.monitors.base import MonitorBase
+from linmon.report.builder import ReportBuilder
+from linmon.report.json import JSONReporter
+from linmon.report.prometheus import PrometheusReporter
+from linmon.report.text import TextReporter
+from linmon.rules.engine import RuleEngine
+from linmon.state.manager import StateManager
+
+DEFAULT_RULES = 2000
+FULL_RULES = 10000
+
+
+class SyntheticMonitor(MonitorBase):
+    """Monitor returning a fixed MetricSet."""
+    
+    def __init__(self, config: MonitorConfig, rule_engine: RuleEngine, metrics: MetricSet):
+        """
+        Initialize monitor.
+        
+        Args:
+            config: Monitor configuration (rules)
+            rule_engine: Rule evaluation engine
+            metrics: Metrics returned by every collection
+        """
+        self.metrics = metrics
+        super().__init__("storage", config, rule_engine)
+    
+    def collect_metrics(self) -> MetricSet:
+        """Return the fixed metrics."""
+        return self.metrics
+    
+    def get_suggested_commands(self) -> List[str]:
+        """Get suggested diagnostic commands."""
+        return ["df -h", "df -i"]
+
+
+def cases(workdir: str, full: bool = False, rules: int = 0) -> List[Case]:
+    """Report cases."""
+    count = rules or (FULL_RULES if full else DEFAULT_RULES)
+    _, _, labelled_rules, metric_set = build_workload(count, 1.0)
+    engine = RuleEngine(StateManager(os.path.join(workdir, f"report-state-{count}.json")))
+    monitor = SyntheticMonitor(MonitorConfig(rules=labelled_rules), engine, metric_set)
+    # Rules need two consecutive violations to become anomalies
+    monitor.evaluate()
+    monitors = {"storage": monitor}
+    results = {"storage": monitor.evaluate()}
+    
+    builder = ReportBuilder()
+    report = builder.build(monitors, results)
+    json_reporter = JSONReporter()
+    text_reporter = TextReporter()
+    prometheus_reporter = PrometheusReporter()
+    
+    return [
+        Case(f"report.build_{count}_rules", lambda: builder.build(monitors, results)),
+        Case(f"report.json_{count}_rules", lambda: json_reporter.format(report)),
+        Case(f"report.text_{count}_rules", lambda: text_reporter.format(report)),
+        Case(f"report.prometheus_{count}_rules", lambda: prometheus_reporter.format(report)),
+    ]
+
+
+def main():
+    """Benchmark entry point."""
+    parser = argparse.ArgumentParser(description="linmon report benchmark")
+    parser.add_argument("--rules", type=int, default=DEFAULT_RULES, help="Number of rules")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory(prefix="linmon-bench-") as tmpdir:
+        run_cases(cases(tmpdir, rules=args.rules))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Rule evaluation benchmark.
+
+Builds a synthetic config with many mount rules and compares the legacy
+per-rule loop (flat metric lookup + if/elif operator chain) with a compiled
+EvaluationPlan over labelled metric families.
+
+Usage:
+    python -m benchmarks.bench_rules --rules 10000 --iterations 20
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from typing import Dict, List
+
+from benchmarks.harness import Case
+from linmon.config.schema import Rule
+from linmon.metrics.model import MetricSet
+from linmon.rules.engine import RuleEngine
+from linmon.rules.model import RuleResult
+from linmon.state.manager import StateManager
+
+OPS = ["gt", "gte", "lt", "lte", "eq", "ne"]
+
+DEFAULT_RULES = 10000
+FULL_RULES = 50000
+
+
+def legacy_apply_operator(op: str, value: float, threshold: float) -> bool:
+    """The original if/elif operator chain."""
+    if op == "gt":
+        return value > threshold
+    elif op == "gte":
+        return value >= threshold
+    elif op == "lt":
+        return value < threshold
+    elif op == "lte":
+        return value <= threshold
+    elif op == "eq":
+        return abs(value - threshold) < 1e-9
+    elif op == "ne":
+        return abs(value - threshold) >= 1e-9
+    raise ValueError(f"Unknown operator: {op}")
+
+
+def legacy_evaluate(state: StateManager, rules: List[Rule], metrics: Dict[str, float]) -> List[RuleResult]:
+    """The original RuleEngine.evaluate loop."""
+    results = []
+    for rule in rules:
+        if rule.metric not in metrics:
+            continue
+        value = metrics[rule.metric]
+        violated = legacy_apply_operator(rule.op, value, rule.value)
+        if violated:
+            streak = state.increment_rule_streak(rule.name)
+        else:
+            state.reset_rule_streak(rule.name)
+            streak = 0
+        results.append(
+            RuleResult(
+                rule_name=rule.name,
+                metric=rule.metric,
+                value=value,
+                threshold=rule.value,
+                operator=rule.op,
+                violated=violated,
+                streak=streak,
+                consecutive_required=rule.consecutive,
+                anomaly=streak >= rule.consecutive,
+            )
+        )
+    return results
+
+
+def build_workload(rule_count: int, present_ratio: float):
+    """
+    Build rules over per-mount metrics, with only a fraction of mounts present.
+    
+    Returns:
+        Tuple of (legacy_rules, flat_metrics, labelled_rules, metric_set)
+    """
+    fields = ["bytes_used_percent", "inodes_used_percent", "bytes_free", "inodes_free"]
+    mounts = max(1, rule_count // len(fields))
+    legacy_rules = []
+    labelled_rules = []
+    flat = {}
+    metric_set = MetricSet()
+    
+    for m in range(mounts):
+        for i, field in enumerate(fields):
+            metric = f"mount_vol{m}_{field}"
+            op = OPS[(m + i) % len(OPS)]
+            legacy_rules.append(Rule(name=f"vol{m}_{field}", metric=metric, op=op, value=90.0, consecutive=2))
+            labelled_rules.append(Rule(
+                name=f"vol{m}_{field}",
+                metric=field,
+                labels={"mount": f"/vol{m}"},
+                op=op,
+                value=90.0,
+                consecutive=2,
+            ))
+            if m < mounts * present_ratio:
+                value = float((m * 7 + i * 13) % 100)
+                flat[metric] = value
+                metric_set.family(field, ("mount",)).set((f"/vol{m}",), value)
+    
+    return legacy_rules[:rule_count], flat, labelled_rules[:rule_count], metric_set
+
+
+def cases(workdir: str, full: bool = False, rule_count: int = 0) -> List[Case]:
+    """Rule compilation and evaluation cases."""
+    rule_count = rule_count or (FULL_RULES if full else DEFAULT_RULES)
+    _, _, labelled_rules, metric_set = build_workload(rule_count, 0.5)
+    engine = RuleEngine(StateManager(os.path.join(workdir, f"rules-state-{rule_count}.json")))
+    plan = engine.compile(labelled_rules)
+    return [
+        Case(f"rules.compile_{rule_count}", lambda: engine.compile(labelled_rules)),
+        Case(f"rules.evaluate_{rule_count}", lambda: engine.evaluate_plan(plan, metric_set)),
+    ]
+
+
+def main():
+    """Benchmark entry point."""
+    parser = argparse.ArgumentParser(description="linmon rule evaluation benchmark")
+    parser.add_argument("--rules", type=int, default=DEFAULT_RULES, help="Number of rules")
+    parser.add_argument("--iterations", type=int, default=20, help="Evaluations per implementation")
+    parser.add_argument("--present", type=float, default=0.5, help="Fraction of rule metrics present")
+    args = parser.parse_args()
+    
+    rules, metrics, labelled_rules, metric_set = build_workload(args.rules, args.present)
+    
+    with tempfile.TemporaryDirectory(prefix="linmon-bench-") as tmpdir:
+        state = StateManager(os.path.join(tmpdir, "state.json"))
+        engine = RuleEngine(state)
+        
+        start = time.perf_counter()
+        plan = engine.compile(labelled_rules)
+        compile_seconds = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        for _ in range(args.iterations):
+            legacy_evaluate(state, rules, metrics)
+        legacy_seconds = (time.perf_counter() - start) / args.iterations
+        
+        start = time.perf_counter()
+        for _ in range(args.iterations):
+            engine.evaluate_plan(plan, metric_set)
+        plan_seconds = (time.perf_counter() - start) / args.iterations
+    
+    print(f"rules={len(rules)} metrics_present={len(metrics)} iterations={args.iterations}")
+    print(f"  compile (once):   {compile_seconds * 1000:9.2f} ms")
+    print(f"  legacy evaluate:  {legacy_seconds * 1000:9.2f} ms/run")
+    print(f"  plan evaluate:    {plan_seconds * 1000:9.2f} ms/run")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+Shared benchmark harness: timing, heap peaks, JSON results and baselines.
+
+Every benchmark module exposes ``cases(workdir, full)`` returning Case
+objects; the suite runs them all (see benchmarks.suite).
+"""
+
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+RESULTS_VERSION = 1
+
+# Cases faster than this are too noisy to fail a baseline check on time
+MIN_CHECKED_SECONDS = 0.001
+
+
+class Case:
+    """One named measurement."""
+    
+    def __init__(self, name: str, fn: Callable[[], Any], repeat: int = 5, warmup: int = 1):
+        """
+        Initialize case.
+        
+        Args:
+            name: Stable name (results are compared by name)
+            fn: Workload; its return value is ignored
+            repeat: Timed runs (the median is reported)
+            warmup: Untimed runs first (caches, imports)
+        """
+        self.name = name
+        self.fn = fn
+        self.repeat = repeat
+        self.warmup = warmup
+
+
+def measure(case: Case) -> Dict[str, Any]:
+    """
+    Run a case.
+    
+    Wall time comes from timed runs without tracing; the Python heap peak
+    from one extra run under tracemalloc, which slows code down.
+    
+    Returns:
+        Median and minimum seconds, heap peak in bytes and repeat count
+    """
+    for _ in range(case.warmup):
+        case.fn()
+    timings = []
+    for _ in range(case.repeat):
+        start = time.perf_counter()
+        case.fn()
+        timings.append(time.perf_counter() - start)
+    
+    tracemalloc.start()
+    try:
+        case.fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "seconds": statistics.median(timings),
+        "min_seconds": min(timings),
+        "peak_bytes": peak,
+        "repeat": case.repeat,
+    }
+
+
+def run_cases(cases: List[Case], log: Optional[Callable[[str], None]] = print) -> Dict[str, Dict[str, Any]]:
+    """
+    Measure cases in order.
+    
+    Args:
+        cases: Cases to run
+        log: Called with one formatted line per case (None: quiet)
+        
+    Returns:
+        Measurements by case name
+    """
+    results = {}
+    for case in cases:
+        result = measure(case)
+        results[case.name] = result
+        if log is not None:
+            log(format_row(case.name, result))
+    return results
+
+
+def format_row(name: str, result: Dict[str, Any]) -> str:
+    """Format one result as a table row."""
+    return f"  {name:<44} {result['seconds'] * 1000:>10.2f} ms {result['peak_bytes'] / 1024:>10.0f} KB"
+
+
+def results_document(results: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Wrap measurements with the environment they were taken in."""
+    return {
+        "version": RESULTS_VERSION,
+        "timestamp": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def write_results(path: str, results: Dict[str, Dict[str, Any]]) -> None:
+    """Write measurements as JSON."""
+    with open(path, "w") as f:
+        json.dump(results_document(results), f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def load_results(path: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Read measurements written by write_results().
+    
+    Raises:
+        OSError: If the file cannot be read
+        ValueError: If it is not a results file
+    """
+    with open(path, "r") as f:
+        data = json.load(f)
+    if not isinstance(data, dict) or data.get("version") != RESULTS_VERSION:
+        raise ValueError(f"Not a benchmark results file: {path}")
+    return data["results"]
+
+
+def compare(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    threshold: float,
+    memory_threshold: Optional[float] = None,
+) -> List[str]:
+    """
+    Find cases that got slower (or bigger) than a baseline allows.
+    
+    Cases missing from either side are not compared.
+    
+    Args:
+        results: Current measurements
+        baseline: Stored measurements
+        threshold: Allowed ratio of median seconds (e.g. 1.5 = 50% slower)
+        memory_threshold: Allowed ratio of heap peaks (default: threshold)
+        
+    Returns:
+        One description per regression
+    """
+    memory_threshold = threshold if memory_threshold is None else memory_threshold
+    regressions = []
+    for name, current in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        seconds, base_seconds = current["seconds"], base["seconds"]
+        if seconds > MIN_CHECKED_SECONDS and seconds > base_seconds * threshold:
+            regressions.append(
+                f"{name}: {seconds * 1000:.2f} ms vs {base_seconds * 1000:.2f} ms baseline "
+                f"(x{seconds / base_seconds:.2f} > x{threshold:.2f})"
+            )
+        peak, base_peak = current["peak_bytes"], base["peak_bytes"]
+        if base_peak and peak > base_peak * memory_threshold:
+            regressions.append(
+                f"{name}: heap peak {peak / 1024:.0f} KB vs {base_peak / 1024:.0f} KB baseline "
+                f"(x{peak / base_peak:.2f} > x{memory_threshold:.2f})"
+            )
+    return regressions
@@ -0,0 +1,101 @@
+"""
+Benchmark suite: runs every benchmark, writes JSON results and checks
+them against a stored baseline.
+
+The default workloads take about a minute; --full adds 50k tasks, 1 GB
+logs and larger end-to-end trees. Baselines are machine-specific: record
+one on the host that runs the check.
+
+Usage:
+    python -m benchmarks.suite --output bench-results.json
+    python -m benchmarks.suite --save-baseline benchmarks/baseline.json
+    python -m benchmarks.suite --baseline benchmarks/baseline.json --threshold 1.5
+
+Exit codes: 0 = no regression (or no baseline), 1 = regression
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+from typing import Callable, Dict, List
+
+from benchmarks import bench_core, bench_logscan, bench_procfs, bench_processes, bench_report, bench_rules
+from benchmarks.harness import Case, compare, load_results, run_cases, write_results
+
+# Benchmark name -> cases(workdir, full)
+BENCHMARKS: Dict[str, Callable[[str, bool], List[Case]]] = {
+    "procfs": bench_procfs.cases,
+    "processes": bench_processes.cases,
+    "logscan": bench_logscan.cases,
+    "rules": bench_rules.cases,
+    "report": bench_report.cases,
+    "core": bench_core.cases,
+}
+
+DEFAULT_THRESHOLD = 1.5
+
+
+def main() -> int:
+    """Suite entry point."""
+    parser = argparse.ArgumentParser(description="linmon benchmark suite")
+    parser.add_argument(
+        "--only",
+        default="",
+        help=f"Comma-separated benchmarks to run (default: all of {', '.join(BENCHMARKS)})",
+    )
+    parser.add_argument("--full", action="store_true", help="Use the larger workloads")
+    parser.add_argument("--output", help="Write results to this JSON file")
+    parser.add_argument("--baseline", help="Compare results with this JSON file")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Allowed slowdown (and heap growth) relative to the baseline",
+    )
+    parser.add_argument("--memory-threshold", type=float, help="Allowed heap growth (default: --threshold)")
+    parser.add_argument("--save-baseline", metavar="PATH", help="Write results as the new baseline")
+    args = parser.parse_args()
+    
+    names = [n.strip() for n in args.only.split(",") if n.strip()] or list(BENCHMARKS)
+    unknown = [n for n in names if n not in BENCHMARKS]
+    if unknown:
+        parser.error(f"Unknown benchmark(s): {', '.join(unknown)}")
+    
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="linmon-bench-") as tmpdir:
+        for name in names:
+            print(f"{name}:")
+            workdir = os.path.join(tmpdir, name)
+            os.mkdir(workdir)
+            results.update(run_cases(BENCHMARKS[name](workdir, args.full)))
+    
+    if args.output:
+        write_results(args.output, results)
+    if args.save_baseline:
+        write_results(args.save_baseline, results)
+        print(f"Baseline saved to {args.save_baseline}")
+    
+    if not args.baseline:
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; skipping the regression check")
+        return 0
+    try:
+        baseline = load_results(args.baseline)
+    except (OSError, ValueError) as e:
+        print(f"Cannot read baseline: {e}", file=sys.stderr)
+        return 1
+    
+    regressions = compare(results, baseline, args.threshold, args.memory_threshold)
+    if regressions:
+        print(f"{len(regressions)} regression(s) against {args.baseline}:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print(f"No regressions against {args.baseline} (threshold x{args.threshold:.2f})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,5 +3,8 @@
 from .base import AlertBase
 from .stdout import StdoutAlert
 from .file import FileAlert
+from .tracker import AlertDigest, AlertEvent, AlertTracker, fingerprint
+from .journald import JournaldAlert
+from .webhook import WebhookAlert
 
-__all__ = ["AlertBase", "StdoutAlert", "FileAlert"]
+__all__ = ["AlertBase", "StdoutAlert", "FileAlert", "JournaldAlert", "WebhookAlert", "AlertDigest", "AlertEvent", "AlertTracker", "fingerprint"]
@@ -1,20 +1,25 @@
 """Base alert class."""
 
 from abc import ABC, abstractmethod
-from typing import Dict, List
-from ..rules.model import RuleResult
+from typing import Dict
+from .tracker import AlertDigest
 
 
 class AlertBase(ABC):
     """Base class for alert handlers."""
     
     @abstractmethod
-    def send(self, anomalies: List[RuleResult], report: Dict) -> None:
+    def send(self, digest: AlertDigest, report: Dict) -> None:
         """
         Send alert.
         
         Args:
-            anomalies: List of anomaly rule results
+            digest: Alert transitions of this run (firing, escalated,
+                reminder and resolved), sent as one notification
             report: Full report dictionary
         """
         pass
+    
+    def close(self) -> None:
+        """Flush pending alerts and release resources (called once at exit)."""
+        pass
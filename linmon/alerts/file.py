@@ -1,9 +1,9 @@
 """File-based alert handler."""
 
-from typing import Dict, List
+from typing import Dict
 from pathlib import Path
 from ..alerts.base import AlertBase
-from ..rules.model import RuleResult
+from ..alerts.tracker import AlertDigest, format_event
 from ..util.fs import ensure_dir
 from ..util.time import now_iso
 
@@ -20,33 +20,30 @@ class FileAlert(AlertBase):
         """
         self.filepath = filepath
     
-    def send(self, anomalies: List[RuleResult], report: Dict) -> None:
+    def send(self, digest: AlertDigest, report: Dict) -> None:
         """
         Append alert to file.
         
         Args:
-            anomalies: List of anomaly rule results
+            digest: Alert transitions of this run
             report: Full report dictionary
         """
-        if not anomalies:
+        if not digest:
             return
         
         ensure_dir(str(Path(self.filepath).parent))
         
-        lines = []
-        lines.append(f"[{now_iso()}] LINMON ALERT")
-        lines.append(f"Anomaly Count: {len(anomalies)}")
-        
         overall = report.get("overall", {})
         triage = overall.get("triage_score", {})
+        
+        lines = []
+        lines.append(f"[{now_iso()}] LINMON ALERT: {digest.summary()}")
+        lines.append(f"Anomaly Count: {overall.get('anomaly_count', 0)}")
         lines.append(f"Severity: {triage.get('severity', 'unknown').upper()}")
         lines.append("")
         
-        for anomaly in anomalies:
-            lines.append(
-                f"  [{anomaly.rule_name}] {anomaly.metric} = {anomaly.value:.2f} "
-                f"({anomaly.operator} {anomaly.threshold}) - Streak: {anomaly.streak}"
-            )
+        for event in digest.events:
+            lines.append(f"  {format_event(event)}")
         
         lines.append("")
         lines.append("-" * 70)
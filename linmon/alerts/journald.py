@@ -0,0 +1,156 @@
+"""Journald alert handler (native journal protocol)."""
+
+import array
+import errno
+import os
+import socket
+import struct
+from typing import Dict, List, Optional, Tuple
+from ..alerts.base import AlertBase
+from ..alerts.tracker import RESOLVED, AlertDigest, format_event
+from ..config.defaults import DEFAULT_JOURNALD_SOCKET
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not on Linux
+    fcntl = None  # type: ignore
+
+# syslog priorities of the triage severities
+PRIORITIES = {"critical": 2, "high": 3, "medium": 4, "low": 5}
+# PRIORITY of a digest that only resolves alerts
+PRIORITY_INFO = 6
+
+
+def encode_fields(fields: List[Tuple[str, str]]) -> bytes:
+    """
+    Serialize journal fields.
+    
+    Values without a newline are sent as ``NAME=value``; others use the
+    binary form (name, newline, 64-bit little-endian length, value).
+    
+    Args:
+        fields: (name, value) pairs; a name may repeat
+        
+    Returns:
+        Datagram payload
+    """
+    parts: List[bytes] = []
+    for name, value in fields:
+        data = value.encode("utf-8")
+        if b"\n" in data:
+            parts.append(name.encode("ascii") + b"\n" + struct.pack("<Q", len(data)) + data + b"\n")
+        else:
+            parts.append(name.encode("ascii") + b"=" + data + b"\n")
+    return b"".join(parts)
+
+
+def digest_fields(digest: AlertDigest, report: Dict) -> List[Tuple[str, str]]:
+    """
+    Build the journal entry of a digest.
+    
+    Each event adds one value to every ``LINMON_*`` event field, in the
+    same order, so the n-th values describe the n-th event (LINMON_VALUE
+    is empty for resolved events).
+    
+    Args:
+        digest: Alert transitions of this run
+        report: Full report dictionary
+        
+    Returns:
+        (name, value) pairs
+    """
+    overall = report.get("overall", {})
+    active = [PRIORITIES.get(e.severity, PRIORITY_INFO) for e in digest.events if e.kind != RESOLVED]
+    summary = digest.summary()
+    message = "\n".join([f"LINMON ALERT: {summary}"] + [format_event(e) for e in digest.events])
+    
+    fields = [
+        ("MESSAGE", message),
+        ("PRIORITY", str(min(active) if active else PRIORITY_INFO)),
+        ("SYSLOG_IDENTIFIER", "linmon"),
+        ("LINMON_SUMMARY", summary),
+        ("LINMON_ANOMALY_COUNT", str(overall.get("anomaly_count", 0))),
+        ("LINMON_TRIAGE_SEVERITY", overall.get("triage_score", {}).get("severity", "unknown")),
+    ]
+    for event in digest.events:
+        value = "" if event.result is None else repr(float(event.result.value))
+        fields.extend([
+            ("LINMON_EVENT", event.kind),
+            ("LINMON_FINGERPRINT", event.fingerprint),
+            ("LINMON_RULE", event.rule_name),
+            ("LINMON_METRIC", event.metric),
+            ("LINMON_VALUE", value),
+            ("LINMON_SEVERITY", event.severity),
+        ])
+    return fields
+
+
+class JournaldAlert(AlertBase):
+    """
+    Writes each digest to journald as one structured entry.
+    
+    The entry goes straight to the journal socket as a single datagram, so
+    shippers can index the ``LINMON_*`` fields instead of parsing text.
+    Entries too large for a datagram are passed in a sealed memfd, as
+    sd_journal_send() does. If journald is not running the digest is
+    dropped (see ``last_error``).
+    """
+    
+    def __init__(self, socket_path: str = DEFAULT_JOURNALD_SOCKET, timeout: float = 1.0):
+        """
+        Initialize journald alert.
+        
+        Args:
+            socket_path: Journal socket
+            timeout: Seconds a send may block when journald is backlogged
+        """
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.last_error: Optional[str] = None
+        self._sock: Optional[socket.socket] = None
+    
+    def send(self, digest: AlertDigest, report: Dict) -> None:
+        """
+        Send a digest as one journal entry.
+        
+        Args:
+            digest: Alert transitions of this run
+            report: Full report dictionary
+        """
+        if not digest:
+            return
+        payload = encode_fields(digest_fields(digest, report))
+        try:
+            if self._sock is None:
+                self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+                self._sock.settimeout(self.timeout)
+            try:
+                self._sock.sendto(payload, self.socket_path)
+            except OSError as e:
+                if e.errno not in (errno.EMSGSIZE, errno.ENOBUFS):
+                    raise
+                self._send_memfd(self._sock, payload)
+            self.last_error = None
+        except OSError as e:
+            self.last_error = str(e)
+    
+    def _send_memfd(self, sock: socket.socket, payload: bytes) -> None:
+        """Pass an oversized entry as a sealed memfd."""
+        if fcntl is None or not hasattr(os, "memfd_create") or not hasattr(fcntl, "F_ADD_SEALS"):
+            raise OSError(errno.EMSGSIZE, "Journal entry too large")
+        fd = os.memfd_create("linmon-journal", os.MFD_CLOEXEC | os.MFD_ALLOW_SEALING)
+        try:
+            os.write(fd, payload)
+            fcntl.fcntl(fd, fcntl.F_ADD_SEALS, fcntl.F_SEAL_SHRINK | fcntl.F_SEAL_GROW
+                        | fcntl.F_SEAL_WRITE | fcntl.F_SEAL_SEAL)
+            sock.sendmsg(
+                [], [(socket.SOL_SOCKET, socket.SCM_RIGHTS, array.array("i", [fd]))], 0, self.socket_path
+            )
+        finally:
+            os.close(fd)
+    
+    def close(self) -> None:
+        """Close the journal socket."""
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
@@ -0,0 +1,210 @@
+"""Durable on-disk queue of alert payloads awaiting delivery."""
+
+import os
+import time
+from typing import List, Optional, Tuple
+from ..util.fs import ensure_dir
+
+SPOOL_SUFFIX = ".json"
+CLAIM_SUFFIX = ".sending"
+
+# A claim older than this is taken to belong to a process that died mid-send
+STALE_CLAIM_SECONDS = 600.0
+
+
+class SpoolEntry:
+    """A queued payload, described entirely by its file name."""
+    
+    __slots__ = ("name", "created_ns", "attempts", "due")
+    
+    def __init__(self, name: str, created_ns: int, attempts: int, due: float):
+        """
+        Initialize entry.
+        
+        Args:
+            name: File name ``<created_ns>-<attempts>-<due_ms>.json``
+            created_ns: Enqueue time (ns since the epoch), orders the queue
+            attempts: Failed delivery attempts so far
+            due: Earliest time of the next attempt (seconds since the epoch)
+        """
+        self.name = name
+        self.created_ns = created_ns
+        self.attempts = attempts
+        self.due = due
+    
+    @classmethod
+    def parse(cls, name: str) -> Optional["SpoolEntry"]:
+        """Parse a spool file name (None if it is not one)."""
+        if not name.endswith(SPOOL_SUFFIX):
+            return None
+        parts = name[:-len(SPOOL_SUFFIX)].split("-")
+        if len(parts) != 3 or not all(p.isdigit() for p in parts):
+            return None
+        return cls(name, int(parts[0]), int(parts[1]), int(parts[2]) / 1000.0)
+    
+    @staticmethod
+    def make_name(created_ns: int, attempts: int, due: float) -> str:
+        """Build the file name of an entry."""
+        return f"{created_ns:020d}-{attempts}-{int(due * 1000)}{SPOOL_SUFFIX}"
+
+
+class Spool:
+    """
+    Directory of payload files, oldest first.
+    
+    Scheduling lives in the file names, so finding due entries is a single
+    directory listing. Payloads are written before delivery is attempted and
+    removed only after it succeeded, so a crash or a dead receiver never
+    loses one; when the directory exceeds ``max_bytes`` the oldest entries
+    are dropped. Senders claim an entry by renaming it, so concurrent
+    processes sharing the spool never deliver the same entry twice.
+    """
+    
+    def __init__(self, directory: str, max_bytes: int):
+        """
+        Initialize spool.
+        
+        Args:
+            directory: Spool directory (created on first put)
+            max_bytes: Total payload bytes to keep
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+    
+    def _path(self, name: str) -> str:
+        """Full path of a spool file."""
+        return os.path.join(self.directory, name)
+    
+    def put(self, payload: bytes) -> str:
+        """
+        Queue a payload for immediate delivery.
+        
+        Args:
+            payload: Request body
+            
+        Returns:
+            Spool file name
+        """
+        ensure_dir(self.directory)
+        now_ns = time.time_ns()
+        name = SpoolEntry.make_name(now_ns, 0, now_ns / 1e9)
+        tmp_path = self._path(f".{name}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, self._path(name))
+        self._enforce_limit()
+        return name
+    
+    def entries(self) -> List[SpoolEntry]:
+        """Queued (unclaimed) entries, oldest first."""
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return []
+        entries = [e for e in (SpoolEntry.parse(n) for n in names) if e is not None]
+        entries.sort(key=lambda e: e.created_ns)
+        return entries
+    
+    def due(self, now: float) -> Tuple[List[SpoolEntry], Optional[float]]:
+        """
+        Get entries ready for delivery.
+        
+        Claims abandoned by dead processes are requeued first.
+        
+        Args:
+            now: Current time (seconds since the epoch)
+            
+        Returns:
+            Tuple of (due entries oldest first, time the next other entry
+            becomes due or None)
+        """
+        self._requeue_stale(now)
+        ready: List[SpoolEntry] = []
+        next_due: Optional[float] = None
+        for entry in self.entries():
+            if entry.due <= now:
+                ready.append(entry)
+            elif next_due is None or entry.due < next_due:
+                next_due = entry.due
+        return (ready, next_due)
+    
+    def claim(self, entry: SpoolEntry) -> Optional[str]:
+        """
+        Take an entry for delivery.
+        
+        Returns:
+            Path of the claimed file, or None if another sender took it
+        """
+        claimed = self._path(entry.name + CLAIM_SUFFIX)
+        try:
+            os.rename(self._path(entry.name), claimed)
+            # Claim age is judged by mtime
+            os.utime(claimed)
+        except OSError:
+            return None
+        return claimed
+    
+    def done(self, claimed: str) -> None:
+        """Remove a delivered entry."""
+        try:
+            os.unlink(claimed)
+        except OSError:
+            pass
+    
+    def retry(self, claimed: str, entry: SpoolEntry, due: float) -> None:
+        """
+        Put a claimed entry back after a failed attempt.
+        
+        Args:
+            claimed: Path returned by claim()
+            entry: The entry
+            due: Time of the next attempt
+        """
+        name = SpoolEntry.make_name(entry.created_ns, entry.attempts + 1, due)
+        try:
+            os.rename(claimed, self._path(name))
+        except OSError:
+            pass
+    
+    def size(self) -> int:
+        """Total bytes of queued and claimed payloads."""
+        total = 0
+        try:
+            with os.scandir(self.directory) as it:
+                for item in it:
+                    if not item.name.startswith("."):
+                        try:
+                            total += item.stat().st_size
+                        except OSError:
+                            continue
+        except OSError:
+            return 0
+        return total
+    
+    def _enforce_limit(self) -> None:
+        """Drop the oldest queued entries while the spool is over its limit."""
+        total = self.size()
+        for entry in self.entries():
+            if total <= self.max_bytes:
+                break
+            path = self._path(entry.name)
+            try:
+                size = os.path.getsize(path)
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+    
+    def _requeue_stale(self, now: float) -> None:
+        """Return claims older than STALE_CLAIM_SECONDS to the queue."""
+        try:
+            names = [n for n in os.listdir(self.directory) if n.endswith(CLAIM_SUFFIX)]
+        except OSError:
+            return
+        for name in names:
+            path = self._path(name)
+            try:
+                if now - os.path.getmtime(path) >= STALE_CLAIM_SECONDS:
+                    os.rename(path, self._path(name[:-len(CLAIM_SUFFIX)]))
+            except OSError:
+                continue
@@ -1,41 +1,37 @@
 """Stdout alert handler."""
 
 import sys
-from typing import Dict, List
+from typing import Dict
 from ..alerts.base import AlertBase
-from ..rules.model import RuleResult
+from ..alerts.tracker import AlertDigest, format_event
 
 
 class StdoutAlert(AlertBase):
     """Sends alerts to stdout."""
     
-    def send(self, anomalies: List[RuleResult], report: Dict) -> None:
+    def send(self, digest: AlertDigest, report: Dict) -> None:
         """
         Print alert to stdout.
         
         Args:
-            anomalies: List of anomaly rule results
+            digest: Alert transitions of this run
             report: Full report dictionary
         """
-        if not anomalies:
+        if not digest:
             return
         
         print("\n" + "!" * 70, file=sys.stderr)
-        print("LINMON ALERT: Anomalies Detected", file=sys.stderr)
+        print(f"LINMON ALERT: {digest.summary()}", file=sys.stderr)
         print("!" * 70, file=sys.stderr)
         
         overall = report.get("overall", {})
         triage = overall.get("triage_score", {})
         
         print(f"Severity: {triage.get('severity', 'unknown').upper()}", file=sys.stderr)
-        print(f"Anomaly Count: {len(anomalies)}", file=sys.stderr)
+        print(f"Anomaly Count: {overall.get('anomaly_count', 0)}", file=sys.stderr)
         print("", file=sys.stderr)
         
-        for anomaly in anomalies:
-            print(
-                f"  [{anomaly.rule_name}] {anomaly.metric} = {anomaly.value:.2f} "
-                f"({anomaly.operator} {anomaly.threshold}) - Streak: {anomaly.streak}",
-                file=sys.stderr
-            )
+        for event in digest.events:
+            print(f"  {format_event(event)}", file=sys.stderr)
         
         print("!" * 70 + "\n", file=sys.stderr)
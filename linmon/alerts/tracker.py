@@ -0,0 +1,208 @@
+"""Alert fingerprinting and transition tracking."""
+
+import hashlib
+from datetime import datetime, timezone
+from typing import Iterable, List, Optional
+from ..rules.model import RuleResult
+from ..state.manager import StateManager
+from ..state.model import AlertState
+from ..triage.scorer import TriageScorer
+
+# Event kinds, in the order a digest lists them
+FIRING = "firing"
+ESCALATED = "escalated"
+REMINDER = "reminder"
+RESOLVED = "resolved"
+EVENT_KINDS = (FIRING, ESCALATED, REMINDER, RESOLVED)
+
+_SEVERITY_RANK = {"low": 0, "medium": 1, "high": 2, "critical": 3}
+
+
+def fingerprint(rule_name: str, metric: str) -> str:
+    """
+    Identify an alert by its rule and series.
+    
+    Args:
+        rule_name: Rule name
+        metric: Reported metric, including labels (e.g. ``bytes_used_percent{mount="/"}``)
+        
+    Returns:
+        16 hex digit fingerprint
+    """
+    return hashlib.sha1(f"{rule_name}\0{metric}".encode("utf-8")).hexdigest()[:16]
+
+
+class AlertEvent:
+    """One alert transition to notify about."""
+    
+    __slots__ = ("kind", "fingerprint", "rule_name", "metric", "severity", "since", "result")
+    
+    def __init__(
+        self,
+        kind: str,
+        fingerprint: str,
+        rule_name: str,
+        metric: str,
+        severity: str,
+        since: float,
+        result: Optional[RuleResult] = None,
+    ):
+        """
+        Initialize event.
+        
+        Args:
+            kind: One of EVENT_KINDS
+            fingerprint: Alert fingerprint
+            rule_name: Rule name
+            metric: Reported metric
+            severity: Current severity (last notified one when resolved)
+            since: When the alert started firing (seconds since the epoch)
+            result: Current anomaly (None when resolved)
+        """
+        self.kind = kind
+        self.fingerprint = fingerprint
+        self.rule_name = rule_name
+        self.metric = metric
+        self.severity = severity
+        self.since = since
+        self.result = result
+
+
+def format_event(event: AlertEvent) -> str:
+    """
+    Format an event as one alert line.
+    
+    Args:
+        event: Alert event
+        
+    Returns:
+        e.g. ``FIRING    [high_cpu] cpu_percent = 87.50 (gt 80.0) - Streak: 3``
+    """
+    label = event.kind.upper().ljust(9)
+    result = event.result
+    if result is None:
+        since = datetime.fromtimestamp(event.since, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        return f"{label} [{event.rule_name}] {event.metric} - firing since {since}"
+    line = (
+        f"{label} [{event.rule_name}] {result.metric} = {result.value:.2f} "
+        f"({result.operator} {result.threshold}) - Streak: {result.streak}"
+    )
+    if event.kind != FIRING:
+        line += f", severity {event.severity}"
+    return line
+
+
+class AlertDigest:
+    """All alert transitions of one run, sent as a single notification."""
+    
+    def __init__(self, events: Iterable[AlertEvent] = ()):
+        """Initialize digest."""
+        self.events: List[AlertEvent] = []
+        self.extend(events)
+    
+    def extend(self, events: Iterable[AlertEvent]) -> None:
+        """Add events, keeping them grouped by kind."""
+        self.events.extend(events)
+        self.events.sort(key=lambda e: EVENT_KINDS.index(e.kind))
+    
+    def of_kind(self, kind: str) -> List[AlertEvent]:
+        """Events of one kind."""
+        return [e for e in self.events if e.kind == kind]
+    
+    def summary(self) -> str:
+        """Short count per kind, e.g. "2 firing, 1 resolved"."""
+        counts = [(kind, len(self.of_kind(kind))) for kind in EVENT_KINDS]
+        return ", ".join(f"{count} {kind}" for kind, count in counts if count)
+    
+    def __bool__(self) -> bool:
+        """True if there is anything to send."""
+        return bool(self.events)
+    
+    def __len__(self) -> int:
+        """Number of events."""
+        return len(self.events)
+
+
+class AlertTracker:
+    """
+    Turns each run's anomalies into firing/escalated/reminder/resolved events.
+    
+    Firing alerts are kept in the state by fingerprint, so an anomaly that
+    persists is notified once when it starts firing, again only when its
+    severity rises or ``reminder_seconds`` have passed, and once more when it
+    resolves.
+    """
+    
+    def __init__(
+        self,
+        state_manager: StateManager,
+        reminder_seconds: Optional[float] = None,
+        notify_resolved: bool = True,
+    ):
+        """
+        Initialize tracker.
+        
+        Args:
+            state_manager: State holding the firing alerts
+            reminder_seconds: Re-notify alerts still firing after this long
+                (None: never)
+            notify_resolved: Emit events for alerts that stopped firing
+        """
+        self.state_manager = state_manager
+        self.reminder_seconds = reminder_seconds
+        self.notify_resolved = notify_resolved
+    
+    def update(self, anomalies: Iterable[RuleResult], now: float) -> List[AlertEvent]:
+        """
+        Record this run's anomalies and get the transitions to notify.
+        
+        Args:
+            anomalies: Rule results that are anomalies
+            now: Current time (seconds since the epoch)
+            
+        Returns:
+            Events, unsorted
+        """
+        firing = dict(self.state_manager.get_alerts())
+        events: List[AlertEvent] = []
+        seen = set()
+        
+        for anomaly in anomalies:
+            key = fingerprint(anomaly.rule_name, anomaly.metric)
+            if key in seen:
+                continue
+            seen.add(key)
+            severity = TriageScorer.anomaly_severity(anomaly)
+            previous = firing.get(key)
+            
+            if previous is None:
+                kind: Optional[str] = FIRING
+                since = now
+            else:
+                since = previous.since
+                if _SEVERITY_RANK[severity] > _SEVERITY_RANK.get(previous.severity, 0):
+                    kind = ESCALATED
+                elif self.reminder_seconds is not None and now - previous.notified >= self.reminder_seconds:
+                    kind = REMINDER
+                else:
+                    kind = None
+            
+            notified = now if kind is not None else previous.notified
+            self.state_manager.set_alert(key, AlertState(
+                rule_name=anomaly.rule_name,
+                metric=anomaly.metric,
+                severity=severity,
+                since=since,
+                notified=notified,
+            ))
+            if kind is not None:
+                events.append(AlertEvent(kind, key, anomaly.rule_name, anomaly.metric, severity, since, anomaly))
+        
+        for key, alert in firing.items():
+            if key in seen:
+                continue
+            self.state_manager.clear_alert(key)
+            if self.notify_resolved:
+                events.append(AlertEvent(RESOLVED, key, alert.rule_name, alert.metric, alert.severity, alert.since))
+        
+        return events
@@ -0,0 +1,269 @@
+"""HTTP(S) webhook alert handler."""
+
+import http.client
+import json
+import socket
+import ssl
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+from ..alerts.base import AlertBase
+from ..alerts.spool import Spool
+from ..alerts.tracker import AlertDigest, AlertEvent
+
+# Delay before the first retry of a failed delivery; doubles per failure
+RETRY_BACKOFF = 30.0
+RETRY_BACKOFF_MAX = 3600.0
+
+
+def _iso(epoch: float) -> str:
+    """Format seconds since the epoch as an ISO 8601 UTC timestamp."""
+    return datetime.fromtimestamp(epoch, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _event_payload(event: AlertEvent) -> Dict[str, Any]:
+    """Serialize one alert event."""
+    payload: Dict[str, Any] = {
+        "kind": event.kind,
+        "fingerprint": event.fingerprint,
+        "rule_name": event.rule_name,
+        "metric": event.metric,
+        "severity": event.severity,
+        "since": _iso(event.since),
+    }
+    result = event.result
+    if result is not None:
+        payload.update({
+            "value": result.value,
+            "operator": result.operator,
+            "threshold": result.threshold,
+            "streak": result.streak,
+        })
+    return payload
+
+
+def digest_payload(digest: AlertDigest, report: Dict) -> bytes:
+    """
+    Build the JSON request body of a digest.
+    
+    Args:
+        digest: Alert transitions of this run
+        report: Full report dictionary
+        
+    Returns:
+        UTF-8 JSON with the host, run timestamp, summary, overall severity
+        and one object per event
+    """
+    overall = report.get("overall", {})
+    body = {
+        "host": socket.gethostname(),
+        "timestamp": report.get("timestamp"),
+        "summary": digest.summary(),
+        "severity": overall.get("triage_score", {}).get("severity", "unknown"),
+        "anomaly_count": overall.get("anomaly_count", 0),
+        "events": [_event_payload(event) for event in digest.events],
+    }
+    return json.dumps(body, separators=(",", ":")).encode("utf-8")
+
+
+def retry_delay(attempts: int) -> float:
+    """Seconds to wait after a delivery has failed ``attempts + 1`` times."""
+    return min(RETRY_BACKOFF * (2 ** min(attempts, 16)), RETRY_BACKOFF_MAX)
+
+
+class WebhookAlert(AlertBase):
+    """
+    POSTs each digest as JSON to a webhook from a background thread.
+    
+    ``send()`` only writes the payload to the spool and wakes the worker,
+    so a check never waits on the receiver. The worker delivers spooled
+    payloads oldest first over one kept-alive connection, with ``timeout``
+    applied to connecting and to every read and write. A payload is removed
+    from the spool only once the receiver answered 2xx; failed ones are
+    retried with exponential backoff, by the worker of a long-running
+    process or on a later run. Delivery is at-least-once.
+    """
+    
+    def __init__(
+        self,
+        url: str,
+        spool_dir: str,
+        timeout: float = 5.0,
+        headers: Optional[Dict[str, str]] = None,
+        spool_max_bytes: int = 16 * 1024 * 1024,
+    ):
+        """
+        Initialize webhook alert.
+        
+        Args:
+            url: http:// or https:// endpoint
+            spool_dir: Directory of undelivered payloads
+            timeout: Socket timeout in seconds
+            headers: Extra request headers (e.g. Authorization)
+            spool_max_bytes: Drop the oldest payloads beyond this total size
+            
+        Raises:
+            ValueError: If the URL is not http(s)
+        """
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"Webhook URL must be http:// or https://: {url!r}")
+        self.url = url
+        self.timeout = timeout
+        self.spool = Spool(spool_dir, spool_max_bytes)
+        self.last_error: Optional[str] = None
+        
+        self._parts = parts
+        self._target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        self._headers = {"Content-Type": "application/json", "User-Agent": "linmon"}
+        self._headers.update(headers or {})
+        self._conn: Optional[http.client.HTTPConnection] = None
+        self._thread: Optional[threading.Thread] = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        
+        # Payloads left over from earlier runs
+        if self.spool.entries():
+            self._start()
+    
+    def send(self, digest: AlertDigest, report: Dict) -> None:
+        """
+        Queue a digest for delivery.
+        
+        Args:
+            digest: Alert transitions of this run
+            report: Full report dictionary
+        """
+        if not digest:
+            return
+        try:
+            self.spool.put(digest_payload(digest, report))
+        except OSError as e:
+            self.last_error = f"spool: {e}"
+            return
+        self._start()
+        self._wake.set()
+    
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Deliver what is due and stop the worker, waiting a bounded time.
+        
+        Payloads not delivered by then stay in the spool for a later run.
+        
+        Args:
+            timeout: Seconds to wait for the worker (default: ``self.timeout``)
+        """
+        with self._lock:
+            thread = self._thread
+        if thread is None:
+            return
+        self._stop.set()
+        self._wake.set()
+        thread.join(self.timeout if timeout is None else timeout)
+        with self._lock:
+            if not thread.is_alive():
+                self._thread = None
+                self._stop.clear()
+    
+    def _start(self) -> None:
+        """Start the worker thread if it is not running."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._worker, name="linmon-webhook", daemon=True)
+            self._thread.start()
+    
+    def _worker(self) -> None:
+        """Deliver due payloads, then sleep until the next one is due or a send."""
+        try:
+            while True:
+                self._wake.clear()
+                delay = self._deliver_due()
+                # A wake-up during delivery may be a send that close() must
+                # not leave behind: go round once more before stopping
+                if self._stop.is_set() and not self._wake.is_set():
+                    break
+                self._wake.wait(delay)
+        finally:
+            self._disconnect()
+    
+    def _deliver_due(self) -> Optional[float]:
+        """
+        Deliver every due payload, stopping at the first failure.
+        
+        Returns:
+            Seconds until the next attempt, or None if the spool is empty
+        """
+        ready, next_due = self.spool.due(time.time())
+        for entry in ready:
+            claimed = self.spool.claim(entry)
+            if claimed is None:
+                continue
+            try:
+                with open(claimed, "rb") as f:
+                    payload = f.read()
+            except OSError:
+                continue
+            if self._post(payload):
+                self.spool.done(claimed)
+                continue
+            retry_at = time.time() + retry_delay(entry.attempts)
+            self.spool.retry(claimed, entry, retry_at)
+            # The receiver is unavailable: leave the rest until the retry
+            return retry_delay(entry.attempts)
+        if next_due is None:
+            return None
+        return max(0.0, next_due - time.time())
+    
+    def _connect(self) -> http.client.HTTPConnection:
+        """Open a connection to the webhook host."""
+        host = self._parts.hostname or ""
+        if self._parts.scheme == "https":
+            self._conn = http.client.HTTPSConnection(
+                host, self._parts.port, timeout=self.timeout, context=ssl.create_default_context()
+            )
+        else:
+            self._conn = http.client.HTTPConnection(host, self._parts.port, timeout=self.timeout)
+        return self._conn
+    
+    def _disconnect(self) -> None:
+        """Close the kept-alive connection."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+    
+    def _post(self, payload: bytes) -> bool:
+        """
+        POST one payload.
+        
+        A kept-alive connection the receiver has closed meanwhile is
+        reopened once.
+        
+        Returns:
+            True if the receiver answered 2xx
+        """
+        for _ in range(2):
+            reused = self._conn is not None
+            conn = self._conn or self._connect()
+            try:
+                conn.request("POST", self._target, body=payload, headers=self._headers)
+                response = conn.getresponse()
+                response.read()
+            except (OSError, http.client.HTTPException) as e:
+                self._disconnect()
+                self.last_error = str(e) or type(e).__name__
+                if reused:
+                    continue
+                return False
+            if response.will_close:
+                self._disconnect()
+            if 200 <= response.status < 300:
+                self.last_error = None
+                return True
+            self.last_error = f"HTTP {response.status}"
+            return False
+        return False
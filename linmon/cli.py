@@ -1,8 +1,61 @@
 """Command-line interface."""
 
+import os
 import sys
 import argparse
-from .core import LinmonCore
+from .config.loader import load_config
+from .core import LinmonCore, make_history_store, make_journal, make_report_store
+from .report.query import (
+    ANOMALY_FIELDS,
+    METRIC_FIELDS,
+    STORE_FIELDS,
+    anomaly_rows,
+    iter_records,
+    metric_rows,
+    store_rows,
+    write_rows,
+)
+from .serve import serve
+from .util.lock import LockBusyError
+from .util.time import parse_duration, parse_time
+
+
+def run_history(args: argparse.Namespace) -> int:
+    """
+    Answer a `linmon history` query from stored reports, the run journal or the history store.
+    
+    Args:
+        args: Parsed history arguments
+        
+    Returns:
+        Exit code (0 if any rows matched, 1 otherwise)
+    """
+    config = load_config(args.config)
+    since = parse_time(args.since) if args.since else None
+    until = parse_time(args.until) if args.until else None
+    patterns = args.metric or []
+    
+    if args.source == "store":
+        if args.anomalies:
+            raise ValueError("--anomalies is not available from the history store")
+        store = make_history_store(config)
+        if store is None:
+            raise ValueError("the history store is not enabled (history.enabled)")
+        try:
+            count = write_rows(store_rows(store, patterns, since, until), STORE_FIELDS, args.format, sys.stdout)
+        finally:
+            store.close()
+        return 0 if count else 1
+    
+    records = iter_records(
+        make_report_store(config), make_journal(config), since, until, source=args.source
+    )
+    if args.anomalies:
+        rows, fields = anomaly_rows(records, patterns), ANOMALY_FIELDS
+    else:
+        rows, fields = metric_rows(records, patterns), METRIC_FIELDS
+    count = write_rows(rows, fields, args.format, sys.stdout)
+    return 0 if count else 1
 
 
 def main():
@@ -26,6 +79,72 @@ def main():
         action="store_true",
         help="Output JSON report to stdout",
     )
+    check_parser.add_argument(
+        "--coalesce",
+        action="store_true",
+        help="Exit successfully without checking if another run is in progress",
+    )
+    
+    # History command
+    history_parser = subparsers.add_parser(
+        "history",
+        help="Query metrics or anomalies of past runs",
+    )
+    history_parser.add_argument(
+        "--config",
+        required=True,
+        help="Path to configuration file",
+    )
+    history_parser.add_argument(
+        "--metric",
+        action="append",
+        help="Metric name, series key or glob (repeatable; default: all)",
+    )
+    history_parser.add_argument(
+        "--anomalies",
+        action="store_true",
+        help="List anomalies instead of metric values",
+    )
+    history_parser.add_argument(
+        "--since",
+        help="Range start: ISO 8601 time (UTC unless an offset is given) or a duration ago with a unit, e.g. 2h",
+    )
+    history_parser.add_argument(
+        "--until",
+        help="Range end, in the same forms as --since",
+    )
+    history_parser.add_argument(
+        "--format",
+        choices=["csv", "json"],
+        default="csv",
+        help="Output format (default: csv)",
+    )
+    history_parser.add_argument(
+        "--source",
+        choices=["auto", "journal", "reports", "store"],
+        default="auto",
+        help="Read the run journal, report files or history store "
+             "(store: min/max/mean per raw sample or rollup bucket; default: journal if present)",
+    )
+    
+    # Serve command
+    serve_parser = subparsers.add_parser(
+        "serve",
+        help="Run checks periodically and serve the latest results over HTTP",
+    )
+    serve_parser.add_argument(
+        "--config",
+        required=True,
+        help="Path to configuration file",
+    )
+    serve_parser.add_argument(
+        "--listen",
+        help="HTTP listen address, host:port (default: serve.listen)",
+    )
+    serve_parser.add_argument(
+        "--interval",
+        help="Time between checks, e.g. 5m (default: serve.interval)",
+    )
     
     # Legacy: support `linmon --config` without subcommand
     parser.add_argument(
@@ -35,6 +154,34 @@ def main():
     
     args = parser.parse_args()
     
+    if args.command == "history":
+        try:
+            sys.exit(run_history(args))
+        except BrokenPipeError:
+            # Output piped into e.g. head; don't fail again flushing stdout
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+            sys.exit(0)
+        except FileNotFoundError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+    
+    if args.command == "serve":
+        try:
+            core = LinmonCore(args.config)
+            listen = args.listen or core.config.serve.listen
+            interval = parse_duration(args.interval) if args.interval else None
+            serve(core, listen, interval)
+        except (FileNotFoundError, OSError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        except ValueError as e:
+            print(f"Configuration error: {e}", file=sys.stderr)
+            sys.exit(1)
+        sys.exit(0)
+    
     # Handle legacy format: `linmon --config <path>`
     if args.config and not args.command:
         config_path = args.config
@@ -44,9 +191,13 @@ def main():
         parser.print_help()
         sys.exit(1)
     
+    # --coalesce: if a run is already in progress, let it stand for this one
+    coalesce = getattr(args, "coalesce", False)
+    core = None
+    
     try:
         core = LinmonCore(config_path)
-        exit_code, text_report, json_report = core.run()
+        exit_code, text_report, json_report = core.run(wait=False if coalesce else None)
         
         if args.json:
             print(json_report)
@@ -55,6 +206,12 @@ def main():
         
         sys.exit(exit_code)
     
+    except LockBusyError as e:
+        if coalesce or core.config.state_lock == "skip":
+            print(f"linmon: {e}; skipping this run", file=sys.stderr)
+            sys.exit(0)
+        print(f"Error: {e} (waited {core.config.state_lock_timeout:g}s)", file=sys.stderr)
+        sys.exit(1)
     except FileNotFoundError as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
@@ -66,6 +223,10 @@ def main():
         import traceback
         traceback.print_exc()
         sys.exit(1)
+    finally:
+        # Give queued webhook alerts a bounded chance to go out
+        if core is not None:
+            core.close()
 
 
 if __name__ == "__main__":
@@ -3,6 +3,15 @@
 from .procfs import ProcFSCollector
 from .psi import PSICollector
 from .logs import LogCollector
+from .logscan import LogScanner, LogScanResult
 from .processes import ProcessCollector
+from .cgroups import CgroupCollector
+from .deleted import DeletedFileCollector, DeletedOpenScan
+from .diskusage import DiskUsageScanner, UsageScan
+from .mounts import MountEntry, MountTable, parse_mountinfo, select_mounts
+from .nfs import NFSMountStats, NFSStatsCollector, parse_mountstats
 
-__all__ = ["ProcFSCollector", "PSICollector", "LogCollector", "ProcessCollector"]
+__all__ = ["ProcFSCollector", "PSICollector", "LogCollector", "LogScanner", "LogScanResult", "ProcessCollector",
+           "CgroupCollector", "DeletedFileCollector", "DeletedOpenScan", "DiskUsageScanner", "UsageScan",
+           "MountEntry", "MountTable", "parse_mountinfo", "select_mounts",
+           "NFSMountStats", "NFSStatsCollector", "parse_mountstats"]
@@ -0,0 +1,260 @@
+"""Collector for per-cgroup CPU, memory, IO and pressure stats (cgroup v2)."""
+
+import os
+import time
+from fnmatch import fnmatchcase
+from typing import Dict, List, Optional, Sequence, Tuple
+
+CGROUP_ROOT = "/sys/fs/cgroup"
+# The v2 hierarchy on hosts still booted with the hybrid layout
+CGROUP_HYBRID_ROOT = "/sys/fs/cgroup/unified"
+
+# Stat files read per cgroup (each only if the cgroup has it)
+STAT_FILES = (
+    "cpu.stat",
+    "memory.current",
+    "memory.events",
+    "io.stat",
+    "cpu.pressure",
+    "memory.pressure",
+    "io.pressure",
+)
+
+# Values of a sample, in order; all but memory_current are counters
+SAMPLE_FIELDS = (
+    "cpu_usage_usec",
+    "cpu_throttled_usec",
+    "memory_current",
+    "memory_high",
+    "memory_max",
+    "memory_oom_kill",
+    "io_rbytes",
+    "io_wbytes",
+    "cpu_some_usec",
+    "memory_some_usec",
+    "io_some_usec",
+)
+(
+    CPU_USAGE, CPU_THROTTLED, MEMORY_CURRENT, MEMORY_HIGH, MEMORY_MAX, MEMORY_OOM_KILL,
+    IO_RBYTES, IO_WBYTES, CPU_SOME, MEMORY_SOME, IO_SOME,
+) = range(len(SAMPLE_FIELDS))
+
+# Child listings are reused while a directory's link count (2 + number of
+# child cgroups) is unchanged, but refreshed after this many seconds to
+# catch a cgroup removed and another created in between
+LISTING_MAX_AGE = 300.0
+
+Sample = List[Optional[int]]
+
+
+def default_root() -> str:
+    """Find the cgroup v2 hierarchy (unified or hybrid layout)."""
+    if os.path.exists(os.path.join(CGROUP_ROOT, "cgroup.controllers")):
+        return CGROUP_ROOT
+    if os.path.exists(os.path.join(CGROUP_HYBRID_ROOT, "cgroup.controllers")):
+        return CGROUP_HYBRID_ROOT
+    return CGROUP_ROOT
+
+
+def _keyed(text: str) -> Dict[str, str]:
+    """Parse a flat keyed file (``key value`` per line)."""
+    values = {}
+    for line in text.splitlines():
+        key, _, value = line.partition(" ")
+        values[key] = value
+    return values
+
+
+def _int(value: Optional[str]) -> Optional[int]:
+    """Parse an integer field (None if missing or malformed)."""
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+def _pressure_total(text: str) -> Optional[int]:
+    """Get the ``some`` stall total (usec) of a pressure file."""
+    for line in text.splitlines():
+        if line.startswith("some "):
+            for field in line.split()[1:]:
+                if field.startswith("total="):
+                    return _int(field[6:])
+    return None
+
+
+def _io_bytes(text: str) -> Tuple[int, int]:
+    """Sum read and written bytes over the devices of an io.stat file."""
+    rbytes = wbytes = 0
+    for line in text.splitlines():
+        for field in line.split()[1:]:
+            if field.startswith("rbytes="):
+                rbytes += int(field[7:])
+            elif field.startswith("wbytes="):
+                wbytes += int(field[7:])
+    return (rbytes, wbytes)
+
+
+def parse_sample(files: Dict[str, str]) -> Sample:
+    """
+    Turn the stat files of one cgroup into a sample.
+    
+    Args:
+        files: Content by file name (files the cgroup lacks are absent)
+        
+    Returns:
+        Values in SAMPLE_FIELDS order (None where unavailable)
+    """
+    sample: Sample = [None] * len(SAMPLE_FIELDS)
+    text = files.get("cpu.stat")
+    if text is not None:
+        cpu = _keyed(text)
+        sample[CPU_USAGE] = _int(cpu.get("usage_usec"))
+        sample[CPU_THROTTLED] = _int(cpu.get("throttled_usec"))
+    text = files.get("memory.current")
+    if text is not None:
+        sample[MEMORY_CURRENT] = _int(text.strip())
+    text = files.get("memory.events")
+    if text is not None:
+        events = _keyed(text)
+        sample[MEMORY_HIGH] = _int(events.get("high"))
+        sample[MEMORY_MAX] = _int(events.get("max"))
+        sample[MEMORY_OOM_KILL] = _int(events.get("oom_kill"))
+    text = files.get("io.stat")
+    if text is not None:
+        try:
+            sample[IO_RBYTES], sample[IO_WBYTES] = _io_bytes(text)
+        except ValueError:
+            pass
+    for name, index in (("cpu.pressure", CPU_SOME), ("memory.pressure", MEMORY_SOME), ("io.pressure", IO_SOME)):
+        text = files.get(name)
+        if text is not None:
+            sample[index] = _pressure_total(text)
+    return sample
+
+
+class _Listing:
+    """Cached children and stat files of one cgroup directory."""
+    
+    __slots__ = ("nlink", "children", "files", "listed")
+    
+    def __init__(self, nlink: int, children: List[str], files: List[str], listed: float):
+        """Initialize listing."""
+        self.nlink = nlink
+        self.children = children
+        self.files = files
+        self.listed = listed
+
+
+class CgroupCollector:
+    """
+    Walks the cgroup v2 hierarchy down to a fixed depth and samples it.
+    
+    Directory listings are cached: a cgroup directory's link count is
+    2 plus its number of child cgroups, so one ``stat()`` tells whether
+    children were added or removed and the directory is only listed again
+    then (or after LISTING_MAX_AGE). The listing also records which stat
+    files exist, so each run opens only those, with one read per file.
+    """
+    
+    def __init__(self, root: Optional[str] = None, depth: int = 2, exclude: Sequence[str] = ()):
+        """
+        Initialize collector.
+        
+        Args:
+            root: cgroup2 mountpoint (default: detected)
+            depth: Levels below the root to walk (1: top-level slices only)
+            exclude: Globs of cgroup paths (relative to the root) to skip,
+                with everything below them
+        """
+        self.root = root or default_root()
+        self.depth = depth
+        self.exclude = list(exclude)
+        self._listings: Dict[str, _Listing] = {}
+        self.listed = 0  # Directories listed by the last walk
+    
+    def walk(self) -> List[Tuple[str, List[str]]]:
+        """
+        Find the cgroups to sample.
+        
+        Returns:
+            (path relative to the root, stat files present) per cgroup,
+            parents before children; the root itself is not included
+        """
+        now = time.monotonic()
+        found: List[Tuple[str, List[str]]] = []
+        seen = set()
+        self.listed = 0
+        stack = [("", 0)]
+        while stack:
+            rel, level = stack.pop()
+            listing = self._list(rel, now)
+            if listing is None:
+                continue
+            seen.add(rel)
+            if rel:
+                found.append((rel, listing.files))
+            if level >= self.depth:
+                continue
+            for name in reversed(listing.children):
+                child = f"{rel}/{name}" if rel else name
+                if not self.exclude or not any(fnmatchcase(child, pattern) for pattern in self.exclude):
+                    stack.append((child, level + 1))
+        # Forget cgroups that are gone or no longer walked
+        for rel in [rel for rel in self._listings if rel not in seen]:
+            del self._listings[rel]
+        return found
+    
+    def _list(self, rel: str, now: float) -> Optional[_Listing]:
+        """Get the listing of a cgroup, reusing the cached one if still valid."""
+        path = os.path.join(self.root, rel) if rel else self.root
+        try:
+            nlink = os.stat(path).st_nlink
+        except OSError:
+            return None
+        cached = self._listings.get(rel)
+        if cached is not None and cached.nlink == nlink and now - cached.listed < LISTING_MAX_AGE:
+            return cached
+        children: List[str] = []
+        files: List[str] = []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    if entry.name in STAT_FILES:
+                        files.append(entry.name)
+                    elif entry.is_dir(follow_symlinks=False):
+                        children.append(entry.name)
+        except OSError:
+            return None
+        self.listed += 1
+        children.sort()
+        listing = _Listing(nlink, children, files, now)
+        self._listings[rel] = listing
+        return listing
+    
+    def sample(self) -> Dict[str, Sample]:
+        """
+        Read the stat files of every walked cgroup.
+        
+        Returns:
+            Sample by cgroup path (relative to the root); cgroups removed
+            during the walk are left out
+        """
+        samples: Dict[str, Sample] = {}
+        for rel, names in self.walk():
+            path = os.path.join(self.root, rel)
+            files: Dict[str, str] = {}
+            try:
+                for name in names:
+                    with open(os.path.join(path, name), "r") as f:
+                        files[name] = f.read()
+            except FileNotFoundError:
+                # Removed meanwhile; relist the parent next time
+                self._listings.pop(rel.rpartition("/")[0], None)
+                continue
+            except OSError:
+                pass
+            samples[rel] = parse_sample(files)
+        return samples
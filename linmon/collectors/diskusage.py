@@ -0,0 +1,345 @@
+"""Parallel directory-size scanner for finding what fills a filesystem."""
+
+import hashlib
+import heapq
+import json
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+from ..util.fs import atomic_write
+
+# Files at least this large are re-statted when their directory is reused
+# from the cache (a growing log does not change its directory's mtime)
+BIG_FILE_BYTES = 64 * 1024 * 1024
+
+# Cached directories are rescanned after this long even if unchanged
+CACHE_MAX_AGE = 3600.0
+
+CACHE_VERSION = 1
+
+# Cache record fields: [mtime_ns, own_bytes, own_inodes, subdirs, big files, scanned]
+_MTIME, _BYTES, _INODES, _SUBDIRS, _BIG, _SCANNED = range(6)
+
+
+class DirVisit:
+    """Result of listing (or reusing) one directory."""
+    
+    __slots__ = ("rel", "record", "subdirs", "entries", "reused", "partial")
+    
+    def __init__(self, rel: str, record: List[Any], subdirs: List[Tuple[str, int]], entries: int,
+                 reused: bool, partial: bool = False):
+        """
+        Initialize visit.
+        
+        Args:
+            rel: Path relative to the scan root ("" for the root)
+            record: Cache record of the directory
+            subdirs: (name, mtime_ns) of subdirectories on the same device
+            entries: Directory entries statted
+            reused: True if the listing came from the cache
+            partial: True if the listing was cut short by the time budget
+        """
+        self.rel = rel
+        self.record = record
+        self.subdirs = subdirs
+        self.entries = entries
+        self.reused = reused
+        self.partial = partial
+
+
+class UsageScan:
+    """Outcome of a scan: the largest directories and how much was covered."""
+    
+    def __init__(self, root: str):
+        """Initialize empty scan result."""
+        self.root = root
+        self.top_bytes: List[Tuple[str, int, int]] = []
+        self.top_inodes: List[Tuple[str, int, int]] = []
+        self.complete = True
+        self.elapsed = 0.0
+        self.dirs_scanned = 0
+        self.dirs_cached = 0
+        self.entries = 0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary."""
+        def rows(items: List[Tuple[str, int, int]]) -> List[Dict[str, Any]]:
+            """Format (path, bytes, inodes) tuples."""
+            return [{"path": path, "bytes": size, "inodes": inodes} for path, size, inodes in items]
+        return {
+            "root": self.root,
+            "top_bytes": rows(self.top_bytes),
+            "top_inodes": rows(self.top_inodes),
+            "complete": self.complete,
+            "elapsed_seconds": round(self.elapsed, 3),
+            "dirs_scanned": self.dirs_scanned,
+            "dirs_cached": self.dirs_cached,
+            "entries": self.entries,
+        }
+
+
+def _parent(rel: str) -> str:
+    """Relative path of a directory's parent ("" for top-level directories)."""
+    return rel.rpartition("/")[0]
+
+
+def _join(rel: str, name: str) -> str:
+    """Append a name to a relative path."""
+    return f"{rel}/{name}" if rel else name
+
+
+class DiskUsageScanner:
+    """
+    Finds the directories holding the most bytes and inodes under a mount.
+    
+    Directories are listed with ``os.scandir`` by a bounded thread pool,
+    without crossing into other filesystems or following symlinks, until
+    the time budget or entry budget runs out. Each directory's own totals
+    are cached with its mtime, so a later scan does not list directories
+    that have not changed. It only stats their subdirectories, and files of
+    at least BIG_FILE_BYTES, whose growth leaves the mtime untouched.
+    Usage is counted in allocated blocks, like ``du``, except that a
+    hard-linked file counts under each of its names.
+    """
+    
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        workers: int = 4,
+        time_budget: float = 10.0,
+        max_entries: int = 1_000_000,
+        top: int = 10,
+    ):
+        """
+        Initialize scanner.
+        
+        Args:
+            cache_dir: Directory of the per-mount caches (None: no cache)
+            workers: Threads listing directories
+            time_budget: Seconds a scan may take
+            max_entries: Directory entries a scan may stat
+            top: Directories reported per ranking
+        """
+        self.cache_dir = cache_dir
+        self.workers = workers
+        self.time_budget = time_budget
+        self.max_entries = max_entries
+        self.top = top
+    
+    def cache_path(self, root: str) -> Optional[str]:
+        """Cache file of a scan root."""
+        if self.cache_dir is None:
+            return None
+        digest = hashlib.sha1(root.encode("utf-8", "surrogateescape")).hexdigest()[:12]
+        return str(Path(self.cache_dir) / f"{digest}.json")
+    
+    def _load_cache(self, root: str) -> Dict[str, List[Any]]:
+        """Load the cache of a root (empty if missing or for another root)."""
+        path = self.cache_path(root)
+        if path is None:
+            return {}
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get("version") != CACHE_VERSION or data.get("root") != root:
+            return {}
+        return data.get("dirs", {})
+    
+    def _save_cache(self, root: str, dirs: Dict[str, List[Any]]) -> None:
+        """Write the cache of a root."""
+        path = self.cache_path(root)
+        if path is None:
+            return
+        try:
+            atomic_write(path, json.dumps(
+                {"version": CACHE_VERSION, "root": root, "dirs": dirs}, separators=(",", ":")
+            ))
+        except OSError:
+            pass
+    
+    def scan(self, root: str) -> UsageScan:
+        """
+        Scan a filesystem from its mountpoint.
+        
+        Args:
+            root: Mountpoint (or any directory) to scan
+            
+        Returns:
+            Largest directories by bytes and by inodes, with scan coverage
+        """
+        result = UsageScan(root)
+        started = time.monotonic()
+        deadline = started + self.time_budget
+        try:
+            root_stat = os.lstat(root)
+        except OSError:
+            result.complete = False
+            return result
+        device = root_stat.st_dev
+        cache = self._load_cache(root)
+        now = time.time()
+        
+        visited: Dict[str, List[Any]] = {}
+        unreached: Set[str] = set()
+        stop = threading.Event()
+        # Finished visits arrive here, so waiting costs the same however
+        # many directories are queued
+        finished: "queue.Queue[Tuple[str, Future]]" = queue.Queue()
+        pending: Dict[str, Future] = {}
+        executor = ThreadPoolExecutor(max_workers=max(1, self.workers), thread_name_prefix="linmon-du")
+        
+        def submit(rel: str, mtime_ns: int) -> None:
+            """Queue a directory visit."""
+            future = executor.submit(
+                self._visit, os.path.join(root, rel) if rel else root, rel, mtime_ns, device,
+                cache.get(rel), now, deadline, stop,
+            )
+            pending[rel] = future
+            future.add_done_callback(lambda f: finished.put((rel, f)))
+        
+        submit("", root_stat.st_mtime_ns)
+        try:
+            while pending:
+                try:
+                    rel, future = finished.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                del pending[rel]
+                visit: Optional[DirVisit] = future.result()
+                if visit is None:
+                    continue
+                result.entries += visit.entries
+                if visit.reused:
+                    result.dirs_cached += 1
+                else:
+                    result.dirs_scanned += 1
+                if visit.partial:
+                    unreached.add(rel)
+                else:
+                    visited[rel] = visit.record
+                for name, mtime_ns in visit.subdirs:
+                    child = _join(rel, name)
+                    if time.monotonic() >= deadline or result.entries >= self.max_entries:
+                        unreached.add(child)
+                    else:
+                        submit(child, mtime_ns)
+        finally:
+            stop.set()
+            for future in pending.values():
+                future.cancel()
+            executor.shutdown(wait=False)
+        
+        unreached.update(pending)
+        if unreached:
+            result.complete = False
+            # Fall back to what the cache knows about subtrees not reached
+            for rel, record in cache.items():
+                if rel in visited:
+                    continue
+                ancestor = rel
+                while ancestor not in unreached and ancestor:
+                    ancestor = _parent(ancestor)
+                if ancestor in unreached:
+                    visited[rel] = record
+        
+        self._rank(result, root, visited)
+        self._save_cache(root, visited)
+        result.elapsed = time.monotonic() - started
+        return result
+    
+    def _rank(self, result: UsageScan, root: str, dirs: Dict[str, List[Any]]) -> None:
+        """Sum subtrees bottom-up and keep the top directories."""
+        totals: Dict[str, List[int]] = {rel: [record[_BYTES], record[_INODES]] for rel, record in dirs.items()}
+        for rel in sorted(totals, key=lambda r: r.count("/"), reverse=True):
+            if not rel:
+                continue
+            parent = _parent(rel)
+            if parent in totals:
+                totals[parent][0] += totals[rel][0]
+                totals[parent][1] += totals[rel][1]
+        rows = [(os.path.join(root, rel), size, inodes) for rel, (size, inodes) in totals.items() if rel]
+        result.top_bytes = heapq.nlargest(self.top, rows, key=lambda row: row[1])
+        result.top_inodes = heapq.nlargest(self.top, rows, key=lambda row: row[2])
+    
+    def _visit(
+        self,
+        path: str,
+        rel: str,
+        mtime_ns: int,
+        device: int,
+        cached: Optional[List[Any]],
+        now: float,
+        deadline: float,
+        stop: threading.Event,
+    ) -> Optional[DirVisit]:
+        """List one directory, or reuse its cache record if it is unchanged."""
+        if stop.is_set():
+            return None
+        if cached is not None and cached[_MTIME] == mtime_ns and now - cached[_SCANNED] < CACHE_MAX_AGE:
+            return self._reuse(path, rel, cached, device)
+        
+        own_bytes = 0
+        own_inodes = 1
+        subdirs: List[Tuple[str, int]] = []
+        big: Dict[str, int] = {}
+        entries = 0
+        partial = False
+        try:
+            own_bytes = os.lstat(path).st_blocks * 512
+            with os.scandir(path) as it:
+                for entry in it:
+                    entries += 1
+                    if entries % 1024 == 0 and (stop.is_set() or time.monotonic() >= deadline):
+                        partial = True
+                        break
+                    try:
+                        st = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    if st.st_dev != device:
+                        # A mount on top of this filesystem
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append((entry.name, st.st_mtime_ns))
+                        continue
+                    size = st.st_blocks * 512
+                    own_bytes += size
+                    own_inodes += 1
+                    if size >= BIG_FILE_BYTES:
+                        big[entry.name] = size
+        except OSError:
+            return None
+        record = [mtime_ns, own_bytes, own_inodes, [name for name, _ in subdirs], big, now]
+        return DirVisit(rel, record, subdirs, entries, reused=False, partial=partial)
+    
+    def _reuse(self, path: str, rel: str, cached: List[Any], device: int) -> DirVisit:
+        """Reuse an unchanged directory: re-stat its subdirectories and big files only."""
+        own_bytes = cached[_BYTES]
+        big: Dict[str, int] = {}
+        entries = 0
+        for name, old_size in cached[_BIG].items():
+            entries += 1
+            try:
+                size = os.lstat(os.path.join(path, name)).st_blocks * 512
+            except OSError:
+                size = 0
+            own_bytes += size - old_size
+            if size:
+                big[name] = size
+        subdirs: List[Tuple[str, int]] = []
+        for name in cached[_SUBDIRS]:
+            entries += 1
+            try:
+                st = os.lstat(os.path.join(path, name))
+            except OSError:
+                continue
+            if st.st_dev == device:
+                subdirs.append((name, st.st_mtime_ns))
+        record = [cached[_MTIME], own_bytes, cached[_INODES], cached[_SUBDIRS], big, cached[_SCANNED]]
+        return DirVisit(rel, record, subdirs, entries, reused=True)
@@ -3,8 +3,9 @@
 import re
 from typing import List, Optional, Tuple
 from pathlib import Path
-from ..util.shell import safe_subprocess, which
+from ..util.shell import safe_subprocess, stream_subprocess, which
 from ..state.model import LogCursor
+from .logscan import LogScanner, LogScanResult
 
 
 class LogCollector:
@@ -15,6 +16,15 @@ class LogCollector:
         re.IGNORECASE
     )
     
+    # Bytes-level equivalents used by the scanning engine
+    HUNG_TASK_ANCHOR = b"blocked for more than"
+    HUNG_TASK_BYTES_PATTERN = re.compile(
+        rb"blocked for more than (\d+) seconds",
+        re.IGNORECASE
+    )
+    
+    CURSOR_PREFIX = b"-- cursor:"
+    
     def __init__(self):
         """Initialize collector."""
         self.journalctl_path = which("journalctl")
@@ -23,6 +33,7 @@ class LogCollector:
             "/var/log/messages",
             "/var/log/syslog",
         ]
+        self.scanner = LogScanner(self.HUNG_TASK_ANCHOR, self.HUNG_TASK_BYTES_PATTERN)
     
     def collect_from_journald(self, cursor: Optional[str] = None) -> Tuple[List[str], Optional[str]]:
         """
@@ -154,3 +165,90 @@ class LogCollector:
             if self.HUNG_TASK_PATTERN.search(line):
                 count += 1
         return count
+    
+    def scan_journald(
+        self,
+        cursor: Optional[str] = None,
+    ) -> Tuple[Optional[LogScanResult], Optional[str]]:
+        """
+        Scan kernel logs from journald for hung tasks in a single pass.
+        
+        journalctl output is read from the pipe in chunks and searched as
+        bytes; the new cursor comes from the ``--show-cursor`` trailer of
+        the same invocation.
+        
+        Args:
+            cursor: Last journald cursor (None for first run)
+            
+        Returns:
+            Tuple of (scan_result, new_cursor); scan_result is None if
+            journald is unavailable or returned nothing
+        """
+        if not self.journalctl_path:
+            return (None, None)
+        
+        cmd = [self.journalctl_path, "-k", "--no-pager", "-o", "short-iso", "--show-cursor"]
+        
+        if cursor:
+            cmd.extend(["--after-cursor", cursor])
+        else:
+            cmd.extend(["--since", "1 hour ago"])
+        
+        with stream_subprocess(cmd, timeout=5.0) as proc:
+            if proc is None or proc.stdout is None:
+                return (None, None)
+            result = self.scanner.scan_stream(proc.stdout)
+            returncode = proc.wait()
+        
+        if returncode != 0 or result.bytes_scanned == 0:
+            return (None, None)
+        
+        new_cursor = cursor
+        last_line = result.last_line
+        if last_line and last_line.startswith(self.CURSOR_PREFIX):
+            new_cursor = last_line[len(self.CURSOR_PREFIX):].strip().decode("utf-8", errors="replace")
+        
+        return (result, new_cursor)
+    
+    def scan_kernel_logs(
+        self,
+        cursor: Optional[LogCursor] = None
+    ) -> Tuple[LogScanResult, Optional[LogCursor]]:
+        """
+        Scan kernel logs for hung tasks, preferring journald with file fallback.
+        
+        Unlike collect_kernel_logs(), no log lines are accumulated: the
+        backlog is scanned once as bytes and only matching lines are decoded.
+        
+        Args:
+            cursor: Previous log cursor state
+            
+        Returns:
+            Tuple of (scan_result, new_cursor)
+        """
+        journald_cursor = cursor.journald_cursor if cursor else None
+        result, new_journald_cursor = self.scan_journald(journald_cursor)
+        
+        if result is not None or new_journald_cursor:
+            new_cursor = LogCursor(
+                journald_cursor=new_journald_cursor,
+                file_offset=cursor.file_offset if cursor else 0,
+            )
+            return (result or LogScanResult(), new_cursor)
+        
+        # Fallback to file logs
+        file_offset = cursor.file_offset if cursor else 0
+        combined = LogScanResult()
+        max_offset = file_offset
+        
+        for log_path in self.kernel_log_paths:
+            path_result, new_offset = self.scanner.scan_file(log_path, file_offset)
+            combined.merge(path_result, self.scanner.max_matches)
+            max_offset = max(max_offset, new_offset)
+        
+        new_cursor = LogCursor(
+            journald_cursor=None,
+            file_offset=max_offset,
+        )
+        
+        return (combined, new_cursor)
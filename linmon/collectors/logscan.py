@@ -0,0 +1,213 @@
+"""Bytes-level log scanner (mmap for files, chunked reads for pipes)."""
+
+import mmap
+import os
+import re
+from typing import BinaryIO, List, Optional, Tuple
+
+
+class LogScanResult:
+    """Outcome of a log scan pass."""
+    
+    __slots__ = ("count", "matches", "bytes_scanned", "last_line")
+    
+    def __init__(self):
+        """Initialize empty result."""
+        self.count = 0
+        self.matches: List[str] = []
+        self.bytes_scanned = 0
+        self.last_line: Optional[bytes] = None
+    
+    def merge(self, other: "LogScanResult", max_matches: int) -> None:
+        """
+        Fold another result into this one.
+        
+        Args:
+            other: Result to merge
+            max_matches: Cap on retained matching lines
+        """
+        self.count += other.count
+        self.bytes_scanned += other.bytes_scanned
+        room = max_matches - len(self.matches)
+        if room > 0:
+            self.matches.extend(other.matches[:room])
+        if other.last_line is not None:
+            self.last_line = other.last_line
+
+
+class LogScanner:
+    """
+    Single-pass scanner that searches raw bytes for a fixed-string anchor.
+    
+    Only lines containing the anchor are sliced out, checked against the
+    full pattern and decoded. Files are mapped in bounded windows and pipes
+    are read in fixed-size chunks, so memory use does not depend on how much
+    backlog there is to catch up on.
+    """
+    
+    WINDOW_SIZE = 64 * 1024 * 1024  # Bytes mapped at a time for file scans
+    CHUNK_SIZE = 64 * 1024  # Bytes read at a time from pipes
+    MAX_LINE = 16 * 1024  # Longest line kept across window/chunk boundaries
+    MAX_MATCHES = 50  # Matching lines retained per scan
+    
+    def __init__(self, anchor: bytes, pattern: "re.Pattern[bytes]", max_matches: int = MAX_MATCHES):
+        """
+        Initialize scanner.
+        
+        Args:
+            anchor: Fixed byte string every matching line must contain
+            pattern: Bytes regex a candidate line must match to be counted
+            max_matches: Cap on decoded matching lines retained
+        """
+        self.anchor = anchor
+        self.pattern = pattern
+        self.max_matches = max_matches
+    
+    def _scan(self, buf, lo: int, start: int, limit: int, hi: int, result: LogScanResult) -> None:
+        """
+        Count matching lines whose anchor lies in buf[start:limit].
+        
+        Args:
+            buf: Buffer supporting find/rfind (bytes, bytearray or mmap)
+            lo: Lowest index line extraction may reach back to
+            start: First index an anchor may start at
+            limit: End bound passed to find() for the anchor
+            hi: Highest index line extraction may reach forward to
+            result: Result to update
+        """
+        find = buf.find
+        anchor = self.anchor
+        search = self.pattern.search
+        max_line = self.MAX_LINE
+        
+        pos = find(anchor, start, limit)
+        while pos != -1:
+            nl = buf.rfind(b"\n", max(lo, pos - max_line), pos)
+            line_start = nl + 1 if nl != -1 else max(lo, pos - max_line)
+            line_end = find(b"\n", pos, min(hi, pos + max_line))
+            if line_end == -1:
+                line_end = min(hi, pos + max_line)
+            
+            line = buf[line_start:line_end]
+            if search(line):
+                result.count += 1
+                if len(result.matches) < self.max_matches:
+                    result.matches.append(line.decode("utf-8", errors="replace").rstrip("\r"))
+            
+            pos = find(anchor, line_end, limit)
+    
+    def scan_file(self, filepath: str, offset: int = 0) -> Tuple[LogScanResult, int]:
+        """
+        Scan a log file from a byte offset using mmap.
+        
+        Only complete lines are consumed; a trailing partial line is left
+        for the next scan.
+        
+        Args:
+            filepath: Path to log file
+            offset: Byte offset to start scanning from
+            
+        Returns:
+            Tuple of (scan_result, new_offset)
+        """
+        result = LogScanResult()
+        try:
+            fd = os.open(filepath, os.O_RDONLY)
+        except OSError:
+            return (result, offset)
+        
+        try:
+            size = os.fstat(fd).st_size
+            if size <= offset:
+                return (result, offset)
+            
+            granularity = mmap.ALLOCATIONGRANULARITY
+            anchor_len = len(self.anchor)
+            pos = offset
+            new_offset = offset
+            
+            while pos < size:
+                window_end = min(size, pos + self.WINDOW_SIZE)
+                map_start = max(0, pos - self.MAX_LINE) // granularity * granularity
+                map_end = min(size, window_end + self.MAX_LINE)
+                
+                mm = mmap.mmap(fd, map_end - map_start, access=mmap.ACCESS_READ, offset=map_start)
+                try:
+                    if hasattr(mm, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+                        mm.madvise(mmap.MADV_SEQUENTIAL)
+                    
+                    start = pos - map_start
+                    stop = window_end - map_start
+                    if window_end == size:
+                        # Leave a trailing partial line for the next run
+                        last_nl = mm.rfind(b"\n", start, stop)
+                        if last_nl != -1:
+                            stop = last_nl + 1
+                        elif stop - start < self.MAX_LINE:
+                            stop = start
+                    
+                    if stop > start:
+                        self._scan(
+                            mm,
+                            0,
+                            start,
+                            min(stop + anchor_len - 1, map_end - map_start),
+                            map_end - map_start,
+                            result,
+                        )
+                    new_offset = map_start + stop
+                finally:
+                    mm.close()
+                
+                if window_end == size:
+                    break
+                pos = window_end
+            
+            result.bytes_scanned = new_offset - offset
+            return (result, new_offset)
+        except (OSError, ValueError):
+            return (result, offset)
+        finally:
+            os.close(fd)
+    
+    def scan_stream(self, stream: BinaryIO) -> LogScanResult:
+        """
+        Scan a binary stream (e.g. a subprocess pipe) in fixed-size chunks.
+        
+        The last complete line seen is kept in ``last_line`` so callers can
+        pick up trailer lines such as journalctl's ``-- cursor:`` output.
+        
+        Args:
+            stream: Binary file object to read until EOF
+            
+        Returns:
+            Scan result
+        """
+        result = LogScanResult()
+        read = getattr(stream, "read1", stream.read)
+        carry = b""
+        
+        while True:
+            chunk = read(self.CHUNK_SIZE)
+            if not chunk:
+                break
+            
+            buf = carry + chunk if carry else chunk
+            last_nl = buf.rfind(b"\n")
+            if last_nl == -1:
+                carry = buf[-self.MAX_LINE:]
+                continue
+            
+            self._scan(buf, 0, 0, last_nl, last_nl, result)
+            result.bytes_scanned += last_nl + 1
+            
+            prev_nl = buf.rfind(b"\n", max(0, last_nl - self.MAX_LINE), last_nl)
+            result.last_line = buf[prev_nl + 1:last_nl]
+            carry = buf[last_nl + 1:]
+        
+        if carry:
+            self._scan(carry, 0, 0, len(carry), len(carry), result)
+            result.bytes_scanned += len(carry)
+            result.last_line = carry
+        
+        return result
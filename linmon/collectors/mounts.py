@@ -0,0 +1,220 @@
+"""Collector for the mount table (/proc/self/mountinfo)."""
+
+import hashlib
+import os
+import re
+import select
+from fnmatch import fnmatchcase
+from typing import Iterable, List, Optional, Sequence, Set
+
+MOUNTINFO_PATH = "/proc/self/mountinfo"
+
+# Octal escapes the kernel uses for space, tab, newline and backslash
+_ESCAPE = re.compile(r"\\([0-7]{3})")
+
+
+def unescape_path(field: str) -> str:
+    """Decode the octal escapes of a mountinfo path field."""
+    if "\\" not in field:
+        return field
+    return _ESCAPE.sub(lambda m: chr(int(m.group(1), 8)), field)
+
+
+class MountEntry:
+    """One line of mountinfo."""
+    
+    __slots__ = ("mount_id", "parent_id", "device", "root", "mountpoint", "fstype", "source")
+    
+    def __init__(
+        self,
+        mount_id: int,
+        parent_id: int,
+        device: str,
+        root: str,
+        mountpoint: str,
+        fstype: str,
+        source: str,
+    ):
+        """
+        Initialize entry.
+        
+        Args:
+            mount_id: Unique mount ID
+            parent_id: ID of the parent mount
+            device: ``major:minor`` of the filesystem
+            root: Directory of the filesystem mounted here ("/" unless a bind mount)
+            mountpoint: Mount path
+            fstype: Filesystem type (with subtype, e.g. ``fuse.sshfs``)
+            source: Mount source (e.g. ``/dev/sda1``)
+        """
+        self.mount_id = mount_id
+        self.parent_id = parent_id
+        self.device = device
+        self.root = root
+        self.mountpoint = mountpoint
+        self.fstype = fstype
+        self.source = source
+
+
+def parse_mountinfo(text: str) -> List[MountEntry]:
+    """
+    Parse mountinfo content.
+    
+    Format: ``id parent major:minor root mountpoint options [optional...] -
+    fstype source superoptions``; malformed lines are skipped.
+    
+    Args:
+        text: File content
+        
+    Returns:
+        Entries in file order (later entries are mounted on top of earlier ones)
+    """
+    entries: List[MountEntry] = []
+    for line in text.splitlines():
+        left, sep, right = line.partition(" - ")
+        if not sep:
+            continue
+        fields = left.split()
+        tail = right.split()
+        if len(fields) < 6 or len(tail) < 2:
+            continue
+        try:
+            entries.append(MountEntry(
+                int(fields[0]),
+                int(fields[1]),
+                fields[2],
+                unescape_path(fields[3]),
+                unescape_path(fields[4]),
+                tail[0],
+                unescape_path(tail[1]),
+            ))
+        except ValueError:
+            continue
+    return entries
+
+
+def _matches(value: str, patterns: Iterable[str]) -> bool:
+    """Check a value against glob patterns."""
+    return any(fnmatchcase(value, pattern) for pattern in patterns)
+
+
+def select_mounts(
+    entries: Sequence[MountEntry],
+    fstypes: Sequence[str],
+    paths: Sequence[str],
+    exclude_paths: Sequence[str] = (),
+    skip_devices: Optional[Set[str]] = None,
+) -> List[MountEntry]:
+    """
+    Filter mounts and keep one per filesystem.
+    
+    Bind mounts and repeated mounts of a device are collapsed to a single
+    entry (preferring a mount of the filesystem root, then the shortest
+    path), so every filesystem is statted once. A mountpoint that was
+    mounted over is dropped in favour of the newer mount.
+    
+    Args:
+        entries: Parsed mount table
+        fstypes: Filesystem type globs to include
+        paths: Mountpoint globs to include
+        exclude_paths: Mountpoint globs to exclude
+        skip_devices: ``major:minor`` devices already monitored
+        
+    Returns:
+        Selected entries, sorted by mountpoint
+    """
+    # Mounts stacked on the same path: only the last one is visible
+    visible = {entry.mountpoint: entry for entry in entries}
+    
+    by_device = {}
+    for entry in visible.values():
+        if not _matches(entry.fstype, fstypes):
+            continue
+        if not _matches(entry.mountpoint, paths) or _matches(entry.mountpoint, exclude_paths):
+            continue
+        if skip_devices and entry.device in skip_devices:
+            continue
+        current = by_device.get(entry.device)
+        rank = (entry.root != "/", len(entry.mountpoint), entry.mountpoint)
+        if current is None or rank < (current.root != "/", len(current.mountpoint), current.mountpoint):
+            by_device[entry.device] = entry
+    return sorted(by_device.values(), key=lambda e: e.mountpoint)
+
+
+class MountTable:
+    """
+    Cached mount table that is reparsed only when it changes.
+    
+    The file stays open; for procfs files the kernel flags a mount table
+    change with POLLPRI, so checking for changes is one ``poll()`` with no
+    read. Other files (e.g. test fixtures) are re-read and compared by hash.
+    """
+    
+    def __init__(self, path: str = MOUNTINFO_PATH):
+        """
+        Initialize table.
+        
+        Args:
+            path: mountinfo file
+        """
+        self.path = path
+        # Incremented whenever the parsed entries change
+        self.generation = 0
+        self._entries: List[MountEntry] = []
+        self._fd: Optional[int] = None
+        self._poller: Optional["select.poll"] = None
+        self._digest: Optional[bytes] = None
+    
+    def entries(self) -> List[MountEntry]:
+        """
+        Get the current mount table.
+        
+        Returns:
+            Parsed entries (empty if the file cannot be read)
+        """
+        if self._fd is None:
+            try:
+                self._fd = os.open(self.path, os.O_RDONLY)
+            except OSError:
+                return self._entries
+            if self.path.startswith("/proc/") and hasattr(select, "poll"):
+                self._poller = select.poll()
+                self._poller.register(self._fd, select.POLLPRI | select.POLLERR)
+            self._load(self._read())
+        elif self._poller is not None:
+            if self._poller.poll(0):
+                self._load(self._read())
+        else:
+            data = self._read()
+            if hashlib.sha1(data).digest() != self._digest:
+                self._load(data)
+        return self._entries
+    
+    def _read(self) -> bytes:
+        """Read the whole file from the start."""
+        if self._fd is None:
+            return b""
+        chunks = []
+        try:
+            os.lseek(self._fd, 0, os.SEEK_SET)
+            while True:
+                chunk = os.read(self._fd, 65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+        except OSError:
+            return b""
+        return b"".join(chunks)
+    
+    def _load(self, data: bytes) -> None:
+        """Parse new content."""
+        self._digest = hashlib.sha1(data).digest()
+        self._entries = parse_mountinfo(data.decode("utf-8", "surrogateescape"))
+        self.generation += 1
+    
+    def close(self) -> None:
+        """Close the mountinfo file."""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+            self._poller = None
@@ -0,0 +1,126 @@
+"""Collector for NFS client RPC statistics (/proc/self/mountstats)."""
+
+from typing import Dict, Iterable, List, Sequence
+from .mounts import unescape_path
+
+MOUNTSTATS_PATH = "/proc/self/mountstats"
+
+NFS_FSTYPES = ("nfs", "nfs4")
+
+# Per-op counters kept from each "per-op statistics" line, in file order
+OP_FIELDS = ("ops", "transmissions", "major_timeouts", "bytes_sent", "bytes_recv", "queue_ms", "rtt_ms", "exe_ms")
+OPS, TRANSMISSIONS, MAJOR_TIMEOUTS, BYTES_SENT, BYTES_RECV, QUEUE_MS, RTT_MS, EXE_MS = range(len(OP_FIELDS))
+
+# Position of (sends, bklog_u) on an xprt line, by transport
+_XPRT_FIELDS = {
+    "tcp": (6, 10),
+    "rdma": (6, 10),
+    "udp": (3, 7),
+}
+
+
+class NFSMountStats:
+    """RPC counters of one NFS mount."""
+    
+    __slots__ = ("mountpoint", "fstype", "ops", "sends", "backlog")
+    
+    def __init__(self, mountpoint: str, fstype: str):
+        """
+        Initialize stats.
+        
+        Args:
+            mountpoint: Mount path
+            fstype: ``nfs`` or ``nfs4``
+        """
+        self.mountpoint = mountpoint
+        self.fstype = fstype
+        # Operation name (e.g. "READ") -> counters in OP_FIELDS order
+        self.ops: Dict[str, List[int]] = {}
+        # RPCs sent, and the backlog queue length summed over those sends
+        self.sends = 0
+        self.backlog = 0
+
+
+def parse_mountstats(lines: Iterable[str], ops: Sequence[str]) -> Dict[str, NFSMountStats]:
+    """
+    Parse mountstats in a single pass.
+    
+    Only ``device`` lines are split to find NFS mounts. Other mounts'
+    lines, and per-op lines of operations not asked for, are skipped
+    without being split.
+    
+    Args:
+        lines: File lines (e.g. the open file itself)
+        ops: Operation names to keep (e.g. ``["READ", "WRITE"]``)
+        
+    Returns:
+        Stats by mountpoint (a mountpoint listed twice keeps the last)
+    """
+    wanted = set(ops)
+    mounts: Dict[str, NFSMountStats] = {}
+    current = None
+    in_ops = False
+    for line in lines:
+        if line.startswith("device "):
+            # device <source> mounted on <path> with fstype <type> [statvers=...]
+            fields = line.split()
+            in_ops = False
+            current = None
+            if len(fields) >= 8 and fields[7] in NFS_FSTYPES:
+                current = NFSMountStats(unescape_path(fields[4]), fields[7])
+                mounts[current.mountpoint] = current
+            continue
+        if current is None:
+            continue
+        stripped = line.strip()
+        if in_ops:
+            name, sep, rest = stripped.partition(":")
+            if sep and name in wanted:
+                values = rest.split()
+                if len(values) >= len(OP_FIELDS):
+                    try:
+                        current.ops[name] = [int(v) for v in values[:len(OP_FIELDS)]]
+                    except ValueError:
+                        pass
+        elif stripped.startswith("xprt:"):
+            fields = stripped.split()[1:]
+            positions = _XPRT_FIELDS.get(fields[0]) if fields else None
+            if positions is not None and len(fields) > positions[1]:
+                try:
+                    # Summed over the transports of an nconnect mount
+                    current.sends += int(fields[positions[0]])
+                    current.backlog += int(fields[positions[1]])
+                except ValueError:
+                    pass
+        elif stripped == "per-op statistics":
+            in_ops = True
+    return mounts
+
+
+class NFSStatsCollector:
+    """Reads NFS client statistics of all NFS mounts."""
+    
+    def __init__(self, path: str = MOUNTSTATS_PATH):
+        """
+        Initialize collector.
+        
+        Args:
+            path: mountstats file
+        """
+        self.path = path
+    
+    def read(self, ops: Sequence[str]) -> Dict[str, NFSMountStats]:
+        """
+        Read the current counters.
+        
+        Args:
+            ops: Operation names to keep
+            
+        Returns:
+            Stats by mountpoint (empty if the file cannot be read)
+        """
+        try:
+            with open(self.path, "r", encoding="utf-8", errors="surrogateescape") as f:
+                return parse_mountstats(f, ops)
+        except OSError:
+            return {}
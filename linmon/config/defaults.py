@@ -6,4 +6,76 @@ DEFAULT_ALERT_FILE = "/var/log/linmon/alerts.log"
 
 DEFAULT_CPU_SAMPLE_SECONDS = 2.0
 DEFAULT_STORAGE_MOUNTPOINTS = ["/"]
+
+# Mount discovery: filesystem types of local volumes, and container/runtime
+# mount trees that are skipped. Network filesystems are opt-in: statvfs() on
+# a mount whose server stopped answering blocks the whole run.
+DEFAULT_DISCOVERY_FSTYPES = [
+    "ext2", "ext3", "ext4", "xfs", "btrfs", "zfs", "f2fs", "jfs", "reiserfs",
+    "vfat", "exfat", "ntfs", "ntfs3", "fuseblk",
+]
+DEFAULT_DISCOVERY_EXCLUDE_PATHS = [
+    "/proc/*", "/sys/*", "/dev/*", "/run/*",
+    "/var/lib/docker/*", "/var/lib/containers/*", "/var/lib/kubelet/*", "/snap/*",
+]
+
+# Disk usage scan on storage anomalies: threads, seconds, entries and
+# directories reported
+DEFAULT_SCAN_WORKERS = 4
+DEFAULT_SCAN_TIME_BUDGET = 10.0
+DEFAULT_SCAN_MAX_ENTRIES = 1_000_000
+DEFAULT_SCAN_TOP = 10
+
+# Processes listed as holding the most space in deleted-but-open files
+DEFAULT_DELETED_TOP = 10
+
 DEFAULT_IO_STUCK_ENABLED = True
+
+# NFS operations whose client RPC statistics are reported
+DEFAULT_NFS_OPS = ["READ", "WRITE", "GETATTR", "LOOKUP", "ACCESS", "COMMIT"]
+
+# cgroup monitor: levels walked below the cgroup root, and cgroups reported
+# per metric family
+DEFAULT_CGROUP_DEPTH = 2
+DEFAULT_CGROUP_TOP = 10
+
+# Samples kept per metric for rate/delta/eta_seconds rules (24 hours at a
+# 5 minute interval); a series grows past this when a rule's window needs
+# it, up to the most the state encoding can hold (a 16-bit count)
+DEFAULT_HISTORY_SAMPLES = 288
+MAX_TREND_SAMPLES = 0xFFFF
+
+# Records kept per series in the history store (7 days at a 5 minute interval)
+DEFAULT_HISTORY_STORE_SAMPLES = 2016
+
+# Ring files the history store keeps mapped between appends (least recently
+# used ones are closed beyond this)
+DEFAULT_HISTORY_OPEN_RINGS = 1024
+
+# Rollup tiers of the history store: (bucket, retention)
+DEFAULT_HISTORY_TIERS = [("1h", "90d"), ("1d", "1825d")]
+
+# Seconds to wait for another run holding the state lock
+DEFAULT_STATE_LOCK_TIMEOUT = 60.0
+
+# Report retention: days kept and total size of report_dir
+DEFAULT_REPORT_MAX_AGE = "30d"
+DEFAULT_REPORT_MAX_SIZE_MB = 512
+
+# Run journal rotation (reports.mode: journal)
+DEFAULT_JOURNAL_MAX_MB = 64
+DEFAULT_JOURNAL_KEEP = 5
+
+# linmon serve: HTTP listen address and seconds between checks
+DEFAULT_SERVE_LISTEN = "127.0.0.1:9810"
+DEFAULT_SERVE_INTERVAL = "5m"
+
+# Re-notify alerts still firing after this long
+DEFAULT_ALERT_REMINDER = "6h"
+
+# Webhook alerts: socket timeout and size of the undelivered payload spool
+DEFAULT_WEBHOOK_TIMEOUT = 5.0
+DEFAULT_ALERT_SPOOL_MAX_MB = 16
+
+# Native protocol socket of systemd-journald
+DEFAULT_JOURNALD_SOCKET = "/run/systemd/journal/socket"
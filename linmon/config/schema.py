@@ -1,29 +1,98 @@
 """Pydantic schemas for configuration validation."""
 
+import re
+from pathlib import Path
 from typing import List, Optional, Dict, Any, Literal
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
+from ..metrics.expr import ExpressionError, compile_expression
+from ..metrics.model import parse_series_key
+from ..metrics.storage import legacy_names, scope_expression, scope_metric
+from ..util.time import parse_duration
 from .defaults import (
     DEFAULT_STATE_FILE,
     DEFAULT_REPORT_DIR,
     DEFAULT_ALERT_FILE,
     DEFAULT_CPU_SAMPLE_SECONDS,
     DEFAULT_STORAGE_MOUNTPOINTS,
+    DEFAULT_DISCOVERY_FSTYPES,
+    DEFAULT_DISCOVERY_EXCLUDE_PATHS,
+    DEFAULT_SCAN_WORKERS,
+    DEFAULT_SCAN_TIME_BUDGET,
+    DEFAULT_SCAN_MAX_ENTRIES,
+    DEFAULT_SCAN_TOP,
+    DEFAULT_DELETED_TOP,
+    DEFAULT_NFS_OPS,
+    DEFAULT_CGROUP_DEPTH,
+    DEFAULT_CGROUP_TOP,
+    DEFAULT_HISTORY_SAMPLES,
+    MAX_TREND_SAMPLES,
+    DEFAULT_HISTORY_STORE_SAMPLES,
+    DEFAULT_HISTORY_TIERS,
+    DEFAULT_STATE_LOCK_TIMEOUT,
+    DEFAULT_REPORT_MAX_AGE,
+    DEFAULT_REPORT_MAX_SIZE_MB,
+    DEFAULT_JOURNAL_MAX_MB,
+    DEFAULT_JOURNAL_KEEP,
+    DEFAULT_SERVE_LISTEN,
+    DEFAULT_SERVE_INTERVAL,
+    DEFAULT_ALERT_REMINDER,
+    DEFAULT_WEBHOOK_TIMEOUT,
+    DEFAULT_ALERT_SPOOL_MAX_MB,
 )
 
 
 # Valid operators
 Operator = Literal["gt", "gte", "lt", "lte", "eq", "ne"]
 
+# Rule types: compare the metric itself, or a trend over its history
+RuleType = Literal["threshold", "rate", "delta", "eta_seconds"]
+
 
 class Rule(BaseModel):
-    """Rule definition for threshold evaluation."""
+    """Rule definition for threshold or expression evaluation."""
     
     name: str = Field(..., description="Rule name")
-    metric: str = Field(..., description="Metric name to evaluate")
-    op: Operator = Field(..., description="Comparison operator")
-    value: float = Field(..., description="Threshold value")
+    type: RuleType = Field(
+        default="threshold",
+        description="What to compare: the metric, or its rate/delta/eta_seconds over recent history"
+    )
+    metric: Optional[str] = Field(default=None, description="Metric name to evaluate")
+    op: Optional[Operator] = Field(default=None, description="Comparison operator")
+    value: Optional[float] = Field(default=None, description="Threshold value")
+    expr: Optional[str] = Field(
+        default=None,
+        description="Boolean expression over metrics (alternative to metric/op/value)"
+    )
+    labels: Dict[str, str] = Field(
+        default_factory=dict,
+        description="Label selector for labelled metrics (values may be globs, e.g. mount: '/srv/*')"
+    )
     consecutive: int = Field(..., ge=1, description="Number of consecutive violations required")
     args: Dict[str, Any] = Field(default_factory=dict, description="Optional rule-specific args")
+    
+    @model_validator(mode="after")
+    def validate_form(self) -> "Rule":
+        """Require either an expression or a metric/op/value threshold."""
+        if self.expr is not None:
+            if self.metric is not None or self.op is not None or self.value is not None:
+                raise ValueError(f"Rule {self.name!r}: use either expr or metric/op/value, not both")
+            if self.labels:
+                raise ValueError(f"Rule {self.name!r}: labels cannot be used with expr")
+            if self.type != "threshold":
+                raise ValueError(f"Rule {self.name!r}: type {self.type} cannot be used with expr")
+            compile_expression(self.expr)
+        elif self.metric is None or self.op is None or self.value is None:
+            raise ValueError(f"Rule {self.name!r}: metric, op and value are required without expr")
+        else:
+            parse_series_key(self.metric)
+        
+        if self.type != "threshold":
+            for key in ("window", "per"):
+                if key in self.args:
+                    parse_duration(str(self.args[key]))
+            if "target" in self.args:
+                float(self.args["target"])
+        return self
 
 
 class StorageMountConfig(BaseModel):
@@ -51,6 +120,38 @@ class CPUConfig(MonitorConfig):
     )
 
 
+class StorageDiscoveryConfig(BaseModel):
+    """Mountpoint discovery from the mount table."""
+    
+    enabled: bool = Field(default=False, description="Monitor mounts found in /proc/self/mountinfo")
+    fstypes: List[str] = Field(
+        default_factory=lambda: list(DEFAULT_DISCOVERY_FSTYPES),
+        description="Filesystem types to include (globs)"
+    )
+    paths: List[str] = Field(default_factory=lambda: ["*"], description="Mountpoints to include (globs)")
+    exclude_paths: List[str] = Field(
+        default_factory=lambda: list(DEFAULT_DISCOVERY_EXCLUDE_PATHS),
+        description="Mountpoints to exclude (globs)"
+    )
+
+
+class StorageScanConfig(BaseModel):
+    """Directory usage scan run on mounts with storage anomalies."""
+    
+    enabled: bool = Field(default=True, description="Scan a mount when one of its storage rules fires")
+    workers: int = Field(default=DEFAULT_SCAN_WORKERS, ge=1, le=64, description="Threads listing directories")
+    time_budget: float = Field(default=DEFAULT_SCAN_TIME_BUDGET, gt=0, description="Seconds per scan")
+    max_entries: int = Field(default=DEFAULT_SCAN_MAX_ENTRIES, ge=1, description="Directory entries per scan")
+    top: int = Field(default=DEFAULT_SCAN_TOP, ge=1, description="Directories reported by bytes and by inodes")
+
+
+class StorageDeletedConfig(BaseModel):
+    """Space held by deleted files that processes still have open."""
+    
+    enabled: bool = Field(default=True, description="Scan /proc/<pid>/fd for deleted files")
+    top: int = Field(default=DEFAULT_DELETED_TOP, ge=1, description="Processes listed in the report")
+
+
 class StorageConfig(MonitorConfig):
     """Storage monitor configuration."""
     
@@ -58,12 +159,125 @@ class StorageConfig(MonitorConfig):
         default_factory=lambda: [StorageMountConfig(path=p) for p in DEFAULT_STORAGE_MOUNTPOINTS],
         description="Mountpoints to monitor"
     )
+    discovery: StorageDiscoveryConfig = Field(
+        default_factory=StorageDiscoveryConfig,
+        description="Add mountpoints discovered from the mount table"
+    )
+    scan: StorageScanConfig = Field(
+        default_factory=StorageScanConfig,
+        description="Find the largest directories of a mount when its rules fire"
+    )
+    deleted_files: StorageDeletedConfig = Field(
+        default_factory=StorageDeletedConfig,
+        description="Report space held by deleted-but-open files"
+    )
+    
+    @model_validator(mode="after")
+    def validate_expressions(self) -> "StorageConfig":
+        """Reject expression rules reading metrics the storage monitor does not emit."""
+        self.scoped_rules()
+        return self
+    
+    def scoped_rules(self) -> List[Rule]:
+        """
+        Get the storage rules, scoped to mount labels.
+        
+        Bare family names in a mountpoint's rules select that mount; in the
+        global rules they select ``/`` as they always have. Legacy
+        ``mount_<name>_<field>`` names are rewritten to the labelled family.
+        Expression rules get the same mapping for each name they read.
+        
+        Returns:
+            Scoped rules, global rules first
+            
+        Raises:
+            ExpressionError: If an expression reads a metric the monitor
+                does not emit
+        """
+        legacy = legacy_names(mount.path for mount in self.mountpoints)
+        
+        def scope(rule: Rule, default_mount: str) -> Rule:
+            """Map one rule onto labelled storage families."""
+            if rule.expr is not None:
+                try:
+                    expr = scope_expression(rule.expr, default_mount, legacy)
+                except ExpressionError as e:
+                    raise ExpressionError(f"Rule {rule.name!r}: {e}") from None
+                return rule.model_copy(update={"expr": expr})
+            if rule.metric is None:
+                return rule
+            metric, labels = scope_metric(rule.metric, rule.labels, default_mount, legacy)
+            if metric == rule.metric and labels == rule.labels:
+                return rule
+            return rule.model_copy(update={"metric": metric, "labels": labels})
+        
+        rules = [scope(rule, "/") for rule in self.rules]
+        for mount in self.mountpoints:
+            rules.extend(scope(rule, mount.path) for rule in mount.rules)
+        return rules
+
+
+class IOStuckNFSConfig(BaseModel):
+    """NFS client RPC statistics from /proc/self/mountstats."""
+    
+    enabled: bool = Field(default=True, description="Report latency and retransmits of NFS mounts")
+    ops: List[str] = Field(
+        default_factory=lambda: list(DEFAULT_NFS_OPS),
+        description="NFS operations to report (e.g. READ, WRITE, GETATTR)"
+    )
+    
+    @field_validator("ops")
+    @classmethod
+    def validate_ops(cls, v: List[str]) -> List[str]:
+        """Normalize operation names to the upper case used by the kernel."""
+        ops = [op.upper() for op in v]
+        for op in ops:
+            if not op.replace("_", "").isalnum():
+                raise ValueError(f"Invalid NFS operation name: {op!r}")
+        return ops
 
 
 class IOStuckConfig(MonitorConfig):
     """IO-stuck monitor configuration."""
     
-    pass
+    nfs: IOStuckNFSConfig = Field(
+        default_factory=IOStuckNFSConfig,
+        description="NFS client latency, retransmits and backlog"
+    )
+
+
+class CgroupConfig(MonitorConfig):
+    """cgroup v2 monitor configuration."""
+    
+    root: Optional[str] = Field(default=None, description="cgroup2 mountpoint (default: detected)")
+    depth: int = Field(default=DEFAULT_CGROUP_DEPTH, ge=1, le=16, description="Levels walked below the root")
+    exclude: List[str] = Field(default_factory=list, description="cgroup paths to skip with their subtrees (globs)")
+    top: int = Field(default=DEFAULT_CGROUP_TOP, ge=1, description="cgroups reported per metric family")
+
+
+class WebhookConfig(BaseModel):
+    """HTTP(S) webhook alert sink."""
+    
+    url: str = Field(..., description="Endpoint receiving a JSON POST per alert digest")
+    timeout: float = Field(
+        default=DEFAULT_WEBHOOK_TIMEOUT,
+        gt=0,
+        description="Seconds allowed for connecting and for each read/write"
+    )
+    headers: Dict[str, str] = Field(default_factory=dict, description="Extra request headers")
+    spool_max_mb: float = Field(
+        default=DEFAULT_ALERT_SPOOL_MAX_MB,
+        gt=0,
+        description="Drop the oldest undelivered payloads beyond this size"
+    )
+    
+    @field_validator("url")
+    @classmethod
+    def validate_url(cls, v: str) -> str:
+        """Check the URL is http(s) with a host."""
+        if not re.match(r"^https?://[^/?#]+", v):
+            raise ValueError(f"Webhook URL must be http:// or https://: {v!r}")
+        return v
 
 
 class AlertsConfig(BaseModel):
@@ -71,17 +285,219 @@ class AlertsConfig(BaseModel):
     
     stdout: bool = Field(default=True, description="Enable stdout alerts")
     file: Optional[str] = Field(default=DEFAULT_ALERT_FILE, description="File path for alerts (None to disable)")
+    reminder: Optional[str] = Field(
+        default=DEFAULT_ALERT_REMINDER,
+        description="Re-notify alerts still firing after this long, e.g. '6h' (None: never)"
+    )
+    notify_resolved: bool = Field(default=True, description="Notify when a firing alert resolves")
+    journald: bool = Field(default=False, description="Write alerts to journald as structured entries")
+    webhooks: List[WebhookConfig] = Field(default_factory=list, description="Webhook alert sinks")
+    
+    @field_validator("reminder")
+    @classmethod
+    def validate_reminder(cls, v: Optional[str]) -> Optional[str]:
+        """Check the reminder interval parses as a positive duration."""
+        if v is not None and parse_duration(v) <= 0:
+            raise ValueError(f"Alert reminder must be positive: {v!r}")
+        return v
+
+
+class HistoryTierConfig(BaseModel):
+    """Rollup tier of the history store."""
+    
+    bucket: str = Field(..., description="Bucket width, e.g. '1h'")
+    retention: str = Field(..., description="How long buckets are kept, e.g. '90d'")
+    
+    @model_validator(mode="after")
+    def validate_durations(self) -> "HistoryTierConfig":
+        """Check both durations parse and retention covers a bucket."""
+        bucket = parse_duration(self.bucket)
+        retention = parse_duration(self.retention)
+        if bucket <= 0:
+            raise ValueError(f"Rollup bucket must be positive: {self.bucket!r}")
+        if retention < bucket:
+            raise ValueError(f"Rollup retention {self.retention!r} is shorter than its bucket {self.bucket!r}")
+        return self
+
+
+class HistoryConfig(BaseModel):
+    """Local metric history store configuration."""
+    
+    enabled: bool = Field(default=False, description="Append each run's metrics to the history store")
+    directory: Optional[str] = Field(
+        default=None,
+        description="Store directory (default: 'history' next to the state file)"
+    )
+    samples: int = Field(
+        default=DEFAULT_HISTORY_STORE_SAMPLES,
+        ge=2,
+        description="Raw records kept per series"
+    )
+    tiers: List[HistoryTierConfig] = Field(
+        default_factory=lambda: [HistoryTierConfig(bucket=b, retention=r) for b, r in DEFAULT_HISTORY_TIERS],
+        description="Rollup tiers (min/max/sum/count buckets)"
+    )
+    trend_samples: int = Field(
+        default=DEFAULT_HISTORY_SAMPLES,
+        ge=2,
+        le=MAX_TREND_SAMPLES,
+        description="Samples kept in the state per series read by trend rules (more when a rule's "
+                    "window needs them); independent of the store and of enabled"
+    )
+
+
+class ReportsConfig(BaseModel):
+    """Report output and retention configuration."""
+    
+    mode: Literal["full", "journal"] = Field(
+        default="full",
+        description="full: write text/JSON reports every run; journal: append a run record "
+                    "and write full reports only on anomalies or a severity change"
+    )
+    journal_file: Optional[str] = Field(
+        default=None,
+        description="Run journal path (default: journal.ndjson in report_dir)"
+    )
+    journal_max_mb: float = Field(
+        default=DEFAULT_JOURNAL_MAX_MB,
+        gt=0,
+        description="Rotate the journal before it grows past this size"
+    )
+    journal_keep: int = Field(default=DEFAULT_JOURNAL_KEEP, ge=0, description="Rotated journal files to keep")
+    fsync: bool = Field(default=False, description="fsync() the journal after every run")
+    max_age: Optional[str] = Field(
+        default=DEFAULT_REPORT_MAX_AGE,
+        description="Remove report days older than this, e.g. '30d' (None to keep)"
+    )
+    max_size_mb: Optional[float] = Field(
+        default=DEFAULT_REPORT_MAX_SIZE_MB,
+        gt=0,
+        description="Remove the oldest report days while report_dir exceeds this size (None for no limit)"
+    )
+    compress: bool = Field(default=True, description="Pack each past day into one tar.gz archive")
+    
+    @field_validator("max_age")
+    @classmethod
+    def validate_max_age(cls, v: Optional[str]) -> Optional[str]:
+        """Check the age parses as a positive duration."""
+        if v is not None and parse_duration(v) <= 0:
+            raise ValueError(f"Report max_age must be positive: {v!r}")
+        return v
+
+
+class PrometheusConfig(BaseModel):
+    """Prometheus exposition output configuration."""
+    
+    textfile: Optional[str] = Field(
+        default=None,
+        description="Write metrics to this .prom file each run (node_exporter textfile collector)"
+    )
+    prefix: str = Field(default="linmon_", description="Prefix of exported metric names")
+    
+    @field_validator("prefix")
+    @classmethod
+    def validate_prefix(cls, v: str) -> str:
+        """Check the prefix keeps metric names valid."""
+        if v and not re.match(r"^[A-Za-z_:][A-Za-z0-9_:]*$", v):
+            raise ValueError(f"Invalid metric name prefix: {v!r}")
+        return v
+
+
+class ServeConfig(BaseModel):
+    """Serve mode (``linmon serve``) configuration."""
+    
+    listen: str = Field(default=DEFAULT_SERVE_LISTEN, description="HTTP listen address (host:port)")
+    interval: str = Field(default=DEFAULT_SERVE_INTERVAL, description="Time between checks, e.g. '5m'")
+    reload: bool = Field(
+        default=True,
+        description="Apply config file changes before the next check (listen needs a restart)"
+    )
+    
+    @field_validator("interval")
+    @classmethod
+    def validate_interval(cls, v: str) -> str:
+        """Check the interval parses as a positive duration."""
+        if parse_duration(v) <= 0:
+            raise ValueError(f"Serve interval must be positive: {v!r}")
+        return v
 
 
 class Config(BaseModel):
     """Root configuration schema."""
     
     state_file: str = Field(default=DEFAULT_STATE_FILE, description="State persistence file path")
+    state_lock: Literal["wait", "skip"] = Field(
+        default="wait",
+        description="When another run holds the state lock: wait for it, or skip this run"
+    )
+    state_lock_timeout: float = Field(
+        default=DEFAULT_STATE_LOCK_TIMEOUT,
+        ge=0,
+        description="Seconds to wait for the state lock before failing"
+    )
+    state_shards: bool = Field(
+        default=False,
+        description="Keep a separate state file (and lock) per monitor"
+    )
     report_dir: str = Field(default=DEFAULT_REPORT_DIR, description="Report output directory")
+    reports: ReportsConfig = Field(default_factory=ReportsConfig, description="Report retention")
     alerts: AlertsConfig = Field(default_factory=AlertsConfig, description="Alert configuration")
+    history: HistoryConfig = Field(default_factory=HistoryConfig, description="Metric history store")
+    prometheus: PrometheusConfig = Field(default_factory=PrometheusConfig, description="Prometheus output")
+    serve: ServeConfig = Field(default_factory=ServeConfig, description="Serve mode")
     
     monitors: Dict[str, Any] = Field(..., description="Monitor configurations")
     
+    def monitor_state_file(self, monitor_name: str) -> str:
+        """
+        Get the state file used by a monitor.
+        
+        Args:
+            monitor_name: Monitor name
+            
+        Returns:
+            state_file, or ``<stem>.<monitor><suffix>`` next to it when
+            state_shards is enabled
+        """
+        if not self.state_shards:
+            return self.state_file
+        path = Path(self.state_file)
+        return str(path.with_name(f"{path.stem}.{monitor_name}{path.suffix}"))
+    
+    @property
+    def journal_file(self) -> str:
+        """Path of the run journal."""
+        if self.reports.journal_file:
+            return self.reports.journal_file
+        return str(Path(self.report_dir) / "journal.ndjson")
+    
+    @property
+    def alert_spool_dir(self) -> str:
+        """Directory of undelivered webhook payloads (next to the state file)."""
+        return str(Path(self.state_file).parent / "alert-spool")
+    
+    @property
+    def scan_cache_dir(self) -> str:
+        """Directory of the disk usage scan caches (next to the state file)."""
+        return str(Path(self.state_file).parent / "du-cache")
+    
+    @property
+    def nfs_counters_file(self) -> str:
+        """Counters of the previous NFS sample (next to the state file)."""
+        return str(Path(self.state_file).parent / "nfs-counters.json")
+    
+    @property
+    def cgroup_counters_file(self) -> str:
+        """Counters of the previous cgroup sample (next to the state file)."""
+        return str(Path(self.state_file).parent / "cgroup-counters.json")
+    
+    @property
+    def history_dir(self) -> str:
+        """Directory of the metric history store."""
+        if self.history.directory:
+            return self.history.directory
+        return str(Path(self.state_file).parent / "history")
+    
     @field_validator("monitors", mode="before")
     @classmethod
     def validate_monitors(cls, v: Any) -> Dict[str, Any]:
@@ -97,6 +513,8 @@ class Config(BaseModel):
                 result[monitor_name] = StorageConfig(**monitor_data)
             elif monitor_name == "iostuck":
                 result[monitor_name] = IOStuckConfig(**monitor_data)
+            elif monitor_name == "cgroup":
+                result[monitor_name] = CgroupConfig(**monitor_data)
             else:
                 raise ValueError(f"Unknown monitor: {monitor_name}")
         
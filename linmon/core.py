@@ -1,23 +1,111 @@
 """Core orchestration logic."""
 
-from typing import Dict, List, Tuple
+import hashlib
+import os
+import sys
+import time
+from datetime import datetime
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from pathlib import Path
+import yaml
 from .config.loader import load_config
-from .config.schema import Config
+from .config.schema import Config, WebhookConfig
 from .state.manager import StateManager
 from .rules.engine import RuleEngine
 from .monitors.cpu import CPUMonitor
 from .monitors.storage import StorageMonitor
 from .monitors.iostuck import IOStuckMonitor
+from .monitors.cgroup import CgroupMonitor
 from .monitors.base import MonitorBase
 from .report.builder import ReportBuilder
 from .report.text import TextReporter
 from .report.json import JSONReporter
+from .report.prometheus import PrometheusReporter
+from .report.journal import RunJournal, journal_record
+from .report.retention import ReportStore
+from .alerts.base import AlertBase
 from .alerts.stdout import StdoutAlert
 from .alerts.file import FileAlert
+from .alerts.journald import JournaldAlert
+from .alerts.webhook import WebhookAlert
+from .alerts.tracker import AlertDigest, AlertTracker
 from .rules.model import RuleResult
-from .util.fs import ensure_dir, atomic_write
-from .util.time import now_iso
+from .store.history import HistoryStore
+from .store.rollup import RollupTier
+from .util.fs import atomic_write
+from .util.lock import LockBusyError
+from .util.time import now_iso, parse_duration
+
+
+def make_report_store(config: Config) -> ReportStore:
+    """Create the report store with the configured retention."""
+    reports = config.reports
+    return ReportStore(
+        config.report_dir,
+        max_age_seconds=parse_duration(reports.max_age) if reports.max_age else None,
+        max_bytes=int(reports.max_size_mb * 1024 * 1024) if reports.max_size_mb else None,
+        compress=reports.compress,
+    )
+
+
+def make_journal(config: Config) -> RunJournal:
+    """Create the run journal with the configured rotation."""
+    reports = config.reports
+    return RunJournal(
+        config.journal_file,
+        max_bytes=int(reports.journal_max_mb * 1024 * 1024),
+        keep=reports.journal_keep,
+        fsync=reports.fsync,
+    )
+
+
+def make_history_store(config: Config) -> Optional[HistoryStore]:
+    """Create the metric history store (None if disabled)."""
+    if not config.history.enabled:
+        return None
+    tiers = [
+        RollupTier(tier.bucket, parse_duration(tier.bucket), parse_duration(tier.retention))
+        for tier in config.history.tiers
+    ]
+    return HistoryStore(config.history_dir, config.history.samples, tiers)
+
+
+def _settings(monitor_config: Any) -> Any:
+    """Monitor configuration without its rules (what the monitor itself is built from)."""
+    def strip(value: Any) -> Any:
+        """Drop "rules" keys at any depth (mountpoints carry their own)."""
+        if isinstance(value, dict):
+            return {k: strip(v) for k, v in value.items() if k != "rules"}
+        if isinstance(value, list):
+            return [strip(v) for v in value]
+        return value
+    return strip(monitor_config.model_dump())
+
+
+def make_webhook_alert(config: Config, webhook: WebhookConfig) -> WebhookAlert:
+    """
+    Build a webhook alert sink with its own spool directory.
+    
+    Args:
+        config: Loaded configuration
+        webhook: Webhook sink configuration
+        
+    Returns:
+        Webhook alert
+    """
+    digest = hashlib.sha1(webhook.url.encode("utf-8")).hexdigest()[:12]
+    return WebhookAlert(
+        webhook.url,
+        str(Path(config.alert_spool_dir) / f"webhook-{digest}"),
+        timeout=webhook.timeout,
+        headers=webhook.headers,
+        spool_max_bytes=int(webhook.spool_max_mb * 1024 * 1024),
+    )
+
+
+# Monitors in evaluation order
+MONITOR_NAMES = ("cpu", "storage", "iostuck", "cgroup")
 
 
 class LinmonCore:
@@ -30,51 +118,381 @@ class LinmonCore:
         Args:
             config_path: Path to configuration file
         """
+        self.config_path = config_path
+        self._config_stamp = self._stat_config()
         self.config: Config = load_config(config_path)
-        self.state_manager = StateManager(self.config.state_file)
-        self.rule_engine = RuleEngine(self.state_manager)
+        
+        # State file path -> manager/engine; one shared pair unless
+        # state_shards gives each monitor its own file and lock
+        self.state_managers: Dict[str, StateManager] = {}
+        self.rule_engines: Dict[str, RuleEngine] = {}
+        self.state_manager = self._state_for("")
+        self.rule_engine = self._engine_for("")
         
         # Initialize monitors
         self.monitors: Dict[str, MonitorBase] = {}
+        for name in MONITOR_NAMES:
+            monitor_config = self.config.monitors.get(name)
+            if monitor_config is not None and monitor_config.enabled:
+                self.monitors[name] = self._make_monitor(name, monitor_config)
         
-        if "cpu" in self.config.monitors:
-            cpu_config = self.config.monitors["cpu"]
-            if cpu_config.enabled:
-                self.monitors["cpu"] = CPUMonitor(cpu_config, self.rule_engine)
-        
-        if "storage" in self.config.monitors:
-            storage_config = self.config.monitors["storage"]
-            if storage_config.enabled:
-                self.monitors["storage"] = StorageMonitor(storage_config, self.rule_engine)
-        
-        if "iostuck" in self.config.monitors:
-            iostuck_config = self.config.monitors["iostuck"]
-            if iostuck_config.enabled:
-                self.monitors["iostuck"] = IOStuckMonitor(
-                    iostuck_config, self.rule_engine, self.state_manager
-                )
+        # Local metric history
+        self.history_store = make_history_store(self.config)
         
         # Initialize reporters
         self.text_reporter = TextReporter()
         self.json_reporter = JSONReporter()
+        self._build_outputs()
+        
+        # Report of the most recent run (served by `linmon serve`)
+        self.last_report: Optional[Dict] = None
         
-        # Initialize alerts
-        self.alerts: List = []
-        if self.config.alerts.stdout:
-            self.alerts.append(StdoutAlert())
-        if self.config.alerts.file:
-            self.alerts.append(FileAlert(self.config.alerts.file))
+        # Initialize alerts, keyed by their configuration so a reload can
+        # keep the unchanged ones
+        self.alert_sinks: Dict[str, AlertBase] = self._build_alerts({})
+    
+    @property
+    def alerts(self) -> List[AlertBase]:
+        """Active alert handlers."""
+        return list(self.alert_sinks.values())
     
-    def run(self) -> Tuple[int, str, str]:
+    def close(self) -> None:
+        """Flush alert sinks before exit (bounded by each sink's timeout) and unmap the history store."""
+        for alert in self.alerts:
+            alert.close()
+        for monitor in self.monitors.values():
+            monitor.close()
+        if self.history_store is not None:
+            self.history_store.close()
+    
+    def _stat_config(self) -> Optional[Tuple[int, int, int]]:
+        """Identify the config file version: (inode, size, mtime_ns), None if missing."""
+        try:
+            st = os.stat(self.config_path)
+        except OSError:
+            return None
+        return (st.st_ino, st.st_size, st.st_mtime_ns)
+    
+    def _make_monitor(self, name: str, monitor_config: Any) -> MonitorBase:
+        """Create a monitor bound to the rule engine (and state) of its state file."""
+        if name == "cpu":
+            return CPUMonitor(monitor_config, self._engine_for(name))
+        if name == "storage":
+            return StorageMonitor(monitor_config, self._engine_for(name), scan_cache_dir=self.config.scan_cache_dir)
+        if name == "cgroup":
+            return CgroupMonitor(monitor_config, self._engine_for(name), self.config.cgroup_counters_file)
+        return IOStuckMonitor(
+            monitor_config, self._engine_for(name), self._state_for(name), self.config.nfs_counters_file
+        )
+    
+    def _build_outputs(self) -> None:
+        """Create the config-dependent report writers."""
+        self.prometheus_reporter = PrometheusReporter(self.config.prometheus.prefix)
+        self.report_store = make_report_store(self.config)
+        self.journal: Optional[RunJournal] = None
+        if self.config.reports.mode == "journal":
+            self.journal = make_journal(self.config)
+    
+    def _build_alerts(self, previous: Dict[str, AlertBase]) -> Dict[str, AlertBase]:
+        """
+        Create the configured alert handlers.
+        
+        Args:
+            previous: Handlers by key; those whose key is still configured
+                are reused as they are
+                
+        Returns:
+            Handlers by key, in notification order
+        """
+        alerts = self.config.alerts
+        factories: List[Tuple[str, Callable[[], AlertBase]]] = []
+        if alerts.stdout:
+            factories.append(("stdout", StdoutAlert))
+        if alerts.file:
+            factories.append((f"file:{alerts.file}", partial(FileAlert, alerts.file)))
+        if alerts.journald:
+            factories.append(("journald", JournaldAlert))
+        for webhook in alerts.webhooks:
+            key = f"webhook:{self.config.alert_spool_dir}:{webhook.model_dump_json()}"
+            factories.append((key, partial(make_webhook_alert, self.config, webhook)))
+        
+        sinks: Dict[str, AlertBase] = {}
+        for key, factory in factories:
+            if key not in sinks:
+                sinks[key] = previous[key] if key in previous else factory()
+        return sinks
+    
+    def reload(self) -> bool:
+        """
+        Apply the config file if it changed since it was last read.
+        
+        A file that fails to load or validate is reported on stderr and
+        ignored; the running config stays in effect until the file changes
+        again.
+        
+        Returns:
+            True if a new config was applied
+        """
+        stamp = self._stat_config()
+        if stamp == self._config_stamp:
+            return False
+        self._config_stamp = stamp
+        try:
+            config = load_config(self.config_path)
+        except (OSError, ValueError, yaml.YAMLError) as e:
+            print(f"linmon: config reload rejected, keeping the running config: {e}", file=sys.stderr)
+            return False
+        changes = self.apply_config(config)
+        print(f"linmon: config reloaded ({', '.join(changes) or 'no effective changes'})", file=sys.stderr)
+        return True
+    
+    def apply_config(self, config: Config) -> List[str]:
+        """
+        Switch to a new config, rebuilding only what it changes.
+        
+        Monitors whose settings and state file are unchanged are kept (with
+        their collectors); if only their rules changed, the rules are
+        recompiled in place. Alert handlers with an unchanged configuration
+        are kept, so e.g. a webhook keeps its connection and pending
+        deliveries. Streaks, log cursors and firing alerts live in the state
+        files and carry over; state of removed rules is pruned by the next
+        run as usual.
+        
+        Must not be called while a run holds the state locks.
+        
+        Args:
+            config: Validated configuration
+            
+        Returns:
+            Descriptions of what was rebuilt, e.g. ``["rules cpu", "alerts"]``
+        """
+        old = self.config
+        self.config = config
+        changes: List[str] = []
+        
+        self.state_manager = self._state_for("")
+        self.rule_engine = self._engine_for("")
+        
+        monitors: Dict[str, MonitorBase] = {}
+        for name in MONITOR_NAMES:
+            monitor_config = config.monitors.get(name)
+            if monitor_config is None or not monitor_config.enabled:
+                if name in self.monitors:
+                    changes.append(f"removed {name}")
+                continue
+            monitor = self.monitors.get(name)
+            same_state = old.monitor_state_file(name) == config.monitor_state_file(name)
+            if monitor is None or not same_state or _settings(monitor.config) != _settings(monitor_config):
+                monitors[name] = self._make_monitor(name, monitor_config)
+                changes.append(f"{'rebuilt' if monitor is not None else 'added'} {name}")
+            elif monitor.config.model_dump() != monitor_config.model_dump():
+                monitor.config = monitor_config
+                monitor.plan = monitor.rule_engine.compile(monitor.get_rules())
+                monitors[name] = monitor
+                changes.append(f"rules {name}")
+            else:
+                monitor.config = monitor_config
+                monitors[name] = monitor
+        for name, monitor in self.monitors.items():
+            if monitors.get(name) is not monitor:
+                monitor.close()
+        self.monitors = monitors
+        
+        # Forget managers of state files no longer in use
+        in_use = {config.state_file} | {config.monitor_state_file(name) for name in monitors}
+        for path in list(self.state_managers):
+            if path not in in_use:
+                del self.state_managers[path]
+                self.rule_engines.pop(path, None)
+        for manager in self.state_managers.values():
+            manager.history_samples = config.history.trend_samples
+        
+        # trend_samples lives in the state, not in the store
+        store_settings = {"trend_samples"}
+        if (old.history.model_dump(exclude=store_settings) != config.history.model_dump(exclude=store_settings)
+                or old.history_dir != config.history_dir):
+            if self.history_store is not None:
+                self.history_store.close()
+            self.history_store = make_history_store(config)
+            changes.append("history")
+        
+        self._build_outputs()
+        
+        sinks = self._build_alerts(self.alert_sinks)
+        retired = [sink for key, sink in self.alert_sinks.items() if key not in sinks]
+        if retired or list(sinks) != list(self.alert_sinks):
+            changes.append("alerts")
+        for sink in retired:
+            sink.close()
+        self.alert_sinks = sinks
+        
+        return changes
+    
+    def _state_for(self, monitor_name: str) -> StateManager:
+        """Get the state manager holding a monitor's state ("" for the shared one)."""
+        path = self.config.monitor_state_file(monitor_name) if monitor_name else self.config.state_file
+        manager = self.state_managers.get(path)
+        if manager is None:
+            manager = StateManager(path, self.config.history.trend_samples)
+            self.state_managers[path] = manager
+        return manager
+    
+    def _engine_for(self, monitor_name: str) -> RuleEngine:
+        """Get the rule engine bound to a monitor's state manager."""
+        manager = self._state_for(monitor_name)
+        engine = self.rule_engines.get(manager.state_file)
+        if engine is None:
+            engine = RuleEngine(manager)
+            self.rule_engines[manager.state_file] = engine
+        return engine
+    
+    def _active_state_managers(self) -> List[StateManager]:
+        """State managers used by this run, in lock order."""
+        if not self.config.state_shards:
+            return [self.state_manager]
+        return [self.state_managers[path] for path in sorted(
+            self.config.monitor_state_file(name) for name in self.monitors
+        )]
+    
+    def lock_state(self, wait: Optional[bool] = None) -> None:
+        """
+        Take the state lock(s) for a run.
+        
+        Shard locks are taken in a fixed order so concurrent runs of
+        overlapping configs cannot deadlock.
+        
+        Args:
+            wait: Override the configured state_lock policy (True: wait up
+                to state_lock_timeout, False: give up immediately)
+                
+        Raises:
+            LockBusyError: If another run holds a lock
+        """
+        if wait is None:
+            wait = self.config.state_lock == "wait"
+        
+        acquired: List[StateManager] = []
+        for manager in self._active_state_managers():
+            if not manager.acquire(wait=wait, timeout=self.config.state_lock_timeout):
+                for held in acquired:
+                    held.release()
+                raise LockBusyError(f"Another linmon run holds {manager.state_file}.lock")
+            acquired.append(manager)
+    
+    def unlock_state(self) -> None:
+        """Release all state locks."""
+        for manager in self.state_managers.values():
+            manager.release()
+    
+    def prune_state(self) -> int:
+        """
+        Garbage-collect state of rules, log sources and histories that no
+        longer exist in the enabled monitors.
+        
+        Returns:
+            Number of state entries removed
+        """
+        removed = 0
+        for manager in self._active_state_managers():
+            rule_names = set()
+            log_sources = set()
+            history_metrics = set()
+            for name, monitor in self.monitors.items():
+                if self._state_for(name) is not manager:
+                    continue
+                rule_names |= monitor.plan.rule_names
+                log_sources.update(monitor.get_log_sources())
+                history_metrics |= monitor.plan.trend_metrics
+            removed += manager.prune(rule_names, log_sources, history_metrics)
+        return removed
+    
+    def run(self, wait: Optional[bool] = None) -> Tuple[int, str, str]:
         """
         Run monitoring check.
         
+        The whole run holds the state lock(s), so overlapping runs never
+        interleave state updates or scan the same log range twice.
+        
+        Args:
+            wait: Override the configured state_lock policy (see lock_state())
+            
         Returns:
             Tuple of (exit_code, text_report, json_report)
             Exit codes: 0=OK, 1=warnings, 2=critical
+            
+        Raises:
+            LockBusyError: If another run holds the state lock
+        """
+        self.lock_state(wait)
+        try:
+            return self._run()
+        finally:
+            self.unlock_state()
+    
+    def track_alerts(self, results: Dict[str, List[RuleResult]]) -> AlertDigest:
         """
+        Update firing alerts in each state shard and collect the transitions.
+        
+        Args:
+            results: Monitor name -> rule results of this run
+            
+        Returns:
+            Digest of this run's alert transitions
+        """
+        alerts = self.config.alerts
+        reminder = parse_duration(alerts.reminder) if alerts.reminder else None
+        now = time.time()
+        digest = AlertDigest()
+        for manager in self._active_state_managers():
+            anomalies = [
+                result
+                for name, monitor_results in results.items()
+                if self._state_for(name) is manager
+                for result in monitor_results
+                if result.anomaly
+            ]
+            tracker = AlertTracker(manager, reminder, alerts.notify_resolved)
+            digest.extend(tracker.update(anomalies, now))
+        return digest
+    
+    def save_reports(self, report: Dict, severity: str, text_report: str, json_report: str) -> Optional[str]:
+        """
+        Write a run's report files and journal record.
+        
+        Args:
+            report: Report dictionary
+            severity: Overall severity of the run
+            text_report: Formatted text report
+            json_report: Formatted JSON report
+            
+        Returns:
+            Path of the JSON report file, or None if no files were written
+        """
+        written_at = datetime.utcnow()
+        write_full = True
+        if self.journal is not None:
+            previous = self.journal.last_record()
+            write_full = bool(report.get("overall", {}).get("anomaly_count")) or (
+                previous is None or previous.get("severity") != severity
+            )
+        
+        json_path = None
+        if write_full:
+            paths = self.report_store.write(written_at, {"txt": text_report, "json": json_report})
+            json_path = paths[-1]
+        if self.journal is not None:
+            relative = str(Path(json_path).relative_to(self.config.report_dir)) if json_path else None
+            self.journal.append(journal_record(report, relative))
+        
+        self.report_store.enforce(written_at.date())
+        return json_path
+    
+    def _run(self) -> Tuple[int, str, str]:
+        """Run monitoring check with the state lock held."""
         # Update last run timestamp
-        self.state_manager.update_last_run(now_iso())
+        run_started = now_iso()
+        for manager in self._active_state_managers():
+            manager.update_last_run(run_started)
         
         # Evaluate all monitors
         all_results: Dict[str, List[RuleResult]] = {}
@@ -85,36 +503,54 @@ class LinmonCore:
             all_results[monitor_name] = results
             all_anomalies.extend([r for r in results if r.anomaly])
         
+        # Append this run's metrics to the history store
+        if self.history_store is not None:
+            timestamp = time.time()
+            for monitor in self.monitors.values():
+                self.history_store.append_metrics(monitor.last_metrics, timestamp)
+        
         # Build report
         report_builder = ReportBuilder()
         report = report_builder.build(self.monitors, all_results)
+        self.last_report = report
         
         # Generate reports
         text_report = self.text_reporter.format(report)
         json_report = self.json_reporter.format(report)
         
-        # Save reports
-        ensure_dir(self.config.report_dir)
-        timestamp = now_iso().replace(":", "-").replace(".", "-")
-        text_path = Path(self.config.report_dir) / f"report-{timestamp}.txt"
-        json_path = Path(self.config.report_dir) / f"report-{timestamp}.json"
+        overall = report.get("overall", {})
+        triage = overall.get("triage_score", {})
+        severity = triage.get("severity", "low")
         
-        atomic_write(str(text_path), text_report)
-        atomic_write(str(json_path), json_report)
+        # Save reports into today's partition (in journal mode only when
+        # something is wrong or changed), then apply retention
+        self.save_reports(report, severity, text_report, json_report)
         
-        # Send alerts if anomalies exist
-        if all_anomalies:
+        # Export for the node_exporter textfile collector
+        if self.config.prometheus.textfile:
+            try:
+                atomic_write(
+                    self.config.prometheus.textfile,
+                    self.prometheus_reporter.format(report),
+                    permissions=0o644,
+                )
+            except OSError:
+                pass
+        
+        # Notify alert transitions (firing, escalated, reminder, resolved)
+        # as one digest
+        digest = self.track_alerts(all_results)
+        if digest:
             for alert in self.alerts:
-                alert.send(all_anomalies, report)
+                alert.send(digest, report)
         
-        # Save state
-        self.state_manager.save()
+        # Drop state for rules and sources no longer configured, then save
+        # (skipped when nothing changed)
+        self.prune_state()
+        for manager in self._active_state_managers():
+            manager.save()
         
         # Determine exit code
-        overall = report.get("overall", {})
-        triage = overall.get("triage_score", {})
-        severity = triage.get("severity", "low")
-        
         if severity == "critical":
             exit_code = 2
         elif severity in ("high", "medium") or all_anomalies:
@@ -0,0 +1,11 @@
+"""Labelled metric model."""
+
+from .model import (
+    LabelSelector,
+    MetricFamily,
+    MetricSet,
+    format_labels,
+    parse_series_key,
+)
+
+__all__ = ["LabelSelector", "MetricFamily", "MetricSet", "format_labels", "parse_series_key"]
@@ -0,0 +1,282 @@
+"""Safe compiled expressions over metrics (used by composite rules)."""
+
+import ast
+import operator
+import os
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, FrozenSet, List, Mapping, Optional
+from .model import parse_series_key
+
+Evaluator = Callable[[Mapping[str, float]], Any]
+
+
+class ExpressionError(ValueError):
+    """Raised when a rule expression is invalid or uses unsupported syntax."""
+    pass
+
+
+# Names resolved once at compile time instead of looked up as metrics
+BUILTIN_NAMES: Dict[str, Callable[[], float]] = {
+    "ncpu": lambda: float(os.cpu_count() or 1),
+}
+
+# Functions callable from expressions
+FUNCTIONS: Dict[str, Callable[..., float]] = {
+    "abs": abs,
+    "min": min,
+    "max": max,
+}
+
+# A name not inside a number (e.g. the "e5" of 1e5), with an optional label
+# selector: bytes_used_percent or bytes_used_percent{mount="/var"}
+_NAME_RE = re.compile(r'(?<![\w.])([A-Za-z_][A-Za-z0-9_]*)(\{(?:[^"{}]|"(?:[^"\\]|\\.)*")*\})?')
+
+# Prefix of the identifiers standing in for series keys while parsing
+_SERIES_PREFIX = "__series_"
+
+_BINARY_OPS: Dict[type, Callable[[Any, Any], Any]] = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+}
+
+_UNARY_OPS: Dict[type, Callable[[Any], Any]] = {
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+    ast.Not: operator.not_,
+}
+
+_COMPARE_OPS: Dict[type, Callable[[Any, Any], bool]] = {
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+}
+
+
+class CompiledExpression:
+    """An expression compiled to a tree of closures over a metrics mapping."""
+    
+    __slots__ = ("source", "names", "_evaluate")
+    
+    def __init__(self, source: str, names: FrozenSet[str], evaluate: Evaluator):
+        """
+        Initialize compiled expression.
+        
+        Args:
+            source: Original expression text
+            names: Metric names and series keys the expression reads
+            evaluate: Closure taking a metrics mapping
+        """
+        self.source = source
+        self.names = names
+        self._evaluate = evaluate
+    
+    def evaluate(self, metrics: Mapping[str, float]) -> Any:
+        """
+        Evaluate against metrics.
+        
+        Args:
+            metrics: Mapping of metric_name -> value (must contain all names)
+            
+        Returns:
+            Expression result (bool for comparisons, float for arithmetic)
+        """
+        return self._evaluate(metrics)
+
+
+class _Compiler:
+    """Translates a whitelisted subset of Python AST into closures."""
+    
+    def __init__(self, source: str, series: Dict[str, str]):
+        """
+        Initialize compiler for one expression.
+        
+        Args:
+            source: Original expression text
+            series: Placeholder identifier -> series key it replaced
+        """
+        self.source = source
+        self.series = series
+        self.names: set = set()
+    
+    def fail(self, node: ast.AST, what: str) -> ExpressionError:
+        """Build an error pointing at the offending node."""
+        col = getattr(node, "col_offset", 0)
+        return ExpressionError(f"{what} in expression {self.source!r} (column {col + 1})")
+    
+    def compile(self, node: ast.AST) -> Evaluator:
+        """Compile an AST node into a closure."""
+        if isinstance(node, ast.Expression):
+            return self.compile(node.body)
+        
+        if isinstance(node, ast.Constant):
+            value = node.value
+            # bool is an int subclass, so True/False are accepted too
+            if not isinstance(value, (int, float)):
+                raise self.fail(node, f"Unsupported constant {value!r}")
+            return lambda m: value
+        
+        if isinstance(node, ast.Name):
+            name = node.id
+            if name.startswith("__"):
+                if name not in self.series:
+                    raise self.fail(node, f"Unsupported name {name!r}")
+                name = self.series[name]
+                self.names.add(name)
+                return lambda m: m[name]
+            if name in BUILTIN_NAMES:
+                constant = BUILTIN_NAMES[name]()
+                return lambda m: constant
+            if name in FUNCTIONS:
+                raise self.fail(node, f"Function {name!r} used as a value")
+            self.names.add(name)
+            return lambda m: m[name]
+        
+        if isinstance(node, ast.BoolOp):
+            operands = [self.compile(v) for v in node.values]
+            if isinstance(node.op, ast.And):
+                def and_(m, operands=operands):
+                    result = True
+                    for fn in operands:
+                        result = fn(m)
+                        if not result:
+                            return result
+                    return result
+                return and_
+            
+            def or_(m, operands=operands):
+                result = False
+                for fn in operands:
+                    result = fn(m)
+                    if result:
+                        return result
+                return result
+            return or_
+        
+        if isinstance(node, ast.UnaryOp):
+            op = _UNARY_OPS.get(type(node.op))
+            if op is None:
+                raise self.fail(node, "Unsupported unary operator")
+            operand = self.compile(node.operand)
+            return lambda m: op(operand(m))
+        
+        if isinstance(node, ast.BinOp):
+            op = _BINARY_OPS.get(type(node.op))
+            if op is None:
+                raise self.fail(node, "Unsupported operator")
+            left = self.compile(node.left)
+            right = self.compile(node.right)
+            return lambda m: op(left(m), right(m))
+        
+        if isinstance(node, ast.Compare):
+            left = self.compile(node.left)
+            ops: List[Callable[[Any, Any], bool]] = []
+            for cmp_op in node.ops:
+                fn = _COMPARE_OPS.get(type(cmp_op))
+                if fn is None:
+                    raise self.fail(node, "Unsupported comparison")
+                ops.append(fn)
+            rights = [self.compile(c) for c in node.comparators]
+            
+            if len(ops) == 1:
+                op, right = ops[0], rights[0]
+                return lambda m: op(left(m), right(m))
+            
+            pairs = list(zip(ops, rights))
+            
+            def chain(m):
+                current = left(m)
+                for op, right in pairs:
+                    nxt = right(m)
+                    if not op(current, nxt):
+                        return False
+                    current = nxt
+                return True
+            return chain
+        
+        if isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or node.func.id not in FUNCTIONS:
+                raise self.fail(node, "Unsupported function call")
+            if node.keywords:
+                raise self.fail(node, "Keyword arguments are not supported")
+            func = FUNCTIONS[node.func.id]
+            args = [self.compile(a) for a in node.args]
+            return lambda m: func(*[a(m) for a in args])
+        
+        raise self.fail(node, f"Unsupported syntax {type(node).__name__}")
+
+
+def rewrite_names(source: str, rename: Callable[[str], Optional[str]]) -> str:
+    """
+    Replace the bare metric names of an expression.
+    
+    Names that already carry a label selector are left alone.
+    
+    Args:
+        source: Expression text
+        rename: Called with each bare name; returns its replacement (e.g. a
+            series key) or None to keep it
+            
+    Returns:
+        Rewritten expression text
+    """
+    def replace(match: "re.Match") -> str:
+        """Rename one bare name."""
+        if match.group(2):
+            return match.group(0)
+        replacement = rename(match.group(1))
+        return match.group(0) if replacement is None else replacement
+    
+    return _NAME_RE.sub(replace, source)
+
+
+@lru_cache(maxsize=None)
+def compile_expression(source: str) -> CompiledExpression:
+    """
+    Parse and compile a rule expression.
+    
+    Supports numeric constants, metric names, series of labelled metrics
+    (``bytes_used_percent{mount="/var"}``, exact label values), the builtins
+    in BUILTIN_NAMES, + - * / // %, comparisons (including chains),
+    and/or/not and the functions in FUNCTIONS. Anything else is rejected,
+    and nothing is ever passed to eval().
+    
+    Args:
+        source: Expression text, e.g. "cpu_percent > 80 and load1 > ncpu * 1.5"
+        
+    Returns:
+        Compiled expression; ``names`` holds the metric names and series
+        keys it reads
+        
+    Raises:
+        ExpressionError: If the expression is invalid or unsupported
+    """
+    series: Dict[str, str] = {}
+    
+    def placeholder(match: "re.Match") -> str:
+        """Swap a series key for an identifier Python can parse."""
+        if not match.group(2):
+            return match.group(0)
+        try:
+            parse_series_key(match.group(0))
+        except ValueError as e:
+            raise ExpressionError(f"{e} in expression {source!r}") from None
+        name = f"{_SERIES_PREFIX}{len(series)}"
+        series[name] = match.group(0)
+        return name
+    
+    try:
+        tree = ast.parse(_NAME_RE.sub(placeholder, source.strip()), mode="eval")
+    except SyntaxError as e:
+        raise ExpressionError(f"Invalid expression {source!r}: {e.msg}") from None
+    
+    compiler = _Compiler(source, series)
+    evaluate = compiler.compile(tree)
+    return CompiledExpression(source, frozenset(compiler.names), evaluate)
@@ -0,0 +1,344 @@
+"""Labelled metric model: families of series stored as compact arrays."""
+
+import collections.abc
+import fnmatch
+import re
+from array import array
+from typing import Dict, Iterator, List, Mapping, Optional, Pattern, Sequence, Tuple
+
+LabelValues = Tuple[str, ...]
+
+_GLOB_CHARS = set("*?[")
+
+_SERIES_RE = re.compile(r"^([A-Za-z_:][A-Za-z0-9_:]*)(?:\{(.*)\})?$", re.DOTALL)
+_LABEL_RE = re.compile(r'\s*([A-Za-z_][A-Za-z0-9_]*)\s*=\s*"((?:[^"\\]|\\.)*)"\s*(?:,|$)', re.DOTALL)
+
+
+def escape_label_value(value: str) -> str:
+    """Escape a label value for the text exposition format."""
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _unescape_label_value(value: str) -> str:
+    """Reverse escape_label_value()."""
+    return re.sub(r"\\(.)", lambda m: "\n" if m.group(1) == "n" else m.group(1), value)
+
+
+def format_labels(label_names: Sequence[str], label_values: Sequence[str]) -> str:
+    """
+    Format labels as ``{name="value",...}``.
+    
+    Returns:
+        Label suffix, or an empty string when there are no labels
+    """
+    if not label_names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{escape_label_value(value)}"' for name, value in zip(label_names, label_values)
+    )
+    return "{" + pairs + "}"
+
+
+def parse_series_key(key: str) -> Tuple[str, Dict[str, str]]:
+    """
+    Parse a series key such as ``bytes_used_percent{mount="/var"}``.
+    
+    Args:
+        key: Series key (a bare name is a series without labels)
+        
+    Returns:
+        Tuple of (family_name, labels)
+        
+    Raises:
+        ValueError: If the key is malformed
+    """
+    match = _SERIES_RE.match(key.strip())
+    if not match:
+        raise ValueError(f"Invalid metric name: {key!r}")
+    
+    name, body = match.group(1), match.group(2)
+    labels: Dict[str, str] = {}
+    if body:
+        pos = 0
+        while pos < len(body):
+            label = _LABEL_RE.match(body, pos)
+            if not label:
+                raise ValueError(f"Invalid label selector in metric: {key!r}")
+            labels[label.group(1)] = _unescape_label_value(label.group(2))
+            pos = label.end()
+    return (name, labels)
+
+
+class LabelSelector:
+    """
+    Compiled label matchers; values are exact strings or shell-style globs.
+    
+    An empty selector matches every series in a family.
+    """
+    
+    __slots__ = ("labels", "matchers", "exact")
+    
+    def __init__(self, labels: Optional[Mapping[str, str]] = None):
+        """
+        Compile a selector.
+        
+        Args:
+            labels: Mapping of label name -> exact value or glob pattern
+        """
+        self.labels: Dict[str, str] = dict(sorted((labels or {}).items()))
+        self.matchers: List[Tuple[str, Optional[str], Optional[Pattern[str]]]] = []
+        for name, value in self.labels.items():
+            if _GLOB_CHARS.intersection(value):
+                self.matchers.append((name, None, re.compile(fnmatch.translate(value))))
+            else:
+                self.matchers.append((name, value, None))
+        
+        # True if the selector pins down exact values only
+        self.exact = bool(self.matchers) and all(m[2] is None for m in self.matchers)
+    
+    def __bool__(self) -> bool:
+        """True if the selector constrains any label."""
+        return bool(self.matchers)
+
+
+class MetricFamily:
+    """
+    All series of one metric name.
+    
+    Label values are kept as tuples ordered like ``label_names`` and sample
+    values in a parallel ``array('d')``. Each label has an inverted index of
+    value -> series positions, so selectors don't scan every series.
+    """
+    
+    __slots__ = ("name", "label_names", "label_values", "values", "_positions", "_index", "_suffixes", "_keys")
+    
+    def __init__(self, name: str, label_names: Sequence[str] = ()):
+        """
+        Initialize family.
+        
+        Args:
+            name: Family (metric) name
+            label_names: Names of the labels identifying each series
+        """
+        self.name = name
+        self.label_names: Tuple[str, ...] = tuple(label_names)
+        self.label_values: List[LabelValues] = []
+        self.values = array("d")
+        self._positions: Dict[LabelValues, int] = {}
+        self._index: Dict[str, Dict[str, List[int]]] = {n: {} for n in self.label_names}
+        self._suffixes: Optional[List[str]] = None
+        self._keys: Optional[List[str]] = None
+    
+    def set(self, label_values: Sequence[str], value: float) -> None:
+        """
+        Set the value of a series, adding it if new.
+        
+        Args:
+            label_values: Label values in label_names order
+            value: Sample value
+        """
+        labels = tuple(label_values)
+        pos = self._positions.get(labels)
+        if pos is not None:
+            self.values[pos] = value
+            return
+        
+        if len(labels) != len(self.label_names):
+            raise ValueError(
+                f"Metric {self.name} expects labels {self.label_names}, got {labels}"
+            )
+        
+        pos = len(self.values)
+        self._positions[labels] = pos
+        self.label_values.append(labels)
+        self.values.append(value)
+        for name, label_value in zip(self.label_names, labels):
+            self._index[name].setdefault(label_value, []).append(pos)
+        self._suffixes = None
+        self._keys = None
+    
+    def get(self, label_values: Sequence[str] = ()) -> Optional[float]:
+        """Get the value of a series, or None if absent."""
+        pos = self._positions.get(tuple(label_values))
+        return None if pos is None else self.values[pos]
+    
+    def select(self, selector: LabelSelector) -> Sequence[int]:
+        """
+        Find series matching a selector.
+        
+        Args:
+            selector: Compiled label selector
+            
+        Returns:
+            Matching series positions, in insertion order
+        """
+        matchers = selector.matchers
+        if not matchers:
+            return range(len(self.values))
+        
+        if len(matchers) == 1 and matchers[0][1] is not None:
+            # Common case: a single exact label, e.g. mount="/var"
+            index = self._index.get(matchers[0][0])
+            return index.get(matchers[0][1], ()) if index is not None else ()
+        
+        positions: Optional[List[int]] = None
+        for name, exact, pattern in matchers:
+            index = self._index.get(name)
+            if index is None:
+                return []
+            
+            if exact is not None:
+                candidates = index.get(exact, [])
+            else:
+                candidates = sorted(
+                    p for value, ps in index.items() if pattern.match(value) for p in ps
+                )
+            
+            if positions is None:
+                positions = list(candidates)
+            else:
+                wanted = set(candidates)
+                positions = [p for p in positions if p in wanted]
+            if not positions:
+                return []
+        
+        return positions or []
+    
+    def label_index(self, label_name: str) -> Mapping[str, List[int]]:
+        """
+        Get the inverted index of one label.
+        
+        Args:
+            label_name: Label name
+            
+        Returns:
+            Mapping of label value -> series positions (empty if no such label)
+        """
+        return self._index.get(label_name, {})
+    
+    def labels_at(self, pos: int) -> Dict[str, str]:
+        """Get the labels of a series as a dict."""
+        return dict(zip(self.label_names, self.label_values[pos]))
+    
+    def label_suffix(self, pos: int) -> str:
+        """Get the formatted labels (``{label="value"}``) of a series."""
+        if self._suffixes is None:
+            self._suffixes = [
+                format_labels(self.label_names, labels) for labels in self.label_values
+            ]
+        return self._suffixes[pos]
+    
+    def series_key(self, pos: int) -> str:
+        """Get the flat key (``name{label="value"}``) of a series."""
+        if self._keys is None:
+            self._keys = [self.name + self.label_suffix(p) for p in range(len(self.values))]
+        return self._keys[pos]
+    
+    def __len__(self) -> int:
+        """Number of series."""
+        return len(self.values)
+
+
+class MetricSet(collections.abc.Mapping):
+    """
+    Metric families collected by a monitor.
+    
+    Also behaves as a read-only mapping of flat series key -> value, so
+    unlabelled metrics can be read as ``metrics["cpu_percent"]`` and
+    labelled ones as ``metrics['bytes_used_percent{mount="/"}']``.
+    """
+    
+    def __init__(self):
+        """Initialize empty set."""
+        self.families: Dict[str, MetricFamily] = {}
+    
+    @classmethod
+    def from_dict(cls, metrics: Mapping[str, float]) -> "MetricSet":
+        """
+        Build a set from flat series keys.
+        
+        Args:
+            metrics: Mapping of series key -> value
+            
+        Returns:
+            Metric set
+        """
+        result = cls()
+        for key, value in metrics.items():
+            if "{" in key:
+                name, labels = parse_series_key(key)
+                names = tuple(sorted(labels))
+                result.family(name, names).set(tuple(labels[n] for n in names), value)
+            else:
+                result.set(key, value)
+        return result
+    
+    def family(self, name: str, label_names: Sequence[str] = ()) -> MetricFamily:
+        """Get a family, creating it if needed."""
+        family = self.families.get(name)
+        if family is None:
+            family = MetricFamily(name, label_names)
+            self.families[name] = family
+        return family
+    
+    def set(self, name: str, value: float, labels: Optional[Mapping[str, str]] = None) -> None:
+        """
+        Set a single series.
+        
+        Args:
+            name: Family name
+            value: Sample value
+            labels: Optional labels (label order is fixed by the first call)
+        """
+        labels = labels or {}
+        family = self.family(name, tuple(labels))
+        family.set(tuple(labels[n] for n in family.label_names), value)
+    
+    def to_dict(self) -> Dict[str, float]:
+        """Flatten to a dictionary of series key -> value."""
+        flat: Dict[str, float] = {}
+        for family in self.families.values():
+            if not family.label_names:
+                if len(family.values):
+                    flat[family.name] = family.values[0]
+                continue
+            for pos, value in enumerate(family.values):
+                flat[family.series_key(pos)] = value
+        return flat
+    
+    def __getitem__(self, key: str) -> float:
+        """Look up a series by flat key."""
+        if "{" not in key:
+            family = self.families.get(key)
+            if family is None or family.label_names or not len(family.values):
+                raise KeyError(key)
+            return family.values[0]
+        
+        try:
+            name, labels = parse_series_key(key)
+        except ValueError:
+            raise KeyError(key) from None
+        family = self.families.get(name)
+        if family is None or set(labels) != set(family.label_names):
+            raise KeyError(key)
+        value = family.get(tuple(labels[n] for n in family.label_names))
+        if value is None:
+            raise KeyError(key)
+        return value
+    
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over flat series keys."""
+        for family in self.families.values():
+            if not family.label_names:
+                if len(family.values):
+                    yield family.name
+                continue
+            for pos in range(len(family.values)):
+                yield family.series_key(pos)
+    
+    def __len__(self) -> int:
+        """Total number of series."""
+        return sum(
+            min(len(f.values), 1) if not f.label_names else len(f.values)
+            for f in self.families.values()
+        )
@@ -0,0 +1,130 @@
+"""Storage metric families and the mapping of storage names onto mount series."""
+
+from typing import Dict, Iterable, Optional, Tuple
+from .expr import ExpressionError, compile_expression, rewrite_names
+from .model import format_labels, parse_series_key
+
+# Per-mount metric families, in the order they are emitted
+METRIC_FIELDS = (
+    "bytes_total",
+    "bytes_free",
+    "bytes_used",
+    "bytes_used_percent",
+    "inodes_total",
+    "inodes_free",
+    "inodes_used",
+    "inodes_used_percent",
+)
+
+# Per-mount families of space held by deleted-but-open files
+DELETED_FIELDS = (
+    "deleted_open_bytes",
+    "deleted_open_files",
+)
+
+# Label identifying the mountpoint of a series
+MOUNT_LABEL = "mount"
+
+# Legacy flat name -> (family, mountpoint path)
+LegacyNames = Dict[str, Tuple[str, str]]
+
+
+def mount_prefix(path: str) -> str:
+    """Create the legacy flat metric prefix for a mountpoint path."""
+    safe_path = path.strip('/').replace('/', '_').replace('-', '_')
+    if safe_path:
+        return f"mount_{safe_path}"
+    return "mount_root"
+
+
+def legacy_names(paths: Iterable[str]) -> LegacyNames:
+    """
+    Get the legacy ``mount_<name>_<field>`` names of configured mountpoints.
+    
+    Args:
+        paths: Mountpoint paths
+        
+    Returns:
+        Mapping of legacy name -> (family, mountpoint path)
+    """
+    return {
+        f"{mount_prefix(path)}_{field}": (field, path)
+        for path in paths
+        for field in METRIC_FIELDS
+    }
+
+
+def is_storage_family(name: str) -> bool:
+    """Check whether a family is emitted per mount by the storage monitor."""
+    return name in METRIC_FIELDS or name in DELETED_FIELDS
+
+
+def scope_metric(
+    metric: str,
+    labels: Dict[str, str],
+    default_mount: str,
+    legacy: LegacyNames,
+) -> Tuple[str, Dict[str, str]]:
+    """
+    Map a rule's metric name and labels onto a labelled storage family.
+    
+    Legacy names become their family with the mount label; a bare family
+    without labels selects ``default_mount``. Anything else is kept.
+    
+    Args:
+        metric: Rule metric (may carry an inline selector)
+        labels: Rule label selector
+        default_mount: Mount a bare family selects
+        legacy: Legacy names (see legacy_names())
+        
+    Returns:
+        Tuple of (metric, labels)
+    """
+    if "{" in metric:
+        return metric, labels
+    if metric in legacy:
+        field, path = legacy[metric]
+        return field, {MOUNT_LABEL: path, **labels}
+    if is_storage_family(metric) and not labels:
+        return metric, {MOUNT_LABEL: default_mount}
+    return metric, labels
+
+
+def scope_expression(source: str, default_mount: str, legacy: LegacyNames) -> str:
+    """
+    Map the names of an expression onto mount series.
+    
+    Args:
+        source: Expression text
+        default_mount: Mount a bare family selects
+        legacy: Legacy names (see legacy_names())
+        
+    Returns:
+        Expression reading ``family{mount="..."}`` series only
+        
+    Raises:
+        ExpressionError: If the expression reads anything but mount series
+    """
+    def scope(name: str) -> Optional[str]:
+        """Series key of a bare or legacy name (None: not a storage name)."""
+        if name in legacy:
+            field, path = legacy[name]
+        elif is_storage_family(name):
+            field, path = name, default_mount
+        else:
+            return None
+        return field + format_labels((MOUNT_LABEL,), (path,))
+    
+    expr = rewrite_names(source, scope)
+    unknown = []
+    for name in sorted(compile_expression(expr).names):
+        family, labels = parse_series_key(name)
+        if not is_storage_family(family) or set(labels) != {MOUNT_LABEL}:
+            unknown.append(name)
+    if unknown:
+        raise ExpressionError(
+            f"{', '.join(unknown)} is not a storage series; expressions may read "
+            f"storage fields (bytes_used_percent), legacy names (mount_var_bytes_used_percent) "
+            f"or series (bytes_used_percent{{mount=\"/var\"}})"
+        )
+    return expr
@@ -4,5 +4,6 @@ from .base import MonitorBase
 from .cpu import CPUMonitor
 from .storage import StorageMonitor
 from .iostuck import IOStuckMonitor
+from .cgroup import CgroupMonitor
 
-__all__ = ["MonitorBase", "CPUMonitor", "StorageMonitor", "IOStuckMonitor"]
+__all__ = ["MonitorBase", "CPUMonitor", "StorageMonitor", "IOStuckMonitor", "CgroupMonitor"]
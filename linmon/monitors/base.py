@@ -1,9 +1,10 @@
 """Base monitor class."""
 
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Mapping
 from ..rules.model import RuleResult
 from ..rules.engine import RuleEngine
+from ..metrics.model import MetricSet
 
 
 class MonitorBase(ABC):
@@ -21,14 +22,19 @@ class MonitorBase(ABC):
         self.name = name
         self.config = config
         self.rule_engine = rule_engine
+        self.plan = rule_engine.compile(self.get_rules())
+        
+        # Metrics from the most recent evaluate() call, reused by reports
+        self.last_metrics = MetricSet()
     
     @abstractmethod
-    def collect_metrics(self) -> Dict[str, float]:
+    def collect_metrics(self) -> Mapping[str, float]:
         """
         Collect metrics for this monitor.
         
         Returns:
-            Dictionary of metric_name -> value
+            Dictionary of metric_name -> value for unlabelled metrics, or a
+            MetricSet for monitors that emit labelled series
         """
         pass
     
@@ -53,13 +59,48 @@ class MonitorBase(ABC):
             return []
         
         metrics = self.collect_metrics()
+        if not isinstance(metrics, MetricSet):
+            metrics = MetricSet.from_dict(metrics)
+        self.last_metrics = metrics
+        return self.rule_engine.evaluate_plan(self.plan, metrics)
+    
+    def get_rules(self) -> List:
+        """
+        Get all rules for this monitor.
+        
+        Returns:
+            Global rules followed by any subclass-specific rules
+        """
         all_rules = list(self.config.rules)
         
         # Allow subclasses to add mountpoint-specific rules
-        mountpoint_rules = self._get_additional_rules()
-        all_rules.extend(mountpoint_rules)
+        all_rules.extend(self._get_additional_rules())
+        return all_rules
+    
+    def get_log_sources(self) -> List[str]:
+        """
+        Get log sources this monitor keeps a cursor for in the state.
         
-        return self.rule_engine.evaluate(all_rules, metrics)
+        Returns:
+            List of log source names
+        """
+        return []
+    
+    def diagnose(self, anomalies: List[RuleResult]) -> Dict[str, Any]:
+        """
+        Gather details that explain this run's anomalies for the report.
+        
+        Args:
+            anomalies: Anomalous results of this monitor
+            
+        Returns:
+            Diagnostics by name (empty if there is nothing to add)
+        """
+        return {}
+    
+    def close(self) -> None:
+        """Release resources held between runs (e.g. open files)."""
+        pass
     
     def _get_additional_rules(self) -> List:
         """Override in subclasses to add mountpoint-specific rules."""
@@ -0,0 +1,176 @@
+"""Per-cgroup resource monitor (cgroup v2)."""
+
+import heapq
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from ..monitors.base import MonitorBase
+from ..collectors.cgroups import (
+    CPU_SOME,
+    CPU_THROTTLED,
+    CPU_USAGE,
+    IO_RBYTES,
+    IO_SOME,
+    IO_WBYTES,
+    MEMORY_CURRENT,
+    MEMORY_HIGH,
+    MEMORY_MAX,
+    MEMORY_OOM_KILL,
+    MEMORY_SOME,
+    CgroupCollector,
+    Sample,
+)
+from ..config.schema import CgroupConfig
+from ..metrics.model import LabelSelector, MetricFamily, MetricSet, parse_series_key
+from ..state.counters import CounterFile
+
+# Label identifying the cgroup (path below the cgroup root) of a series
+CGROUP_LABEL = "cgroup"
+
+
+def _gauge(current: int, previous: Optional[int], elapsed: float) -> Optional[float]:
+    """Current value."""
+    return float(current)
+
+
+def _delta(current: int, previous: Optional[int], elapsed: float) -> Optional[float]:
+    """Increase since the previous run (None after a counter reset)."""
+    if previous is None or current < previous:
+        return None
+    return float(current - previous)
+
+
+def _per_second(current: int, previous: Optional[int], elapsed: float) -> Optional[float]:
+    """Increase per second since the previous run."""
+    delta = _delta(current, previous, elapsed)
+    return None if delta is None else delta / elapsed
+
+
+def _usec_percent(current: int, previous: Optional[int], elapsed: float) -> Optional[float]:
+    """Microseconds accrued per second, as a percentage of wall time."""
+    delta = _delta(current, previous, elapsed)
+    return None if delta is None else delta / elapsed / 1e4
+
+
+# Metric family -> (sample field, value function)
+FAMILIES: Dict[str, Tuple[int, Callable[[int, Optional[int], float], Optional[float]]]] = {
+    "cgroup_cpu_percent": (CPU_USAGE, _usec_percent),
+    "cgroup_cpu_throttled_percent": (CPU_THROTTLED, _usec_percent),
+    "cgroup_memory_bytes": (MEMORY_CURRENT, _gauge),
+    "cgroup_memory_high_events": (MEMORY_HIGH, _delta),
+    "cgroup_memory_max_events": (MEMORY_MAX, _delta),
+    "cgroup_oom_kills": (MEMORY_OOM_KILL, _delta),
+    "cgroup_io_read_bytes_per_second": (IO_RBYTES, _per_second),
+    "cgroup_io_write_bytes_per_second": (IO_WBYTES, _per_second),
+    "cgroup_cpu_pressure_percent": (CPU_SOME, _usec_percent),
+    "cgroup_memory_pressure_percent": (MEMORY_SOME, _usec_percent),
+    "cgroup_io_pressure_percent": (IO_SOME, _usec_percent),
+}
+
+
+class CgroupMonitor(MonitorBase):
+    """
+    Monitors CPU, memory, IO and pressure per cgroup.
+    
+    Counters (CPU time, throttled time, memory events, IO bytes, pressure
+    stall time) are turned into rates and increases since the previous
+    run; their last values are kept in ``counters_file``, so the first run
+    after that file is lost only reports gauges. Every family is reported
+    for its ``top`` cgroups with a non-zero value, e.g.
+    ``cgroup_io_pressure_percent{cgroup="system.slice/postgresql.service"}``,
+    so the output stays small with thousands of cgroups. Cgroups selected by
+    a configured rule are always reported (zero values included), so their
+    alerts don't resolve and fire again as they leave and re-enter the top.
+    """
+    
+    def __init__(
+        self,
+        config: CgroupConfig,
+        rule_engine,
+        counters_file: Optional[str] = None,
+        collector: Optional[CgroupCollector] = None,
+    ):
+        """
+        Initialize cgroup monitor.
+        
+        Args:
+            config: Cgroup monitor configuration
+            rule_engine: Rule evaluation engine
+            counters_file: File keeping the counters of the previous run
+                (None: only kept in memory)
+            collector: cgroup collector (default: built from the config)
+        """
+        super().__init__("cgroup", config, rule_engine)
+        self.config: CgroupConfig = config
+        self.collector = collector or CgroupCollector(config.root, config.depth, config.exclude)
+        self.counters = CounterFile(counters_file, self.collector.root)
+    
+    def _rule_selectors(self) -> Dict[str, List[LabelSelector]]:
+        """
+        Get the label selectors of the rules reading each metric family.
+        
+        Returns:
+            Mapping of family name -> selectors of threshold rules and of
+            labelled series named in expression rules
+        """
+        selectors: Dict[str, List[LabelSelector]] = {}
+        for compiled in self.plan.rules:
+            if compiled.expression is None:
+                selectors.setdefault(compiled.metric, []).append(compiled.selector)
+                continue
+            for name in compiled.expression.names:
+                family, labels = parse_series_key(name)
+                # A bare name never matches a labelled cgroup series
+                if labels:
+                    selectors.setdefault(family, []).append(LabelSelector(labels))
+        return selectors
+    
+    def collect_metrics(self) -> MetricSet:
+        """Collect per-cgroup metrics for the top cgroups of each family and rule-selected cgroups."""
+        samples = self.collector.sample()
+        now = time.time()
+        # Read from the plan each run, as a reload recompiles it
+        rule_selectors = self._rule_selectors()
+        previous = self.counters.swap(now, samples)
+        
+        metrics = MetricSet()
+        metrics.set("cgroup_count", float(len(samples)))
+        elapsed = 0.0
+        old_samples: Dict[str, Sample] = {}
+        if previous is not None:
+            elapsed = now - previous[0]
+            old_samples = previous[1]
+        
+        for name, (field, compute) in FAMILIES.items():
+            if compute is not _gauge and elapsed <= 0:
+                continue
+            values: List[Tuple[float, str]] = []
+            for rel, sample in samples.items():
+                current = sample[field]
+                if current is None:
+                    continue
+                old = old_samples.get(rel)
+                value = compute(current, None if old is None else old[field], elapsed)
+                if value is not None:
+                    values.append((value, rel))
+            family = metrics.family(name, (CGROUP_LABEL,))
+            for value, rel in heapq.nlargest(self.config.top, (item for item in values if item[0])):
+                family.set((rel,), value)
+            
+            selectors = rule_selectors.get(name)
+            if selectors:
+                candidates = MetricFamily(name, (CGROUP_LABEL,))
+                for value, rel in values:
+                    candidates.set((rel,), value)
+                for selector in selectors:
+                    for pos in candidates.select(selector):
+                        family.set(candidates.label_values[pos], candidates.values[pos])
+        return metrics
+    
+    def get_suggested_commands(self) -> List[str]:
+        """Get suggested diagnostic commands."""
+        root = self.collector.root
+        return [
+            "systemd-cgtop -b -n 2 -d 1",
+            f"cat {root}/<cgroup>/cpu.stat {root}/<cgroup>/memory.events",
+            f"cat {root}/<cgroup>/io.pressure {root}/<cgroup>/io.stat",
+        ]
@@ -1,54 +1,159 @@
 """IO-stuck and hung task monitor."""
 
-from typing import Dict, List
+import time
+from typing import Any, Dict, List, Optional
 from ..monitors.base import MonitorBase
 from ..collectors.psi import PSICollector
 from ..collectors.logs import LogCollector
+from ..collectors.nfs import (
+    EXE_MS,
+    MAJOR_TIMEOUTS,
+    OPS,
+    QUEUE_MS,
+    RTT_MS,
+    TRANSMISSIONS,
+    NFSStatsCollector,
+)
 from ..collectors.processes import ProcessCollector
+from ..metrics.model import MetricSet
+from ..state.counters import CounterFile
 from ..state.manager import StateManager
 from ..config.schema import IOStuckConfig
 
+# Label identifying the mountpoint of an NFS series
+MOUNT_LABEL = "mount"
+
 
 class IOStuckMonitor(MonitorBase):
-    """Monitors for IO-stuck conditions via logs, PSI, and D-state tasks."""
+    """
+    Monitors for IO-stuck conditions via logs, PSI, and D-state tasks.
+    
+    NFS mounts are also watched through their client RPC statistics. A
+    slow server shows up there as rising round-trip times long before its
+    blocked tasks are reported as hung: per mount and operation, e.g.
+    ``nfs_read_avg_rtt_ms{mount="/data"}``, averaged over the RPCs
+    completed since the previous run.
+    """
+    
+    LOG_SOURCE = "kernel"  # State key of the kernel log cursor
     
-    def __init__(self, config: IOStuckConfig, rule_engine, state_manager: StateManager):
-        """Initialize IO-stuck monitor."""
+    def __init__(
+        self,
+        config: IOStuckConfig,
+        rule_engine,
+        state_manager: StateManager,
+        nfs_counters_file: Optional[str] = None,
+        nfs_collector: Optional[NFSStatsCollector] = None,
+    ):
+        """
+        Initialize IO-stuck monitor.
+        
+        Args:
+            config: IO-stuck monitor configuration
+            rule_engine: Rule evaluation engine
+            state_manager: State manager keeping the kernel log cursor
+            nfs_counters_file: File keeping the NFS counters of the previous
+                run (None: only kept in memory)
+            nfs_collector: NFS statistics collector (default: /proc/self/mountstats)
+        """
         super().__init__("iostuck", config, rule_engine)
         self.config: IOStuckConfig = config
         self.psi_collector = PSICollector()
         self.log_collector = LogCollector()
         self.process_collector = ProcessCollector()
         self.state_manager = state_manager
+        self.nfs_collector: Optional[NFSStatsCollector] = None
+        if config.nfs.enabled:
+            self.nfs_collector = nfs_collector or NFSStatsCollector()
+            self.nfs_counters = CounterFile(nfs_counters_file, self.nfs_collector.path)
     
-    def collect_metrics(self) -> Dict[str, float]:
+    def collect_metrics(self) -> MetricSet:
         """Collect IO-stuck metrics."""
-        metrics = {}
+        metrics = MetricSet()
         
         # Hung tasks from kernel logs
-        cursor = self.state_manager.get_log_cursor("kernel")
-        log_lines, new_cursor = self.log_collector.collect_kernel_logs(cursor)
-        hung_task_count = self.log_collector.find_hung_tasks(log_lines)
-        metrics["hung_task_count"] = float(hung_task_count)
+        cursor = self.state_manager.get_log_cursor(self.LOG_SOURCE)
+        scan_result, new_cursor = self.log_collector.scan_kernel_logs(cursor)
+        metrics.set("hung_task_count", float(scan_result.count))
         
         # Update cursor
         if new_cursor:
-            self.state_manager.set_log_cursor("kernel", new_cursor)
+            self.state_manager.set_log_cursor(self.LOG_SOURCE, new_cursor)
         
         # PSI IO pressure (if available)
         if self.psi_collector.is_available():
             psi_data = self.psi_collector.read_io_pressure()
             if psi_data:
-                metrics["psi_io_avg10"] = psi_data.get("avg10", 0.0)
-                metrics["psi_io_avg60"] = psi_data.get("avg60", 0.0)
-                metrics["psi_io_avg300"] = psi_data.get("avg300", 0.0)
+                metrics.set("psi_io_avg10", psi_data.get("avg10", 0.0))
+                metrics.set("psi_io_avg60", psi_data.get("avg60", 0.0))
+                metrics.set("psi_io_avg300", psi_data.get("avg300", 0.0))
         
         # D-state tasks
         d_state_tasks = self.process_collector.get_d_state_tasks()
-        metrics["d_state_task_count"] = float(len(d_state_tasks))
+        metrics.set("d_state_task_count", float(len(d_state_tasks)))
+        
+        # NFS client RPC statistics
+        if self.nfs_collector is not None:
+            self._collect_nfs(metrics)
         
         return metrics
     
+    def _collect_nfs(self, metrics: MetricSet) -> None:
+        """
+        Add per-mount, per-operation NFS metrics for the interval since the
+        previous run.
+        
+        For each operation: ``nfs_<op>_ops_per_second``, the average
+        ``_avg_rtt_ms`` (server round trip), ``_avg_exe_ms`` (whole call)
+        and ``_avg_queue_ms`` (waiting to be sent) of the RPCs completed
+        meanwhile, ``_retransmits`` and ``_major_timeouts``. Per mount,
+        ``nfs_backlog_avg`` is the average transport backlog queue length
+        seen by RPCs sent. Nothing is reported on the first run, nor for a
+        mount whose counters went backwards (remounted).
+        """
+        now = time.time()
+        current: Dict[str, Dict[str, Any]] = {
+            mountpoint: {"ops": stats.ops, "xprt": [stats.sends, stats.backlog]}
+            for mountpoint, stats in self.nfs_collector.read(self.config.nfs.ops).items()
+        }
+        previous = self.nfs_counters.swap(now, current)
+        if previous is None or now <= previous[0]:
+            return
+        elapsed = now - previous[0]
+        
+        for mountpoint, counters in current.items():
+            old = previous[1].get(mountpoint)
+            if not isinstance(old, dict):
+                continue
+            labels = {MOUNT_LABEL: mountpoint}
+            old_ops = old.get("ops", {})
+            for op, values in counters["ops"].items():
+                old_values = old_ops.get(op)
+                if not old_values or len(old_values) != len(values):
+                    continue
+                delta = [new - prior for new, prior in zip(values, old_values)]
+                if min(delta) < 0:
+                    continue
+                name = f"nfs_{op.lower()}"
+                ops = delta[OPS]
+                metrics.set(f"{name}_ops_per_second", ops / elapsed, labels)
+                if ops:
+                    metrics.set(f"{name}_avg_rtt_ms", delta[RTT_MS] / ops, labels)
+                    metrics.set(f"{name}_avg_exe_ms", delta[EXE_MS] / ops, labels)
+                    metrics.set(f"{name}_avg_queue_ms", delta[QUEUE_MS] / ops, labels)
+                metrics.set(f"{name}_retransmits", float(max(0, delta[TRANSMISSIONS] - ops)), labels)
+                metrics.set(f"{name}_major_timeouts", float(delta[MAJOR_TIMEOUTS]), labels)
+            old_xprt = old.get("xprt")
+            if old_xprt and len(old_xprt) == 2:
+                sends = counters["xprt"][0] - old_xprt[0]
+                backlog = counters["xprt"][1] - old_xprt[1]
+                if sends >= 0 and backlog >= 0:
+                    metrics.set("nfs_backlog_avg", backlog / sends if sends else 0.0, labels)
+    
+    def get_log_sources(self) -> List[str]:
+        """Get log sources this monitor keeps a cursor for."""
+        return [self.LOG_SOURCE]
+    
     def get_suggested_commands(self) -> List[str]:
         """Get suggested diagnostic commands."""
         return [
@@ -57,4 +162,5 @@ class IOStuckMonitor(MonitorBase):
             "journalctl -k --since '10 minutes ago' | grep -i 'hung\\|blocked\\|stuck'",
             "iostat -x 1 5",
             "cat /proc/pressure/io",
+            "nfsiostat 1 3",
         ]
@@ -1,33 +1,112 @@
 """Storage usage monitor."""
 
 import os
-from typing import Dict, List
+from typing import Any, Dict, List, Optional, Set
 from ..monitors.base import MonitorBase
+from ..collectors.deleted import DeletedFileCollector, DeletedOpenScan
+from ..collectors.diskusage import DiskUsageScanner
+from ..collectors.mounts import MountEntry, MountTable, select_mounts
 from ..config.schema import StorageConfig, StorageMountConfig
+from ..metrics.model import MetricSet, parse_series_key
+from ..metrics.storage import DELETED_FIELDS, METRIC_FIELDS, MOUNT_LABEL
+from ..rules.model import RuleResult
 
 
 class StorageMonitor(MonitorBase):
-    """Monitors disk space and inode usage."""
+    """
+    Monitors disk space and inode usage.
     
-    def __init__(self, config: StorageConfig, rule_engine):
-        """Initialize storage monitor."""
+    Metrics are emitted as labelled families, e.g.
+    ``bytes_used_percent{mount="/var"}``. Rules may select mounts with
+    ``labels`` (globs allowed); the legacy flat names
+    (``mount_var_bytes_used_percent``, and bare names for ``/``) are still
+    accepted and mapped onto the labelled series.
+    
+    With discovery enabled, mounts from the mount table are added to the
+    configured ones: filtered by fstype and path, one per filesystem, and
+    recomputed only when the mount table changes.
+    
+    Space still held by deleted files that processes keep open (what
+    ``df`` counts but ``du`` cannot find) is reported per mount as
+    ``deleted_open_bytes`` and ``deleted_open_files``.
+    """
+    
+    def __init__(
+        self,
+        config: StorageConfig,
+        rule_engine,
+        mount_table: Optional[MountTable] = None,
+        scan_cache_dir: Optional[str] = None,
+        deleted_collector: Optional[DeletedFileCollector] = None,
+    ):
+        """
+        Initialize storage monitor.
+        
+        Args:
+            config: Storage monitor configuration
+            rule_engine: Rule evaluation engine
+            mount_table: Mount table for discovery (default: /proc/self/mountinfo)
+            scan_cache_dir: Directory of the disk usage scan caches (None: no cache)
+            deleted_collector: Deleted-but-open file collector (default: /proc)
+        """
         super().__init__("storage", config, rule_engine)
         self.config: StorageConfig = config
+        self.scan_cache_dir = scan_cache_dir
+        self._paths: List[str] = [mount.path for mount in config.mountpoints]
+        self.mount_table: Optional[MountTable] = None
+        if config.discovery.enabled:
+            self.mount_table = mount_table or MountTable()
+        self._discovered: List[MountEntry] = []
+        self._generation = -1
+        self.deleted_collector: Optional[DeletedFileCollector] = None
+        if config.deleted_files.enabled:
+            self.deleted_collector = deleted_collector or DeletedFileCollector()
+        self._deleted: Optional[DeletedOpenScan] = None
+    
+    def mount_paths(self) -> List[str]:
+        """
+        Get the mountpoints to collect.
+        
+        Returns:
+            Configured mountpoints followed by discovered ones on other
+            filesystems
+        """
+        if self.mount_table is None:
+            return self._paths
+        entries = self.mount_table.entries()
+        if self.mount_table.generation != self._generation:
+            self._generation = self.mount_table.generation
+            discovery = self.config.discovery
+            self._discovered = select_mounts(
+                entries, discovery.fstypes, discovery.paths, discovery.exclude_paths, self._configured_devices()
+            )
+        configured = set(self._paths)
+        return self._paths + [e.mountpoint for e in self._discovered if e.mountpoint not in configured]
     
-    def collect_metrics(self) -> Dict[str, float]:
+    def _configured_devices(self) -> Set[str]:
+        """Devices (``major:minor``) of the configured mountpoints."""
+        devices = set()
+        for path in self._paths:
+            try:
+                st_dev = os.stat(path).st_dev
+            except OSError:
+                continue
+            devices.add(f"{os.major(st_dev)}:{os.minor(st_dev)}")
+        return devices
+    
+    def collect_metrics(self) -> MetricSet:
         """Collect storage metrics for all mountpoints."""
-        metrics = {}
+        metrics = MetricSet()
+        families = [metrics.family(field, (MOUNT_LABEL,)) for field in METRIC_FIELDS]
+        deleted_families = []
+        self._deleted = None
+        if self.deleted_collector is not None:
+            self._deleted = self.deleted_collector.scan()
+            deleted_families = [metrics.family(field, (MOUNT_LABEL,)) for field in DELETED_FIELDS]
         
-        for mount in self.config.mountpoints:
-            # Create safe prefix from mountpoint path
-            safe_path = mount.path.strip('/').replace('/', '_').replace('-', '_')
-            if safe_path:
-                prefix = f"mount_{safe_path}"
-            else:
-                prefix = "mount_root"
-            
+        for path in self.mount_paths():
             try:
-                stat = os.statvfs(mount.path)
+                stat = os.statvfs(path)
                 
                 # Bytes
                 total_bytes = stat.f_blocks * stat.f_frsize
@@ -41,38 +120,80 @@ class StorageMonitor(MonitorBase):
                 used_inodes = total_inodes - free_inodes
                 used_inodes_percent = (used_inodes / total_inodes * 100) if total_inodes > 0 else 0.0
                 
-                metrics[f"{prefix}_bytes_total"] = float(total_bytes)
-                metrics[f"{prefix}_bytes_free"] = float(free_bytes)
-                metrics[f"{prefix}_bytes_used"] = float(used_bytes)
-                metrics[f"{prefix}_bytes_used_percent"] = used_percent
-                metrics[f"{prefix}_inodes_total"] = float(total_inodes)
-                metrics[f"{prefix}_inodes_free"] = float(free_inodes)
-                metrics[f"{prefix}_inodes_used"] = float(used_inodes)
-                metrics[f"{prefix}_inodes_used_percent"] = used_inodes_percent
+                values = (
+                    float(total_bytes),
+                    float(free_bytes),
+                    float(used_bytes),
+                    used_percent,
+                    float(total_inodes),
+                    float(free_inodes),
+                    float(used_inodes),
+                    used_inodes_percent,
+                )
+                labels = (path,)
+                for family, value in zip(families, values):
+                    family.set(labels, value)
                 
-                # Also add simplified names for root mountpoint
-                if mount.path == "/":
-                    metrics["bytes_total"] = float(total_bytes)
-                    metrics["bytes_free"] = float(free_bytes)
-                    metrics["bytes_used"] = float(used_bytes)
-                    metrics["bytes_used_percent"] = used_percent
-                    metrics["inodes_total"] = float(total_inodes)
-                    metrics["inodes_free"] = float(free_inodes)
-                    metrics["inodes_used"] = float(used_inodes)
-                    metrics["inodes_used_percent"] = used_inodes_percent
-                    
+                if self._deleted is not None:
+                    held = self._deleted.device_totals(os.stat(path).st_dev)
+                    for family, value in zip(deleted_families, held):
+                        family.set(labels, float(value))
+            
             except (OSError, ValueError):
                 # Mountpoint not accessible, skip
                 continue
         
         return metrics
     
-    def _get_additional_rules(self) -> List:
-        """Get mountpoint-specific rules."""
-        rules = []
-        for mount in self.config.mountpoints:
-            rules.extend(mount.rules)
-        return rules
+    def get_rules(self) -> List:
+        """Get all rules, scoped to mount labels (see StorageConfig.scoped_rules())."""
+        return self.config.scoped_rules()
+    
+    def diagnose(self, anomalies: List[RuleResult]) -> Dict[str, Any]:
+        """
+        Explain storage anomalies.
+        
+        Mounts with an anomalous usage family are scanned for their largest
+        directories; processes holding deleted files open are listed when
+        they hold any space.
+        
+        Args:
+            anomalies: Anomalous results of this monitor
+            
+        Returns:
+            ``{"disk_usage": {mount: scan}}`` (see UsageScan.to_dict()) and
+            ``{"deleted_open": {...}}``, each only when there is something
+            to report
+        """
+        diagnostics: Dict[str, Any] = {}
+        mounts: List[str] = []
+        for result in anomalies:
+            try:
+                family, labels = parse_series_key(result.metric)
+            except ValueError:
+                continue
+            mount = labels.get(MOUNT_LABEL)
+            if family in METRIC_FIELDS and mount and mount not in mounts:
+                mounts.append(mount)
+        
+        scan = self.config.scan
+        if scan.enabled and mounts:
+            scanner = DiskUsageScanner(self.scan_cache_dir, scan.workers, scan.time_budget, scan.max_entries, scan.top)
+            diagnostics["disk_usage"] = {mount: scanner.scan(mount).to_dict() for mount in mounts}
+        
+        deleted = self._deleted
+        if deleted is not None and deleted.holders:
+            diagnostics["deleted_open"] = {
+                "holders": [holder.to_dict() for holder in deleted.top(self.config.deleted_files.top)],
+                "processes": deleted.processes,
+                "processes_denied": deleted.processes_denied,
+            }
+        return diagnostics
+    
+    def close(self) -> None:
+        """Close the mount table."""
+        if self.mount_table is not None:
+            self.mount_table.close()
     
     def get_suggested_commands(self) -> List[str]:
         """Get suggested diagnostic commands."""
@@ -81,4 +202,5 @@ class StorageMonitor(MonitorBase):
             "df -i",
             "du -sh /* 2>/dev/null | sort -h | tail -10",
             "lsof +D / | head -20",
+            "lsof -nP +L1",
         ]
@@ -3,5 +3,6 @@
 from .builder import ReportBuilder
 from .text import TextReporter
 from .json import JSONReporter
+from .prometheus import PrometheusReporter
 
-__all__ = ["ReportBuilder", "TextReporter", "JSONReporter"]
+__all__ = ["ReportBuilder", "TextReporter", "JSONReporter", "PrometheusReporter"]
@@ -29,53 +29,56 @@ class ReportBuilder:
         Returns:
             Report dictionary
         """
-        # Collect all anomalies
+        # Serialize every result exactly once; anomaly lists share the dicts
+        serialized: Dict[str, List[Dict]] = {}
+        monitor_anomalies: Dict[str, List[Dict]] = {}
         all_anomalies: List[RuleResult] = []
-        monitor_anomalies: Dict[str, List[RuleResult]] = {}
+        monitor_scores: Dict[str, TriageScore] = {}
         
         for monitor_name, monitor_results in results.items():
+            dumped = [r.to_dict() for r in monitor_results]
             anomalies = [r for r in monitor_results if r.anomaly]
-            monitor_anomalies[monitor_name] = anomalies
+            serialized[monitor_name] = dumped
+            monitor_anomalies[monitor_name] = [d for d in dumped if d["anomaly"]]
+            monitor_scores[monitor_name] = self.scorer.score_anomalies(anomalies)
             all_anomalies.extend(anomalies)
         
         # Calculate triage scores
         overall_score = self.scorer.score_anomalies(all_anomalies)
-        monitor_scores = {}
-        
-        for monitor_name, anomalies in monitor_anomalies.items():
-            monitor_scores[monitor_name] = self.scorer.score_anomalies(anomalies)
-        
-        # Ensure all monitors have scores (even if no anomalies)
-        for monitor_name in monitors.keys():
-            if monitor_name not in monitor_scores:
-                monitor_scores[monitor_name] = self.scorer.score_anomalies([])
+        empty_score = self.scorer.score_anomalies([]).to_dict()
         
-        # Collect metrics and suggested commands
-        monitor_metrics = {}
+        # Reuse metrics collected during evaluation and gather suggested commands
+        monitor_data = {}
         suggested_commands = []
         
         for monitor_name, monitor in monitors.items():
+            commands = monitor.get_suggested_commands()
             if monitor.config.enabled:
-                metrics = monitor.collect_metrics()
-                monitor_metrics[monitor_name] = metrics
-                suggested_commands.extend(monitor.get_suggested_commands())
+                suggested_commands.extend(commands)
+            
+            score = monitor_scores.get(monitor_name)
+            monitor_data[monitor_name] = {
+                "triage_score": score.to_dict() if score is not None else empty_score,
+                "metrics": monitor.last_metrics.to_dict() if monitor.config.enabled else {},
+                "results": serialized.get(monitor_name, []),
+                "anomalies": monitor_anomalies.get(monitor_name, []),
+                "suggested_commands": commands,
+            }
+            
+            # Details explaining the anomalies (e.g. what fills a disk)
+            anomalies = [r for r in results.get(monitor_name, []) if r.anomaly]
+            if anomalies:
+                diagnostics = monitor.diagnose(anomalies)
+                if diagnostics:
+                    monitor_data[monitor_name]["diagnostics"] = diagnostics
         
         return {
             "timestamp": self._get_timestamp(),
             "overall": {
-                "triage_score": overall_score.model_dump(),
+                "triage_score": overall_score.to_dict(),
                 "anomaly_count": len(all_anomalies),
             },
-            "monitors": {
-                name: {
-                    "triage_score": monitor_scores.get(name, self.scorer.score_anomalies([])).model_dump(),
-                    "metrics": monitor_metrics.get(name, {}),
-                    "results": [r.model_dump() for r in results.get(name, [])],
-                    "anomalies": [r.model_dump() for r in monitor_anomalies.get(name, [])],
-                    "suggested_commands": monitor.get_suggested_commands(),
-                }
-                for name, monitor in monitors.items()
-            },
+            "monitors": monitor_data,
             "suggested_commands": list(set(suggested_commands)),  # Deduplicate
         }
     
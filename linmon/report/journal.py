@@ -0,0 +1,318 @@
+"""Append-only NDJSON journal with one compact line per run."""
+
+import bisect
+import json
+import os
+import struct
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from ..util.fs import ensure_dir
+from ..util.time import parse_iso
+
+# Bytes first read from the end of a journal file to find its last line;
+# doubled until a complete line is in the buffer
+_TAIL_BYTES = 64 * 1024
+
+# Sparse index next to each journal file: (record timestamp, byte offset)
+INDEX_SUFFIX = ".idx"
+INDEX_ENTRY = struct.Struct("<dQ")
+# Journal bytes between index entries
+INDEX_STRIDE = 64 * 1024
+
+# Every record line starts with its timestamp (see journal_record())
+_TIMESTAMP_PREFIX = b'{"timestamp":"'
+
+
+def journal_record(report: Dict, report_path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Condense a report into a journal record.
+    
+    Args:
+        report: Report dictionary from ReportBuilder
+        report_path: Full report file written for this run, if any
+        
+    Returns:
+        Record with the timestamp, severity, metrics per monitor and
+        anomalies
+    """
+    overall = report.get("overall", {})
+    metrics: Dict[str, Dict[str, float]] = {}
+    anomalies: List[Dict[str, Any]] = []
+    for monitor_name, data in report.get("monitors", {}).items():
+        metrics[monitor_name] = data.get("metrics", {})
+        for anomaly in data.get("anomalies", []):
+            anomalies.append({
+                "monitor": monitor_name,
+                "rule_name": anomaly["rule_name"],
+                "metric": anomaly["metric"],
+                "value": anomaly["value"],
+                "operator": anomaly["operator"],
+                "threshold": anomaly["threshold"],
+                "streak": anomaly["streak"],
+            })
+    return {
+        "timestamp": report.get("timestamp"),
+        "severity": overall.get("triage_score", {}).get("severity", "low"),
+        "anomaly_count": overall.get("anomaly_count", len(anomalies)),
+        "metrics": metrics,
+        "anomalies": anomalies,
+        "report": report_path,
+    }
+
+
+class RunJournal:
+    """
+    Size-rotated NDJSON file of run records.
+    
+    Each append is a single ``write()`` on an ``O_APPEND`` descriptor, so a
+    run costs one small append rather than creating files. When the file
+    would exceed ``max_bytes`` it is renamed to ``<path>.1`` (older files
+    shift up to ``<path>.<keep>``; the oldest is dropped).
+    
+    Each file has a sparse ``.idx`` sidecar with the timestamp and offset
+    of its first record and then of one record every ``INDEX_STRIDE``
+    bytes, so a time-range read seeks close to its start and never parses
+    more than a stride of earlier records.
+    """
+    
+    def __init__(self, path: str, max_bytes: int, keep: int = 5, fsync: bool = False):
+        """
+        Initialize journal.
+        
+        Args:
+            path: Journal file path
+            max_bytes: Rotate before the file grows past this size
+            keep: Rotated files to keep
+            fsync: fsync() the file after every append
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.keep = keep
+        self.fsync = fsync
+    
+    def rotated_path(self, index: int) -> str:
+        """Path of the index-th rotated file (0 is the live file)."""
+        return self.path if index == 0 else f"{self.path}.{index}"
+    
+    @staticmethod
+    def index_path(path: str) -> str:
+        """Path of the sparse index of a journal file."""
+        return path + INDEX_SUFFIX
+    
+    def files(self) -> List[str]:
+        """Existing journal files, oldest first."""
+        paths = [self.rotated_path(i) for i in range(self.keep, -1, -1)]
+        return [p for p in paths if os.path.exists(p)]
+    
+    def append(self, record: Dict[str, Any]) -> int:
+        """
+        Append a record, rotating first if the file would grow too large.
+        
+        Args:
+            record: JSON-serializable record
+            
+        Returns:
+            Byte offset of the new line in the live file
+        """
+        line = (json.dumps(record, separators=(",", ":")) + "\n").encode("utf-8")
+        ensure_dir(str(Path(self.path).parent))
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            size = 0
+        if size and size + len(line) > self.max_bytes:
+            self.rotate()
+            size = 0
+        
+        fd = os.open(self.path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            if size and os.pread(fd, 1, size - 1) != b"\n":
+                # Terminate a line torn by a crash so this record parses
+                line = b"\n" + line
+                size += 1
+            os.write(fd, line)
+            if self.fsync:
+                os.fsync(fd)
+        finally:
+            os.close(fd)
+        
+        self._index(record, size)
+        return size
+    
+    def _index(self, record: Dict[str, Any], offset: int) -> None:
+        """Add an index entry for a record that starts a file or a new stride."""
+        try:
+            timestamp = parse_iso(str(record.get("timestamp")))
+        except ValueError:
+            return
+        entry = INDEX_ENTRY.pack(timestamp, offset)
+        index_path = self.index_path(self.path)
+        try:
+            if offset == 0:
+                # New file: drop any index left over from a removed journal
+                with open(index_path, "wb") as f:
+                    f.write(entry)
+                return
+            with open(index_path, "ab+") as f:
+                size = f.seek(0, os.SEEK_END)
+                if size % INDEX_ENTRY.size:
+                    # Drop an entry torn by a crash
+                    size -= size % INDEX_ENTRY.size
+                    f.truncate(size)
+                if size:
+                    f.seek(size - INDEX_ENTRY.size)
+                    _, last_offset = INDEX_ENTRY.unpack(f.read(INDEX_ENTRY.size))
+                    if offset < last_offset + INDEX_STRIDE:
+                        return
+                f.write(entry)
+        except OSError:
+            pass
+    
+    def read_index(self, path: str) -> List[Tuple[float, int]]:
+        """
+        Load the sparse index of a journal file.
+        
+        Args:
+            path: Journal file path
+            
+        Returns:
+            List of (timestamp, offset), oldest first (empty if missing)
+        """
+        try:
+            with open(self.index_path(path), "rb") as f:
+                data = f.read()
+        except OSError:
+            return []
+        data = data[:len(data) - len(data) % INDEX_ENTRY.size]
+        return list(INDEX_ENTRY.iter_unpack(data))
+    
+    def read(self, since: Optional[float] = None, until: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate records in a time range, oldest first.
+        
+        Files wholly before ``since`` (the next file starts before it) are
+        skipped without being opened, and reading starts from the last
+        index entry at or before ``since``. Only lines inside the range are
+        parsed as JSON.
+        
+        Args:
+            since: Earliest timestamp to include (seconds since the epoch)
+            until: Latest timestamp to include
+            
+        Yields:
+            Record dictionaries
+        """
+        files = self.files()
+        indexes = [self.read_index(path) for path in files]
+        for position, path in enumerate(files):
+            if since is not None and position + 1 < len(files):
+                following = indexes[position + 1]
+                if following and following[0][0] < since:
+                    continue
+            
+            offset = 0
+            entries = indexes[position]
+            if since is not None and entries:
+                slot = bisect.bisect_right([ts for ts, _ in entries], since) - 1
+                if slot >= 0:
+                    offset = entries[slot][1]
+            
+            try:
+                f = open(path, "rb")
+            except OSError:
+                continue
+            with f:
+                f.seek(offset)
+                for line in f:
+                    timestamp = _line_timestamp(line)
+                    if timestamp is None:
+                        continue
+                    if since is not None and timestamp < since:
+                        continue
+                    if until is not None and timestamp > until:
+                        return
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue
+    
+    def rotate(self) -> None:
+        """Shift the live file to ``.1`` and older files up by one (with their indexes)."""
+        if self.keep < 1:
+            for path in (self.path, self.index_path(self.path)):
+                if os.path.exists(path):
+                    os.unlink(path)
+            return
+        for index in range(self.keep - 1, -1, -1):
+            source = self.rotated_path(index)
+            target = self.rotated_path(index + 1)
+            if os.path.exists(source):
+                os.replace(source, target)
+                if os.path.exists(self.index_path(source)):
+                    os.replace(self.index_path(source), self.index_path(target))
+                elif os.path.exists(self.index_path(target)):
+                    os.unlink(self.index_path(target))
+    
+    def last_record(self) -> Optional[Dict[str, Any]]:
+        """
+        Get the newest record without reading whole files.
+        
+        Returns:
+            Last parseable record of the newest non-empty file, or None
+        """
+        for path in reversed(self.files()):
+            try:
+                record = _last_line_record(path)
+            except OSError:
+                continue
+            if record is not None:
+                return record
+        return None
+
+
+def _last_line_record(path: str) -> Optional[Dict[str, Any]]:
+    """
+    Parse the last complete line of a file that holds a JSON object.
+    
+    The file is read backwards from its end, in blocks that double in size,
+    so a record of any size is found without reading the whole file.
+    Lines that do not parse (a torn write) are skipped.
+    
+    Raises:
+        OSError: If the file cannot be read
+    """
+    with open(path, "rb") as f:
+        pos = f.seek(0, os.SEEK_END)
+        buf = b""
+        while pos > 0:
+            step = min(pos, max(_TAIL_BYTES, len(buf)))
+            pos -= step
+            f.seek(pos)
+            buf = f.read(step) + buf
+            # Lines after the first newline are complete; before it, the
+            # start of a line may still be further back
+            start = 0 if pos == 0 else buf.find(b"\n") + 1
+            if start == 0 and pos > 0:
+                continue
+            for line in reversed(buf[start:].splitlines()):
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(record, dict):
+                    return record
+            buf = buf[:start]
+    return None
+
+
+def _line_timestamp(line: bytes) -> Optional[float]:
+    """Read a record's timestamp from the start of its line without parsing it."""
+    if not line.startswith(_TIMESTAMP_PREFIX):
+        return None
+    end = line.find(b'"', len(_TIMESTAMP_PREFIX))
+    if end < 0:
+        return None
+    try:
+        return parse_iso(line[len(_TIMESTAMP_PREFIX):end].decode("ascii"))
+    except (UnicodeDecodeError, ValueError):
+        return None
@@ -0,0 +1,127 @@
+"""Prometheus text exposition format report generator."""
+
+import math
+from typing import Dict, List, Tuple
+from ..metrics.model import escape_label_value
+from ..util.time import parse_iso
+
+# HELP text of the metric families linmon collects
+METRIC_HELP: Dict[str, str] = {
+    "cpu_percent": "CPU utilisation over the sample window, in percent.",
+    "load1": "1-minute load average.",
+    "load5": "5-minute load average.",
+    "load15": "15-minute load average.",
+    "bytes_total": "Filesystem size in bytes.",
+    "bytes_free": "Filesystem bytes available to unprivileged users.",
+    "bytes_used": "Filesystem bytes in use.",
+    "bytes_used_percent": "Filesystem space in use, in percent.",
+    "inodes_total": "Filesystem inode count.",
+    "inodes_free": "Free filesystem inodes.",
+    "inodes_used": "Filesystem inodes in use.",
+    "inodes_used_percent": "Filesystem inodes in use, in percent.",
+    "hung_task_count": "Hung task messages in the kernel log since the previous run.",
+    "psi_io_avg10": "IO pressure (some), 10 second average, in percent.",
+    "psi_io_avg60": "IO pressure (some), 60 second average, in percent.",
+    "psi_io_avg300": "IO pressure (some), 300 second average, in percent.",
+    "d_state_task_count": "Tasks in uninterruptible sleep (D state).",
+}
+
+SEVERITIES = ("low", "medium", "high", "critical")
+
+
+def format_value(value: float) -> str:
+    """Format a sample value (``NaN``, ``+Inf`` and ``-Inf`` as Prometheus spells them)."""
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def _labels(**labels: str) -> str:
+    """Format labels given as keyword arguments."""
+    pairs = ",".join(f'{name}="{escape_label_value(str(value))}"' for name, value in labels.items())
+    return "{" + pairs + "}"
+
+
+class PrometheusReporter:
+    """
+    Generates Prometheus text exposition format.
+    
+    Every collected series becomes a gauge named ``<prefix><family>`` with
+    its labels kept as-is, followed by per-rule result gauges and the triage
+    scores. Samples of a family are always grouped under one HELP and TYPE
+    header, as the format requires.
+    """
+    
+    def __init__(self, prefix: str = "linmon_"):
+        """
+        Initialize reporter.
+        
+        Args:
+            prefix: Prepended to every metric name
+        """
+        self.prefix = prefix
+    
+    def format(self, report: Dict) -> str:
+        """
+        Format report as Prometheus exposition text.
+        
+        Args:
+            report: Report dictionary from ReportBuilder
+            
+        Returns:
+            Exposition text (ends with a newline)
+        """
+        # family -> (help, sample lines), in first-seen order
+        families: Dict[str, Tuple[str, List[str]]] = {}
+        
+        def add(family: str, help_text: str, labels: str, value: float) -> None:
+            """Add one sample to its family."""
+            name = self.prefix + family
+            if name not in families:
+                families[name] = (help_text, [])
+            families[name][1].append(f"{name}{labels} {format_value(value)}")
+        
+        monitors = report.get("monitors", {})
+        for data in monitors.values():
+            for key, value in data.get("metrics", {}).items():
+                family, brace, rest = key.partition("{")
+                add(family, METRIC_HELP.get(family, f"linmon metric {family}."), brace + rest, value)
+        
+        for monitor_name, data in monitors.items():
+            for result in data.get("results", []):
+                labels = _labels(monitor=monitor_name, rule=result["rule_name"], metric=result["metric"])
+                add("rule_violated", "1 if the rule's condition held on the last run.",
+                    labels, float(result["violated"]))
+                add("rule_anomaly", "1 if the rule has held for its required consecutive runs.",
+                    labels, float(result["anomaly"]))
+                add("rule_streak", "Consecutive runs the rule's condition has held.",
+                    labels, float(result["streak"]))
+                add("rule_value", "Value the rule compared against its threshold.",
+                    labels, float(result["value"]))
+        
+        scopes = [("overall", report.get("overall", {}).get("triage_score", {}))]
+        scopes += [(name, data.get("triage_score", {})) for name, data in monitors.items()]
+        for scope, triage in scopes:
+            add("triage_score", "Triage score from 0 to 100.",
+                _labels(scope=scope), float(triage.get("score", 0)))
+            for severity in SEVERITIES:
+                add("triage_severity", "1 for the current triage severity of the scope.",
+                    _labels(scope=scope, severity=severity), float(triage.get("severity") == severity))
+        
+        overall = report.get("overall", {})
+        add("anomaly_count", "Anomalies on the last run.", "", float(overall.get("anomaly_count", 0)))
+        if report.get("timestamp"):
+            try:
+                add("last_run_timestamp_seconds", "Time of the last run, in seconds since the epoch.",
+                    "", parse_iso(report["timestamp"]))
+            except ValueError:
+                pass
+        
+        lines: List[str] = []
+        for name, (help_text, samples) in families.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,170 @@
+"""Metric and anomaly queries over stored reports, the run journal and the history store."""
+
+import csv
+import json
+from fnmatch import fnmatchcase
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, TextIO
+from .journal import RunJournal, journal_record
+from .retention import ReportStore
+from ..store.history import HistoryStore
+from ..store.rollup import bucket_mean
+from ..util.time import format_iso
+
+METRIC_FIELDS = ["timestamp", "monitor", "series", "value"]
+ANOMALY_FIELDS = ["timestamp", "monitor", "rule_name", "metric", "value", "operator", "threshold", "streak"]
+STORE_FIELDS = ["timestamp", "series", "tier", "min", "max", "mean", "count"]
+
+
+def iter_records(
+    store: ReportStore,
+    journal: Optional[RunJournal],
+    since: Optional[float] = None,
+    until: Optional[float] = None,
+    source: str = "auto",
+) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate run records in a time range, oldest first.
+    
+    Args:
+        store: Report store
+        journal: Run journal (None if not configured)
+        since: Earliest run time (seconds since the epoch)
+        until: Latest run time
+        source: "journal", "reports", or "auto" (the journal if it has any
+            files, otherwise the report files)
+            
+    Yields:
+        Journal-style records (see journal_record())
+        
+    Raises:
+        ValueError: If the source is unknown
+    """
+    if source not in ("auto", "journal", "reports"):
+        raise ValueError(f"Unknown history source: {source}")
+    if source == "auto":
+        source = "journal" if journal is not None and journal.files() else "reports"
+    
+    if source == "journal":
+        if journal is not None:
+            yield from journal.read(since, until)
+        return
+    for _, location, report in store.reports(since, until):
+        yield journal_record(report, location)
+
+
+def _matches(series: str, patterns: Sequence[str]) -> bool:
+    """Check a series key against metric names, series keys or globs."""
+    family = series.split("{", 1)[0]
+    return any(
+        pattern == series or pattern == family or fnmatchcase(series, pattern)
+        for pattern in patterns
+    )
+
+
+def metric_rows(records: Iterable[Dict[str, Any]], patterns: Sequence[str]) -> Iterator[Dict[str, Any]]:
+    """
+    Flatten records into one row per matching series.
+    
+    Args:
+        records: Run records
+        patterns: Metric names (e.g. ``bytes_used_percent``), exact series
+            keys or globs; empty for every series
+            
+    Yields:
+        Rows with METRIC_FIELDS
+    """
+    for record in records:
+        timestamp = record.get("timestamp")
+        for monitor_name, metrics in record.get("metrics", {}).items():
+            for series, value in metrics.items():
+                if not patterns or _matches(series, patterns):
+                    yield {"timestamp": timestamp, "monitor": monitor_name, "series": series, "value": value}
+
+
+def anomaly_rows(records: Iterable[Dict[str, Any]], patterns: Sequence[str] = ()) -> Iterator[Dict[str, Any]]:
+    """
+    Flatten records into one row per anomaly.
+    
+    Args:
+        records: Run records
+        patterns: Only anomalies whose metric matches (empty for all)
+        
+    Yields:
+        Rows with ANOMALY_FIELDS
+    """
+    for record in records:
+        timestamp = record.get("timestamp")
+        for anomaly in record.get("anomalies", []):
+            if patterns and not _matches(str(anomaly.get("metric", "")), patterns):
+                continue
+            row = {"timestamp": timestamp}
+            row.update({field: anomaly.get(field) for field in ANOMALY_FIELDS[1:]})
+            yield row
+
+
+def store_rows(
+    store: HistoryStore,
+    patterns: Sequence[str],
+    since: Optional[float] = None,
+    until: Optional[float] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Read matching series from the metric history store.
+    
+    Each series is read from the finest tier covering the range (see
+    HistoryStore.query()), so long ranges come from a few hundred rollup
+    buckets rather than every run.
+    
+    Args:
+        store: History store
+        patterns: Metric names, exact series keys or globs; empty for every series
+        since: Range start (seconds since the epoch)
+        until: Range end
+        
+    Yields:
+        Rows with STORE_FIELDS, one per raw sample or bucket
+    """
+    for series in store.series():
+        if patterns and not _matches(series, patterns):
+            continue
+        tier, buckets = store.query(series, since, until)
+        for bucket in buckets:
+            yield {
+                "timestamp": format_iso(bucket[0]),
+                "series": series,
+                "tier": tier,
+                "min": bucket[1],
+                "max": bucket[2],
+                "mean": bucket_mean(bucket),
+                "count": bucket[4],
+            }
+
+
+def write_rows(rows: Iterable[Dict[str, Any]], fields: List[str], fmt: str, out: TextIO) -> int:
+    """
+    Write query rows as CSV or JSON.
+    
+    CSV rows are streamed as they are read; JSON is a single array.
+    
+    Args:
+        rows: Rows to write
+        fields: Column names
+        fmt: "csv" or "json"
+        out: Output stream
+        
+    Returns:
+        Number of rows written
+    """
+    count = 0
+    if fmt == "csv":
+        writer = csv.DictWriter(out, fieldnames=fields, lineterminator="\n")
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+        return count
+    
+    collected = list(rows)
+    json.dump(collected, out, indent=2)
+    out.write("\n")
+    return len(collected)
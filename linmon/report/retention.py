@@ -0,0 +1,352 @@
+"""Date-partitioned report storage with retention and per-day archives."""
+
+import json
+import os
+import shutil
+import tarfile
+import tempfile
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from ..util.fs import atomic_write, ensure_dir
+
+REPORT_PREFIX = "report-"
+ARCHIVE_SUFFIX = ".tar.gz"
+
+# (report time, location, parsed report)
+StoredReport = Tuple[float, str, Dict[str, Any]]
+
+
+def report_stamp(when: datetime) -> str:
+    """
+    Format a report timestamp for use in file names.
+    
+    Args:
+        when: Report time (UTC)
+        
+    Returns:
+        e.g. ``2024-01-15T10-30-00-123456Z``
+    """
+    return (when.isoformat() + "Z").replace(":", "-").replace(".", "-")
+
+
+def parse_report_stamp(name: str) -> Optional[float]:
+    """
+    Get the time of a report from its file name.
+    
+    Args:
+        name: File name, e.g. ``report-2024-01-15T10-30-00-123456Z.json``
+        
+    Returns:
+        Seconds since the epoch, or None if the name is not a report
+    """
+    if not name.startswith(REPORT_PREFIX):
+        return None
+    stamp = name[len(REPORT_PREFIX):].split("Z", 1)[0]
+    for layout in ("%Y-%m-%dT%H-%M-%S-%f", "%Y-%m-%dT%H-%M-%S"):
+        try:
+            parsed = datetime.strptime(stamp, layout)
+        except ValueError:
+            continue
+        return parsed.replace(tzinfo=timezone.utc).timestamp()
+    return None
+
+
+def _parse_day(year: str, month: str, day: str) -> Optional[date]:
+    """Parse a partition path back into a date (None if it is not one)."""
+    try:
+        return date(int(year), int(month), int(day))
+    except ValueError:
+        return None
+
+
+class ReportStore:
+    """
+    Report files partitioned by UTC day under ``<directory>/YYYY/MM/DD/``.
+    
+    Retention works on whole days, so enforcing it only lists the year,
+    month and day entries rather than every report file: past days are
+    packed into one ``YYYY/MM/DD.tar.gz`` archive, days older than
+    ``max_age_seconds`` are removed, and the oldest days are removed while
+    the total exceeds ``max_bytes``. The current day is never removed.
+    """
+    
+    def __init__(
+        self,
+        directory: str,
+        max_age_seconds: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+        compress: bool = True,
+    ):
+        """
+        Initialize store.
+        
+        Args:
+            directory: Report root directory
+            max_age_seconds: Remove days older than this (None: keep)
+            max_bytes: Total size to stay under (None: unlimited)
+            compress: Pack past days into per-day archives
+        """
+        self.directory = Path(directory)
+        self.max_age_seconds = max_age_seconds
+        self.max_bytes = max_bytes
+        self.compress = compress
+    
+    def day_dir(self, day: date) -> Path:
+        """Get the directory holding a day's reports."""
+        return self.directory / f"{day.year:04d}" / f"{day.month:02d}" / f"{day.day:02d}"
+    
+    def archive_path(self, day: date) -> Path:
+        """Get the archive path of a day's reports."""
+        return self.day_dir(day).with_name(f"{day.day:02d}{ARCHIVE_SUFFIX}")
+    
+    def write(self, when: datetime, contents: Dict[str, str]) -> List[str]:
+        """
+        Write one run's reports into its day partition.
+        
+        Args:
+            when: Report time (UTC)
+            contents: Mapping of file extension -> report text
+            
+        Returns:
+            Paths written
+        """
+        target = self.day_dir(when.date())
+        ensure_dir(str(target))
+        stamp = report_stamp(when)
+        paths = []
+        for extension, content in contents.items():
+            path = str(target / f"{REPORT_PREFIX}{stamp}.{extension}")
+            atomic_write(path, content)
+            paths.append(path)
+        return paths
+    
+    def days(self) -> List[Tuple[date, Path]]:
+        """
+        List stored days, oldest first.
+        
+        Returns:
+            List of (day, path) where path is the day directory or archive;
+            a day with both (reports written after it was archived) is
+            listed once per entry
+        """
+        entries: List[Tuple[date, Path]] = []
+        for year_dir in self._subdirs(self.directory):
+            for month_dir in self._subdirs(year_dir):
+                try:
+                    children = list(os.scandir(month_dir))
+                except OSError:
+                    continue
+                for entry in children:
+                    name = entry.name
+                    if entry.is_dir(follow_symlinks=False):
+                        day = _parse_day(year_dir.name, month_dir.name, name)
+                    elif name.endswith(ARCHIVE_SUFFIX):
+                        day = _parse_day(year_dir.name, month_dir.name, name[:-len(ARCHIVE_SUFFIX)])
+                    else:
+                        continue
+                    if day is not None:
+                        entries.append((day, Path(entry.path)))
+        entries.sort(key=lambda item: (item[0], item[1].name))
+        return entries
+    
+    def reports(
+        self,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+    ) -> Iterator[StoredReport]:
+        """
+        Iterate JSON reports in a time range, oldest first.
+        
+        The day partitions and file names act as the time index: days
+        outside the range are not opened, and only reports inside it are
+        read and parsed (from the day directory or its archive).
+        
+        Args:
+            since: Earliest report time (seconds since the epoch)
+            until: Latest report time
+            
+        Yields:
+            Tuples of (report time, path relative to the report directory
+            or ``<archive>:<member>``, parsed report)
+        """
+        first = datetime.fromtimestamp(since, timezone.utc).date() if since is not None else None
+        last = datetime.fromtimestamp(until, timezone.utc).date() if until is not None else None
+        
+        by_day: Dict[date, List[Path]] = {}
+        for day, path in self.days():
+            if (first is None or day >= first) and (last is None or day <= last):
+                by_day.setdefault(day, []).append(path)
+        
+        def in_range(timestamp: Optional[float]) -> bool:
+            """Check a report time against the requested range."""
+            return timestamp is not None and (since is None or timestamp >= since) and (
+                until is None or timestamp <= until
+            )
+        
+        for day in sorted(by_day):
+            found: List[StoredReport] = []
+            for path in by_day[day]:
+                relative = str(path.relative_to(self.directory))
+                if path.is_dir():
+                    found.extend(self._read_dir(path, relative, in_range))
+                else:
+                    found.extend(self._read_archive(path, relative, in_range))
+            found.sort(key=lambda item: item[0])
+            yield from found
+    
+    @staticmethod
+    def _read_dir(path: Path, relative: str, in_range: Callable[[Optional[float]], bool]) -> List[StoredReport]:
+        """Read the in-range JSON reports of a day directory (unreadable ones are skipped)."""
+        found = []
+        try:
+            entries = list(os.scandir(path))
+        except OSError:
+            return found
+        for entry in entries:
+            timestamp = parse_report_stamp(entry.name)
+            if not entry.name.endswith(".json") or not in_range(timestamp):
+                continue
+            try:
+                with open(entry.path) as f:
+                    found.append((timestamp, f"{relative}/{entry.name}", json.load(f)))
+            except (OSError, ValueError):
+                continue
+        return found
+    
+    @staticmethod
+    def _read_archive(path: Path, relative: str, in_range: Callable[[Optional[float]], bool]) -> List[StoredReport]:
+        """Read the in-range JSON reports of a day archive."""
+        found = []
+        try:
+            with tarfile.open(str(path), "r:gz") as tar:
+                for member in tar:
+                    name = os.path.basename(member.name)
+                    timestamp = parse_report_stamp(name)
+                    if not member.isfile() or not name.endswith(".json") or not in_range(timestamp):
+                        continue
+                    try:
+                        found.append((timestamp, f"{relative}:{member.name}", json.load(tar.extractfile(member))))
+                    except ValueError:
+                        continue
+        except (OSError, tarfile.TarError):
+            pass
+        return found
+    
+    @staticmethod
+    def _subdirs(path: Path) -> List[Path]:
+        """Numeric subdirectories of a partition level, sorted."""
+        try:
+            return sorted(
+                Path(entry.path) for entry in os.scandir(path)
+                if entry.name.isdigit() and entry.is_dir(follow_symlinks=False)
+            )
+        except OSError:
+            return []
+    
+    def enforce(self, today: date) -> int:
+        """
+        Apply compression and retention.
+        
+        Reports left flat in the root directory by older versions are first
+        moved into their day partitions. Errors on individual days are
+        skipped so a bad entry never fails the run.
+        
+        Args:
+            today: Current UTC day (kept uncompressed and never removed)
+            
+        Returns:
+            Number of days removed
+        """
+        self._migrate_flat()
+        
+        if self.compress:
+            for day, path in self.days():
+                if day < today and path.is_dir():
+                    try:
+                        self._archive(day, path)
+                    except (OSError, tarfile.TarError):
+                        continue
+        
+        entries = [(day, path) for day, path in self.days() if day < today]
+        doomed = set()
+        if self.max_age_seconds is not None:
+            max_days = self.max_age_seconds / 86400
+            doomed.update(path for day, path in entries if (today - day).days > max_days)
+        
+        if self.max_bytes is not None:
+            sizes = {path: self._size(path) for _, path in self.days()}
+            total = sum(sizes.values()) - sum(sizes[path] for path in doomed)
+            for _, path in entries:
+                if total <= self.max_bytes:
+                    break
+                if path not in doomed:
+                    doomed.add(path)
+                    total -= sizes[path]
+        
+        removed = set()
+        for day, path in entries:
+            if path not in doomed:
+                continue
+            try:
+                if path.is_dir():
+                    shutil.rmtree(path)
+                else:
+                    path.unlink()
+            except OSError:
+                continue
+            removed.add(day)
+        return len(removed)
+    
+    @staticmethod
+    def _size(path: Path) -> int:
+        """Bytes used by a day directory or archive."""
+        try:
+            if not path.is_dir():
+                return path.stat().st_size
+            return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+        except OSError:
+            return 0
+    
+    def _archive(self, day: date, path: Path) -> None:
+        """Pack a day directory into its archive and remove the directory."""
+        archive = self.archive_path(day)
+        prefix = day.isoformat()
+        fd, tmp_path = tempfile.mkstemp(dir=str(archive.parent), prefix=f".{archive.name}.tmp")
+        os.close(fd)
+        try:
+            with tarfile.open(tmp_path, "w:gz") as tar:
+                if archive.exists():
+                    # Reports written after the day was archived: keep both
+                    with tarfile.open(str(archive), "r:gz") as old:
+                        for member in old:
+                            tar.addfile(member, old.extractfile(member) if member.isfile() else None)
+                for entry in sorted(os.scandir(path), key=lambda e: e.name):
+                    if entry.is_file():
+                        tar.add(entry.path, arcname=f"{prefix}/{entry.name}")
+            os.replace(tmp_path, archive)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+        shutil.rmtree(path)
+    
+    def _migrate_flat(self) -> None:
+        """Move ``report-<ts>.*`` files from the root into day partitions."""
+        try:
+            entries = [e for e in os.scandir(self.directory) if e.name.startswith(REPORT_PREFIX)]
+        except OSError:
+            return
+        for entry in entries:
+            stamp = entry.name[len(REPORT_PREFIX):]
+            day = _parse_day(stamp[0:4], stamp[5:7], stamp[8:10])
+            if day is None or not entry.is_file(follow_symlinks=False):
+                continue
+            target = self.day_dir(day)
+            try:
+                ensure_dir(str(target))
+                os.replace(entry.path, str(target / entry.name))
+            except OSError:
+                continue
@@ -1,6 +1,53 @@
 """Text format report generator."""
 
-from typing import Dict, List
+from typing import Any, Callable, Dict, List
+
+
+def format_bytes(value: float) -> str:
+    """Format a byte count with a binary unit, e.g. ``1.5G``."""
+    for unit in ("B", "K", "M", "G", "T"):
+        if abs(value) < 1024 or unit == "T":
+            return f"{value:.0f}{unit}" if unit == "B" else f"{value:.1f}{unit}"
+        value /= 1024
+    return f"{value:.1f}P"
+
+
+def _format_disk_usage(data: Dict[str, Any]) -> List[str]:
+    """Format disk usage scans: the largest directories of each mount."""
+    lines = []
+    for mount, scan in data.items():
+        coverage = "complete" if scan.get("complete") else "partial (budget reached)"
+        lines.append(
+            f"  Largest directories on {mount} ({coverage}, {scan.get('elapsed_seconds', 0):.1f}s, "
+            f"{scan.get('dirs_scanned', 0)} scanned, {scan.get('dirs_cached', 0)} cached):"
+        )
+        for row in scan.get("top_bytes", []):
+            lines.append(f"    {format_bytes(row['bytes']):>8}  {row['path']}")
+        if scan.get("top_inodes"):
+            lines.append("  Most inodes:")
+            for row in scan["top_inodes"]:
+                lines.append(f"    {row['inodes']:>8}  {row['path']}")
+    return lines
+
+
+def _format_deleted_open(data: Dict[str, Any]) -> List[str]:
+    """Format the processes holding deleted files open."""
+    lines = ["  Deleted files still held open:"]
+    for holder in data.get("holders", []):
+        lines.append(
+            f"    {format_bytes(holder['bytes']):>8}  pid {holder['pid']} ({holder['comm']}), "
+            f"{holder['files']} file(s), largest {holder['largest_path']}"
+        )
+    if data.get("processes_denied"):
+        lines.append(f"    ({data['processes_denied']} processes not readable; run as root to see all)")
+    return lines
+
+
+# Renderers of monitor diagnostics by name
+DIAGNOSTIC_FORMATTERS: Dict[str, Callable[[Dict[str, Any]], List[str]]] = {
+    "disk_usage": _format_disk_usage,
+    "deleted_open": _format_deleted_open,
+}
 
 
 class TextReporter:
@@ -69,6 +116,16 @@ class TextReporter:
                 lines.append("Status: OK (no anomalies)")
                 lines.append("")
             
+            # Diagnostics gathered for the anomalies
+            diagnostics = monitor_data.get("diagnostics", {})
+            if diagnostics:
+                lines.append("Diagnostics:")
+                for name, data in diagnostics.items():
+                    formatter = DIAGNOSTIC_FORMATTERS.get(name)
+                    if formatter is not None:
+                        lines.extend(formatter(data))
+                lines.append("")
+            
             # Suggested commands
             commands = monitor_data.get("suggested_commands", [])
             if commands and anomalies:
@@ -1,7 +1,15 @@
 """Rule evaluation engine."""
 
 from .engine import RuleEngine
-from .operators import apply_operator
+from .operators import apply_operator, get_operator
 from .model import RuleResult
+from .plan import EvaluationPlan, CompiledRule
 
-__all__ = ["RuleEngine", "apply_operator", "RuleResult"]
+__all__ = [
+    "RuleEngine",
+    "apply_operator",
+    "get_operator",
+    "RuleResult",
+    "EvaluationPlan",
+    "CompiledRule",
+]
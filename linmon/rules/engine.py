@@ -1,11 +1,16 @@
 """Rule evaluation engine with streak tracking."""
 
-from typing import Dict, List
+import time
+from typing import List, Mapping, Optional, Union
 from .model import RuleResult
-from .operators import apply_operator
+from .plan import CompiledRule, EvaluationPlan
 from ..config.schema import Rule
+from ..metrics.model import MetricFamily, MetricSet
 from ..state.manager import StateManager
 
+# Upper bound on series per family, used to build integer sort keys
+_MAX_SERIES = 1 << 32
+
 
 class RuleEngine:
     """Evaluates rules against metrics with streak tracking."""
@@ -19,52 +24,186 @@ class RuleEngine:
         """
         self.state = state_manager
     
+    def compile(self, rules: List[Rule]) -> EvaluationPlan:
+        """
+        Compile rules into an evaluation plan.
+        
+        Args:
+            rules: List of rules to compile
+            
+        Returns:
+            Evaluation plan to pass to evaluate_plan()
+        """
+        return EvaluationPlan(rules)
+    
     def evaluate(
         self,
-        rules: List[Rule],
-        metrics: Dict[str, float],
+        rules: Union[List[Rule], EvaluationPlan],
+        metrics: Mapping[str, float],
     ) -> List[RuleResult]:
         """
         Evaluate rules against metrics.
         
         Args:
-            rules: List of rules to evaluate
-            metrics: Dictionary of metric_name -> value
+            rules: List of rules (compiled on the fly) or a compiled plan
+            metrics: MetricSet, or dictionary of metric_name -> value
             
         Returns:
             List of rule evaluation results
         """
-        results = []
+        plan = rules if isinstance(rules, EvaluationPlan) else EvaluationPlan(rules)
+        return self.evaluate_plan(plan, metrics)
+    
+    def evaluate_plan(
+        self,
+        plan: EvaluationPlan,
+        metrics: Mapping[str, float],
+        now: Optional[float] = None,
+    ) -> List[RuleResult]:
+        """
+        Evaluate a compiled plan against metrics.
         
-        for rule in rules:
-            if rule.metric not in metrics:
-                # Metric not available, skip rule
-                continue
+        Each threshold rule is applied to every series of its family that
+        matches its label selector. Trend rules first record the sample in
+        the series history (sized to cover the longest window of the rules
+        reading the family) and compare the derived rate/delta/ETA instead;
+        while that is undefined (too few samples, or not heading for the
+        target) their streak is reset and no result is reported. Rules whose
+        metric is missing are skipped. Results are returned in plan (config)
+        order.
+        
+        Args:
+            plan: Compiled evaluation plan
+            metrics: MetricSet, or dictionary of metric_name -> value
+            now: Sample timestamp for trend rules (defaults to time.time())
+            
+        Returns:
+            List of rule evaluation results
+        """
+        if not isinstance(metrics, MetricSet):
+            metrics = MetricSet.from_dict(metrics)
+        
+        by_metric = plan.by_metric
+        by_label = plan.by_label
+        
+        # Matches are collected into parallel lists (no per-match tuples, to
+        # keep GC pressure down) and then processed in plan order, so streaks
+        # advance and results are built in config order
+        order: List[int] = []
+        matched_rules: List[CompiledRule] = []
+        matched_families: List[Optional[MetricFamily]] = []
+        matched_positions: List[int] = []
+        
+        def add(compiled: CompiledRule, family: Optional[MetricFamily], pos: int) -> None:
+            order.append(compiled.index * _MAX_SERIES + pos)
+            matched_rules.append(compiled)
+            matched_families.append(family)
+            matched_positions.append(pos)
+        
+        for name, family in metrics.families.items():
+            compiled_rules = by_metric.get(name)
+            if compiled_rules is not None:
+                for compiled in compiled_rules:
+                    for pos in family.select(compiled.selector):
+                        add(compiled, family, pos)
             
-            value = metrics[rule.metric]
-            violated = apply_operator(rule.op, value, rule.value)
+            label_rules = by_label.get(name)
+            if label_rules is not None:
+                # Join rules and series on label value, walking the smaller side
+                for label_name, rules_by_value in label_rules.items():
+                    series_by_value = family.label_index(label_name)
+                    if len(rules_by_value) <= len(series_by_value):
+                        pairs = ((r, series_by_value.get(v)) for v, r in rules_by_value.items())
+                    else:
+                        pairs = ((rules_by_value.get(v), p) for v, p in series_by_value.items())
+                    for pinned, positions in pairs:
+                        if not pinned or not positions:
+                            continue
+                        for compiled in pinned:
+                            for pos in positions:
+                                add(compiled, family, pos)
+        
+        for compiled in plan.expressions:
+            if all(name in metrics for name in compiled.expression.names):
+                add(compiled, None, 0)
+        
+        results: List[RuleResult] = []
+        record = self._record
+        if now is None:
+            now = time.time()
+        for i in sorted(range(len(order)), key=order.__getitem__):
+            compiled = matched_rules[i]
+            family = matched_families[i]
+            
+            if family is None:
+                try:
+                    violated = bool(compiled.expression.evaluate(metrics))
+                except (ArithmeticError, TypeError):
+                    # e.g. division by a zero-valued metric
+                    continue
+                results.append(record(compiled, compiled.name, compiled.metric, 1.0 if violated else 0.0, violated))
+                continue
             
-            # Update streak
-            if violated:
-                streak = self.state.increment_rule_streak(rule.name)
-            else:
-                self.state.reset_rule_streak(rule.name)
-                streak = 0
+            pos = matched_positions[i]
+            value = family.values[pos]
+            series_key = family.series_key(pos)
+            streak_key = compiled.streak_key(family.label_suffix(pos))
             
-            anomaly = streak >= rule.consecutive
+            if compiled.trend is not None:
+                history = self.state.record_sample(series_key, now, value, plan.trend_spans.get(compiled.metric))
+                since = now - compiled.window if compiled.window is not None else None
+                value = compiled.trend(history, since, compiled.per, compiled.target)
+                if value is None:
+                    self.state.reset_rule_streak(streak_key)
+                    continue
             
-            results.append(
-                RuleResult(
-                    rule_name=rule.name,
-                    metric=rule.metric,
-                    value=value,
-                    threshold=rule.value,
-                    operator=rule.op,
-                    violated=violated,
-                    streak=streak,
-                    consecutive_required=rule.consecutive,
-                    anomaly=anomaly,
-                )
-            )
+            violated = compiled.test(value, compiled.threshold)
+            results.append(record(
+                compiled,
+                streak_key,
+                compiled.report_metric(series_key),
+                value,
+                violated,
+            ))
         
         return results
+    
+    def _record(
+        self,
+        compiled: CompiledRule,
+        streak_key: str,
+        metric: str,
+        value: float,
+        violated: bool,
+    ) -> RuleResult:
+        """
+        Update the streak for a rule and build its result.
+        
+        Args:
+            compiled: Compiled rule
+            streak_key: State key for the streak
+            metric: Metric (series) name to report
+            value: Value to report
+            violated: Whether the rule condition was met
+            
+        Returns:
+            Rule evaluation result
+        """
+        # Update streak
+        if violated:
+            streak = self.state.increment_rule_streak(streak_key)
+        else:
+            self.state.reset_rule_streak(streak_key)
+            streak = 0
+        
+        return RuleResult(
+            rule_name=compiled.name,
+            metric=metric,
+            value=value,
+            threshold=compiled.threshold,
+            operator=compiled.op,
+            violated=violated,
+            streak=streak,
+            consecutive_required=compiled.consecutive,
+            anomaly=streak >= compiled.consecutive,
+        )
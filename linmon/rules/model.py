@@ -1,18 +1,73 @@
 """Rule evaluation result models."""
 
-from typing import Optional
-from pydantic import BaseModel
+from typing import Any, Dict
 
 
-class RuleResult(BaseModel):
-    """Result of rule evaluation."""
+class RuleResult:
+    """
+    Result of rule evaluation.
     
-    rule_name: str
-    metric: str
-    value: float
-    threshold: float
-    operator: str
-    violated: bool
-    streak: int
-    consecutive_required: int
-    anomaly: bool  # True if streak >= consecutive_required
+    A plain ``__slots__`` record rather than a pydantic model: thousands are
+    created per run, and they are only ever serialized via to_dict().
+    """
+    
+    __slots__ = (
+        "rule_name",
+        "metric",
+        "value",
+        "threshold",
+        "operator",
+        "violated",
+        "streak",
+        "consecutive_required",
+        "anomaly",
+    )
+    
+    def __init__(
+        self,
+        *,
+        rule_name: str,
+        metric: str,
+        value: float,
+        threshold: float,
+        operator: str,
+        violated: bool,
+        streak: int,
+        consecutive_required: int,
+        anomaly: bool,  # True if streak >= consecutive_required
+    ):
+        """Initialize result."""
+        self.rule_name = rule_name
+        self.metric = metric
+        self.value = value
+        self.threshold = threshold
+        self.operator = operator
+        self.violated = violated
+        self.streak = streak
+        self.consecutive_required = consecutive_required
+        self.anomaly = anomaly
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize to a JSON-compatible dictionary."""
+        return {
+            "rule_name": self.rule_name,
+            "metric": self.metric,
+            "value": self.value,
+            "threshold": self.threshold,
+            "operator": self.operator,
+            "violated": self.violated,
+            "streak": self.streak,
+            "consecutive_required": self.consecutive_required,
+            "anomaly": self.anomaly,
+        }
+    
+    def __eq__(self, other: object) -> bool:
+        """Compare field by field."""
+        if not isinstance(other, RuleResult):
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in self.__slots__)
+    
+    def __repr__(self) -> str:
+        """Debug representation."""
+        fields = ", ".join(f"{f}={getattr(self, f)!r}" for f in self.__slots__)
+        return f"RuleResult({fields})"
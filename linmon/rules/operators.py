@@ -1,9 +1,52 @@
 """Comparison operators for rule evaluation."""
 
-from typing import Literal
+import operator
+from typing import Callable, Dict, Literal
 
 Operator = Literal["gt", "gte", "lt", "lte", "eq", "ne"]
 
+OperatorFunc = Callable[[float, float], bool]
+
+
+def _eq(value: float, threshold: float) -> bool:
+    """Float-tolerant equality."""
+    return abs(value - threshold) < 1e-9
+
+
+def _ne(value: float, threshold: float) -> bool:
+    """Float-tolerant inequality."""
+    return abs(value - threshold) >= 1e-9
+
+
+# Dispatch table: operator name -> comparison function
+OPERATORS: Dict[str, OperatorFunc] = {
+    "gt": operator.gt,
+    "gte": operator.ge,
+    "lt": operator.lt,
+    "lte": operator.le,
+    "eq": _eq,
+    "ne": _ne,
+}
+
+
+def get_operator(op: Operator) -> OperatorFunc:
+    """
+    Look up the comparison function for an operator.
+    
+    Args:
+        op: Operator name
+        
+    Returns:
+        Function taking (value, threshold) and returning True on violation
+        
+    Raises:
+        ValueError: If the operator is unknown
+    """
+    try:
+        return OPERATORS[op]
+    except KeyError:
+        raise ValueError(f"Unknown operator: {op}") from None
+
 
 def apply_operator(op: Operator, value: float, threshold: float) -> bool:
     """
@@ -17,17 +60,4 @@ def apply_operator(op: Operator, value: float, threshold: float) -> bool:
     Returns:
         True if condition is met (violation)
     """
-    if op == "gt":
-        return value > threshold
-    elif op == "gte":
-        return value >= threshold
-    elif op == "lt":
-        return value < threshold
-    elif op == "lte":
-        return value <= threshold
-    elif op == "eq":
-        return abs(value - threshold) < 1e-9  # Float comparison
-    elif op == "ne":
-        return abs(value - threshold) >= 1e-9
-    else:
-        raise ValueError(f"Unknown operator: {op}")
+    return get_operator(op)(value, threshold)
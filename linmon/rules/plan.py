@@ -0,0 +1,175 @@
+"""Compiled rule evaluation plans."""
+
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from ..metrics.expr import CompiledExpression, compile_expression
+from .operators import OperatorFunc, get_operator
+from .trend import TrendFunc, get_trend
+from ..config.schema import Rule
+from ..metrics.model import LabelSelector, parse_series_key
+from ..util.time import parse_duration
+
+# Operator label reported for expression rules
+EXPR_OPERATOR = "expr"
+
+
+class CompiledRule:
+    """A rule with its operator bound and its position in the plan fixed."""
+    
+    __slots__ = (
+        "index",
+        "rule",
+        "name",
+        "metric",
+        "op",
+        "threshold",
+        "consecutive",
+        "test",
+        "expression",
+        "selector",
+        "trend",
+        "window",
+        "per",
+        "target",
+    )
+    
+    def __init__(self, index: int, rule: Rule):
+        """
+        Compile a rule.
+        
+        Args:
+            index: Position of the rule in the plan (used to order results)
+            rule: Validated rule from the config
+        """
+        self.index = index
+        self.rule = rule
+        self.name = rule.name
+        self.consecutive = rule.consecutive
+        self.expression: Optional[CompiledExpression] = None
+        self.selector = LabelSelector()
+        self.trend: Optional[TrendFunc] = None
+        self.window: Optional[float] = None
+        self.per = 1.0
+        self.target = 100.0
+        
+        if rule.expr is not None:
+            # Expression rules report the expression as their metric and a
+            # 1.0/0.0 truth value against a threshold of 1.0
+            self.expression = compile_expression(rule.expr)
+            self.metric = rule.expr
+            self.op = EXPR_OPERATOR
+            self.threshold = 1.0
+            self.test: OperatorFunc = get_operator("gte")
+        else:
+            # metric may carry an inline selector: name{label="value"}
+            family, inline_labels = parse_series_key(rule.metric)
+            self.metric = family
+            self.op = rule.op
+            self.threshold = rule.value
+            self.test = get_operator(rule.op)
+            self.selector = LabelSelector({**inline_labels, **rule.labels})
+            
+            if rule.type != "threshold":
+                # Trend rules compare a value derived from the series history
+                self.trend = get_trend(rule.type)
+                if "window" in rule.args:
+                    self.window = parse_duration(str(rule.args["window"]))
+                self.per = parse_duration(str(rule.args.get("per", "1s")))
+                self.target = float(rule.args.get("target", 100.0))
+    
+    def streak_key(self, label_suffix: str) -> str:
+        """
+        Get the state key used to track this rule's streak for one series.
+        
+        Rules pinned to a single series keep the plain rule name; rules that
+        can match several series track a streak per series.
+        
+        Args:
+            label_suffix: Formatted labels of the series (may be empty)
+            
+        Returns:
+            Streak key
+        """
+        if not label_suffix or self.selector.exact:
+            return self.name
+        return self.name + label_suffix
+    
+    def report_metric(self, series_key: str) -> str:
+        """Get the metric name to report for a series, e.g. ``rate(x)``."""
+        if self.trend is None:
+            return series_key
+        return f"{self.rule.type}({series_key})"
+
+
+class EvaluationPlan:
+    """
+    Rules compiled once and indexed by metric family name.
+    
+    Evaluating a plan only touches rules whose family is present, so the
+    cost follows the number of metrics collected rather than the number of
+    rules configured. Rules pinned to one exact label value are indexed by
+    label name and value and joined against the family's label index;
+    other selectors are resolved through MetricFamily.select(). Exact duplicate rules are
+    collapsed so each rule is evaluated (and its streak advanced) once per
+    run. Expression rules read several metrics and are kept in a separate
+    list.
+    """
+    
+    def __init__(self, rules: Iterable[Rule]):
+        """
+        Compile rules into a plan.
+        
+        Args:
+            rules: Rules to compile, in reporting order
+        """
+        self.rules: List[CompiledRule] = []
+        self.by_metric: Dict[str, List[CompiledRule]] = {}
+        self.by_label: Dict[str, Dict[str, Dict[str, List[CompiledRule]]]] = {}
+        self.expressions: List[CompiledRule] = []
+        # Family -> longest trend window, the span its histories must cover
+        self.trend_spans: Dict[str, float] = {}
+        
+        seen: Set[Tuple] = set()
+        for rule in rules:
+            key = (
+                rule.name,
+                rule.metric,
+                tuple(sorted(rule.labels.items())),
+                rule.op,
+                rule.value,
+                rule.expr,
+                rule.consecutive,
+                rule.type,
+                tuple(sorted((k, str(v)) for k, v in rule.args.items())),
+            )
+            if key in seen:
+                continue
+            seen.add(key)
+            
+            compiled = CompiledRule(len(self.rules), rule)
+            self.rules.append(compiled)
+            if compiled.window is not None:
+                span = self.trend_spans.get(compiled.metric, 0.0)
+                self.trend_spans[compiled.metric] = max(span, compiled.window)
+            matchers = compiled.selector.matchers
+            if compiled.expression is not None:
+                self.expressions.append(compiled)
+            elif len(matchers) == 1 and matchers[0][1] is not None:
+                label_name, label_value = matchers[0][0], matchers[0][1]
+                by_value = self.by_label.setdefault(compiled.metric, {}).setdefault(label_name, {})
+                by_value.setdefault(label_value, []).append(compiled)
+            else:
+                self.by_metric.setdefault(compiled.metric, []).append(compiled)
+    
+    def __len__(self) -> int:
+        """Number of compiled rules."""
+        return len(self.rules)
+    
+    @property
+    def rule_names(self) -> Set[str]:
+        """Names of all rules in the plan."""
+        return {compiled.name for compiled in self.rules}
+    
+    @property
+    def trend_metrics(self) -> Set[str]:
+        """Metric families whose history is kept for trend rules."""
+        return {compiled.metric for compiled in self.rules if compiled.trend is not None}
@@ -0,0 +1,61 @@
+"""Trend functions for rate, delta and time-to-target rules."""
+
+from typing import Callable, Dict, Optional
+from ..state.history import MetricHistory
+
+# (history, since, per, target) -> derived value, or None if undefined
+TrendFunc = Callable[[MetricHistory, Optional[float], float, float], Optional[float]]
+
+
+def _rate(history: MetricHistory, since: Optional[float], per: float, target: float) -> Optional[float]:
+    """Least-squares rate of change per ``per`` seconds."""
+    slope = history.slope(since)
+    return None if slope is None else slope * per
+
+
+def _delta(history: MetricHistory, since: Optional[float], per: float, target: float) -> Optional[float]:
+    """Change across the window."""
+    return history.delta(since)
+
+
+def _eta_seconds(history: MetricHistory, since: Optional[float], per: float, target: float) -> Optional[float]:
+    """Seconds until the fitted trend reaches ``target`` from the latest value."""
+    slope = history.slope(since)
+    last = history.last()
+    if slope is None or last is None:
+        return None
+    
+    remaining = target - last[1]
+    if remaining == 0:
+        return 0.0
+    if remaining * slope <= 0:
+        # Flat or moving away from the target
+        return None
+    return remaining / slope
+
+
+# Dispatch table: rule type -> trend function
+TRENDS: Dict[str, TrendFunc] = {
+    "rate": _rate,
+    "delta": _delta,
+    "eta_seconds": _eta_seconds,
+}
+
+
+def get_trend(rule_type: str) -> TrendFunc:
+    """
+    Look up the trend function for a rule type.
+    
+    Args:
+        rule_type: Rule type other than "threshold"
+        
+    Returns:
+        Function taking (history, since, per, target)
+        
+    Raises:
+        ValueError: If the rule type has no trend function
+    """
+    try:
+        return TRENDS[rule_type]
+    except KeyError:
+        raise ValueError(f"Unknown trend rule type: {rule_type}") from None
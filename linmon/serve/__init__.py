@@ -0,0 +1,15 @@
+"""Long-running serve mode: periodic checks plus an HTTP snapshot endpoint."""
+
+from .snapshot import Response, Snapshot, SnapshotCache, build_snapshot
+from .server import MetricsServer, collect_once, parse_listen, serve
+
+__all__ = [
+    "Response",
+    "Snapshot",
+    "SnapshotCache",
+    "build_snapshot",
+    "MetricsServer",
+    "collect_once",
+    "parse_listen",
+    "serve",
+]
@@ -0,0 +1,173 @@
+"""Threaded HTTP listener serving cached snapshots, and the serve-mode loop."""
+
+import signal
+import socket
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Tuple
+from .snapshot import SnapshotCache, build_snapshot
+from ..util.lock import LockBusyError
+from ..util.time import parse_duration
+
+
+def parse_listen(listen: str) -> Tuple[str, int]:
+    """
+    Parse a listen address.
+    
+    Args:
+        listen: "host:port", "[v6addr]:port" or ":port" (all interfaces)
+        
+    Returns:
+        Tuple of (host, port)
+        
+    Raises:
+        ValueError: If the address is malformed
+    """
+    host, sep, port = listen.rpartition(":")
+    if not sep or not port.isdigit() or not 0 < int(port) < 65536:
+        raise ValueError(f"Invalid listen address: {listen!r} (use host:port)")
+    return (host.strip("[]"), int(port))
+
+
+class SnapshotHandler(BaseHTTPRequestHandler):
+    """Serves GET/HEAD requests from the server's snapshot cache."""
+    
+    server_version = "linmon"
+    protocol_version = "HTTP/1.1"
+    
+    def do_GET(self) -> None:
+        """Send the cached response for the path."""
+        self._respond(send_body=True)
+    
+    def do_HEAD(self) -> None:
+        """Send the headers of the cached response."""
+        self._respond(send_body=False)
+    
+    def _respond(self, send_body: bool) -> None:
+        """Look the path up in the current snapshot and write it out."""
+        path = self.path.split("?", 1)[0]
+        snapshot, response = self.server.cache.lookup(path)
+        if snapshot is None:
+            self._send_plain(503, b"no snapshot yet\n", send_body)
+            return
+        if response is None:
+            self._send_plain(404, b"not found\n", send_body)
+            return
+        
+        body = response.body
+        gzipped = response.gzip_body is not None and "gzip" in self.headers.get("Accept-Encoding", "")
+        if gzipped:
+            body = response.gzip_body
+        self.send_response(200)
+        self.send_header("Content-Type", response.content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if gzipped:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Vary", "Accept-Encoding")
+        self.send_header("Age", str(max(0, int(time.time() - snapshot.created))))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+    
+    def _send_plain(self, status: int, body: bytes, send_body: bool) -> None:
+        """Send a short plain-text status response."""
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+    
+    def log_message(self, format: str, *args) -> None:
+        """Don't log every scrape."""
+        pass
+
+
+class MetricsServer(ThreadingHTTPServer):
+    """HTTP server whose handler threads read a shared SnapshotCache."""
+    
+    daemon_threads = True
+    
+    def __init__(self, address: Tuple[str, int], cache: SnapshotCache):
+        """
+        Bind the listener.
+        
+        Args:
+            address: (host, port) to listen on
+            cache: Snapshot cache to serve from
+        """
+        self.cache = cache
+        if ":" in address[0]:
+            self.address_family = socket.AF_INET6
+        super().__init__(address, SnapshotHandler)
+
+
+def collect_once(core, cache: SnapshotCache) -> Optional[int]:
+    """
+    Run one check and publish its snapshot.
+    
+    Args:
+        core: LinmonCore instance
+        cache: Snapshot cache to publish to
+        
+    Returns:
+        Exit code of the run, or None if another run held the state lock
+    """
+    try:
+        exit_code, _, json_report = core.run(wait=False)
+    except LockBusyError as e:
+        print(f"linmon: {e}; keeping the previous snapshot", file=sys.stderr)
+        return None
+    cache.publish(build_snapshot(core.prometheus_reporter.format(core.last_report), json_report))
+    return exit_code
+
+
+def serve(
+    core,
+    listen: str,
+    interval: Optional[float] = None,
+    stop: Optional[threading.Event] = None,
+) -> None:
+    """
+    Serve snapshots over HTTP while running a check every ``interval`` seconds.
+    
+    Checks run on the calling thread; requests are answered on listener
+    threads from the last published snapshot. Before each check the config
+    file is reloaded if it changed (unless serve.reload is off). Returns
+    after SIGTERM/SIGINT or when ``stop`` is set.
+    
+    Args:
+        core: LinmonCore instance
+        listen: Listen address ("host:port")
+        interval: Seconds between checks (None: serve.interval of the
+            current config)
+        stop: Event that ends the loop (default: set by SIGTERM/SIGINT)
+    """
+    cache = SnapshotCache()
+    server = MetricsServer(parse_listen(listen), cache)
+    listener = threading.Thread(target=server.serve_forever, name="linmon-http", daemon=True)
+    listener.start()
+    
+    if stop is None:
+        stop = threading.Event()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, lambda *_: stop.set())
+    
+    try:
+        while not stop.is_set():
+            started = time.monotonic()
+            try:
+                if core.config.serve.reload:
+                    core.reload()
+                collect_once(core, cache)
+            except Exception as e:
+                # Keep serving the last good snapshot
+                print(f"linmon: check failed: {e}", file=sys.stderr)
+            period = interval if interval is not None else parse_duration(core.config.serve.interval)
+            stop.wait(max(0.0, period - (time.monotonic() - started)))
+    finally:
+        server.shutdown()
+        server.server_close()
+        core.close()
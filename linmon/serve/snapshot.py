@@ -0,0 +1,107 @@
+"""Precomputed HTTP responses for the latest run."""
+
+import gzip
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+JSON_CONTENT_TYPE = "application/json"
+TEXT_CONTENT_TYPE = "text/plain; charset=utf-8"
+
+# Bodies smaller than this are not worth compressing
+GZIP_MIN_BYTES = 1024
+
+
+class Response:
+    """A fully rendered response body with an optional gzip variant."""
+    
+    __slots__ = ("content_type", "body", "gzip_body")
+    
+    def __init__(self, content_type: str, body: bytes):
+        """
+        Initialize response, compressing the body once up front.
+        
+        Args:
+            content_type: Content-Type header value
+            body: Response body
+        """
+        self.content_type = content_type
+        self.body = body
+        self.gzip_body: Optional[bytes] = (
+            gzip.compress(body, compresslevel=6) if len(body) >= GZIP_MIN_BYTES else None
+        )
+
+
+class Snapshot:
+    """Responses of every endpoint for one run; never modified once published."""
+    
+    __slots__ = ("created", "responses")
+    
+    def __init__(self, responses: Dict[str, Response], created: Optional[float] = None):
+        """
+        Initialize snapshot.
+        
+        Args:
+            responses: Mapping of URL path -> response
+            created: Time the snapshot was built (default: now)
+        """
+        self.created = time.time() if created is None else created
+        self.responses = responses
+
+
+def build_snapshot(prometheus_text: str, json_report: str) -> Snapshot:
+    """
+    Render all endpoints for a run.
+    
+    Args:
+        prometheus_text: Exposition text from PrometheusReporter
+        json_report: JSON report from JSONReporter
+        
+    Returns:
+        Snapshot to publish
+    """
+    metrics = Response(PROMETHEUS_CONTENT_TYPE, prometheus_text.encode("utf-8"))
+    report = Response(JSON_CONTENT_TYPE, json_report.encode("utf-8"))
+    return Snapshot({
+        "/metrics": metrics,
+        "/report.json": report,
+        "/healthz": Response(TEXT_CONTENT_TYPE, b"ok\n"),
+    })
+
+
+class SnapshotCache:
+    """
+    Holds the snapshot that requests are served from.
+    
+    Publishing swaps a single reference, so request threads read either the
+    old or the new snapshot without locking, and a scrape never waits for
+    or triggers a collection.
+    """
+    
+    def __init__(self):
+        """Initialize empty cache."""
+        self.current: Optional[Snapshot] = None
+        self._published = threading.Event()
+    
+    def publish(self, snapshot: Snapshot) -> None:
+        """Replace the served snapshot."""
+        self.current = snapshot
+        self._published.set()
+    
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait until a first snapshot is published; True if there is one."""
+        return self._published.wait(timeout)
+    
+    def lookup(self, path: str) -> Tuple[Optional[Snapshot], Optional[Response]]:
+        """
+        Find the response for a path in the current snapshot.
+        
+        Returns:
+            Tuple of (snapshot or None before the first run, response or
+            None for an unknown path)
+        """
+        snapshot = self.current
+        if snapshot is None:
+            return (None, None)
+        return (snapshot, snapshot.responses.get(path))
@@ -1,6 +1,8 @@
 """State persistence management."""
 
+from .counters import CounterFile
+from .history import MetricHistory
 from .manager import StateManager
-from .model import State
+from .model import AlertState, State
 
-__all__ = ["StateManager", "State"]
+__all__ = ["StateManager", "State", "AlertState", "MetricHistory", "CounterFile"]
@@ -0,0 +1,74 @@
+"""Counter snapshots kept between runs, for monitors that report rates."""
+
+import json
+from typing import Any, Dict, Optional, Tuple
+from ..util.fs import atomic_write
+
+COUNTERS_VERSION = 1
+
+Snapshot = Tuple[float, Dict[str, Any]]
+
+
+class CounterFile:
+    """
+    The previous sample of a set of kernel counters.
+    
+    Monitors turn counters into rates by comparing each run with the one
+    before. In a long-running process the previous sample is kept in
+    memory; it is also written to its own file (not the state file, which
+    would then change on every run), so one-shot runs can pick it up.
+    """
+    
+    def __init__(self, path: Optional[str], source: str):
+        """
+        Initialize counter file.
+        
+        Args:
+            path: Snapshot file (None: keep it in memory only)
+            source: What was sampled (e.g. the cgroup root); a snapshot of
+                another source is ignored
+        """
+        self.path = path
+        self.source = source
+        self._previous: Optional[Snapshot] = None
+        self._loaded = False
+    
+    def swap(self, timestamp: float, counters: Dict[str, Any]) -> Optional[Snapshot]:
+        """
+        Store this run's counters and get the previous run's.
+        
+        Args:
+            timestamp: Sample time (seconds since the epoch)
+            counters: JSON-serializable counters
+            
+        Returns:
+            (timestamp, counters) of the previous sample, or None
+        """
+        previous = self._previous if self._loaded else self._load()
+        self._previous = (timestamp, counters)
+        self._loaded = True
+        if self.path is not None:
+            data = {"version": COUNTERS_VERSION, "source": self.source, "timestamp": timestamp, "counters": counters}
+            try:
+                atomic_write(self.path, json.dumps(data, separators=(",", ":")))
+            except OSError:
+                pass
+        return previous
+    
+    def _load(self) -> Optional[Snapshot]:
+        """Read the snapshot file."""
+        if self.path is None:
+            return None
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict):
+            return None
+        if data.get("version") != COUNTERS_VERSION or data.get("source") != self.source:
+            return None
+        try:
+            return (float(data["timestamp"]), dict(data["counters"]))
+        except (KeyError, TypeError, ValueError):
+            return None
@@ -0,0 +1,237 @@
+"""Fixed-size ring history of (timestamp, value) samples per metric."""
+
+import base64
+import struct
+from array import array
+from typing import Optional, Tuple
+
+_HEADER = struct.Struct("<dH")  # base timestamp, sample count
+
+
+class MetricHistory:
+    """
+    Ring buffer of samples with a running least-squares fit.
+    
+    Sums for the fit are updated as samples are appended and evicted, so
+    the slope over the whole ring is O(1). Times are kept relative to a
+    base timestamp to keep the sums well conditioned.
+    """
+    
+    __slots__ = ("capacity", "base", "times", "values", "head", "count", "_n", "_st", "_sv", "_stt", "_stv")
+    
+    def __init__(self, capacity: int, base: Optional[float] = None):
+        """
+        Initialize empty history.
+        
+        Args:
+            capacity: Maximum number of samples kept
+            base: Base timestamp (defaults to the first sample's)
+        """
+        self.capacity = capacity
+        self.base = base
+        self.times = array("d", [0.0]) * capacity
+        self.values = array("d", [0.0]) * capacity
+        self.head = 0  # Index of the oldest sample
+        self.count = 0
+        self._reset_sums()
+    
+    def _reset_sums(self) -> None:
+        """Clear the running fit sums."""
+        self._n = 0
+        self._st = 0.0
+        self._sv = 0.0
+        self._stt = 0.0
+        self._stv = 0.0
+    
+    def _add(self, t: float, v: float, sign: int) -> None:
+        """Add (sign=1) or remove (sign=-1) a sample from the fit sums."""
+        self._n += sign
+        self._st += sign * t
+        self._sv += sign * v
+        self._stt += sign * t * t
+        self._stv += sign * t * v
+    
+    def append(self, timestamp: float, value: float) -> None:
+        """
+        Append a sample, evicting the oldest when full.
+        
+        A sample with the same timestamp as the newest one replaces it, so
+        several rules reading one series in a run record it once.
+        
+        Args:
+            timestamp: Sample time (seconds since the epoch)
+            value: Sample value
+        """
+        if self.base is None:
+            self.base = timestamp
+        t = timestamp - self.base
+        
+        if self.count:
+            last = (self.head + self.count - 1) % self.capacity
+            if self.times[last] == t:
+                self._add(t, self.values[last], -1)
+                self.values[last] = value
+                self._add(t, value, 1)
+                return
+        
+        if self.count == self.capacity:
+            self._add(self.times[self.head], self.values[self.head], -1)
+            self.head = (self.head + 1) % self.capacity
+            self.count -= 1
+        
+        slot = (self.head + self.count) % self.capacity
+        self.times[slot] = t
+        self.values[slot] = value
+        self.count += 1
+        self._add(t, value, 1)
+    
+    def resize(self, capacity: int) -> None:
+        """
+        Change the capacity, keeping the newest samples.
+        
+        Args:
+            capacity: New maximum number of samples
+        """
+        kept = list(self.samples())[-capacity:]
+        self.capacity = capacity
+        self.times = array("d", [0.0]) * capacity
+        self.values = array("d", [0.0]) * capacity
+        self.head = 0
+        self.count = 0
+        self._reset_sums()
+        for timestamp, value in kept:
+            self.append(timestamp, value)
+    
+    def interval(self) -> Optional[float]:
+        """Average time between samples, or None with fewer than two."""
+        if self.count < 2:
+            return None
+        oldest = self.times[self.head]
+        newest = self.times[(self.head + self.count - 1) % self.capacity]
+        return (newest - oldest) / (self.count - 1)
+    
+    def samples(self, since: Optional[float] = None):
+        """
+        Iterate samples oldest first.
+        
+        Args:
+            since: Only yield samples at or after this timestamp
+            
+        Yields:
+            (timestamp, value) tuples
+        """
+        base = self.base or 0.0
+        for i in range(self.count):
+            slot = (self.head + i) % self.capacity
+            timestamp = self.times[slot] + base
+            if since is None or timestamp >= since:
+                yield (timestamp, self.values[slot])
+    
+    def last(self) -> Optional[Tuple[float, float]]:
+        """Get the newest sample, or None if empty."""
+        if not self.count:
+            return None
+        slot = (self.head + self.count - 1) % self.capacity
+        return (self.times[slot] + (self.base or 0.0), self.values[slot])
+    
+    def slope(self, since: Optional[float] = None) -> Optional[float]:
+        """
+        Least-squares slope (value units per second).
+        
+        Args:
+            since: Only fit samples at or after this timestamp
+            
+        Returns:
+            Slope, or None with fewer than two distinct sample times
+        """
+        oldest = next(self.samples(), None)
+        if since is None or oldest is None or oldest[0] >= since:
+            n, st, sv, stt, stv = self._n, self._st, self._sv, self._stt, self._stv
+        else:
+            base = self.base or 0.0
+            n, st, sv, stt, stv = 0, 0.0, 0.0, 0.0, 0.0
+            for timestamp, v in self.samples(since):
+                t = timestamp - base
+                n += 1
+                st += t
+                sv += v
+                stt += t * t
+                stv += t * v
+        
+        if n < 2:
+            return None
+        denominator = n * stt - st * st
+        if denominator <= 1e-9:
+            return None
+        return (n * stv - st * sv) / denominator
+    
+    def delta(self, since: Optional[float] = None) -> Optional[float]:
+        """
+        Change between the oldest and newest sample.
+        
+        Args:
+            since: Only consider samples at or after this timestamp
+            
+        Returns:
+            Difference, or None with fewer than two samples
+        """
+        window = list(self.samples(since))
+        if len(window) < 2:
+            return None
+        return window[-1][1] - window[0][1]
+    
+    def encode(self) -> str:
+        """
+        Pack the history into a compact base64 string.
+        
+        Layout: oldest timestamp and count, then float32 time offsets from
+        the oldest sample and float64 values, oldest first. Offsets only
+        span the ring, so float32 keeps sub-second precision.
+        """
+        times = array("f")
+        values = array("d")
+        oldest = self.times[self.head] if self.count else 0.0
+        for i in range(self.count):
+            slot = (self.head + i) % self.capacity
+            times.append(self.times[slot] - oldest)
+            values.append(self.values[slot])
+        
+        base = (self.base or 0.0) + oldest
+        data = _HEADER.pack(base, self.count) + times.tobytes() + values.tobytes()
+        return base64.b64encode(data).decode("ascii")
+    
+    @classmethod
+    def decode(cls, packed: str, capacity: int, grow: bool = False) -> "MetricHistory":
+        """
+        Unpack a history produced by encode().
+        
+        Args:
+            packed: Base64 string
+            capacity: Ring capacity (older samples beyond it are dropped)
+            grow: Enlarge the ring to hold every stored sample instead
+            
+        Returns:
+            Metric history
+            
+        Raises:
+            ValueError: If the data is malformed
+        """
+        try:
+            data = base64.b64decode(packed.encode("ascii"), validate=True)
+            base, count = _HEADER.unpack_from(data)
+            times = array("f")
+            values = array("d")
+            offset = _HEADER.size
+            times.frombytes(data[offset:offset + 4 * count])
+            values.frombytes(data[offset + 4 * count:offset + 12 * count])
+        except (ValueError, struct.error) as e:
+            raise ValueError(f"Invalid metric history: {e}") from None
+        if len(times) != count or len(values) != count:
+            raise ValueError("Invalid metric history: truncated")
+        
+        if grow:
+            capacity = max(capacity, count)
+        history = cls(capacity, base if count else None)
+        for t, v in zip(times[-capacity:], values[-capacity:]):
+            history.append(base + t, v)
+        return history
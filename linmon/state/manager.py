@@ -1,24 +1,99 @@
 """State manager with atomic persistence."""
 
 import json
+import math
+import os
 from pathlib import Path
-from typing import Optional
-from .model import State, LogCursor
+from typing import Dict, Iterable, Optional, Set, Tuple
+from .history import MetricHistory
+from .model import AlertState, State, LogCursor
+from ..config.defaults import DEFAULT_HISTORY_SAMPLES, MAX_TREND_SAMPLES
 from ..util.fs import atomic_write_json, ensure_dir
+from ..util.lock import FileLock
+
+LOCK_SUFFIX = ".lock"
 
 
 class StateManager:
-    """Manages state persistence with atomic writes."""
+    """
+    Manages state persistence with atomic writes.
+    
+    Changes are tracked with a dirty flag and save() skips the write when
+    nothing that matters changed. A new last_run timestamp alone does not
+    count, so quiet runs don't rewrite the file.
     
-    def __init__(self, state_file: str):
+    A run should hold the state lock (``<state_file>.lock``, via acquire())
+    from before the state is read until after it is saved, so concurrent
+    processes can't interleave read-modify-write cycles.
+    """
+    
+    def __init__(self, state_file: str, history_samples: int = DEFAULT_HISTORY_SAMPLES):
         """
         Initialize state manager.
         
         Args:
             state_file: Path to state JSON file
+            history_samples: Samples kept per metric history (more when a
+                series needs them to cover a time span, see record_sample())
         """
         self.state_file = state_file
+        self.history_samples = history_samples
         self._state: Optional[State] = None
+        self._dirty = False
+        # Decoded histories; changed ones are packed back into the state on save
+        self._histories: Dict[str, MetricHistory] = {}
+        self._changed_histories: Set[str] = set()
+        self.write_count = 0  # Number of times save() actually wrote the file
+        self._lock = FileLock(state_file + LOCK_SUFFIX)
+        # Identity of the file as last read or written, to spot other writers
+        self._file_id: Optional[Tuple[int, int, int]] = None
+    
+    @property
+    def dirty(self) -> bool:
+        """True if there are changes that save() would write."""
+        return self._dirty
+    
+    @property
+    def locked(self) -> bool:
+        """True if this manager holds the state lock."""
+        return self._lock.locked
+    
+    def acquire(self, wait: bool = True, timeout: Optional[float] = None) -> bool:
+        """
+        Take the cross-process state lock.
+        
+        If another process rewrote the state file since it was last read
+        here, the cached state is dropped so the next access reloads it.
+        
+        Args:
+            wait: Wait for another holder (False: give up immediately)
+            timeout: Maximum seconds to wait (None: no limit)
+            
+        Returns:
+            True if the lock is held, False if another process holds it
+        """
+        ensure_dir(str(Path(self.state_file).parent))
+        if not self._lock.acquire(wait=wait, timeout=timeout):
+            return False
+        
+        if self._state is not None and self._stat_file() != self._file_id:
+            self._state = None
+            self._dirty = False
+            self._histories.clear()
+            self._changed_histories.clear()
+        return True
+    
+    def release(self) -> None:
+        """Release the state lock."""
+        self._lock.release()
+    
+    def _stat_file(self) -> Optional[Tuple[int, int, int]]:
+        """Get (inode, mtime, size) of the state file, or None if missing."""
+        try:
+            st = os.stat(self.state_file)
+        except OSError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
     
     def load(self) -> State:
         """Load state from file, creating empty state if file doesn't exist."""
@@ -26,8 +101,10 @@ class StateManager:
             return self._state
         
         path = Path(self.state_file)
+        self._file_id = self._stat_file()
         if not path.exists():
             self._state = State()
+            self._dirty = True
             return self._state
         
         try:
@@ -35,18 +112,78 @@ class StateManager:
                 data = json.load(f)
             self._state = State(**data)
         except Exception:
-            # On any error, start fresh
+            # On any error, start fresh (and replace the bad file)
             self._state = State()
+            self._dirty = True
         
         return self._state
     
-    def save(self) -> None:
-        """Atomically save state to file."""
-        if self._state is None:
-            return
+    def save(self) -> bool:
+        """
+        Atomically save state to file if it changed.
+        
+        Returns:
+            True if the file was written
+        """
+        if self._state is None or not self._dirty:
+            return False
+        
+        for key in self._changed_histories:
+            history = self._histories.get(key)
+            if history is not None:
+                self._state.metric_history[key] = history.encode()
+        self._changed_histories.clear()
         
         ensure_dir(str(Path(self.state_file).parent))
-        atomic_write_json(self.state_file, self._state.model_dump())
+        atomic_write_json(self.state_file, self._state.model_dump(), indent=None)
+        self._file_id = self._stat_file()
+        self._dirty = False
+        self.write_count += 1
+        return True
+    
+    def prune(
+        self,
+        rule_names: Iterable[str],
+        log_sources: Iterable[str] = (),
+        history_metrics: Iterable[str] = (),
+    ) -> int:
+        """
+        Drop state for rules, log sources and series that no longer exist.
+        
+        Args:
+            rule_names: Names of all configured rules (per-series streak keys
+                such as ``rule{mount="/"}`` are matched on the rule name)
+            log_sources: Log sources that keep a cursor
+            history_metrics: Metric families used by trend rules
+            
+        Returns:
+            Number of entries removed
+        """
+        state = self.load()
+        rule_names = set(rule_names)
+        log_sources = set(log_sources)
+        history_metrics = set(history_metrics)
+        
+        stale_streaks = [k for k in state.rule_streaks if k.split("{", 1)[0] not in rule_names]
+        stale_cursors = [k for k in state.log_cursors if k not in log_sources]
+        stale_history = [
+            k for k in set(state.metric_history) | set(self._histories)
+            if k.split("{", 1)[0] not in history_metrics
+        ]
+        
+        for key in stale_streaks:
+            del state.rule_streaks[key]
+        for key in stale_cursors:
+            del state.log_cursors[key]
+        for key in stale_history:
+            state.metric_history.pop(key, None)
+            self._histories.pop(key, None)
+            self._changed_histories.discard(key)
+        
+        removed = len(stale_streaks) + len(stale_cursors) + len(stale_history)
+        if removed:
+            self._dirty = True
+        return removed
     
     def get_rule_streak(self, rule_name: str) -> int:
         """Get current streak count for a rule."""
@@ -58,7 +195,7 @@ class StateManager:
         state = self.load()
         current = state.rule_streaks.get(rule_name, 0)
         state.rule_streaks[rule_name] = current + 1
-        self._state = state
+        self._dirty = True
         return state.rule_streaks[rule_name]
     
     def reset_rule_streak(self, rule_name: str) -> None:
@@ -66,7 +203,7 @@ class StateManager:
         state = self.load()
         if rule_name in state.rule_streaks:
             del state.rule_streaks[rule_name]
-        self._state = state
+            self._dirty = True
     
     def get_log_cursor(self, source: str) -> Optional[LogCursor]:
         """Get log cursor for a source."""
@@ -76,11 +213,102 @@ class StateManager:
     def set_log_cursor(self, source: str, cursor: LogCursor) -> None:
         """Set log cursor for a source."""
         state = self.load()
-        state.log_cursors[source] = cursor
-        self._state = state
+        if state.log_cursors.get(source) != cursor:
+            state.log_cursors[source] = cursor
+            self._dirty = True
+    
+    def get_alerts(self) -> Dict[str, AlertState]:
+        """Get the firing alerts by fingerprint (read-only; use set_alert/clear_alert)."""
+        return self.load().alerts
+    
+    def set_alert(self, fingerprint: str, alert: AlertState) -> None:
+        """Record or update a firing alert."""
+        state = self.load()
+        if state.alerts.get(fingerprint) != alert:
+            state.alerts[fingerprint] = alert
+            self._dirty = True
+    
+    def clear_alert(self, fingerprint: str) -> None:
+        """Forget a resolved alert."""
+        state = self.load()
+        if fingerprint in state.alerts:
+            del state.alerts[fingerprint]
+            self._dirty = True
     
     def update_last_run(self, timestamp: str) -> None:
-        """Update last run timestamp."""
+        """
+        Update last run timestamp.
+        
+        This alone does not mark the state dirty; it is written along with
+        the next real change.
+        """
         state = self.load()
         state.last_run = timestamp
-        self._state = state
+    
+    def get_history(self, key: str) -> Optional[MetricHistory]:
+        """
+        Get the sample history of a metric series.
+        
+        Args:
+            key: Series key
+            
+        Returns:
+            History, or None if the series has none (or it is unreadable)
+        """
+        history = self._histories.get(key)
+        if history is not None:
+            return history
+        
+        packed = self.load().metric_history.get(key)
+        if packed is None:
+            return None
+        try:
+            # A ring grown for a long window keeps its size across runs
+            history = MetricHistory.decode(packed, self.history_samples, grow=True)
+        except ValueError:
+            return None
+        self._histories[key] = history
+        return history
+    
+    def record_sample(
+        self,
+        key: str,
+        timestamp: float,
+        value: float,
+        span: Optional[float] = None,
+    ) -> MetricHistory:
+        """
+        Append a sample to a metric series history.
+        
+        The ring holds ``history_samples`` samples, or as many as ``span``
+        takes at the series' average sample interval if that is more. It is
+        grown with some headroom before it would drop a sample still inside
+        the span, and shrunk again once it is over twice the size needed.
+        
+        Args:
+            key: Series key
+            timestamp: Sample time (seconds since the epoch)
+            value: Sample value
+            span: Time the history must cover, e.g. the longest window of
+                the trend rules reading the series
+                
+        Returns:
+            Updated history
+        """
+        history = self.get_history(key)
+        if history is None:
+            history = MetricHistory(self.history_samples)
+            self._histories[key] = history
+        
+        target = self.history_samples
+        interval = history.interval() if span else None
+        if interval:
+            target = max(target, min(MAX_TREND_SAMPLES, math.ceil(span / interval) + 1))
+        if history.capacity < target:
+            history.resize(min(MAX_TREND_SAMPLES, target + target // 4))
+        elif history.capacity > 2 * target:
+            history.resize(target)
+        history.append(timestamp, value)
+        self._changed_histories.add(key)
+        self._dirty = True
+        return history
@@ -18,9 +18,21 @@ class LogCursor(BaseModel):
     file_offset: int = 0
 
 
+class AlertState(BaseModel):
+    """Notification state of one firing alert (keyed by fingerprint)."""
+    
+    rule_name: str
+    metric: str
+    severity: str  # Severity last notified
+    since: float  # When it started firing (seconds since the epoch)
+    notified: float  # When a notification was last sent
+
+
 class State(BaseModel):
     """Complete application state."""
     
     rule_streaks: Dict[str, int] = {}  # rule_name -> streak count
     log_cursors: Dict[str, LogCursor] = {}  # log_source -> cursor
+    metric_history: Dict[str, str] = {}  # series key -> packed MetricHistory
+    alerts: Dict[str, AlertState] = {}  # fingerprint -> firing alert
     last_run: Optional[str] = None
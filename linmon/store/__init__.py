@@ -0,0 +1,7 @@
+"""Embedded local metric history storage."""
+
+from .history import HistoryStore
+from .ring import RingFile, RingFormatError, resize_ring
+from .rollup import RollupTier
+
+__all__ = ["HistoryStore", "RingFile", "RingFormatError", "RollupTier", "resize_ring"]
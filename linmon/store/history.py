@@ -0,0 +1,360 @@
+"""Local metric history: one ring file of (timestamp, value) records per series."""
+
+import hashlib
+import os
+import struct
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+from .ring import RingFile, RingFormatError, resize_ring
+from .rollup import BUCKET, Bucket, RollupTier, fold
+from ..config.defaults import DEFAULT_HISTORY_OPEN_RINGS, DEFAULT_HISTORY_STORE_SAMPLES
+from ..util.fs import ensure_dir
+
+# One sample: timestamp (seconds since the epoch), value
+SAMPLE = struct.Struct("<dd")
+
+RING_SUFFIX = ".ring"
+ROLLUP_SUFFIX = ".rollup"
+
+
+class HistoryStore:
+    """
+    Embedded time-series store for collected metrics.
+    
+    Each series gets a fixed-size ring file under ``<directory>/<family>/``,
+    so appending a run's metrics costs one record write per series and the
+    store never grows beyond ``capacity`` records per series. Rollup tiers
+    keep min/max/sum/count buckets of each series in further ring files,
+    updated in place as samples arrive, so long ranges can be read from a
+    few hundred buckets with bounded disk use.
+    
+    Rings are resized to the configured capacity when next appended to, so
+    changing the sample count or a tier's retention applies to existing
+    series too. Tier files are named by bucket and capacity; a tier whose
+    file is missing takes over the file of a retired tier with the same
+    bucket. Reads map files read-only and never resize or move them.
+    """
+    
+    def __init__(
+        self,
+        directory: str,
+        capacity: int = DEFAULT_HISTORY_STORE_SAMPLES,
+        tiers: Sequence[RollupTier] = (),
+        max_open: int = DEFAULT_HISTORY_OPEN_RINGS,
+    ):
+        """
+        Initialize store.
+        
+        Args:
+            directory: Root directory for ring files
+            capacity: Records kept per series
+            tiers: Rollup tiers, finest first
+            max_open: Ring files kept mapped; the least recently used ones
+                are closed beyond this, so series that come and go (e.g.
+                transient cgroups) don't pile up mappings
+        """
+        self.directory = directory
+        self.capacity = capacity
+        self.tiers: List[RollupTier] = sorted(tiers, key=lambda t: (t.bucket_seconds, t.capacity))
+        self.max_open = max(1, max_open)
+        self._rings: "OrderedDict[Tuple[str, str], RingFile]" = OrderedDict()
+    
+    def path_for(self, key: str, tier: Optional[RollupTier] = None) -> str:
+        """
+        Get the ring file path of a series.
+        
+        Args:
+            key: Series key, e.g. ``bytes_used_percent{mount="/"}``
+            tier: Rollup tier (None for raw samples)
+            
+        Returns:
+            File path
+        """
+        family = key.split("{", 1)[0]
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+        if tier is None:
+            return os.path.join(self.directory, family, digest + RING_SUFFIX)
+        return os.path.join(self.directory, family, f"{digest}.{tier.name}-{tier.capacity}{ROLLUP_SUFFIX}")
+    
+    def _retired_tier_file(self, path: str, tier: RollupTier) -> Optional[str]:
+        """
+        Find the file a tier used before its retention changed.
+        
+        Args:
+            path: The tier's current file path
+            tier: Rollup tier
+            
+        Returns:
+            Path of a file of the same bucket that no configured tier uses
+            (including the pre-capacity ``<digest>.<name>.rollup``), or None;
+            only the longest tier of a bucket takes such a file over
+        """
+        capacities = [t.capacity for t in self.tiers if t.name == tier.name]
+        if tier.capacity != max(capacities):
+            return None
+        in_use = {f"-{capacity}" for capacity in capacities}
+        directory, filename = os.path.split(path)
+        prefix = filename[:filename.index(".") + 1] + tier.name
+        try:
+            names = sorted(os.listdir(directory))
+        except OSError:
+            return None
+        for name in names:
+            if not name.startswith(prefix) or not name.endswith(ROLLUP_SUFFIX):
+                continue
+            suffix = name[len(prefix):-len(ROLLUP_SUFFIX)]
+            if suffix == "" or (suffix[:1] == "-" and suffix[1:].isdigit() and suffix not in in_use):
+                return os.path.join(directory, name)
+        return None
+    
+    def _cache_key(self, key: str, tier: Optional[RollupTier]) -> Tuple[str, str]:
+        """Key of a series' (or tier's) ring in the open-ring cache."""
+        return (key, f"{tier.name}-{tier.capacity}" if tier is not None else "")
+    
+    def _ring(self, key: str, tier: Optional[RollupTier] = None) -> RingFile:
+        """
+        Get the writable ring of a series (or tier), opening or creating its file.
+        
+        This is the write path: a file with another capacity is resized, and a
+        missing tier file takes over a retired one (see _retired_tier_file()).
+        """
+        cache_key = self._cache_key(key, tier)
+        ring = self._rings.get(cache_key)
+        if ring is not None:
+            self._rings.move_to_end(cache_key)
+            return ring
+        
+        path = self.path_for(key, tier)
+        record = SAMPLE if tier is None else BUCKET
+        capacity = self.capacity if tier is None else tier.capacity
+        source = path
+        if tier is not None and not os.path.exists(path):
+            source = self._retired_tier_file(path, tier) or path
+        
+        ensure_dir(os.path.dirname(path))
+        try:
+            ring = RingFile(source, record, capacity, key)
+        except RingFormatError:
+            # Corrupt or foreign file: start the series over
+            os.unlink(source)
+            source = path
+            ring = RingFile(path, record, capacity, key)
+        if ring.capacity != capacity or source != path:
+            ring = resize_ring(ring, capacity, path)
+        self._rings[cache_key] = ring
+        while len(self._rings) > self.max_open:
+            _, evicted = self._rings.popitem(last=False)
+            evicted.close()
+        return ring
+    
+    @contextmanager
+    def _reading(self, key: str, tier: Optional[RollupTier] = None) -> Iterator[Optional[RingFile]]:
+        """
+        Open the ring of a series (or tier) for reading.
+        
+        A ring this store has open for writing is used as is; otherwise the
+        file (or, for a tier, the retired file it would take over) is mapped
+        read-only for the duration of the block and never modified.
+        
+        Yields:
+            The ring, or None if the series has no readable file
+        """
+        ring = self._rings.get(self._cache_key(key, tier))
+        if ring is not None:
+            yield ring
+            return
+        
+        path = self.path_for(key, tier)
+        if tier is not None and not os.path.exists(path):
+            path = self._retired_tier_file(path, tier) or path
+        try:
+            ring = RingFile(path, SAMPLE if tier is None else BUCKET, 0, key, readonly=True)
+        except (OSError, RingFormatError):
+            yield None
+            return
+        try:
+            yield ring
+        finally:
+            ring.close()
+    
+    def append(self, key: str, timestamp: float, value: float) -> None:
+        """
+        Append a sample to a series.
+        
+        The sample is also folded into the current bucket of every rollup
+        tier. A sample at the newest raw timestamp replaces the raw record
+        (rollups keep the first value); older samples (e.g. after the clock
+        stepped back) are dropped to keep the rings ordered.
+        
+        Args:
+            key: Series key
+            timestamp: Sample time (seconds since the epoch)
+            value: Sample value
+        """
+        ring = self._ring(key)
+        last = ring.last()
+        if last is not None and timestamp <= last[0]:
+            if timestamp == last[0]:
+                ring.replace_last((timestamp, value))
+            return
+        ring.append((timestamp, value))
+        
+        for tier in self.tiers:
+            tier_ring = self._ring(key, tier)
+            start = tier.bucket_start(timestamp)
+            bucket = tier_ring.last()
+            if bucket is not None and bucket[0] == start:
+                tier_ring.replace_last(fold(bucket, start, value))
+            elif bucket is None or start > bucket[0]:
+                tier_ring.append(fold(None, start, value))
+    
+    def append_metrics(self, metrics: Mapping[str, float], timestamp: float) -> int:
+        """
+        Append every series of a metrics snapshot.
+        
+        Series that cannot be written are skipped.
+        
+        Args:
+            metrics: Mapping of series key -> value (e.g. a MetricSet)
+            timestamp: Sample time (seconds since the epoch)
+            
+        Returns:
+            Number of series written
+        """
+        written = 0
+        for key, value in metrics.items():
+            try:
+                self.append(key, timestamp, float(value))
+                written += 1
+            except (OSError, ValueError):
+                continue
+        return written
+    
+    def read(
+        self,
+        key: str,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+    ) -> List[Tuple[float, float]]:
+        """
+        Read samples of a series in a time range.
+        
+        Args:
+            key: Series key
+            since: Earliest timestamp to include
+            until: Latest timestamp to include
+            
+        Returns:
+            List of (timestamp, value), oldest first (empty if unknown)
+        """
+        with self._reading(key) as ring:
+            return [] if ring is None else list(ring.read(since, until))
+    
+    def read_rollup(
+        self,
+        key: str,
+        tier_name: str,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+    ) -> List[Bucket]:
+        """
+        Read rollup buckets of a series in a time range.
+        
+        Args:
+            key: Series key
+            tier_name: Name of a configured tier (the shortest retention if
+                several tiers share it)
+            since: Earliest bucket start to include
+            until: Latest bucket start to include
+            
+        Returns:
+            List of (start, min, max, sum, count), oldest first
+            
+        Raises:
+            KeyError: If no tier has that name
+        """
+        tier = next((t for t in self.tiers if t.name == tier_name), None)
+        if tier is None:
+            raise KeyError(tier_name)
+        return self._read_tier(key, tier, since, until)
+    
+    def _read_tier(
+        self,
+        key: str,
+        tier: RollupTier,
+        since: Optional[float],
+        until: Optional[float],
+    ) -> List[Bucket]:
+        """Read rollup buckets of a series from one tier (see read_rollup())."""
+        if since is not None:
+            since = tier.bucket_start(since)
+        with self._reading(key, tier) as ring:
+            return [] if ring is None else list(ring.read(since, until))
+    
+    def query(
+        self,
+        key: str,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+    ) -> Tuple[str, List[Bucket]]:
+        """
+        Read a range from the finest tier that still covers it.
+        
+        Raw samples are used while they reach back to ``since``; otherwise
+        the finest rollup tier whose retention covers the range is read (or
+        the coarsest one if none does).
+        
+        Args:
+            key: Series key
+            since: Range start (None for everything in the raw ring)
+            until: Range end
+            
+        Returns:
+            Tuple of (tier name, "raw" for raw samples, and buckets); raw
+            samples are returned as single-sample buckets
+        """
+        with self._reading(key) as raw:
+            if raw is not None:
+                oldest = next(raw.read(), None)
+                if since is None or len(raw) < raw.capacity or (oldest is not None and oldest[0] <= since):
+                    return ("raw", [(t, v, v, v, 1) for t, v in raw.read(since, until)])
+        
+        if not self.tiers:
+            return ("raw", [])
+        
+        chosen = self.tiers[-1]
+        for tier in self.tiers:
+            with self._reading(key, tier) as ring:
+                first = next(ring.read(), None) if ring is not None else None
+                if first is not None and (since is None or len(ring) < ring.capacity or first[0] <= since):
+                    chosen = tier
+                    break
+        return (chosen.name, self._read_tier(key, chosen, since, until))
+    
+    def series(self) -> Iterator[str]:
+        """
+        Iterate keys of all series in the store.
+        
+        Yields:
+            Series keys (read from the ring file headers)
+        """
+        root = Path(self.directory)
+        if not root.is_dir():
+            return
+        for path in sorted(root.glob("*/*" + RING_SUFFIX)):
+            try:
+                ring = RingFile(str(path), SAMPLE, self.capacity, readonly=True)
+            except (OSError, RingFormatError):
+                continue
+            try:
+                yield ring.key
+            finally:
+                ring.close()
+    
+    def close(self) -> None:
+        """Close all open ring files."""
+        for ring in self._rings.values():
+            ring.close()
+        self._rings.clear()
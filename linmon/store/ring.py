@@ -0,0 +1,244 @@
+"""Memory-mapped ring files of fixed-size binary records."""
+
+import mmap
+import os
+import struct
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+MAGIC = b"LMRG"
+VERSION = 1
+
+# magic, version, key length, record size, capacity, records ever appended
+_HEADER = struct.Struct("<4sHHIIQ")
+HEADER_SIZE = 512
+MAX_KEY = HEADER_SIZE - _HEADER.size
+
+
+class RingFormatError(ValueError):
+    """Raised when a ring file is corrupt or does not match the requested layout."""
+    pass
+
+
+class RingFile:
+    """
+    Fixed-capacity ring of binary records in one memory-mapped file.
+    
+    The file is a 512-byte header (layout, record count and the series key
+    it holds) followed by ``capacity`` slots of ``record.size`` bytes. An
+    append packs one record into its slot and bumps the count in place, so
+    the cost is constant and nothing is ever rewritten. The first record
+    field must be a timestamp that only increases; range reads binary-search
+    it and hand out memoryviews of the mapping without copying.
+    """
+    
+    def __init__(self, path: str, record: struct.Struct, capacity: int, key: str = "", readonly: bool = False):
+        """
+        Open a ring file, creating it if needed.
+        
+        An existing file keeps its own capacity (see resize_ring()).
+        
+        Args:
+            path: File path
+            record: Record layout (first field is the timestamp)
+            capacity: Number of record slots for a new file
+            key: Identifier stored in the header (e.g. the series key)
+            readonly: Map an existing file read-only (never created; only
+                reads are allowed)
+                
+        Raises:
+            RingFormatError: If an existing file is not a compatible ring
+            OSError: If the file cannot be opened or created
+        """
+        self.path = path
+        self.record = record
+        key_bytes = key.encode("utf-8")
+        if len(key_bytes) > MAX_KEY:
+            raise ValueError(f"Ring key too long ({len(key_bytes)} > {MAX_KEY} bytes)")
+        
+        fd = os.open(path, os.O_RDONLY if readonly else os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            size = os.fstat(fd).st_size
+            if size == 0 and readonly:
+                raise RingFormatError(f"Empty ring file: {path}")
+            if size == 0:
+                os.ftruncate(fd, HEADER_SIZE + capacity * record.size)
+                header = _HEADER.pack(MAGIC, VERSION, len(key_bytes), record.size, capacity, 0)
+                os.pwrite(fd, header + key_bytes, 0)
+                size = HEADER_SIZE + capacity * record.size
+            elif size < HEADER_SIZE:
+                raise RingFormatError(f"Truncated ring file: {path}")
+            self._mm = mmap.mmap(fd, size, access=mmap.ACCESS_READ) if readonly else mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+        
+        magic, version, key_len, record_size, self.capacity, _ = _HEADER.unpack_from(self._mm)
+        if magic != MAGIC or version != VERSION:
+            self._mm.close()
+            raise RingFormatError(f"Not a linmon ring file: {path}")
+        if record_size != record.size or size != HEADER_SIZE + self.capacity * record_size:
+            self._mm.close()
+            raise RingFormatError(f"Ring file layout mismatch: {path}")
+        self.key = bytes(self._mm[_HEADER.size:_HEADER.size + key_len]).decode("utf-8", errors="replace")
+    
+    @property
+    def total(self) -> int:
+        """Number of records ever appended."""
+        return _HEADER.unpack_from(self._mm)[5]
+    
+    def __len__(self) -> int:
+        """Number of records currently held."""
+        return min(self.total, self.capacity)
+    
+    def _offset(self, index: int) -> int:
+        """Byte offset of the record with absolute index ``index``."""
+        return HEADER_SIZE + (index % self.capacity) * self.record.size
+    
+    def _set_total(self, total: int) -> None:
+        """Store the appended-record count in the header."""
+        struct.pack_into("<Q", self._mm, _HEADER.size - 8, total)
+    
+    def append(self, values: Sequence) -> None:
+        """
+        Append a record, overwriting the oldest one when full.
+        
+        Args:
+            values: Record field values (timestamp first)
+        """
+        total = self.total
+        self.record.pack_into(self._mm, self._offset(total), *values)
+        # Count is bumped after the record is in place
+        self._set_total(total + 1)
+    
+    def last(self) -> Optional[Tuple]:
+        """Get the newest record, or None if empty."""
+        total = self.total
+        if not total:
+            return None
+        return self.record.unpack_from(self._mm, self._offset(total - 1))
+    
+    def replace_last(self, values: Sequence) -> None:
+        """
+        Overwrite the newest record in place.
+        
+        Args:
+            values: Record field values (timestamp first)
+            
+        Raises:
+            IndexError: If the ring is empty
+        """
+        total = self.total
+        if not total:
+            raise IndexError("replace_last() on an empty ring")
+        self.record.pack_into(self._mm, self._offset(total - 1), *values)
+    
+    def _timestamp(self, index: int) -> float:
+        """Timestamp of the record with absolute index ``index``."""
+        return struct.unpack_from("<d", self._mm, self._offset(index))[0]
+    
+    def _bisect(self, lo: int, hi: int, timestamp: float, right: bool = False) -> int:
+        """
+        First absolute index in [lo, hi) whose timestamp is >= timestamp
+        (> timestamp if right is True).
+        """
+        while lo < hi:
+            mid = (lo + hi) // 2
+            ts = self._timestamp(mid)
+            if ts < timestamp or (right and ts == timestamp):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+    
+    def segments(self, since: Optional[float] = None, until: Optional[float] = None) -> List[memoryview]:
+        """
+        Get the raw bytes of records in a time range, oldest first.
+        
+        The range is returned as at most two memoryviews into the mapping
+        (two when it wraps around the end of the file). Views must be
+        released before close().
+        
+        Args:
+            since: Earliest timestamp to include
+            until: Latest timestamp to include
+            
+        Returns:
+            List of memoryviews over whole records
+        """
+        total = self.total
+        first = total - min(total, self.capacity)
+        lo = first if since is None else self._bisect(first, total, since)
+        hi = total if until is None else self._bisect(lo, total, until, right=True)
+        if lo >= hi:
+            return []
+        
+        view = memoryview(self._mm)
+        start = self._offset(lo)
+        end = self._offset(hi - 1) + self.record.size
+        if start < end:
+            return [view[start:end]]
+        return [view[start:], view[HEADER_SIZE:end]]
+    
+    def read(self, since: Optional[float] = None, until: Optional[float] = None) -> Iterator[Tuple]:
+        """
+        Iterate records in a time range, oldest first.
+        
+        Args:
+            since: Earliest timestamp to include
+            until: Latest timestamp to include
+            
+        Yields:
+            Unpacked record tuples
+        """
+        for segment in self.segments(since, until):
+            try:
+                yield from self.record.iter_unpack(segment)
+            finally:
+                segment.release()
+    
+    def flush(self) -> None:
+        """Flush dirty pages to disk."""
+        self._mm.flush()
+    
+    def close(self) -> None:
+        """Unmap the file."""
+        if not self._mm.closed:
+            self._mm.close()
+
+
+def resize_ring(ring: RingFile, capacity: int, path: Optional[str] = None) -> RingFile:
+    """
+    Rewrite a ring with another capacity, keeping its newest records.
+    
+    The new file is built next to the target and renamed into place, so a
+    failure leaves the old ring intact. ``ring`` is closed; when moved to
+    another path, its file is removed.
+    
+    Args:
+        ring: Open ring
+        capacity: Number of record slots of the new file
+        path: Where to write the new ring (default: over the old one)
+        
+    Returns:
+        The resized ring, open at its new path
+        
+    Raises:
+        OSError: If the new file cannot be written
+    """
+    target = path or ring.path
+    tmp_path = target + ".resize"
+    if os.path.exists(tmp_path):
+        os.unlink(tmp_path)
+    resized = RingFile(tmp_path, ring.record, capacity, ring.key)
+    try:
+        skip = max(0, len(ring) - capacity)
+        for index, values in enumerate(ring.read()):
+            if index >= skip:
+                resized.append(values)
+        resized.flush()
+    finally:
+        resized.close()
+    ring.close()
+    os.replace(tmp_path, target)
+    if target != ring.path:
+        os.unlink(ring.path)
+    return RingFile(target, resized.record, capacity, resized.key)
@@ -0,0 +1,61 @@
+"""Downsampled rollup tiers for the metric history store."""
+
+import math
+import struct
+from typing import Optional, Tuple
+
+# One bucket: start timestamp, min, max, sum, count
+BUCKET = struct.Struct("<ddddI")
+
+Bucket = Tuple[float, float, float, float, int]
+
+
+class RollupTier:
+    """A bucket width and how many buckets of it to keep."""
+    
+    __slots__ = ("name", "bucket_seconds", "capacity")
+    
+    def __init__(self, name: str, bucket_seconds: float, retention_seconds: float):
+        """
+        Initialize tier.
+        
+        Args:
+            name: Tier name, used in ring file names (e.g. "1h")
+            bucket_seconds: Bucket width in seconds
+            retention_seconds: How far back buckets are kept
+        """
+        self.name = name
+        self.bucket_seconds = bucket_seconds
+        self.capacity = max(1, int(math.ceil(retention_seconds / bucket_seconds)))
+    
+    @property
+    def retention_seconds(self) -> float:
+        """Time span covered by a full tier."""
+        return self.capacity * self.bucket_seconds
+    
+    def bucket_start(self, timestamp: float) -> float:
+        """Start of the bucket containing a timestamp."""
+        return math.floor(timestamp / self.bucket_seconds) * self.bucket_seconds
+
+
+def fold(bucket: Optional[Bucket], start: float, value: float) -> Bucket:
+    """
+    Add a sample to a bucket.
+    
+    Args:
+        bucket: Existing bucket, or None to start a new one
+        start: Bucket start timestamp
+        value: Sample value
+        
+    Returns:
+        Updated bucket
+    """
+    if bucket is None:
+        return (start, value, value, value, 1)
+    _, low, high, total, count = bucket
+    return (start, min(low, value), max(high, value), total + value, count + 1)
+
+
+def bucket_mean(bucket: Bucket) -> float:
+    """Average of the samples in a bucket."""
+    return bucket[3] / bucket[4] if bucket[4] else 0.0
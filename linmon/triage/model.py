@@ -1,14 +1,46 @@
 """Triage scoring models."""
 
-from typing import Literal
-from pydantic import BaseModel
+from typing import Any, Dict, List, Literal, Optional
 
 Severity = Literal["low", "medium", "high", "critical"]
 
 
-class TriageScore(BaseModel):
+class TriageScore:
     """Triage score for a monitor or overall system."""
     
-    severity: Severity
-    score: int  # 0-100
-    factors: list[str] = []  # List of contributing factors
+    __slots__ = ("severity", "score", "factors")
+    
+    def __init__(self, *, severity: Severity, score: int, factors: Optional[List[str]] = None):
+        """
+        Initialize score.
+        
+        Args:
+            severity: Severity level
+            score: Score from 0-100
+            factors: List of contributing factors
+        """
+        self.severity: Severity = severity
+        self.score = score
+        self.factors: List[str] = factors if factors is not None else []
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize to a JSON-compatible dictionary."""
+        return {
+            "severity": self.severity,
+            "score": self.score,
+            "factors": list(self.factors),
+        }
+    
+    def __eq__(self, other: object) -> bool:
+        """Compare field by field."""
+        if not isinstance(other, TriageScore):
+            return NotImplemented
+        return (
+            self.severity == other.severity
+            and self.score == other.score
+            and self.factors == other.factors
+        )
+    
+    def __repr__(self) -> str:
+        """Debug representation."""
+        return f"TriageScore(severity={self.severity!r}, score={self.score!r}, factors={self.factors!r})"
@@ -8,6 +8,23 @@ from ..rules.model import RuleResult
 class TriageScorer:
     """Calculates triage scores based on rule violations."""
     
+    @staticmethod
+    def anomaly_severity(anomaly: RuleResult) -> Severity:
+        """
+        Get the severity of a single anomaly from how long it has persisted.
+        
+        Args:
+            anomaly: Rule result that is an anomaly
+            
+        Returns:
+            "critical" (streak >= 5), "high" (streak >= 3) or "medium"
+        """
+        if anomaly.streak >= 5:
+            return "critical"
+        if anomaly.streak >= 3:
+            return "high"
+        return "medium"
+    
     @staticmethod
     def score_anomalies(anomalies: List[RuleResult]) -> TriageScore:
         """
@@ -31,10 +48,11 @@ class TriageScorer:
         
         for anomaly in anomalies:
             # High streak indicates persistent issue
-            if anomaly.streak >= 5:
+            level = TriageScorer.anomaly_severity(anomaly)
+            if level == "critical":
                 critical_count += 1
                 factors.append(f"{anomaly.rule_name}: persistent (streak={anomaly.streak})")
-            elif anomaly.streak >= 3:
+            elif level == "high":
                 high_count += 1
                 factors.append(f"{anomaly.rule_name}: repeated (streak={anomaly.streak})")
             else:
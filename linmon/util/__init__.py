@@ -1,7 +1,18 @@
 """Utility modules for linmon."""
 
 from .fs import atomic_write, ensure_dir
-from .time import now_iso, parse_duration
+from .time import now_iso, parse_duration, parse_iso, parse_time
 from .shell import safe_subprocess
+from .lock import FileLock, LockBusyError
 
-__all__ = ["atomic_write", "ensure_dir", "now_iso", "parse_duration", "safe_subprocess"]
+__all__ = [
+    "atomic_write",
+    "ensure_dir",
+    "now_iso",
+    "parse_duration",
+    "parse_iso",
+    "parse_time",
+    "safe_subprocess",
+    "FileLock",
+    "LockBusyError",
+]
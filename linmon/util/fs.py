@@ -3,11 +3,11 @@
 import os
 import tempfile
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional
 import json
 
 
-def atomic_write(filepath: str, content: str, mode: str = "w") -> None:
+def atomic_write(filepath: str, content: str, mode: str = "w", permissions: Optional[int] = None) -> None:
     """
     Atomically write content to a file using a temporary file and rename.
     
@@ -15,6 +15,7 @@ def atomic_write(filepath: str, content: str, mode: str = "w") -> None:
         filepath: Target file path
         content: Content to write (string)
         mode: Write mode ('w' for text, 'wb' for binary)
+        permissions: File mode bits (default: the 0600 of the temporary file)
     """
     path = Path(filepath)
     path.parent.mkdir(parents=True, exist_ok=True)
@@ -24,6 +25,8 @@ def atomic_write(filepath: str, content: str, mode: str = "w") -> None:
     try:
         with os.fdopen(fd, mode) as f:
             f.write(content)
+        if permissions is not None:
+            os.chmod(tmp_path, permissions)
         # Atomic rename
         os.replace(tmp_path, path)
     except Exception:
@@ -35,16 +38,17 @@ def atomic_write(filepath: str, content: str, mode: str = "w") -> None:
         raise
 
 
-def atomic_write_json(filepath: str, data: Any, indent: int = 2) -> None:
+def atomic_write_json(filepath: str, data: Any, indent: Optional[int] = 2) -> None:
     """
     Atomically write JSON data to a file.
     
     Args:
         filepath: Target file path
         data: JSON-serializable data
-        indent: JSON indentation
+        indent: JSON indentation (None for compact output without whitespace)
     """
-    content = json.dumps(data, indent=indent)
+    separators = (",", ":") if indent is None else None
+    content = json.dumps(data, indent=indent, separators=separators)
     atomic_write(filepath, content)
 
 
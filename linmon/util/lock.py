@@ -0,0 +1,96 @@
+"""Advisory cross-process file locks."""
+
+import fcntl
+import os
+import time
+from typing import Optional
+
+
+class LockBusyError(RuntimeError):
+    """Raised when a lock is held by another process and could not be taken."""
+    pass
+
+
+class FileLock:
+    """
+    Exclusive ``flock()`` lock on a lock file.
+    
+    The lock belongs to the open file description, so it is released
+    automatically if the process dies, and two FileLock objects on the
+    same path exclude each other even within one process.
+    """
+    
+    POLL_INTERVAL = 0.05  # Seconds between attempts while waiting
+    
+    def __init__(self, path: str):
+        """
+        Initialize lock.
+        
+        Args:
+            path: Lock file path (created if missing)
+        """
+        self.path = path
+        self._fd: Optional[int] = None
+    
+    @property
+    def locked(self) -> bool:
+        """True if this object holds the lock."""
+        return self._fd is not None
+    
+    def acquire(self, wait: bool = True, timeout: Optional[float] = None) -> bool:
+        """
+        Take the lock.
+        
+        Args:
+            wait: Wait for the holder to release it (False: try once)
+            timeout: Maximum seconds to wait (None: wait indefinitely)
+            
+        Returns:
+            True if the lock was taken, False if it is busy
+        """
+        if self._fd is not None:
+            return True
+        
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            while True:
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    if not wait or (deadline is not None and time.monotonic() >= deadline):
+                        os.close(fd)
+                        return False
+                    time.sleep(self.POLL_INTERVAL)
+        except BaseException:
+            os.close(fd)
+            raise
+        
+        # Record the holder for operators inspecting the lock file
+        try:
+            os.ftruncate(fd, 0)
+            os.pwrite(fd, f"{os.getpid()}\n".encode("ascii"), 0)
+        except OSError:
+            pass
+        self._fd = fd
+        return True
+    
+    def release(self) -> None:
+        """Release the lock if held."""
+        if self._fd is None:
+            return
+        try:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+    
+    def __enter__(self) -> "FileLock":
+        """Take the lock, waiting indefinitely."""
+        self.acquire()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        """Release the lock."""
+        self.release()
@@ -2,7 +2,9 @@
 
 import subprocess
 import shutil
-from typing import Optional, Tuple, List
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional, Tuple, List
 
 
 def safe_subprocess(
@@ -44,6 +46,45 @@ def safe_subprocess(
         return (-1, None, str(e))
 
 
+@contextmanager
+def stream_subprocess(
+    cmd: List[str],
+    timeout: float = 10.0,
+) -> Iterator[Optional[subprocess.Popen]]:
+    """
+    Run a subprocess with its stdout exposed as a binary pipe.
+    
+    The process is killed if it is still running after timeout seconds or
+    when the context exits, so readers never block past the deadline.
+    
+    Args:
+        cmd: Command and arguments as list
+        timeout: Timeout in seconds
+        
+    Yields:
+        Popen object (read ``proc.stdout``, then ``proc.wait()``), or None
+        if the command could not be started
+    """
+    try:
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    except (OSError, ValueError):
+        yield None
+        return
+    
+    timer = threading.Timer(timeout, proc.kill)
+    timer.daemon = True
+    timer.start()
+    try:
+        yield proc
+    finally:
+        timer.cancel()
+        if proc.poll() is None:
+            proc.kill()
+        if proc.stdout:
+            proc.stdout.close()
+        proc.wait()
+
+
 def which(cmd: str) -> Optional[str]:
     """Find command in PATH, similar to Unix which."""
     return shutil.which(cmd)
@@ -1,14 +1,28 @@
 """Time utilities."""
 
-from datetime import datetime, timedelta
+import re
+import time
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 
+# Fractional seconds of a timestamp; datetime.fromisoformat() before Python
+# 3.11 only accepts exactly 3 or 6 digits
+_FRACTION_RE = re.compile(r"(?<=:\d\d)\.(\d+)")
+
+# A number without a unit (e.g. "2024"), too easily meant as a year
+_BARE_NUMBER_RE = re.compile(r"^[+-]?(\d+\.?\d*|\.\d+)$")
+
 
 def now_iso() -> str:
     """Return current time as ISO 8601 string."""
     return datetime.utcnow().isoformat() + "Z"
 
 
+def format_iso(timestamp: float) -> str:
+    """Format seconds since the epoch like now_iso()."""
+    return datetime.fromtimestamp(timestamp, timezone.utc).replace(tzinfo=None).isoformat() + "Z"
+
+
 def parse_duration(s: str) -> float:
     """
     Parse duration string to seconds.
@@ -33,3 +47,59 @@ def parse_duration(s: str) -> float:
     else:
         # Assume seconds if no unit
         return float(s)
+
+
+def parse_iso(s: str) -> float:
+    """
+    Parse an ISO 8601 timestamp to seconds since the epoch.
+    
+    Timestamps without an offset (including the ``Z`` suffix written by
+    now_iso()) are taken as UTC.
+    
+    Args:
+        s: Timestamp string, e.g. "2024-01-15T10:30:00.5Z"
+        
+    Returns:
+        Seconds since the epoch
+        
+    Raises:
+        ValueError: If the string is not an ISO 8601 timestamp
+    """
+    s = s.strip()
+    if s.endswith(("Z", "z")):
+        s = s[:-1]
+    s = _FRACTION_RE.sub(lambda m: "." + m.group(1)[:6].ljust(6, "0"), s, count=1)
+    parsed = datetime.fromisoformat(s)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def parse_time(s: str, now: Optional[float] = None) -> float:
+    """
+    Parse an absolute or relative point in time.
+    
+    Args:
+        s: ISO 8601 timestamp, or a duration with a unit meaning that long
+            ago (e.g. "2h")
+        now: Reference time for durations (default: current time)
+        
+    Returns:
+        Seconds since the epoch
+        
+    Raises:
+        ValueError: If the string is neither (a bare number such as "2024"
+            is rejected rather than read as seconds)
+    """
+    try:
+        return parse_iso(s)
+    except ValueError:
+        pass
+    if _BARE_NUMBER_RE.match(s.strip()):
+        raise ValueError(f"Invalid time: {s!r} (a duration needs a unit, e.g. '{s.strip()}s'; "
+                         "dates must be ISO 8601, e.g. '2024-01-15')")
+    try:
+        ago = parse_duration(s)
+    except ValueError:
+        raise ValueError(f"Invalid time: {s!r} (use ISO 8601 or a duration like '2h')") from None
+    return (time.time() if now is None else now) - ago
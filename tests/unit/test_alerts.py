@@ -0,0 +1,277 @@
+"""Tests for alert fingerprinting, transitions and digests."""
+
+import json
+import socket
+import struct
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+import pytest
+from linmon.alerts import webhook
+from linmon.alerts.file import FileAlert
+from linmon.alerts.journald import JournaldAlert
+from linmon.alerts.spool import Spool
+from linmon.alerts.tracker import AlertDigest, AlertTracker, fingerprint
+from linmon.alerts.webhook import WebhookAlert
+from linmon.rules.model import RuleResult
+from linmon.state.manager import StateManager
+
+
+def anomaly(name, metric, streak):
+    """Create an anomalous rule result."""
+    return RuleResult(
+        rule_name=name,
+        metric=metric,
+        value=95.0,
+        threshold=90.0,
+        operator="gt",
+        violated=True,
+        streak=streak,
+        consecutive_required=1,
+        anomaly=True,
+    )
+
+
+@pytest.fixture
+def manager(tmp_path):
+    """Create a state manager on a temporary file."""
+    return StateManager(str(tmp_path / "state.json"))
+
+
+def kinds(events):
+    """Summarize events as (kind, rule) pairs."""
+    return sorted((e.kind, e.rule_name) for e in events)
+
+
+def test_alert_transitions(manager):
+    """Test firing, silence while persisting, escalation, reminder and resolution."""
+    tracker = AlertTracker(manager, reminder_seconds=3600)
+    disk = 'bytes_used_percent{mount="/"}'
+    
+    events = tracker.update([anomaly("disk", disk, 1), anomaly("cpu", "cpu_percent", 1)], now=0)
+    assert kinds(events) == [("firing", "cpu"), ("firing", "disk")]
+    
+    # Same severity, before the reminder is due: nothing to send
+    assert tracker.update([anomaly("disk", disk, 2), anomaly("cpu", "cpu_percent", 2)], now=300) == []
+    
+    # Streak 3 raises the severity to high
+    events = tracker.update([anomaly("disk", disk, 3), anomaly("cpu", "cpu_percent", 3)], now=600)
+    assert kinds(events) == [("escalated", "cpu"), ("escalated", "disk")]
+    
+    # cpu resolves; disk is still firing an hour after the last notification
+    events = tracker.update([anomaly("disk", disk, 4)], now=4200)
+    assert kinds(events) == [("reminder", "disk"), ("resolved", "cpu")]
+    resolved = [e for e in events if e.kind == "resolved"][0]
+    assert resolved.since == 0 and resolved.result is None
+    
+    # Survives a save/reload; fingerprints include the labels
+    manager.save()
+    reloaded = StateManager(manager.state_file)
+    assert set(reloaded.get_alerts()) == {fingerprint("disk", disk)}
+    assert fingerprint("disk", disk) != fingerprint("disk", 'bytes_used_percent{mount="/var"}')
+
+
+def test_alert_digest_written_once_per_run(manager, tmp_path):
+    """Test that transitions of a run are coalesced into one file entry."""
+    tracker = AlertTracker(manager, reminder_seconds=None, notify_resolved=False)
+    digest = AlertDigest(tracker.update([anomaly("a", "m1", 1), anomaly("b", "m2", 1)], now=0))
+    assert digest.summary() == "2 firing"
+    
+    path = tmp_path / "alerts.log"
+    FileAlert(str(path)).send(digest, {"overall": {"anomaly_count": 2}})
+    text = path.read_text()
+    assert text.count("LINMON ALERT") == 1
+    assert "FIRING    [a] m1 = 95.00 (gt 90.0) - Streak: 1" in text
+    
+    # Persisting without reminders, resolving without notification: silence
+    assert not AlertDigest(tracker.update([anomaly("a", "m1", 2)], now=10))
+    assert not AlertDigest(tracker.update([], now=20))
+    assert manager.get_alerts() == {}
+
+
+class Receiver(BaseHTTPRequestHandler):
+    """Webhook stand-in recording bodies and answering ``server.status``."""
+    
+    protocol_version = "HTTP/1.1"
+    
+    def setup(self):
+        """Count connections."""
+        super().setup()
+        self.server.connections += 1
+    
+    def do_POST(self):
+        """Record the body and answer with the configured status."""
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        if self.server.status == 200:
+            self.server.bodies.append(json.loads(body))
+        self.send_response(self.server.status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+    
+    def log_message(self, format, *args):
+        """Keep test output quiet."""
+
+
+@pytest.fixture
+def receiver():
+    """Run a local webhook receiver."""
+    srv = HTTPServer(("127.0.0.1", 0), Receiver)
+    srv.bodies, srv.connections, srv.status = [], 0, 200
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def test_webhook_delivers_over_one_connection(receiver, tmp_path):
+    """Test digests are POSTed in order over a kept-alive connection."""
+    url = f"http://127.0.0.1:{receiver.server_port}/hook"
+    alert = WebhookAlert(url, str(tmp_path / "spool"), timeout=2.0)
+    for name in ("a", "b"):
+        digest = AlertDigest(AlertTracker(StateManager(str(tmp_path / f"{name}.json"))).update(
+            [anomaly(name, "cpu_percent", 1)], 1000.0))
+        alert.send(digest, {"timestamp": "2024-01-15T10:00:00Z"})
+    alert.close(timeout=5.0)
+    
+    assert [body["events"][0]["rule_name"] for body in receiver.bodies] == ["a", "b"]
+    assert receiver.bodies[0]["events"][0]["kind"] == "firing"
+    assert receiver.connections == 1
+    assert Spool(str(tmp_path / "spool"), 1 << 20).entries() == []
+
+
+def test_webhook_spools_and_retries(receiver, tmp_path, monkeypatch):
+    """Test failed deliveries stay spooled and go out on a later run."""
+    url = f"http://127.0.0.1:{receiver.server_port}/"
+    spool_dir = str(tmp_path / "spool")
+    digest = AlertDigest(AlertTracker(StateManager(str(tmp_path / "s.json"))).update(
+        [anomaly("a", "cpu_percent", 1)], 1000.0))
+    
+    receiver.status = 503
+    first = WebhookAlert(url, spool_dir, timeout=2.0)
+    first.send(digest, {})
+    first.close(timeout=5.0)
+    entries = Spool(spool_dir, 1 << 20).entries()
+    assert receiver.bodies == []
+    assert [e.attempts for e in entries] == [1]
+    assert first.last_error == "HTTP 503"
+    
+    # A later run, past the backoff, picks the spool up with nothing new to send
+    receiver.status = 200
+    later = time.time() + webhook.RETRY_BACKOFF
+    monkeypatch.setattr(webhook.time, "time", lambda: later)
+    second = WebhookAlert(url, spool_dir, timeout=2.0)
+    second.close(timeout=5.0)
+    assert len(receiver.bodies) == 1
+    assert Spool(spool_dir, 1 << 20).entries() == []
+
+
+def test_webhook_close_delivers_send_during_post(receiver, tmp_path, monkeypatch):
+    """Test close() does not drop a digest sent while a delivery is in flight."""
+    url = f"http://127.0.0.1:{receiver.server_port}/"
+    alert = WebhookAlert(url, str(tmp_path / "spool"), timeout=2.0)
+    entered, release = threading.Event(), threading.Event()
+    post = alert._post
+    
+    def slow_post(payload):
+        """Hold the delivery until the test releases it."""
+        entered.set()
+        release.wait(5.0)
+        return post(payload)
+    
+    monkeypatch.setattr(alert, "_post", slow_post)
+    for name in ("a", "b"):
+        digest = AlertDigest(AlertTracker(StateManager(str(tmp_path / f"{name}.json"))).update(
+            [anomaly(name, "cpu_percent", 1)], 1000.0))
+        alert.send(digest, {})
+        # The second send lands while the worker is inside _post
+        assert entered.wait(5.0)
+    
+    closer = threading.Thread(target=alert.close, kwargs={"timeout": 5.0})
+    closer.start()
+    while not alert._stop.is_set():
+        time.sleep(0.01)
+    release.set()
+    closer.join()
+    
+    assert sorted(body["events"][0]["rule_name"] for body in receiver.bodies) == ["a", "b"]
+    assert Spool(str(tmp_path / "spool"), 1 << 20).entries() == []
+
+
+def test_webhook_unreachable_does_not_block(tmp_path):
+    """Test send() returns at once and the payload is kept when nobody listens."""
+    alert = WebhookAlert("http://127.0.0.1:9/", str(tmp_path / "spool"), timeout=1.0)
+    digest = AlertDigest(AlertTracker(StateManager(str(tmp_path / "s.json"))).update(
+        [anomaly("a", "cpu_percent", 1)], 1000.0))
+    alert.send(digest, {})
+    alert.close(timeout=5.0)
+    assert len(Spool(str(tmp_path / "spool"), 1 << 20).entries()) == 1
+    assert alert.last_error
+
+
+def test_spool_size_limit_drops_oldest(tmp_path):
+    """Test the spool keeps the newest payloads within its size limit."""
+    spool = Spool(str(tmp_path / "spool"), 250)
+    for index in range(5):
+        spool.put(bytes([48 + index]) * 100)
+    entries = spool.entries()
+    assert len(entries) == 2
+    with open(tmp_path / "spool" / entries[-1].name, "rb") as f:
+        assert f.read() == b"4" * 100
+
+
+def parse_journal_fields(data):
+    """Decode a native journal protocol datagram into (name, value) pairs."""
+    fields = []
+    while data:
+        line, _, rest = data.partition(b"\n")
+        if b"=" in line:
+            name, _, value = line.partition(b"=")
+            data = rest
+        else:
+            name = line
+            (size,) = struct.unpack("<Q", rest[:8])
+            value, data = rest[8:8 + size], rest[9 + size:]
+        fields.append((name.decode(), value.decode()))
+    return fields
+
+
+def test_journald_entry_per_digest(manager, tmp_path):
+    """Test a digest is one datagram with aligned per-event fields."""
+    path = str(tmp_path / "journal.sock")
+    journal = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    journal.bind(path)
+    journal.settimeout(2.0)
+    try:
+        tracker = AlertTracker(manager)
+        tracker.update([anomaly("io", "psi_io_avg10", 1)], 1000.0)
+        events = tracker.update([anomaly("disk", 'bytes_used_percent{mount="/"}', 5)], 1060.0)
+        report = {"overall": {"anomaly_count": 1, "triage_score": {"severity": "critical"}}}
+        
+        alert = JournaldAlert(path)
+        alert.send(AlertDigest(events), report)
+        alert.close()
+        fields = parse_journal_fields(journal.recv(65536))
+    finally:
+        journal.close()
+    
+    values = {}
+    for name, value in fields:
+        values.setdefault(name, []).append(value)
+    assert values["PRIORITY"] == ["2"]
+    assert values["SYSLOG_IDENTIFIER"] == ["linmon"]
+    assert values["LINMON_EVENT"] == ["firing", "resolved"]
+    assert values["LINMON_RULE"] == ["disk", "io"]
+    assert values["LINMON_METRIC"] == ['bytes_used_percent{mount="/"}', "psi_io_avg10"]
+    assert values["LINMON_VALUE"] == ["95.0", ""]
+    assert values["LINMON_SEVERITY"] == ["critical", "medium"]
+    assert values["MESSAGE"][0].startswith("LINMON ALERT: 1 firing, 1 resolved\n")
+
+
+def test_journald_missing_socket(tmp_path):
+    """Test sending without journald only records the error."""
+    alert = JournaldAlert(str(tmp_path / "missing.sock"))
+    digest = AlertDigest(AlertTracker(StateManager(str(tmp_path / "s.json"))).update(
+        [anomaly("a", "cpu_percent", 1)], 1000.0))
+    alert.send(digest, {})
+    assert alert.last_error
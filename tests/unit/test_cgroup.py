@@ -0,0 +1,121 @@
+"""Tests for cgroup monitor."""
+
+import pytest
+from linmon.collectors import cgroups
+from linmon.collectors.cgroups import CgroupCollector, parse_sample
+from linmon.monitors.cgroup import CgroupMonitor
+from linmon.config.schema import CgroupConfig
+from linmon.rules.engine import RuleEngine
+from linmon.state.manager import StateManager
+
+
+@pytest.fixture
+def rule_engine(tmp_path):
+    """Create a rule engine."""
+    return RuleEngine(StateManager(str(tmp_path / "state.json")))
+
+
+def write_cgroup(root, rel, usage=0, throttled=0, memory=0, oom_kills=0, rbytes=0, io_stall=0):
+    """Create a fake cgroup directory with v2 stat files."""
+    path = root / rel
+    path.mkdir(parents=True, exist_ok=True)
+    (path / "cpu.stat").write_text(
+        f"usage_usec {usage}\nuser_usec {usage}\nsystem_usec 0\n"
+        f"nr_periods 10\nnr_throttled 1\nthrottled_usec {throttled}\n"
+    )
+    (path / "memory.current").write_text(f"{memory}\n")
+    (path / "memory.events").write_text(f"low 0\nhigh 0\nmax 0\noom 0\noom_kill {oom_kills}\n")
+    (path / "io.stat").write_text(f"8:0 rbytes={rbytes} wbytes=0 rios=1 wios=0 dbytes=0 dios=0\n")
+    (path / "io.pressure").write_text(
+        f"some avg10=0.00 avg60=0.00 avg300=0.00 total={io_stall}\n"
+        "full avg10=0.00 avg60=0.00 avg300=0.00 total=0\n"
+    )
+    (path / "cgroup.procs").write_text("")
+
+
+def test_parse_sample_sums_io_devices():
+    """Test stat files are parsed and io.stat is summed over devices."""
+    sample = parse_sample({
+        "io.stat": "8:0 rbytes=100 wbytes=5\n8:16 rbytes=20 wbytes=7\n",
+        "memory.current": "4096\n",
+    })
+    assert sample[cgroups.IO_RBYTES] == 120
+    assert sample[cgroups.IO_WBYTES] == 12
+    assert sample[cgroups.MEMORY_CURRENT] == 4096
+    assert sample[cgroups.CPU_USAGE] is None
+
+
+def test_collector_walks_to_depth_and_caches_listings(tmp_path):
+    """Test the walk honours depth and exclude, and lists only changed directories."""
+    write_cgroup(tmp_path, "system.slice")
+    write_cgroup(tmp_path, "system.slice/nginx.service")
+    write_cgroup(tmp_path, "system.slice/nginx.service/worker")
+    write_cgroup(tmp_path, "user.slice")
+    collector = CgroupCollector(str(tmp_path), depth=2, exclude=["user.slice"])
+    
+    assert [rel for rel, _ in collector.walk()] == ["system.slice", "system.slice/nginx.service"]
+    assert collector.listed == 3
+    
+    # Nothing changed: only stat() calls
+    collector.walk()
+    assert collector.listed == 0
+    
+    write_cgroup(tmp_path, "system.slice/sshd.service")
+    assert "system.slice/sshd.service" in [rel for rel, _ in collector.walk()]
+    assert collector.listed == 2
+
+
+def test_cgroup_monitor_rates_and_top(rule_engine, tmp_path, monkeypatch):
+    """Test counters become rates across runs and only the top cgroups are kept."""
+    root = tmp_path / "cgroup"
+    write_cgroup(root, "a.slice", usage=0, memory=100, rbytes=0, io_stall=0)
+    write_cgroup(root, "b.slice", usage=0, memory=300, rbytes=0, io_stall=0)
+    write_cgroup(root, "c.slice", usage=0, memory=200, rbytes=0, io_stall=0)
+    config = CgroupConfig(root=str(root), top=2)
+    counters = str(tmp_path / "counters.json")
+    
+    clock = iter([1000.0, 1010.0])
+    monkeypatch.setattr("linmon.monitors.cgroup.time.time", lambda: next(clock))
+    first = CgroupMonitor(config, rule_engine, counters).collect_metrics()
+    assert first["cgroup_count"] == 3.0
+    assert set(first.family("cgroup_memory_bytes", ("cgroup",)).label_values) == {("b.slice",), ("c.slice",)}
+    assert len(first.family("cgroup_cpu_percent", ("cgroup",))) == 0
+    
+    # 10 s later, in a new process: counters come from the counters file
+    write_cgroup(root, "a.slice", usage=5_000_000, memory=100, rbytes=1000, io_stall=2_000_000, oom_kills=1)
+    write_cgroup(root, "b.slice", usage=1_000_000, memory=300, rbytes=0, io_stall=0)
+    second = CgroupMonitor(config, rule_engine, counters).collect_metrics()
+    assert second['cgroup_cpu_percent{cgroup="a.slice"}'] == pytest.approx(50.0)
+    assert second['cgroup_cpu_percent{cgroup="b.slice"}'] == pytest.approx(10.0)
+    assert second['cgroup_io_read_bytes_per_second{cgroup="a.slice"}'] == pytest.approx(100.0)
+    assert second['cgroup_io_pressure_percent{cgroup="a.slice"}'] == pytest.approx(20.0)
+    assert second['cgroup_oom_kills{cgroup="a.slice"}'] == 1.0
+    # Zero increases are not reported
+    assert len(second.family("cgroup_io_pressure_percent", ("cgroup",))) == 1
+
+
+def test_cgroup_monitor_reports_rule_selected_cgroups(rule_engine, tmp_path, monkeypatch):
+    """Test cgroups selected by a rule are reported even when outside the top."""
+    root = tmp_path / "cgroup"
+    write_cgroup(root, "system.slice/db.service", memory=100)
+    write_cgroup(root, "system.slice/web.service", memory=0)
+    write_cgroup(root, "user.slice", memory=300)
+    config = CgroupConfig(root=str(root), top=1, rules=[
+        {"name": "db_memory", "metric": "cgroup_memory_bytes", "op": "gt", "value": 50,
+         "consecutive": 1, "labels": {"cgroup": "system.slice/*"}},
+        {"name": "user_io", "expr": 'cgroup_io_pressure_percent{cgroup="user.slice"} > 10', "consecutive": 1},
+    ])
+    
+    clock = iter([1000.0, 1010.0])
+    monkeypatch.setattr("linmon.monitors.cgroup.time.time", lambda: next(clock))
+    monitor = CgroupMonitor(config, rule_engine, str(tmp_path / "counters.json"))
+    metrics = monitor.collect_metrics()
+    assert metrics.family("cgroup_memory_bytes", ("cgroup",)).label_values == [
+        ("user.slice",), ("system.slice/db.service",), ("system.slice/web.service",),
+    ]
+    assert metrics['cgroup_memory_bytes{cgroup="system.slice/web.service"}'] == 0.0
+    
+    # A zero rate is still reported for the cgroup the expression reads
+    metrics = monitor.collect_metrics()
+    assert metrics['cgroup_io_pressure_percent{cgroup="user.slice"}'] == 0.0
+    assert len(metrics.family("cgroup_io_pressure_percent", ("cgroup",))) == 1
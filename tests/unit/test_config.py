@@ -1,10 +1,12 @@
 """Tests for configuration loading and validation."""
 
+import os
 import pytest
 import tempfile
 import yaml
 from pathlib import Path
 from linmon.config.loader import load_config
+from linmon.core import LinmonCore
 from linmon.config.schema import Config, Rule, CPUConfig
 
 
@@ -89,3 +91,62 @@ def test_rule_validation():
             value=80.0,
             consecutive=0,  # Invalid
         )
+
+
+def write_config(path, stamp, cpu_threshold=80.0, mounts=("/",), alert_file="alerts.log"):
+    """Write a config with a CPU rule and storage mounts; ``stamp`` (distinct per write) sets its mtime."""
+    data = {
+        "state_file": str(path.parent / "state.json"),
+        "report_dir": str(path.parent / "reports"),
+        "alerts": {"stdout": True, "file": str(path.parent / alert_file)},
+        "monitors": {
+            "cpu": {"rules": [{"name": "high_cpu", "metric": "cpu_percent", "op": "gt", "value": cpu_threshold, "consecutive": 1}]},
+            "storage": {"mountpoints": [{"path": mount} for mount in mounts]},
+        },
+    }
+    path.write_text(yaml.dump(data))
+    mtime_ns = (1_000_000_000 + stamp) * 10**9
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_reload_rebuilds_only_changes(tmp_path):
+    """Test a config reload keeps unchanged monitors, sinks and state."""
+    path = tmp_path / "linmon.yaml"
+    write_config(path, 1)
+    core = LinmonCore(str(path))
+    cpu, storage = core.monitors["cpu"], core.monitors["storage"]
+    stdout_sink, file_sink = core.alerts
+    core.state_manager.increment_rule_streak("high_cpu")
+    assert core.reload() is False
+    
+    # Rules only: recompiled in place
+    write_config(path, 2, cpu_threshold=90.0)
+    assert core.reload() is True
+    assert core.monitors["cpu"] is cpu
+    assert cpu.plan.rules[0].threshold == 90.0
+    assert core.monitors["storage"] is storage
+    assert core.alerts == [stdout_sink, file_sink]
+    assert core.state_manager.get_rule_streak("high_cpu") == 1
+    
+    # Monitor settings and a sink changed: only those are rebuilt
+    write_config(path, 3, cpu_threshold=90.0, mounts=("/", "/tmp"), alert_file="other.log")
+    assert core.apply_config(load_config(str(path))) == ["rebuilt storage", "alerts"]
+    assert core.monitors["cpu"] is cpu
+    assert core.monitors["storage"] is not storage
+    assert core.alerts[0] is stdout_sink and core.alerts[1] is not file_sink
+
+
+def test_reload_rejects_invalid_config(tmp_path, capsys):
+    """Test an invalid config file leaves the running config in place."""
+    path = tmp_path / "linmon.yaml"
+    write_config(path, 1)
+    core = LinmonCore(str(path))
+    config = core.config
+    
+    path.write_text("monitors:\n  gpu: {}\n")
+    os.utime(path, ns=(2 * 10**18, 2 * 10**18))
+    assert core.reload() is False
+    assert core.config is config
+    assert "reload rejected" in capsys.readouterr().err
+    # Not retried until the file changes again
+    assert core.reload() is False
@@ -0,0 +1,44 @@
+"""Tests for per-metric ring history."""
+
+import pytest
+from linmon.state.history import MetricHistory
+
+
+def test_history_ring_and_slope():
+    """Test eviction, running fit and windowed fit."""
+    history = MetricHistory(4)
+    for i in range(6):
+        history.append(1000.0 + 60 * i, 10.0 + 2 * i)
+    
+    assert history.count == 4
+    assert [v for _, v in history.samples()] == [14.0, 16.0, 18.0, 20.0]
+    assert history.last() == (1300.0, 20.0)
+    assert history.slope() == pytest.approx(2.0 / 60)
+    assert history.slope(since=1240.0) == pytest.approx(2.0 / 60)
+    assert history.slope(since=1300.0) is None
+    assert history.delta() == pytest.approx(6.0)
+    
+    # Same timestamp replaces the newest sample
+    history.append(1300.0, 30.0)
+    assert history.count == 4
+    assert history.last() == (1300.0, 30.0)
+
+
+def test_history_encode_roundtrip():
+    """Test packed encoding is compact and round-trips."""
+    history = MetricHistory(64)
+    for i in range(64):
+        history.append(1.7e9 + 300 * i, 1e9 + 4096.0 * i)
+    
+    packed = history.encode()
+    assert len(packed) < 64 * 12 * 4 // 3 + 32
+    
+    restored = MetricHistory.decode(packed, 64)
+    assert list(restored.samples()) == list(history.samples())
+    assert restored.slope() == pytest.approx(history.slope())
+    
+    # Shrinking the capacity keeps the newest samples
+    assert MetricHistory.decode(packed, 8).count == 8
+    
+    with pytest.raises(ValueError):
+        MetricHistory.decode("not base64!", 8)
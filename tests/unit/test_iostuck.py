@@ -7,6 +7,10 @@ from linmon.config.schema import IOStuckConfig
 from linmon.rules.engine import RuleEngine
 from linmon.state.manager import StateManager
 from linmon.state.model import LogCursor
+from linmon.collectors.logscan import LogScanResult
+from linmon.collectors.nfs import NFSStatsCollector, parse_mountstats
+import io
+import os
 import tempfile
 
 
@@ -54,21 +58,20 @@ def test_iostuck_monitor_suggested_commands(iostuck_monitor):
     assert len(commands) > 0
 
 
-@patch("linmon.collectors.logs.LogCollector.collect_kernel_logs")
-@patch("linmon.collectors.logs.LogCollector.find_hung_tasks")
+@patch("linmon.collectors.logs.LogCollector.scan_kernel_logs")
 @patch("linmon.collectors.psi.PSICollector.is_available")
 @patch("linmon.collectors.processes.ProcessCollector.get_d_state_tasks")
 def test_iostuck_monitor_with_mocks(
     mock_d_state,
     mock_psi_available,
-    mock_find_hung,
-    mock_collect_logs,
+    mock_scan_logs,
     iostuck_monitor,
 ):
     """Test IO-stuck monitor with mocked collectors."""
-    # Mock log collection
-    mock_collect_logs.return_value = (["line1", "line2"], LogCursor(journald_cursor="cursor123"))
-    mock_find_hung.return_value = 2
+    # Mock log scanning
+    scan_result = LogScanResult()
+    scan_result.count = 2
+    mock_scan_logs.return_value = (scan_result, LogCursor(journald_cursor="cursor123"))
     
     # Mock PSI
     mock_psi_available.return_value = False
@@ -100,3 +103,115 @@ def test_log_collector_hung_task_pattern():
     
     count = collector.find_hung_tasks(lines)
     assert count == 2
+
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "..", "fixtures")
+
+
+def test_log_scanner_file():
+    """Test mmap-based scanning of a kernel log file."""
+    from linmon.collectors.logs import LogCollector
+    
+    collector = LogCollector()
+    path = os.path.join(FIXTURES, "kernel_logs.txt")
+    
+    result, offset = collector.scanner.scan_file(path, 0)
+    assert result.count == 3
+    assert offset == os.path.getsize(path)
+    assert result.matches[0].endswith("blocked for more than 120 seconds.")
+    
+    # Nothing new past the saved offset
+    result, new_offset = collector.scanner.scan_file(path, offset)
+    assert result.count == 0
+    assert new_offset == offset
+
+
+def test_log_scanner_leaves_partial_line():
+    """Test that a trailing partial line is not consumed."""
+    from linmon.collectors.logs import LogCollector
+    
+    collector = LogCollector()
+    with tempfile.NamedTemporaryFile(mode="wb", suffix=".log", delete=False) as f:
+        f.write(b"INFO: task a:1 blocked for more than 120 seconds.\n")
+        f.write(b"INFO: task b:2 blocked for more")
+        path = f.name
+    
+    try:
+        result, offset = collector.scanner.scan_file(path, 0)
+        assert result.count == 1
+        
+        with open(path, "ab") as f:
+            f.write(b" than 60 seconds.\n")
+        
+        result, _ = collector.scanner.scan_file(path, offset)
+        assert result.count == 1
+    finally:
+        os.unlink(path)
+
+
+def test_log_scanner_stream():
+    """Test chunked stream scanning across chunk boundaries."""
+    from linmon.collectors.logs import LogCollector
+    
+    collector = LogCollector()
+    collector.scanner.CHUNK_SIZE = 7  # Force anchors to straddle chunks
+    data = (
+        b"kernel: normal message\n"
+        b"kernel: INFO: task x:1 blocked for more than 120 seconds.\n"
+        b"-- cursor: s=abc;i=1\n"
+    )
+    
+    result = collector.scanner.scan_stream(io.BytesIO(data))
+    assert result.count == 1
+    assert result.last_line == b"-- cursor: s=abc;i=1"
+
+
+def mountstats(read_ops, read_rtt, transmissions, sends, backlog):
+    """Build a mountstats file with one local and one NFS mount."""
+    return (
+        "device /dev/sda1 mounted on / with fstype ext4\n"
+        "device nas:/export mounted on /mnt/my\\040data with fstype nfs4 statvers=1.1\n"
+        "\topts:\trw,vers=4.2,rsize=1048576\n"
+        "\tevents:\t1 2 3\n"
+        "\tRPC iostats version: 1.1  p/v: 100003/4 (nfs)\n"
+        f"\txprt:\ttcp 833 1 1 0 0 {sends} {sends} 0 {sends} {backlog} 64 0 0\n"
+        "\tper-op statistics\n"
+        "\t        NULL: 0 0 0 0 0 0 0 0 0\n"
+        f"\t        READ: {read_ops} {transmissions} 0 1000 100000 {read_ops} {read_rtt} {read_rtt + read_ops} 0\n"
+        "\t       WRITE: 5 5 0 5000 500 1 2 3 0\n"
+    )
+
+
+def test_parse_mountstats():
+    """Test NFS mounts, selected ops and transport counters are parsed."""
+    stats = parse_mountstats(io.StringIO(mountstats(10, 50, 12, 100, 30)), ["READ"])
+    assert list(stats) == ["/mnt/my data"]
+    mount = stats["/mnt/my data"]
+    assert mount.ops == {"READ": [10, 12, 0, 1000, 100000, 10, 50, 60]}
+    assert (mount.sends, mount.backlog) == (100, 30)
+
+
+def test_iostuck_monitor_nfs_deltas(rule_engine, state_manager, tmp_path, monkeypatch):
+    """Test NFS latency and retransmits are computed between runs."""
+    path = tmp_path / "mountstats"
+    path.write_text(mountstats(10, 50, 10, 100, 0))
+    monkeypatch.setattr("linmon.monitors.iostuck.time.time", iter([1000.0, 1060.0]).__next__)
+    config = IOStuckConfig(enabled=True, rules=[], nfs={"ops": ["read", "write"]})
+    monitor = IOStuckMonitor(config, rule_engine, state_manager, str(tmp_path / "nfs.json"),
+                             nfs_collector=NFSStatsCollector(str(path)))
+    monitor.log_collector = Mock(scan_kernel_logs=Mock(return_value=(LogScanResult(), None)))
+    monitor.process_collector = Mock(get_d_state_tasks=Mock(return_value=[]))
+    
+    assert not any(key.startswith("nfs_") for key in monitor.collect_metrics())
+    
+    # 60 s later: 30 more READs taking 3000 ms in total, 3 of them retransmitted
+    path.write_text(mountstats(40, 3050, 43, 160, 120))
+    metrics = monitor.collect_metrics()
+    mount = '{mount="/mnt/my data"}'
+    assert metrics[f"nfs_read_avg_rtt_ms{mount}"] == pytest.approx(100.0)
+    assert metrics[f"nfs_read_ops_per_second{mount}"] == pytest.approx(0.5)
+    assert metrics[f"nfs_read_retransmits{mount}"] == 3.0
+    assert metrics[f"nfs_backlog_avg{mount}"] == pytest.approx(2.0)
+    # No WRITE completed meanwhile: no average
+    assert f"nfs_write_avg_rtt_ms{mount}" not in metrics
+    assert metrics[f"nfs_write_ops_per_second{mount}"] == 0.0
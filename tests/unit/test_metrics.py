@@ -0,0 +1,50 @@
+"""Tests for the labelled metric model."""
+
+import pytest
+from linmon.metrics.model import LabelSelector, MetricSet, format_labels, parse_series_key
+
+
+def test_parse_and_format_series_key():
+    """Test series key round trip, including escaping."""
+    assert parse_series_key("cpu_percent") == ("cpu_percent", {})
+    assert parse_series_key('bytes_used_percent{mount="/var"}') == (
+        "bytes_used_percent",
+        {"mount": "/var"},
+    )
+    
+    key = "x" + format_labels(("path",), ('a "quoted" \\ path',))
+    assert parse_series_key(key) == ("x", {"path": 'a "quoted" \\ path'})
+    
+    with pytest.raises(ValueError):
+        parse_series_key("bad name{")
+
+
+def test_metric_set_mapping_view():
+    """Test flat-key access to labelled and unlabelled series."""
+    metrics = MetricSet()
+    metrics.set("cpu_percent", 12.5)
+    family = metrics.family("bytes_used_percent", ("mount",))
+    family.set(("/",), 40.0)
+    family.set(("/var",), 91.0)
+    
+    assert metrics["cpu_percent"] == 12.5
+    assert metrics['bytes_used_percent{mount="/var"}'] == 91.0
+    assert "bytes_used_percent" not in metrics
+    assert len(metrics) == 3
+    assert MetricSet.from_dict(metrics.to_dict()).to_dict() == metrics.to_dict()
+
+
+def test_family_select():
+    """Test exact and glob label selection through the index."""
+    metrics = MetricSet()
+    family = metrics.family("bytes_used_percent", ("mount",))
+    for i, path in enumerate(["/", "/srv/a", "/var", "/srv/b"]):
+        family.set((path,), float(i))
+    
+    assert list(family.select(LabelSelector())) == [0, 1, 2, 3]
+    assert list(family.select(LabelSelector({"mount": "/var"}))) == [2]
+    assert list(family.select(LabelSelector({"mount": "/srv/*"}))) == [1, 3]
+    assert list(family.select(LabelSelector({"mount": "/nope"}))) == []
+    assert list(family.select(LabelSelector({"device": "sda"}))) == []
+    assert LabelSelector({"mount": "/var"}).exact is True
+    assert LabelSelector({"mount": "/srv/*"}).exact is False
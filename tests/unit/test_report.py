@@ -0,0 +1,227 @@
+"""Tests for report building and formatting."""
+
+import pytest
+import json
+import tarfile
+from datetime import date, datetime
+from unittest.mock import Mock
+from linmon.report.builder import ReportBuilder
+from linmon.report.json import JSONReporter
+from linmon.report.text import TextReporter
+from linmon.report import journal as journal_module
+from linmon.report.journal import RunJournal, journal_record
+from linmon.report.prometheus import PrometheusReporter
+from linmon.report.query import anomaly_rows, iter_records, metric_rows
+from linmon.report.retention import ReportStore
+from linmon.rules.model import RuleResult
+from linmon.metrics.model import MetricSet
+
+
+def make_result(name, anomaly, streak=1):
+    """Create a rule result."""
+    return RuleResult(
+        rule_name=name,
+        metric="cpu_percent",
+        value=91.0,
+        threshold=80.0,
+        operator="gt",
+        violated=anomaly,
+        streak=streak,
+        consecutive_required=1,
+        anomaly=anomaly,
+    )
+
+
+@pytest.fixture
+def monitor():
+    """Create a mock monitor that has already been evaluated."""
+    mon = Mock()
+    mon.config.enabled = True
+    mon.last_metrics = MetricSet.from_dict({"cpu_percent": 91.0})
+    mon.get_suggested_commands.return_value = ["top -bn1 | head -20"]
+    mon.diagnose.return_value = {}
+    return mon
+
+
+def test_report_builder_uses_evaluated_metrics(monitor):
+    """Test that building a report does not collect metrics a second time."""
+    results = {"cpu": [make_result("high_cpu", True), make_result("ok_rule", False)]}
+    
+    report = ReportBuilder().build({"cpu": monitor}, results)
+    
+    monitor.collect_metrics.assert_not_called()
+    cpu = report["monitors"]["cpu"]
+    assert cpu["metrics"] == {"cpu_percent": 91.0}
+    assert len(cpu["results"]) == 2
+    assert [a["rule_name"] for a in cpu["anomalies"]] == ["high_cpu"]
+    assert report["overall"]["anomaly_count"] == 1
+    assert report["overall"]["triage_score"]["severity"] == "medium"
+
+
+def test_report_formats(monitor):
+    """Test that built reports serialize to JSON and text."""
+    results = {"cpu": [make_result("high_cpu", True, streak=5)]}
+    report = ReportBuilder().build({"cpu": monitor}, results)
+    
+    data = json.loads(JSONReporter().format(report))
+    assert data["monitors"]["cpu"]["anomalies"][0]["streak"] == 5
+    
+    text = TextReporter().format(report)
+    assert "Overall Status: CRITICAL" in text
+    assert "[high_cpu] cpu_percent = 91.00" in text
+
+
+def test_prometheus_exposition(monitor):
+    """Test grouped families with HELP/TYPE, labels and rule/triage gauges."""
+    monitor.last_metrics = MetricSet.from_dict({
+        "cpu_percent": 91.0,
+        'bytes_used_percent{mount="/"}': 50.0,
+        'bytes_used_percent{mount="/var"}': float("nan"),
+    })
+    report = ReportBuilder().build({"cpu": monitor}, {"cpu": [make_result("high_cpu", True, streak=3)]})
+    text = PrometheusReporter().format(report)
+    lines = text.splitlines()
+    
+    assert text.endswith("\n")
+    assert lines[:3] == [
+        "# HELP linmon_cpu_percent CPU utilisation over the sample window, in percent.",
+        "# TYPE linmon_cpu_percent gauge",
+        "linmon_cpu_percent 91.0",
+    ]
+    start = lines.index("# TYPE linmon_bytes_used_percent gauge")
+    assert lines[start + 1:start + 3] == [
+        'linmon_bytes_used_percent{mount="/"} 50.0',
+        'linmon_bytes_used_percent{mount="/var"} NaN',
+    ]
+    assert 'linmon_rule_streak{monitor="cpu",rule="high_cpu",metric="cpu_percent"} 3.0' in lines
+    assert 'linmon_rule_anomaly{monitor="cpu",rule="high_cpu",metric="cpu_percent"} 1.0' in lines
+    severity = report["overall"]["triage_score"]["severity"]
+    assert f'linmon_triage_severity{{scope="overall",severity="{severity}"}} 1.0' in lines
+    assert "linmon_anomaly_count 1.0" in lines
+    
+    # Each family has exactly one TYPE line
+    types = [line.split()[2] for line in lines if line.startswith("# TYPE")]
+    assert len(types) == len(set(types))
+
+
+def test_report_store_partitions_archives_and_retains(tmp_path):
+    """Test day partitions, per-day archives, age and size retention."""
+    store = ReportStore(str(tmp_path), max_age_seconds=3 * 86400, compress=True)
+    for day in (1, 2, 5, 6):
+        store.write(datetime(2024, 1, day, 12, 0, 0), {"txt": "x" * 100, "json": "{}"})
+    assert (tmp_path / "2024/01/06/report-2024-01-06T12-00-00Z.txt").is_file()
+    
+    # Legacy flat report is moved into its day
+    (tmp_path / "report-2024-01-05T08-00-00-5Z.json").write_text("{}")
+    
+    removed = store.enforce(date(2024, 1, 6))
+    assert removed == 2
+    assert [d.day for d, _ in store.days()] == [5, 6]
+    assert not (tmp_path / "2024/01/05").exists()
+    with tarfile.open(str(store.archive_path(date(2024, 1, 5)))) as tar:
+        assert sorted(tar.getnames()) == [
+            "2024-01-05/report-2024-01-05T08-00-00-5Z.json",
+            "2024-01-05/report-2024-01-05T12-00-00Z.json",
+            "2024-01-05/report-2024-01-05T12-00-00Z.txt",
+        ]
+    assert (tmp_path / "2024/01/06").is_dir()
+    
+    # Size limit drops the oldest day but never today
+    store = ReportStore(str(tmp_path), max_bytes=1, compress=False)
+    assert store.enforce(date(2024, 1, 6)) == 1
+    assert [d.day for d, _ in store.days()] == [6]
+
+
+def test_run_journal_records_and_rotation(tmp_path, monitor):
+    """Test compact journal records, tail lookup and size rotation."""
+    report = ReportBuilder().build({"cpu": monitor}, {"cpu": [make_result("high_cpu", True)]})
+    record = journal_record(report, "2024/01/06/report-x.json")
+    assert record["severity"] == "medium"
+    assert record["metrics"] == {"cpu": {"cpu_percent": 91.0}}
+    assert record["anomalies"][0]["rule_name"] == "high_cpu"
+    assert record["anomalies"][0]["monitor"] == "cpu"
+    
+    path = str(tmp_path / "journal.ndjson")
+    journal = RunJournal(path, max_bytes=200, keep=2)
+    assert journal.last_record() is None
+    
+    offsets = [journal.append({"n": i, "pad": "x" * 60}) for i in range(7)]
+    assert offsets[:2] == [0, 77]
+    assert journal.files() == [path + ".2", path + ".1", path]
+    assert journal.last_record()["n"] == 6
+    with open(path) as f:
+        assert [json.loads(line)["n"] for line in f] == [6]
+    
+    # A torn final line is skipped
+    with open(path, "a") as f:
+        f.write('{"n": 7, "pa')
+    assert journal.last_record()["n"] == 6
+    assert journal.append({"n": 8}) == 90
+    assert journal.last_record()["n"] == 8
+
+
+def test_run_journal_last_record_larger_than_tail(tmp_path):
+    """Test the newest record is found however far back its line starts."""
+    journal = RunJournal(str(tmp_path / "journal.ndjson"), max_bytes=10 * 1024 * 1024)
+    journal.append({"n": 0})
+    journal.append({"n": 1, "pad": "x" * 300 * 1024})
+    assert journal.last_record()["n"] == 1
+    
+    # Not mistaken for a torn line and skipped for the small record before it
+    journal.append({"n": 2, "pad": "y" * 200 * 1024})
+    with open(journal.path, "a") as f:
+        f.write('{"n": 3, "pa')
+    assert journal.last_record()["n"] == 2
+
+
+def test_history_queries_journal_index_and_reports(tmp_path, monkeypatch, monitor):
+    """Test sparse-index seeks in the journal and range reads of report files."""
+    monkeypatch.setattr(journal_module, "INDEX_STRIDE", 150)
+    journal = RunJournal(str(tmp_path / "journal.ndjson"), max_bytes=1000, keep=3)
+    for minute in range(30):
+        journal.append({
+            "timestamp": f"2024-01-06T10:{minute:02d}:00Z",
+            "metrics": {"cpu": {"cpu_percent": float(minute), "load1": 1.0}},
+            "anomalies": [],
+        })
+    
+    files = journal.files()
+    assert len(files) > 1
+    index = journal.read_index(files[-1])
+    assert index[0][1] == 0 and all(b[1] - a[1] >= 150 for a, b in zip(index, index[1:]))
+    
+    since = datetime(2024, 1, 6, 10, 20).timestamp() - datetime(1970, 1, 1).timestamp()
+    opened = []
+    real_open = open
+    
+    def tracking_open(path, *args, **kwargs):
+        opened.append(str(path))
+        return real_open(path, *args, **kwargs)
+    
+    monkeypatch.setattr("builtins.open", tracking_open)
+    records = list(journal.read(since, since + 300))
+    monkeypatch.undo()
+    assert [r["timestamp"][14:16] for r in records] == ["20", "21", "22", "23", "24", "25"]
+    assert files[0] not in opened
+    
+    rows = list(metric_rows(records, ["cpu_percent"]))
+    assert [row["value"] for row in rows] == [20.0, 21.0, 22.0, 23.0, 24.0, 25.0]
+    assert rows[0] == {"timestamp": "2024-01-06T10:20:00Z", "monitor": "cpu", "series": "cpu_percent", "value": 20.0}
+    
+    # Report files: the day partitions and file names bound what is parsed
+    store = ReportStore(str(tmp_path / "reports"))
+    report = ReportBuilder().build({"cpu": monitor}, {"cpu": [make_result("high_cpu", True)]})
+    for day in (4, 5, 6):
+        store.write(datetime(2024, 1, day, 12, 0, 0), {"json": json.dumps(report)})
+    store.enforce(date(2024, 1, 6))
+    day5 = datetime(2024, 1, 5).timestamp() - datetime(1970, 1, 1).timestamp()
+    found = list(store.reports(day5, day5 + 86400))
+    assert [location for _, location, _ in found] == [
+        "2024/01/05.tar.gz:2024-01-05/report-2024-01-05T12-00-00Z.json",
+    ]
+    
+    records = list(iter_records(store, None, day5, None))
+    assert [r["report"].split("/")[-1] for r in records] == [
+        "report-2024-01-05T12-00-00Z.json", "report-2024-01-06T12-00-00Z.json",
+    ]
+    assert [row["rule_name"] for row in anomaly_rows(records)] == ["high_cpu", "high_cpu"]
@@ -123,3 +123,174 @@ def test_rule_engine_streak(rule_engine):
     results3 = rule_engine.evaluate(rules, metrics)
     assert results3[0].violated is False
     assert results3[0].streak == 0
+
+
+def test_evaluation_plan_groups_and_dedups():
+    """Test plan indexing by metric and collapsing of duplicate rules."""
+    from linmon.rules.plan import EvaluationPlan
+    
+    rule = Rule(name="high_cpu", metric="cpu_percent", op="gt", value=80.0, consecutive=1)
+    plan = EvaluationPlan([
+        rule,
+        Rule(name="high_load", metric="load1", op="gt", value=4.0, consecutive=1),
+        rule,
+    ])
+    
+    assert len(plan) == 2
+    assert set(plan.by_metric) == {"cpu_percent", "load1"}
+    assert plan.rule_names == {"high_cpu", "high_load"}
+
+
+def test_rule_engine_plan_order_and_missing_metrics(rule_engine):
+    """Test compiled evaluation keeps config order and skips missing metrics."""
+    plan = rule_engine.compile([
+        Rule(name="load", metric="load1", op="gt", value=4.0, consecutive=1),
+        Rule(name="disk", metric="bytes_used_percent", op="gt", value=90.0, consecutive=1),
+        Rule(name="cpu", metric="cpu_percent", op="gte", value=80.0, consecutive=1),
+    ])
+    
+    metrics = {"cpu_percent": 80.0, "load1": 1.0}
+    results = rule_engine.evaluate_plan(plan, metrics)
+    
+    assert [r.rule_name for r in results] == ["load", "cpu"]
+    assert results[0].violated is False
+    assert results[1].violated is True
+    assert results[1].anomaly is True
+
+
+def test_rule_engine_label_selectors(rule_engine, state_manager):
+    """Test label selectors, per-series streaks and config ordering."""
+    from linmon.metrics.model import MetricSet
+    
+    metrics = MetricSet()
+    family = metrics.family("bytes_used_percent", ("mount",))
+    family.set(("/",), 50.0)
+    family.set(("/srv/a",), 95.0)
+    family.set(("/srv/b",), 97.0)
+    
+    plan = rule_engine.compile([
+        Rule(name="srv_full", metric="bytes_used_percent", labels={"mount": "/srv/*"}, op="gt", value=90.0, consecutive=1),
+        Rule(name="root_full", metric='bytes_used_percent{mount="/"}', op="gt", value=90.0, consecutive=1),
+    ])
+    results = rule_engine.evaluate_plan(plan, metrics)
+    
+    assert [(r.rule_name, r.metric) for r in results] == [
+        ("srv_full", 'bytes_used_percent{mount="/srv/a"}'),
+        ("srv_full", 'bytes_used_percent{mount="/srv/b"}'),
+        ("root_full", 'bytes_used_percent{mount="/"}'),
+    ]
+    assert [r.violated for r in results] == [True, True, False]
+    
+    # Glob rules track a streak per series; pinned rules keep the rule name
+    assert state_manager.get_rule_streak('srv_full{mount="/srv/a"}') == 1
+    assert state_manager.get_rule_streak("root_full") == 0
+
+
+def test_rule_engine_trend_rules(rule_engine, state_manager):
+    """Test eta_seconds and rate rules over recorded history."""
+    plan = rule_engine.compile([
+        Rule(
+            name="disk_full_soon",
+            type="eta_seconds",
+            metric="bytes_used_percent",
+            args={"target": 100, "window": "1h"},
+            op="lt",
+            value=3600,
+            consecutive=1,
+        ),
+        Rule(
+            name="disk_growth",
+            type="rate",
+            metric="bytes_used_percent",
+            args={"per": "1h"},
+            op="gt",
+            value=10.0,
+            consecutive=1,
+        ),
+    ])
+    
+    # A single sample has no trend yet
+    assert rule_engine.evaluate_plan(plan, {"bytes_used_percent": 80.0}, now=0.0) == []
+    
+    # +5% every 5 minutes: 60%/hour, full in 20 minutes
+    results = rule_engine.evaluate_plan(plan, {"bytes_used_percent": 85.0}, now=300.0)
+    assert [r.metric for r in results] == ["eta_seconds(bytes_used_percent)", "rate(bytes_used_percent)"]
+    assert results[0].value == pytest.approx(900.0)
+    assert results[0].anomaly is True
+    assert results[1].value == pytest.approx(60.0)
+    assert state_manager.get_history("bytes_used_percent").count == 2
+    
+    # Shrinking usage: no ETA, streak cleared
+    results = rule_engine.evaluate_plan(plan, {"bytes_used_percent": 50.0}, now=600.0)
+    assert [r.rule_name for r in results] == ["disk_growth"]
+    assert state_manager.get_rule_streak("disk_full_soon") == 0
+
+
+def test_trend_rule_validation():
+    """Test trend rule config validation."""
+    with pytest.raises(ValueError):
+        Rule(name="bad", type="rate", expr="cpu_percent > 1", consecutive=1)
+    with pytest.raises(ValueError):
+        Rule(name="bad", type="rate", metric="x", op="gt", value=1, args={"window": "soon"}, consecutive=1)
+
+
+def test_compile_expression():
+    """Test compiling and evaluating expressions."""
+    from linmon.metrics.expr import compile_expression
+    
+    expr = compile_expression("cpu_percent > 80 and load1 > ncpu * 1.5")
+    assert expr.names == {"cpu_percent", "load1"}
+    assert expr.evaluate({"cpu_percent": 90.0, "load1": 10000.0}) is True
+    assert expr.evaluate({"cpu_percent": 50.0, "load1": 10000.0}) is False
+    
+    expr = compile_expression("0 < max(psi_io_avg10, psi_io_avg60) <= 100 and not d_state_task_count")
+    assert expr.evaluate({"psi_io_avg10": 5.0, "psi_io_avg60": 1.0, "d_state_task_count": 0.0}) is True
+
+
+@pytest.mark.parametrize("source", [
+    "__import__('os')",
+    "cpu_percent.real > 1",
+    "[cpu_percent][0] > 1",
+    "cpu_percent > 'high'",
+    "lambda: 1",
+    "cpu_percent >",
+])
+def test_compile_expression_rejects_unsafe(source):
+    """Test that unsupported syntax is rejected at compile time."""
+    from linmon.metrics.expr import compile_expression, ExpressionError
+    
+    with pytest.raises(ExpressionError):
+        compile_expression(source)
+
+
+def test_rule_engine_expression_streak(rule_engine):
+    """Test expression rules with streak tracking and missing metrics."""
+    rules = [
+        Rule(name="io_stuck", expr="psi_io_avg10 > 20 and d_state_task_count > 5", consecutive=2),
+    ]
+    plan = rule_engine.compile(rules)
+    metrics = {"psi_io_avg10": 30.0, "d_state_task_count": 8.0}
+    
+    results = rule_engine.evaluate_plan(plan, metrics)
+    assert results[0].violated is True
+    assert results[0].operator == "expr"
+    assert results[0].anomaly is False
+    
+    results = rule_engine.evaluate_plan(plan, metrics)
+    assert results[0].streak == 2
+    assert results[0].anomaly is True
+    
+    # Missing metric: rule skipped
+    assert rule_engine.evaluate_plan(plan, {"psi_io_avg10": 30.0}) == []
+
+
+def test_rule_expression_validation():
+    """Test that expr and metric/op/value forms are validated."""
+    with pytest.raises(ValueError):
+        Rule(name="both", expr="load1 > 1", metric="load1", op="gt", value=1.0, consecutive=1)
+    
+    with pytest.raises(ValueError):
+        Rule(name="neither", consecutive=1)
+    
+    with pytest.raises(ValueError):
+        Rule(name="bad", expr="load1 >", consecutive=1)
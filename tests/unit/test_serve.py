@@ -0,0 +1,63 @@
+"""Tests for the serve-mode HTTP snapshot endpoint."""
+
+import gzip
+import threading
+import urllib.error
+import urllib.request
+import pytest
+from linmon.serve import MetricsServer, SnapshotCache, build_snapshot, parse_listen
+
+
+@pytest.fixture
+def server():
+    """Run a snapshot server on an ephemeral port."""
+    cache = SnapshotCache()
+    srv = MetricsServer(("127.0.0.1", 0), cache)
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def fetch(srv, path, headers=None):
+    """GET a path; returns (status, headers, body)."""
+    url = f"http://127.0.0.1:{srv.server_address[1]}{path}"
+    request = urllib.request.Request(url, headers=headers or {})
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, response.headers, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, e.read()
+
+
+def test_parse_listen():
+    """Test listen address forms."""
+    assert parse_listen("127.0.0.1:9810") == ("127.0.0.1", 9810)
+    assert parse_listen(":9810") == ("", 9810)
+    assert parse_listen("[::1]:9810") == ("::1", 9810)
+    with pytest.raises(ValueError):
+        parse_listen("localhost")
+
+
+def test_serves_published_snapshots(server):
+    """Test 503 before the first run, cached bodies, gzip and atomic replacement."""
+    assert fetch(server, "/metrics")[0] == 503
+    
+    metrics = "# TYPE linmon_cpu_percent gauge\nlinmon_cpu_percent 12.0\n" * 40
+    server.cache.publish(build_snapshot(metrics, '{"overall": {}}'))
+    
+    status, headers, body = fetch(server, "/metrics")
+    assert status == 200
+    assert headers["Content-Type"].startswith("text/plain; version=0.0.4")
+    assert body == metrics.encode()
+    
+    status, headers, body = fetch(server, "/metrics?x=1", {"Accept-Encoding": "gzip"})
+    assert headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(body) == metrics.encode()
+    
+    assert fetch(server, "/report.json")[2] == b'{"overall": {}}'
+    assert fetch(server, "/missing")[0] == 404
+    
+    server.cache.publish(build_snapshot("linmon_cpu_percent 1.0\n", "{}"))
+    assert fetch(server, "/metrics")[2] == b"linmon_cpu_percent 1.0\n"
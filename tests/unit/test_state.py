@@ -0,0 +1,123 @@
+"""Tests for state persistence."""
+
+import json
+import os
+import pytest
+from linmon.state.manager import StateManager
+from linmon.state.model import LogCursor
+
+
+@pytest.fixture
+def state_file(tmp_path):
+    """Path of a state file that does not exist yet."""
+    return str(tmp_path / "state.json")
+
+
+def test_save_skips_unchanged_state(state_file):
+    """Test only real changes are written, in compact form."""
+    manager = StateManager(state_file)
+    manager.update_last_run("2024-01-01T00:00:00Z")
+    assert manager.save() is True  # New file
+    assert manager.save() is False
+    
+    content = open(state_file).read()
+    assert "\n" not in content and ": " not in content
+    
+    # A later run with no streak, cursor or history changes writes nothing
+    manager = StateManager(state_file)
+    manager.update_last_run("2024-01-01T00:05:00Z")
+    manager.reset_rule_streak("not_violated")
+    manager.set_log_cursor("kernel", LogCursor())
+    manager.set_log_cursor("kernel", LogCursor())
+    assert manager.save() is True  # New cursor
+    
+    manager = StateManager(state_file)
+    mtime = os.stat(state_file).st_mtime_ns
+    manager.update_last_run("2024-01-01T00:10:00Z")
+    manager.set_log_cursor("kernel", LogCursor())
+    manager.get_history("bytes_used")
+    assert manager.save() is False
+    assert manager.write_count == 0
+    assert os.stat(state_file).st_mtime_ns == mtime
+    
+    manager.increment_rule_streak("high_cpu")
+    manager.record_sample("bytes_used", 0.0, 1.0)
+    assert manager.save() is True
+    assert manager.write_count == 1
+
+
+def test_prune_stale_entries(state_file):
+    """Test streaks, cursors and histories of removed config are dropped."""
+    manager = StateManager(state_file)
+    manager.increment_rule_streak("high_cpu")
+    manager.increment_rule_streak("old_rule")
+    manager.increment_rule_streak('srv_full{mount="/srv/a"}')
+    manager.set_log_cursor("kernel", LogCursor(file_offset=10))
+    manager.set_log_cursor("gone", LogCursor(file_offset=10))
+    manager.record_sample('bytes_used_percent{mount="/"}', 0.0, 1.0)
+    manager.record_sample("old_metric", 0.0, 1.0)
+    manager.save()
+    
+    manager = StateManager(state_file)
+    removed = manager.prune(
+        rule_names={"high_cpu", "srv_full"},
+        log_sources={"kernel"},
+        history_metrics={"bytes_used_percent"},
+    )
+    assert removed == 3
+    assert manager.prune({"high_cpu", "srv_full"}, {"kernel"}, {"bytes_used_percent"}) == 0
+    assert manager.save() is True
+    
+    data = json.load(open(state_file))
+    assert set(data["rule_streaks"]) == {"high_cpu", 'srv_full{mount="/srv/a"}'}
+    assert set(data["log_cursors"]) == {"kernel"}
+    assert set(data["metric_history"]) == {'bytes_used_percent{mount="/"}'}
+
+
+def test_state_lock_skip_wait_and_reload(state_file):
+    """Test the state lock excludes a second manager and reloads its changes."""
+    first = StateManager(state_file)
+    second = StateManager(state_file)
+    
+    assert first.acquire(wait=False) is True
+    second.get_rule_streak("high_cpu")  # Cached before the other run writes
+    assert second.acquire(wait=False) is False
+    assert second.acquire(wait=True, timeout=0.1) is False
+    
+    first.increment_rule_streak("high_cpu")
+    first.save()
+    first.release()
+    
+    assert second.acquire(wait=False) is True
+    assert second.locked
+    assert second.get_rule_streak("high_cpu") == 1
+    second.release()
+
+
+def test_monitor_state_file_sharding():
+    """Test per-monitor state file names."""
+    from linmon.config.schema import Config
+    
+    config = Config(state_file="/var/lib/linmon/state.json", monitors={})
+    assert config.monitor_state_file("cpu") == "/var/lib/linmon/state.json"
+    
+    config = Config(state_file="/var/lib/linmon/state.json", state_shards=True, monitors={})
+    assert config.monitor_state_file("cpu") == "/var/lib/linmon/state.cpu.json"
+
+
+def test_history_grows_to_cover_span(state_file):
+    """Test a trend history holds its window at the observed interval, across runs."""
+    manager = StateManager(state_file, history_samples=8)
+    # One-minute samples for 7 hours, read by a rule with a 6h window
+    for minute in range(420):
+        history = manager.record_sample("load1", minute * 60.0, float(minute), span=6 * 3600.0)
+    assert next(history.samples())[0] <= 419 * 60.0 - 6 * 3600
+    manager.save()
+    
+    manager = StateManager(state_file, history_samples=8)
+    assert manager.get_history("load1").count == history.count
+    
+    # Without a window the ring shrinks back to history_samples
+    history = manager.record_sample("load1", 420 * 60.0, 420.0)
+    assert history.capacity == 8
+    assert [t for t, _ in history.samples()][-1] == 420 * 60.0
@@ -3,11 +3,17 @@
 import pytest
 import os
 from unittest.mock import patch, MagicMock
+from linmon.collectors import diskusage
+from linmon.collectors.deleted import DeletedFileCollector
+from linmon.collectors.diskusage import DiskUsageScanner
+from linmon.collectors.mounts import MountTable, parse_mountinfo, select_mounts
 from linmon.monitors.storage import StorageMonitor
-from linmon.config.schema import StorageConfig, StorageMountConfig
+from linmon.config.schema import Rule, StorageConfig, StorageDiscoveryConfig, StorageMountConfig
 from linmon.rules.engine import RuleEngine
+from linmon.rules.model import RuleResult
 from linmon.state.manager import StateManager
 import tempfile
+from collections.abc import Mapping
 
 
 @pytest.fixture
@@ -55,7 +61,7 @@ def test_storage_monitor_collect_metrics(storage_monitor):
     metrics = storage_monitor.collect_metrics()
     
     # Should have metrics for root mountpoint
-    assert isinstance(metrics, dict)
+    assert isinstance(metrics, Mapping)
     # May have metrics if / is accessible
     if metrics:
         assert any("bytes" in key or "inodes" in key for key in metrics)
@@ -82,7 +88,240 @@ def test_storage_monitor_with_mock(mock_statvfs, storage_monitor):
     
     metrics = storage_monitor.collect_metrics()
     
-    # Should have calculated metrics
-    assert "bytes_used_percent" in metrics
-    assert metrics["bytes_used_percent"] > 0
-    assert "inodes_used_percent" in metrics
+    # Should have calculated labelled metrics
+    assert 'bytes_used_percent{mount="/"}' in metrics
+    assert metrics['bytes_used_percent{mount="/"}'] > 0
+    assert 'inodes_used_percent{mount="/"}' in metrics
+    
+    # Root is no longer duplicated under unlabelled names
+    assert "bytes_used_percent" not in metrics
+    assert "mount_root_bytes_used_percent" not in metrics
+
+
+@patch("os.statvfs")
+def test_storage_rules_labels_and_legacy_names(mock_statvfs, rule_engine):
+    """Test label-selector rules and legacy flat metric names."""
+    def fake_statvfs(path):
+        used = {"/": 500000, "/var": 950000, "/srv/a": 960000, "/srv/b": 100000}[path]
+        stat = MagicMock()
+        stat.f_blocks = 1000000
+        stat.f_bavail = 1000000 - used
+        stat.f_frsize = 4096
+        stat.f_files = 1000
+        stat.f_favail = 500
+        return stat
+    
+    mock_statvfs.side_effect = fake_statvfs
+    
+    config = StorageConfig(
+        enabled=True,
+        rules=[
+            Rule(name="root_full", metric="bytes_used_percent", op="gt", value=40.0, consecutive=1),
+            Rule(
+                name="srv_full",
+                metric="bytes_used_percent",
+                labels={"mount": "/srv/*"},
+                op="gt",
+                value=90.0,
+                consecutive=1,
+            ),
+        ],
+        mountpoints=[
+            StorageMountConfig(path="/", rules=[]),
+            StorageMountConfig(path="/var", rules=[
+                Rule(name="var_full", metric="mount_var_bytes_used_percent", op="gt", value=90.0, consecutive=1),
+            ]),
+            StorageMountConfig(path="/srv/a", rules=[]),
+            StorageMountConfig(path="/srv/b", rules=[]),
+        ],
+    )
+    monitor = StorageMonitor(config, rule_engine)
+    
+    results = {(r.rule_name, r.metric): r for r in monitor.evaluate()}
+    
+    assert results[("root_full", 'bytes_used_percent{mount="/"}')].anomaly is True
+    assert results[("var_full", 'bytes_used_percent{mount="/var"}')].anomaly is True
+    assert results[("srv_full", 'bytes_used_percent{mount="/srv/a"}')].anomaly is True
+    assert results[("srv_full", 'bytes_used_percent{mount="/srv/b"}')].anomaly is False
+    assert len(results) == 4
+    
+    # Glob rules track a streak per series; exact rules keep the rule name
+    assert rule_engine.state.get_rule_streak('srv_full{mount="/srv/a"}') == 1
+    assert rule_engine.state.get_rule_streak("var_full") == 1
+
+
+@patch("os.statvfs")
+def test_storage_expression_rules(mock_statvfs, rule_engine):
+    """Test expression rules read mount series by bare, legacy and selector names."""
+    def fake_statvfs(path):
+        used = {"/": 500000, "/var": 950000}[path]
+        stat = MagicMock()
+        stat.f_blocks = 1000000
+        stat.f_bavail = 1000000 - used
+        stat.f_frsize = 4096
+        stat.f_files = 1000
+        stat.f_favail = 500
+        return stat
+    
+    mock_statvfs.side_effect = fake_statvfs
+    
+    config = StorageConfig(
+        rules=[
+            Rule(name="root_any", expr="bytes_used_percent >= 0", consecutive=1),
+            Rule(name="var_worse", expr="mount_var_bytes_used_percent > bytes_used_percent + 40", consecutive=1),
+            Rule(name="var_series", expr='bytes_used_percent{mount="/var"} > 90', consecutive=1),
+        ],
+        mountpoints=[
+            StorageMountConfig(path="/", rules=[]),
+            StorageMountConfig(path="/var", rules=[
+                Rule(name="var_inodes", expr="inodes_used_percent >= 50", consecutive=1),
+            ]),
+        ],
+    )
+    monitor = StorageMonitor(config, rule_engine)
+    
+    results = {r.rule_name: r for r in monitor.evaluate()}
+    assert sorted(results) == ["root_any", "var_inodes", "var_series", "var_worse"]
+    assert all(r.anomaly for r in results.values())
+    assert results["var_inodes"].metric == 'inodes_used_percent{mount="/var"} >= 50'
+    
+    # Names the monitor never emits are rejected when the config is loaded
+    with pytest.raises(ValueError, match="cpu_percent"):
+        StorageConfig(rules=[Rule(name="bad", expr="cpu_percent > 1", consecutive=1)])
+    with pytest.raises(ValueError, match="mount_srv_bytes_used_percent"):
+        StorageConfig(rules=[Rule(name="bad", expr="mount_srv_bytes_used_percent > 1", consecutive=1)])
+
+
+def mountinfo_line(mount_id, device, root, path, fstype, source="/dev/sda1"):
+    """Format one mountinfo line."""
+    path = path.replace(" ", "\\040")
+    return f"{mount_id} 1 {device} {root} {path} rw,relatime shared:1 - {fstype} {source} rw\n"
+
+
+def test_parse_mountinfo_and_select():
+    """Test parsing, filtering and collapsing bind mounts to one per device."""
+    text = "".join([
+        mountinfo_line(20, "8:1", "/", "/", "ext4"),
+        mountinfo_line(21, "0:5", "/", "/proc", "proc", "proc"),
+        mountinfo_line(22, "0:40", "/", "/run", "tmpfs", "tmpfs"),
+        mountinfo_line(23, "8:2", "/", "/srv/my data", "xfs", "/dev/sdb1"),
+        mountinfo_line(24, "8:2", "/exports", "/home/exports", "xfs", "/dev/sdb1"),
+        mountinfo_line(25, "0:60", "/", "/var/lib/docker/overlay2/x/merged", "overlay", "overlay"),
+        mountinfo_line(26, "8:1", "/var/log", "/mnt/logs", "ext4"),
+        mountinfo_line(27, "0:70", "/", "/mnt/nas", "nfs4", "nas:/export"),
+        "garbage\n",
+    ])
+    entries = parse_mountinfo(text)
+    assert len(entries) == 8
+    assert entries[3].mountpoint == "/srv/my data"
+    assert entries[4].root == "/exports"
+    
+    config = StorageDiscoveryConfig(enabled=True)
+    selected = select_mounts(entries, config.fstypes, config.paths, config.exclude_paths)
+    assert [(e.mountpoint, e.device) for e in selected] == [("/", "8:1"), ("/srv/my data", "8:2")]
+    
+    selected = select_mounts(entries, config.fstypes, ["/srv/*"], skip_devices={"8:1"})
+    assert [e.mountpoint for e in selected] == ["/srv/my data"]
+    
+    # Network filesystems are opt-in
+    selected = select_mounts(entries, ["nfs*"], config.paths, config.exclude_paths)
+    assert [e.mountpoint for e in selected] == ["/mnt/nas"]
+
+
+def test_storage_discovery_follows_mount_table(rule_engine, tmp_path):
+    """Test discovered mounts are collected and the table is reparsed only on change."""
+    data, other = tmp_path / "data", tmp_path / "other"
+    data.mkdir()
+    other.mkdir()
+    mountinfo = tmp_path / "mountinfo"
+    mountinfo.write_text(mountinfo_line(30, "9:1", "/", str(data), "ext4"))
+    
+    config = StorageConfig(
+        mountpoints=[],
+        discovery=StorageDiscoveryConfig(enabled=True, paths=[str(tmp_path) + "/*"]),
+    )
+    monitor = StorageMonitor(config, rule_engine, MountTable(str(mountinfo)))
+    metrics = monitor.collect_metrics()
+    assert set(metrics.family("bytes_total", ("mount",)).label_values) == {(str(data),)}
+    
+    generation = monitor.mount_table.generation
+    monitor.collect_metrics()
+    assert monitor.mount_table.generation == generation
+    
+    mountinfo.write_text(mountinfo.read_text() + mountinfo_line(31, "9:2", "/", str(other), "xfs"))
+    metrics = monitor.collect_metrics()
+    assert set(metrics.family("bytes_total", ("mount",)).label_values) == {(str(data),), (str(other),)}
+    monitor.close()
+
+
+def test_disk_usage_scan_uses_cache(tmp_path, monkeypatch):
+    """Test ranking, cache reuse of unchanged directories and regrowth of big files."""
+    monkeypatch.setattr(diskusage, "BIG_FILE_BYTES", 64 * 1024)
+    root = tmp_path / "fs"
+    for name in ("logs", "small", "many"):
+        (root / name).mkdir(parents=True)
+    (root / "logs" / "app.log").write_bytes(b"x" * 512 * 1024)
+    (root / "small" / "f").write_bytes(b"x" * 8192)
+    for index in range(50):
+        (root / "many" / str(index)).write_bytes(b"x")
+    
+    scanner = DiskUsageScanner(str(tmp_path / "cache"), workers=2)
+    first = scanner.scan(str(root))
+    assert first.complete
+    assert first.top_bytes[0][0] == str(root / "logs")
+    assert first.top_inodes[0][0] == str(root / "many")
+    assert (first.dirs_scanned, first.dirs_cached) == (4, 0)
+    
+    # Unchanged directories come from the cache; a log growing in place is still seen
+    with open(root / "logs" / "app.log", "ab") as f:
+        f.write(b"x" * 512 * 1024)
+    second = scanner.scan(str(root))
+    assert (second.dirs_scanned, second.dirs_cached) == (0, 4)
+    assert second.top_bytes[0][1] >= first.top_bytes[0][1] + 512 * 1024
+    
+    # A new entry changes its directory's mtime, so only that one is listed again
+    (root / "small" / "g").write_bytes(b"x" * 8192)
+    third = scanner.scan(str(root))
+    assert (third.dirs_scanned, third.dirs_cached) == (1, 3)
+
+
+def test_disk_usage_scan_budget_and_diagnose(rule_engine, tmp_path):
+    """Test an exhausted budget marks the scan partial, and anomalies trigger a scan."""
+    (tmp_path / "a").mkdir()
+    scan = DiskUsageScanner(max_entries=1).scan(str(tmp_path))
+    assert not scan.complete
+    
+    config = StorageConfig(mountpoints=[StorageMountConfig(path=str(tmp_path))])
+    monitor = StorageMonitor(config, rule_engine)
+    anomaly = RuleResult(
+        rule_name="low_disk_space",
+        metric=f'bytes_used_percent{{mount="{tmp_path}"}}',
+        value=95.0,
+        threshold=90.0,
+        operator="gt",
+        violated=True,
+        streak=1,
+        consecutive_required=1,
+        anomaly=True,
+    )
+    diagnostics = monitor.diagnose([anomaly])
+    assert diagnostics["disk_usage"][str(tmp_path)]["top_bytes"][0]["path"] == str(tmp_path / "a")
+
+
+def test_deleted_open_files(rule_engine, tmp_path):
+    """Test space of a deleted file held open is found per mount and per process."""
+    path = tmp_path / "rotated.log"
+    path.write_bytes(b"x" * 256 * 1024)
+    with open(path, "rb") as first, open(path, "rb") as second:
+        path.unlink()
+        config = StorageConfig(mountpoints=[StorageMountConfig(path=str(tmp_path))])
+        monitor = StorageMonitor(config, rule_engine, deleted_collector=DeletedFileCollector())
+        metrics = monitor.collect_metrics()
+        held = os.fstat(first.fileno()).st_blocks * 512
+        diagnostics = monitor.diagnose([])
+    
+    assert metrics[f'deleted_open_bytes{{mount="{tmp_path}"}}'] >= held
+    # Two fds of one file count once (pytest's own capture files are small)
+    holder = next(h for h in diagnostics["deleted_open"]["holders"] if h["pid"] == os.getpid())
+    assert held <= holder["bytes"] < 2 * held
+    assert holder["largest_path"] == str(path)
@@ -0,0 +1,155 @@
+"""Tests for the embedded metric history store."""
+
+import os
+import struct
+import pytest
+from linmon.metrics.model import MetricSet
+from linmon.store.history import HistoryStore
+from linmon.store.ring import HEADER_SIZE, RingFile, RingFormatError
+
+
+def test_ring_file_wraps_and_reads_ranges(tmp_path):
+    """Test constant-size ring, wrap-around and range reads."""
+    path = str(tmp_path / "x.ring")
+    ring = RingFile(path, struct.Struct("<dd"), 4, key="x")
+    for i in range(6):
+        ring.append((float(i), i * 10.0))
+    
+    assert len(ring) == 4
+    assert ring.total == 6
+    assert os.path.getsize(path) == HEADER_SIZE + 4 * 16
+    assert [r[0] for r in ring.read()] == [2.0, 3.0, 4.0, 5.0]
+    assert list(ring.read(since=3.0, until=4.0)) == [(3.0, 30.0), (4.0, 40.0)]
+    assert list(ring.read(since=9.0)) == []
+    
+    # The range wraps around the end of the file: two zero-copy views
+    segments = ring.segments()
+    assert [len(s) for s in segments] == [32, 32]
+    for segment in segments:
+        segment.release()
+    ring.close()
+    
+    reopened = RingFile(path, struct.Struct("<dd"), 100)
+    assert reopened.capacity == 4
+    assert reopened.key == "x"
+    assert reopened.last() == (5.0, 50.0)
+    reopened.close()
+    
+    with pytest.raises(RingFormatError):
+        RingFile(path, struct.Struct("<ddd"), 4)
+
+
+def test_history_store_append_metrics(tmp_path):
+    """Test appending snapshots and reading series back."""
+    store = HistoryStore(str(tmp_path / "history"), capacity=8)
+    metrics = MetricSet()
+    metrics.set("cpu_percent", 10.0)
+    metrics.set("bytes_used_percent", 50.0, {"mount": "/"})
+    
+    assert store.append_metrics(metrics, 100.0) == 2
+    metrics.set("cpu_percent", 20.0)
+    store.append_metrics(metrics, 160.0)
+    store.append("cpu_percent", 130.0, 99.0)  # Out of order: dropped
+    store.close()
+    
+    store = HistoryStore(str(tmp_path / "history"), capacity=8)
+    assert store.read("cpu_percent") == [(100.0, 10.0), (160.0, 20.0)]
+    assert store.read('bytes_used_percent{mount="/"}', since=150.0) == [(160.0, 50.0)]
+    assert store.read("missing") == []
+    assert sorted(store.series()) == ['bytes_used_percent{mount="/"}', "cpu_percent"]
+    store.close()
+
+
+def test_history_store_rollups(tmp_path):
+    """Test incremental min/max/sum/count buckets and tier selection."""
+    from linmon.store.rollup import RollupTier
+    
+    tiers = [RollupTier("1d", 86400, 30 * 86400), RollupTier("1h", 3600, 2 * 86400)]
+    store = HistoryStore(str(tmp_path / "history"), capacity=4, tiers=tiers)
+    assert [t.name for t in store.tiers] == ["1h", "1d"]
+    assert store.tiers[0].capacity == 48
+    
+    # Every 20 minutes for 3 hours
+    for i in range(9):
+        store.append("load1", 1200.0 * i, float(i))
+    
+    buckets = store.read_rollup("load1", "1h")
+    assert buckets == [(0.0, 0.0, 2.0, 3.0, 3), (3600.0, 3.0, 5.0, 12.0, 3), (7200.0, 6.0, 8.0, 21.0, 3)]
+    assert store.read_rollup("load1", "1d") == [(0.0, 0.0, 8.0, 36.0, 9)]
+    assert store.read_rollup("load1", "1h", since=4000.0) == buckets[1:]
+    
+    # Raw only holds the last 4 samples, so older ranges come from rollups
+    assert store.query("load1", since=6000.0)[0] == "raw"
+    tier, result = store.query("load1", since=0.0)
+    assert tier == "1h"
+    assert result == buckets
+    
+    with pytest.raises(KeyError):
+        store.read_rollup("load1", "5m")
+    store.close()
+
+
+def test_history_store_bounds_open_rings(tmp_path):
+    """Test the least recently used rings are closed beyond max_open."""
+    store = HistoryStore(str(tmp_path / "history"), capacity=4, max_open=2)
+    for name in ("a", "b", "a", "c"):
+        store.append(name, 100.0, 1.0)
+    assert [key for key, _ in store._rings] == ["a", "c"]
+    assert store.read("b") == [(100.0, 1.0)]
+    store.close()
+    assert not store._rings
+
+
+def test_history_store_applies_changed_capacity(tmp_path):
+    """Test existing rings follow a changed sample count or tier retention."""
+    from linmon.store.rollup import RollupTier
+    
+    directory = str(tmp_path / "history")
+    store = HistoryStore(directory, capacity=8, tiers=[RollupTier("1h", 3600, 4 * 3600)])
+    for i in range(8):
+        store.append("load1", 3600.0 * i, float(i))
+    store.close()
+    
+    # Fewer raw samples and a longer retention, plus a second 1h tier
+    tiers = [RollupTier("1h", 3600, 6 * 3600), RollupTier("1h", 3600, 2 * 3600)]
+    store = HistoryStore(directory, capacity=3, tiers=tiers)
+    series_dir = tmp_path / "history" / "load1"
+    before = sorted((p.name, p.stat().st_mtime_ns) for p in series_dir.iterdir())
+    
+    # Reads see the old files as they are and change nothing on disk
+    assert len(store.read("load1")) == 8
+    short, long = store.tiers
+    assert store._read_tier("load1", short, None, None) == []
+    assert [b[0] for b in store._read_tier("load1", long, None, None)] == [3600.0 * i for i in range(4, 8)]
+    assert store.query("load1", since=0.0)[0] == "raw"
+    assert sorted((p.name, p.stat().st_mtime_ns) for p in series_dir.iterdir()) == before
+    
+    # The next append resizes the raw ring and the longer tier takes over the old file
+    store.append("load1", 8 * 3600.0, 8.0)
+    assert store.read("load1") == [(6 * 3600.0, 6.0), (7 * 3600.0, 7.0), (8 * 3600.0, 8.0)]
+    assert len(store._read_tier("load1", short, None, None)) == 1
+    assert len(store._read_tier("load1", long, None, None)) == 5
+    store.close()
+    
+    files = sorted(p.name.split(".", 1)[1] for p in (tmp_path / "history" / "load1").iterdir())
+    assert files == ["1h-2.rollup", "1h-6.rollup", "ring"]
+
+
+def test_store_rows_read_finest_covering_tier(tmp_path):
+    """Test history store rows come from raw samples or a covering rollup tier."""
+    from linmon.report.query import store_rows
+    from linmon.store.rollup import RollupTier
+    
+    store = HistoryStore(str(tmp_path / "history"), capacity=2, tiers=[RollupTier("1h", 3600, 86400)])
+    for i in range(4):
+        store.append("load1", 1800.0 * i, float(i))
+        store.append("load5", 1800.0 * i, 1.0)
+    
+    rows = list(store_rows(store, ["load1"], since=0.0))
+    assert [(r["timestamp"], r["tier"], r["min"], r["max"], r["mean"], r["count"]) for r in rows] == [
+        ("1970-01-01T00:00:00Z", "1h", 0.0, 1.0, 0.5, 2),
+        ("1970-01-01T01:00:00Z", "1h", 2.0, 3.0, 2.5, 2),
+    ]
+    rows = list(store_rows(store, [], since=5400.0))
+    assert {(r["series"], r["tier"]) for r in rows} == {("load1", "raw"), ("load5", "raw")}
+    store.close()
@@ -0,0 +1,24 @@
+"""Tests for time parsing."""
+
+import pytest
+from linmon.util.time import parse_iso, parse_time
+
+
+def test_parse_iso_fractions_and_offsets():
+    """Test any number of fractional digits, Z and explicit offsets."""
+    base = parse_iso("2024-01-15T10:30:00Z")
+    assert parse_iso("2024-01-15T10:30:00.5Z") == base + 0.5
+    assert parse_iso("2024-01-15T10:30:00.1234567") == pytest.approx(base + 0.123456)
+    assert parse_iso("2024-01-15T12:30:00.25+02:00") == base + 0.25
+    assert parse_iso("2024-01-15") == base - 37800
+    with pytest.raises(ValueError):
+        parse_iso("yesterday")
+
+
+def test_parse_time_requires_unit_or_date():
+    """Test durations count back from now and bare numbers are rejected."""
+    assert parse_time("2h", now=10000.0) == 2800.0
+    assert parse_time("2024-01-15T10:30:00Z") == parse_iso("2024-01-15T10:30:00Z")
+    for value in ("2024", "90", "1.5"):
+        with pytest.raises(ValueError, match="needs a unit"):
+            parse_time(value, now=10000.0)